@@ -0,0 +1,203 @@
+import os
+import sqlite3
+
+from mock import patch
+import numpy as np
+import pandas as pd
+
+from zipline.assets import AssetDBWriter, AssetFinder
+from zipline.assets.synthetic import make_simple_equity_info
+from zipline.data.bundles.incremental import (
+    append_daily_bars,
+    append_minute_bars,
+    assign_sids,
+    last_daily_session,
+    upsert_equities,
+)
+from zipline.data.minute_bars import (
+    BcolzMinuteBarReader,
+    BcolzMinuteBarWriter,
+    US_EQUITIES_MINUTES_PER_DAY,
+)
+from zipline.data.us_equity_pricing import (
+    BcolzDailyBarReader,
+    BcolzDailyBarWriter,
+)
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+
+
+def make_bars(index, base):
+    n = len(index)
+    return pd.DataFrame(
+        {
+            'open': base + np.arange(n, dtype=np.float64),
+            'high': base + np.arange(n, dtype=np.float64) + 1,
+            'low': base + np.arange(n, dtype=np.float64) - 1,
+            'close': base + np.arange(n, dtype=np.float64) + 0.5,
+            'volume': 100.0 + np.arange(n, dtype=np.float64),
+        },
+        index=index,
+    )
+
+
+class IncrementalIngestTestCase(WithTradingCalendars,
+                                WithInstanceTmpDir,
+                                ZiplineTestCase):
+
+    START_SESSION = pd.Timestamp('2015-06-01', tz='UTC')
+    END_SESSION = pd.Timestamp('2015-06-12', tz='UTC')
+
+    @classmethod
+    def init_class_fixtures(cls):
+        super(IncrementalIngestTestCase, cls).init_class_fixtures()
+        cls.sessions = cls.trading_calendar.sessions_in_range(
+            cls.START_SESSION,
+            cls.END_SESSION,
+        )
+
+    def test_assign_sids(self):
+        sids = assign_sids(['A', 'C', 'B', 'D'], {'A': 0, 'B': 5})
+        assert_equal(sids, {'A': 0, 'B': 5, 'C': 6, 'D': 7})
+
+    def test_append_daily_bars(self):
+        path = self.instance_tmpdir.getpath('daily')
+        old_sessions = self.sessions[:-2]
+        BcolzDailyBarWriter(
+            path,
+            self.trading_calendar,
+            self.sessions[0],
+            old_sessions[-1],
+        ).write([
+            (1, make_bars(old_sessions, 10.0)),
+            (2, make_bars(old_sessions[:3], 20.0)),
+        ])
+        assert_equal(last_daily_session(path), old_sessions[-1])
+
+        full_1 = make_bars(self.sessions, 10.0)
+        full_3 = make_bars(self.sessions[4:], 30.0)
+        converted = []
+        to_ctable = BcolzDailyBarWriter.to_ctable
+
+        def record_conversions(self, raw_data, invalid_data_behavior):
+            if isinstance(raw_data, pd.DataFrame):
+                converted.append(len(raw_data))
+            return to_ctable(self, raw_data, invalid_data_behavior)
+
+        with patch.object(BcolzDailyBarWriter,
+                          'to_ctable',
+                          record_conversions):
+            append_daily_bars(
+                path,
+                self.trading_calendar,
+                self.sessions[-1],
+                [
+                    # the sessions already written are dropped
+                    (1, full_1.iloc[-4:]),
+                    # a new sid brings its whole history
+                    (3, full_3),
+                ],
+            )
+        assert_equal(last_daily_session(path), self.sessions[-1])
+        # only the new rows are converted, the stored rows are copied.
+        assert_equal(converted, [2, len(full_3)])
+
+        reader = BcolzDailyBarReader(path)
+        closes = reader.load_raw_arrays(
+            ['close'], self.sessions[0], self.sessions[-1], [1, 2, 3],
+        )[0]
+        np.testing.assert_array_almost_equal(closes[:, 0], full_1.close)
+        np.testing.assert_array_almost_equal(
+            closes[:3, 1], make_bars(old_sessions[:3], 20.0).close,
+        )
+        assert np.isnan(closes[3:, 1]).all()
+        assert np.isnan(closes[:4, 2]).all()
+        np.testing.assert_array_almost_equal(closes[4:, 2], full_3.close)
+
+    def test_upsert_equities(self):
+        path = self.instance_tmpdir.getpath('assets.sqlite')
+        equities = make_simple_equity_info(
+            [0, 1, 2],
+            self.sessions[0],
+            self.sessions[-3],
+            symbols=['A', 'B', 'C'],
+        )
+        writer = AssetDBWriter(path)
+        writer.write(equities=equities.loc[[0, 1]])
+        writer.engine.dispose()
+
+        def mappings():
+            conn = sqlite3.connect(path)
+            try:
+                return sorted(conn.execute(
+                    'SELECT sid, id FROM equity_symbol_mappings'
+                ).fetchall())
+            finally:
+                conn.close()
+
+        before = mappings()
+        equities.loc[1, 'end_date'] = self.sessions[-1]
+        # sid 0 is not in the update, it is kept as it is.
+        upsert_equities(path, equities.loc[[1, 2]])
+
+        after = mappings()
+        assert_equal([sid for sid, _ in after], [0, 1, 2])
+        assert_equal(after[0], before[0])
+
+        finder = AssetFinder(path)
+        self.add_instance_callback(finder.engine.dispose)
+        assert_equal(sorted(finder.sids), [0, 1, 2])
+        assert_equal(finder.retrieve_asset(0).end_date, self.sessions[-3])
+        assert_equal(finder.retrieve_asset(1).end_date, self.sessions[-1])
+        assert_equal(finder.lookup_symbol('B', self.sessions[-1]).sid, 1)
+        assert_equal(finder.lookup_symbol('C', self.sessions[0]).sid, 2)
+        self.assertFalse(os.path.exists(path + '.incremental'))
+
+    def test_append_minute_bars_links_previous(self):
+        src = self.instance_tmpdir.getpath('minute_src')
+        dst = self.instance_tmpdir.getpath('minute_dst')
+        os.makedirs(src)
+        old_sessions = self.sessions[:-1]
+        writer = BcolzMinuteBarWriter(
+            src,
+            self.trading_calendar,
+            self.sessions[0],
+            old_sessions[-1],
+            US_EQUITIES_MINUTES_PER_DAY,
+        )
+        open_ = self.trading_calendar.session_open(old_sessions[-1])
+        minutes = pd.date_range(open_, periods=3, freq='min')
+        writer.write([
+            (1, make_bars(minutes, 10.0)),
+            (2, make_bars(minutes, 20.0)),
+        ])
+
+        new_open = self.trading_calendar.session_open(self.sessions[-1])
+        new_minutes = pd.date_range(new_open, periods=3, freq='min')
+        append_minute_bars(
+            dst,
+            self.sessions[-1],
+            [(1, make_bars(new_minutes, 11.0))],
+            src=src,
+        )
+
+        # the previous ingestion is not modified
+        src_reader = BcolzMinuteBarReader(src)
+        assert_equal(src_reader.last_available_dt,
+                     self.trading_calendar.session_close(old_sessions[-1]))
+        assert_equal(src_reader.table_len(1), src_reader.table_len(2))
+
+        reader = BcolzMinuteBarReader(dst)
+        assert_equal(reader.get_value(1, new_minutes[0], 'close'), 11.5)
+        assert_equal(reader.get_value(1, minutes[0], 'close'), 10.5)
+        assert_equal(reader.get_value(2, minutes[-1], 'close'), 22.5)
+
+        # untouched sids are hard links to the previous ingestion
+        sid_2 = os.path.join(dst, '00', '00', '000002.bcolz', 'close',
+                             'meta', 'sizes')
+        if hasattr(os, 'link'):
+            assert_equal(os.stat(sid_2).st_nlink, 2)
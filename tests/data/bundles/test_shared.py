@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from zipline.assets import AssetDBWriter
+from zipline.assets.synthetic import make_simple_equity_info
+from zipline.data.bundles.shared import (
+    ADJUSTMENT_DB_FILENAME,
+    ASSET_DB_FILENAME,
+    attach_bundle,
+    release_bundle,
+    share_bundle,
+    shared_bundle_path,
+)
+from zipline.data.minute_bars import (
+    BcolzMinuteBarWriter,
+    US_EQUITIES_MINUTES_PER_DAY,
+)
+from zipline.data.mmap_daily_bars import MmapDailyBarReader
+from zipline.data.mmap_minute_bars import MmapMinuteBarReader
+from zipline.data.us_equity_pricing import (
+    BcolzDailyBarReader,
+    BcolzDailyBarWriter,
+    SQLiteAdjustmentWriter,
+)
+from zipline.pipeline.loaders.synthetic import make_bar_data
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import (
+    assert_equal,
+    assert_false,
+    assert_is_instance,
+    assert_true,
+)
+
+
+class SharedBundleTestCase(WithTradingCalendars,
+                           WithInstanceTmpDir,
+                           ZiplineTestCase):
+
+    START_DATE = pd.Timestamp('2014-01-06', tz='utc')
+    END_DATE = pd.Timestamp('2014-01-10', tz='utc')
+
+    def init_instance_fixtures(self):
+        super(SharedBundleTestCase, self).init_instance_fixtures()
+
+        self.path = self.instance_tmpdir.makedir('bundle')
+        self.root = self.instance_tmpdir.getpath('shared')
+
+        sessions = self.trading_calendar.sessions_in_range(
+            self.START_DATE,
+            self.END_DATE,
+        )
+        self.sessions = sessions
+        equities = make_simple_equity_info(
+            [1, 2],
+            self.START_DATE,
+            self.END_DATE,
+        )
+        AssetDBWriter(os.path.join(self.path, ASSET_DB_FILENAME)).write(
+            equities=equities,
+        )
+
+        daily_path = os.path.join(self.path, 'daily')
+        BcolzDailyBarWriter(
+            daily_path,
+            self.trading_calendar,
+            sessions[0],
+            sessions[-1],
+        ).write(make_bar_data(equities, sessions))
+        SQLiteAdjustmentWriter(
+            os.path.join(self.path, ADJUSTMENT_DB_FILENAME),
+            BcolzDailyBarReader(daily_path),
+            self.trading_calendar.all_sessions,
+        ).write(splits=pd.DataFrame({
+            'effective_date': np.array(
+                [sessions[2].value // 10 ** 9], dtype=np.int64,
+            ),
+            'ratio': [0.5],
+            'sid': [1],
+        }))
+
+        minute_path = os.path.join(self.path, 'minute')
+        os.makedirs(minute_path)
+        minutes = self.trading_calendar.minutes_for_session(sessions[1])
+        BcolzMinuteBarWriter(
+            minute_path,
+            self.trading_calendar,
+            sessions[0],
+            sessions[-1],
+            US_EQUITIES_MINUTES_PER_DAY,
+        ).write([(1, pd.DataFrame(
+            {
+                'open': 10.0,
+                'high': 11.0,
+                'low': 9.0,
+                'close': 10.5,
+                'volume': 100.0,
+            },
+            index=minutes[:5],
+        ))])
+
+    def test_share_and_attach(self):
+        shared_path = share_bundle(self.path, root=self.root, minute=True)
+        assert_equal(shared_path, shared_bundle_path(self.path, self.root))
+        # sharing again reuses the directory.
+        assert_equal(
+            share_bundle(self.path, root=self.root, minute=True),
+            shared_path,
+        )
+
+        bundle = attach_bundle(shared_path)
+        assert_is_instance(bundle.equity_daily_bar_reader,
+                           MmapDailyBarReader)
+        assert_is_instance(bundle.equity_minute_bar_reader,
+                           MmapMinuteBarReader)
+
+        expected = BcolzDailyBarReader(os.path.join(self.path, 'daily'))
+        columns = ['open', 'close', 'volume']
+        for e, r in zip(
+                expected.load_raw_arrays(
+                    columns, self.sessions[0], self.sessions[-1], [1, 2],
+                ),
+                bundle.equity_daily_bar_reader.load_raw_arrays(
+                    columns, self.sessions[0], self.sessions[-1], [1, 2],
+                )):
+            np.testing.assert_array_equal(r, e)
+
+        assert_equal(
+            [a.sid for a in bundle.asset_finder.retrieve_all([1, 2])],
+            [1, 2],
+        )
+        assert_equal(
+            bundle.adjustment_reader.get_adjustments_for_sid('splits', 1),
+            [[self.sessions[2], 0.5]],
+        )
+        minute = self.trading_calendar.session_open(self.sessions[1])
+        assert_equal(
+            bundle.equity_minute_bar_reader.get_value(1, minute, 'close'),
+            10.5,
+        )
+
+        release_bundle(shared_path)
+        assert_false(os.path.exists(shared_path))
+
+    def test_share_without_minute_bars(self):
+        shared_path = share_bundle(self.path, root=self.root)
+        assert_false(os.path.exists(os.path.join(shared_path, 'minute')))
+        bundle = attach_bundle(shared_path)
+        minute = self.trading_calendar.session_open(self.sessions[1])
+        assert_equal(
+            bundle.equity_minute_bar_reader.get_value(1, minute, 'close'),
+            10.5,
+        )
+        assert_true(os.path.isdir(os.path.join(shared_path, 'daily')))
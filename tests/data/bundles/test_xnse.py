@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from zipline.data.bundles.ingest_utilities import split_frames, write_csvs
+from zipline.data.bundles.XNSE import _pricing_iter
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
+from zipline.testing.predicates import assert_equal
+
+
+class XNSEPricingTestCase(WithInstanceTmpDir, ZiplineTestCase):
+
+    SYMBOLS = ['AAA', 'BBB']
+
+    def init_instance_fixtures(self):
+        super(XNSEPricingTestCase, self).init_instance_fixtures()
+        self.bizdays = list(pd.bdate_range('2018-01-01', '2018-01-12'))
+        self.maps = pd.DataFrame({
+            'symbol': self.SYMBOLS,
+            'start_date': [self.bizdays[0], self.bizdays[2]],
+            'end_date': [self.bizdays[-1], self.bizdays[-3]],
+        })
+
+        rows = []
+        for i, symbol in enumerate(self.SYMBOLS):
+            for j, dt in enumerate(self.bizdays):
+                # BBB has no bar on the 5th session.
+                if symbol == 'BBB' and j == 4:
+                    continue
+                price = 10.0 * (i + 1) + j
+                rows.append((symbol, dt, price, price + 1, price - 1,
+                             price + 0.5, 100.0 + j))
+        # the bulk file is ordered by date, not by ticker.
+        self.bulk = pd.DataFrame(
+            sorted(rows, key=lambda row: row[1]),
+            columns=['ticker', 'date', 'open', 'high', 'low', 'close',
+                     'volume'],
+        )
+        self.csvdir = self.instance_tmpdir.makedir('daily')
+
+    def pricing(self, bars=None):
+        meta_data = self.maps.copy()
+        return list(_pricing_iter(self.csvdir, self.SYMBOLS, meta_data,
+                                  self.bizdays, False, bars=bars))
+
+    def test_standalone_ingest_reads_written_csvs(self):
+        bars = split_frames(self.bulk, maps=self.maps)
+        write_csvs(bars, self.csvdir)
+        assert_equal(
+            sorted(os.listdir(self.csvdir)),
+            ['AAA.csv', 'BBB.csv'],
+        )
+
+        # an ingest registered outside of the loop has no bars in memory,
+        # and reads the same bars back from the csvs.
+        from_csvs = self.pricing()
+        from_memory = self.pricing(bars)
+        assert_equal([sid for sid, _ in from_csvs], [0, 1])
+        assert_equal([sid for sid, _ in from_memory], [0, 1])
+        for (_, expected), (_, result) in zip(from_memory, from_csvs):
+            assert_frame_equal(
+                result.astype(np.float64),
+                expected.astype(np.float64),
+                check_names=False,
+            )
+
+    def test_missing_csv(self):
+        bars = split_frames(self.bulk, maps=self.maps)
+        write_csvs({'AAA': bars['AAA']}, self.csvdir)
+        with self.assertRaises(ValueError):
+            self.pricing()
+        # the symbols in memory do not need a csv.
+        assert_equal(len(self.pricing({'BBB': bars['BBB']})), 2)
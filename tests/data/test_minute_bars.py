@@ -183,6 +183,50 @@ class BcolzMinuteBarTestCase(WithTradingCalendars,
         volume_price = reader.get_value(sid, minute, 'volume')
         self.assertEquals(50.0, volume_price)
 
+    def test_get_values(self):
+        minutes = self.market_opens[self.test_calendar_start:].iloc[:2]
+        data = {
+            1: DataFrame(
+                data={
+                    'open': [10.0, 11.0],
+                    'high': [20.0, 21.0],
+                    'low': [30.0, 31.0],
+                    'close': [40.0, 41.0],
+                    'volume': [50.0, 51.0],
+                },
+                index=minutes,
+            ),
+            # only trades on the second session.
+            2: DataFrame(
+                data={
+                    'open': [110.0],
+                    'high': [120.0],
+                    'low': [130.0],
+                    'close': [140.0],
+                    'volume': [150.0],
+                },
+                index=minutes[1:],
+            ),
+        }
+        self.writer.write(sorted(data.items()))
+        reader = BcolzMinuteBarReader(self.dest)
+
+        for minute in minutes:
+            # the next minute has no trades for either sid.
+            for dt in (minute, minute + timedelta(minutes=1)):
+                for field in reader.FIELDS:
+                    expected = [reader.get_value(sid, dt, field)
+                                for sid in (2, 1)]
+                    assert_almost_equal(
+                        reader.get_values([2, 1], dt, field),
+                        expected,
+                    )
+
+        assert_array_equal(
+            reader.get_values([1, 2], minutes[0], 'volume'),
+            array([50, 0], dtype=int64),
+        )
+
     def test_write_two_bars(self):
         minute_0 = self.market_opens[self.test_calendar_start]
         minute_1 = minute_0 + timedelta(minutes=1)
@@ -882,6 +926,41 @@ class BcolzMinuteBarTestCase(WithTradingCalendars,
                 assert_almost_equal(data[sid].loc[minutes, col],
                                     arrays[i][j][minute_locs])
 
+    def test_exclusion_indices_for_range(self):
+        day_before_thanksgiving = Timestamp('2015-11-25', tz='UTC')
+        black_friday = Timestamp('2015-11-27', tz='UTC')
+        xmas_eve = Timestamp('2015-12-24', tz='UTC')
+
+        metadata = self.reader._get_metadata()
+        session_lengths = (
+            self.market_closes - self.market_opens
+        ).values.astype('timedelta64[m]').astype(int64) + 1
+        assert_array_equal(metadata.session_lengths, session_lengths)
+
+        start_idx = self.reader._find_position_of_minute(
+            self.market_opens[day_before_thanksgiving],
+        )
+        end_idx = self.reader._find_position_of_minute(
+            self.market_closes[xmas_eve],
+        )
+        black_friday_open = self.reader._find_position_of_minute(
+            self.market_opens[black_friday],
+        )
+        black_friday_close = self.reader._find_position_of_minute(
+            self.market_closes[black_friday],
+        )
+        self.assertEqual(
+            self.reader._exclusion_indices_for_range(start_idx, end_idx),
+            [(black_friday_close + 1,
+              black_friday_open + US_EQUITIES_MINUTES_PER_DAY - 1)],
+        )
+        self.assertIsNone(
+            self.reader._exclusion_indices_for_range(
+                start_idx,
+                black_friday_close,
+            ),
+        )
+
     def test_adjust_non_trading_minutes(self):
         start_day = Timestamp('2015-06-01', tz='UTC')
         end_day = Timestamp('2015-06-02', tz='UTC')
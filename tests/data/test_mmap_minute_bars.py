@@ -0,0 +1,140 @@
+import os
+
+from numpy import arange, float64
+from numpy.testing import assert_almost_equal, assert_array_equal
+from pandas import DataFrame, Timestamp
+
+from zipline.data.bar_reader import NoDataForSid
+from zipline.data.minute_bars import (
+    BcolzMinuteBarReader,
+    BcolzMinuteBarWriter,
+    US_EQUITIES_MINUTES_PER_DAY,
+)
+from zipline.data.mmap_minute_bars import (
+    MmapMinuteBarReader,
+    bcolz_minute_bar_sids,
+    convert_bcolz_minute_bars,
+)
+from zipline.testing.fixtures import (
+    WithAssetFinder,
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+
+# covers the early close of 2015-11-27.
+TEST_CALENDAR_START = Timestamp('2015-11-23', tz='UTC')
+TEST_CALENDAR_STOP = Timestamp('2015-12-04', tz='UTC')
+
+
+class MmapMinuteBarTestCase(WithTradingCalendars,
+                            WithAssetFinder,
+                            WithInstanceTmpDir,
+                            ZiplineTestCase):
+
+    ASSET_FINDER_EQUITY_SIDS = 1, 2, 3
+
+    def init_instance_fixtures(self):
+        super(MmapMinuteBarTestCase, self).init_instance_fixtures()
+
+        self.src = self.instance_tmpdir.getpath('bcolz')
+        self.dest = self.instance_tmpdir.getpath('mmap')
+        os.makedirs(self.src)
+
+        writer = BcolzMinuteBarWriter(
+            self.src,
+            self.trading_calendar,
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+            US_EQUITIES_MINUTES_PER_DAY,
+            ohlc_ratios_per_sid={3: 10000},
+        )
+        sessions = self.trading_calendar.sessions_in_range(
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+        )
+        self.sessions = sessions
+        # sid 1 trades every minute, sid 2 every other minute of the first
+        # sessions only and sid 3 has prices with more decimals.
+        writer.write([
+            (1, self.make_bars(
+                self.trading_calendar.minutes_for_sessions_in_range(
+                    sessions[0], sessions[-1]),
+                10.0,
+            )),
+            (2, self.make_bars(
+                self.trading_calendar.minutes_for_sessions_in_range(
+                    sessions[0], sessions[2])[::2],
+                20.0,
+            )),
+            (3, self.make_bars(
+                self.trading_calendar.minutes_for_session(sessions[4]),
+                30.1234,
+            )),
+        ])
+
+        convert_bcolz_minute_bars(self.src, self.dest, sessions_per_block=3)
+        self.bcolz_reader = BcolzMinuteBarReader(self.src)
+        self.reader = MmapMinuteBarReader(self.dest)
+
+    @staticmethod
+    def make_bars(minutes, base):
+        values = base + arange(len(minutes), dtype=float64) / 100
+        return DataFrame(
+            {
+                'open': values,
+                'high': values + 1,
+                'low': values - 1,
+                'close': values + 0.5,
+                'volume': arange(len(minutes), dtype=float64) + 100,
+            },
+            index=minutes,
+        )
+
+    def test_sids(self):
+        self.assertEqual(bcolz_minute_bar_sids(self.src), [1, 2, 3])
+        assert_array_equal(self.reader._sids, [1, 2, 3])
+
+    def test_no_minute_bars_for_sid(self):
+        minute = self.trading_calendar.session_open(self.sessions[0])
+        with self.assertRaises(NoDataForSid):
+            self.reader.get_value(1337, minute, 'close')
+
+    def test_get_value(self):
+        for session in self.sessions[[0, 2, 3, 4]]:
+            minutes = self.trading_calendar.minutes_for_session(session)
+            for minute in minutes[[0, 1, 2, -1]]:
+                for sid in (1, 2, 3):
+                    for field in self.reader.FIELDS:
+                        assert_almost_equal(
+                            self.reader.get_value(sid, minute, field),
+                            self.bcolz_reader.get_value(sid, minute, field),
+                        )
+                for field in self.reader.FIELDS:
+                    assert_almost_equal(
+                        self.reader.get_values([3, 1, 2], minute, field),
+                        self.bcolz_reader.get_values([3, 1, 2], minute,
+                                                     field),
+                    )
+
+    def test_load_raw_arrays(self):
+        # spans the early close.
+        start = self.trading_calendar.session_open(self.sessions[3])
+        end = self.trading_calendar.session_close(self.sessions[5])
+        fields = list(self.reader.FIELDS)
+        expected = self.bcolz_reader.load_raw_arrays(
+            fields, start, end, [1, 2, 3],
+        )
+        result = self.reader.load_raw_arrays(fields, start, end, [1, 2, 3])
+        for e, r in zip(expected, result):
+            assert_almost_equal(r, e)
+
+    def test_get_last_traded_dt(self):
+        for sid in (1, 2, 3):
+            asset = self.asset_finder.retrieve_asset(sid)
+            for session in self.sessions[[0, 3, -1]]:
+                minute = self.trading_calendar.session_close(session)
+                self.assertEqual(
+                    self.reader.get_last_traded_dt(asset, minute),
+                    self.bcolz_reader.get_last_traded_dt(asset, minute),
+                )
@@ -30,6 +30,10 @@ from pandas import (
 )
 from pandas.util.testing import assert_index_equal
 
+from zipline.data.mmap_daily_bars import (
+    MmapDailyBarReader,
+    convert_bcolz_daily_bars,
+)
 from zipline.data.us_equity_pricing import (
     BcolzDailyBarReader,
     BcolzDailyBarWriter,
@@ -369,6 +373,33 @@ class BcolzDailyBarNeverReadAllTestCase(BcolzDailyBarTestCase):
     BCOLZ_DAILY_BAR_READ_ALL_THRESHOLD = maxsize
 
 
+class MmapDailyBarTestCase(BcolzDailyBarTestCase):
+    """
+    Run the tests defined in BcolzDailyBarTestCase against the daily bars
+    converted to memory-mapped columns.
+    """
+    @classmethod
+    def init_class_fixtures(cls):
+        super(MmapDailyBarTestCase, cls).init_class_fixtures()
+        path = cls.tmpdir.getpath('mmap_daily_bars')
+        convert_bcolz_daily_bars(cls.bcolz_daily_bar_ctable, path)
+        cls.bcolz_equity_daily_bar_reader = MmapDailyBarReader(path)
+
+    def test_unadjusted_get_value_empty_value(self):
+        # the columns are shared between readers, they can't be modified.
+        reader = self.bcolz_equity_daily_bar_reader
+        with self.assertRaises(ValueError):
+            reader._spot_col('close')[0] = 0
+
+    def test_sessions_and_calendar(self):
+        expected = BcolzDailyBarReader(self.bcolz_daily_bar_ctable)
+        reader = self.bcolz_equity_daily_bar_reader
+        assert_index_equal(reader.sessions, expected.sessions)
+        self.assertEqual(reader.trading_calendar, expected.trading_calendar)
+        self.assertEqual(reader.last_available_dt,
+                         expected.last_available_dt)
+
+
 class BcolzDailyBarWriterMissingDataTestCase(WithAssetFinder,
                                              WithTmpDir,
                                              WithTradingCalendars,
@@ -38,6 +38,7 @@ from zipline.finance.slippage import (
     VolatilityVolumeShare,
     VolumeShareSlippage,
     FixedBasisPointsSlippage,
+    FixedSlippage,
 )
 from zipline.protocol import DATASOURCE_TYPE, BarData
 from zipline.testing import (
@@ -698,6 +699,78 @@ class VolumeShareSlippageTestCase(WithCreateBarData,
 
         self.assertEquals(len(orders_txns), 0)
 
+    @parameterized.expand([
+        ('volume_share', VolumeShareSlippage(volume_limit=0.1)),
+        ('fixed_basis_points', FixedBasisPointsSlippage(volume_limit=0.1)),
+        ('fixed', FixedSlippage(spread=0.02)),
+    ])
+    def test_simulate_many(self, name, slippage_model):
+        def make_orders():
+            dt = datetime.datetime(2006, 1, 5, 14, 30, tzinfo=pytz.utc)
+            return [
+                (self.ASSET133, [
+                    Order(dt=dt, amount=3, filled=0, asset=self.ASSET133),
+                    # the limit is worse than the impacted price.
+                    Order(dt=dt, amount=10, filled=0, asset=self.ASSET133,
+                          limit=3.0),
+                    Order(dt=dt, amount=-30, filled=0, asset=self.ASSET133),
+                    Order(dt=dt, amount=5, filled=0, asset=self.ASSET133),
+                ]),
+                (self.ASSET1000, [
+                    Order(dt=dt, amount=-4, filled=0, asset=self.ASSET1000),
+                    Order(dt=dt, amount=8, filled=0, asset=self.ASSET1000),
+                ]),
+            ]
+
+        def summarize(orders_by_asset, orders_txns):
+            orders = [o for _, asset_orders in orders_by_asset
+                      for o in asset_orders]
+            return [
+                (orders.index(order), txn.asset, txn.amount, txn.price)
+                for order, txn in orders_txns
+            ]
+
+        bar_data = self.create_bardata(
+            simulation_dt_func=lambda: self.minutes[0],
+        )
+
+        expected_orders = make_orders()
+        expected = []
+        for asset, asset_orders in expected_orders:
+            expected.extend(
+                slippage_model.simulate(bar_data, asset, asset_orders),
+            )
+
+        orders = make_orders()
+        result = list(slippage_model.simulate_many(bar_data, orders))
+
+        self.assertTrue(result)
+        self.assertEqual(
+            summarize(orders, result),
+            summarize(expected_orders, expected),
+        )
+
+    def test_simulate_many_with_process_order_override(self):
+        class HalfFixedSlippage(FixedSlippage):
+            def process_order(self, data, order):
+                price, amount = super(HalfFixedSlippage, self).process_order(
+                    data,
+                    order,
+                )
+                return price, amount // 2
+
+        dt = datetime.datetime(2006, 1, 5, 14, 30, tzinfo=pytz.utc)
+        order = Order(dt=dt, amount=10, filled=0, asset=self.ASSET133)
+        bar_data = self.create_bardata(
+            simulation_dt_func=lambda: self.minutes[0],
+        )
+
+        result = list(HalfFixedSlippage().simulate_many(
+            bar_data,
+            [(self.ASSET133, [order])],
+        ))
+        self.assertEqual([txn.amount for _, txn in result], [5])
+
     def test_volume_share_slippage_with_future(self):
         slippage_model = VolumeShareSlippage(volume_limit=1, price_impact=0.3)
 
@@ -893,7 +966,7 @@ class VolatilityVolumeShareTestCase(WithCreateBarData,
 
 class MarketImpactTestCase(WithCreateBarData, ZiplineTestCase):
 
-    ASSET_FINDER_EQUITY_SIDS = (1,)
+    ASSET_FINDER_EQUITY_SIDS = (1, 2)
 
     @classmethod
     def make_equity_minute_bar_data(cls):
@@ -945,6 +1018,35 @@ class MarketImpactTestCase(WithCreateBarData, ZiplineTestCase):
         reference_vol = pd.Series(range(29, 49)).pct_change().std() * sqrt(252)
         self.assertEqual(volatility, reference_vol)
 
+    def test_window_data_of_many_assets(self):
+        session = pd.Timestamp('2006-03-01')
+        minute = self.trading_calendar.minutes_for_session(session)[1]
+        data = self.create_bardata(simulation_dt_func=lambda: minute)
+        assets = self.asset_finder.retrieve_all([1, 2])
+
+        model = VolatilityVolumeShare(0.0)
+        model._load_window_data(data, assets, window_length=20)
+
+        for asset in assets:
+            self.assertEqual(
+                model._get_window_data(data, asset, window_length=20),
+                VolatilityVolumeShare(0.0)._get_window_data(
+                    data, asset, window_length=20,
+                ),
+            )
+        self.assertEqual(len(model._mean_volumes), 2)
+
+        # the window data is computed again in the next session.
+        next_minute = self.trading_calendar.minutes_for_session(
+            pd.Timestamp('2006-03-02'),
+        )[1]
+        data = self.create_bardata(simulation_dt_func=lambda: next_minute)
+        mean_volume, _ = model._get_window_data(
+            data, assets[0], window_length=20,
+        )
+        self.assertEqual(mean_volume, 129.5)
+        self.assertEqual(len(model._mean_volumes), 1)
+
 
 class OrdersStopTestCase(WithSimParams,
                          WithTradingEnvironment,
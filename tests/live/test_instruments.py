@@ -0,0 +1,118 @@
+"""
+Tests for the index of the instrument master of a broker.
+"""
+import numpy as np
+import pandas as pd
+
+from zipline.live.brokers.instruments import InstrumentIndex
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
+from zipline.testing.predicates import assert_equal
+
+CREATED = pd.Timestamp('2018-06-01 08:30', tz='Asia/Kolkata')
+
+
+def make_instruments():
+    return pd.DataFrame.from_records([
+        (408065, 'INFY', 'INFOSYS', 'NSE', 'NSE', 'EQ', '', 0.0, 1, 0.05),
+        (13238786, 'NIFTY18JUNFUT', 'NIFTY', 'NFO', 'NFO-FUT', 'FUT',
+         '2018-06-28', 0.0, 75, 0.05),
+        (13355266, 'NIFTY18JULFUT', 'NIFTY', 'NFO', 'NFO-FUT', 'FUT',
+         '2018-07-26', 0.0, 75, 0.05),
+        (12010498, 'BANKNIFTY18JUN2126000CE', 'BANKNIFTY', 'NFO', 'NFO-OPT',
+         'CE', '2018-06-21', 26000.0, 40, 0.05),
+        (12010754, 'BANKNIFTY18JUN2826000CE', 'BANKNIFTY', 'NFO', 'NFO-OPT',
+         'CE', '2018-06-28', 26000.0, 40, 0.05),
+    ], columns=[
+        'instrument_token', 'tradingsymbol', 'name', 'exchange', 'segment',
+        'instrument_type', 'expiry', 'strike', 'lot_size', 'tick_size',
+    ])
+
+
+class InstrumentIndexTestCase(WithInstanceTmpDir, ZiplineTestCase):
+
+    def init_instance_fixtures(self):
+        super(InstrumentIndexTestCase, self).init_instance_fixtures()
+        self.index = InstrumentIndex.from_frame(
+            make_instruments(),
+            created=CREATED,
+        )
+
+    def check_lookups(self, index):
+        assert_equal(len(index), 5)
+
+        assert_equal(index.lookup_symbol('INFY', 'NSE'), 0)
+        assert_equal(index.lookup_symbol('NIFTY18JULFUT', 'NFO'), 2)
+        assert_equal(index.lookup_token(12010498), 3)
+        assert_equal(
+            index.lookup_contract('NIFTY', '2018-06-28', 0, 'FUT'),
+            1,
+        )
+        assert_equal(
+            index.lookup_contract(
+                'BANKNIFTY',
+                pd.Timestamp('2018-06-28', tz='UTC'),
+                26000,
+                'CE',
+            ),
+            4,
+        )
+
+        # misses
+        assert_equal(index.lookup_symbol('INFY', 'NFO'), None)
+        assert_equal(index.lookup_symbol('TCS', 'NSE'), None)
+        assert_equal(index.lookup_token(1), None)
+        assert_equal(
+            index.lookup_contract('NIFTY', '2018-08-30', 0, 'FUT'),
+            None,
+        )
+        assert_equal(
+            index.lookup_contract('BANKNIFTY', '2018-06-21', 26000, 'PE'),
+            None,
+        )
+
+        row = index.row(index.lookup_symbol('NIFTY18JUNFUT', 'NFO'))
+        assert_equal(row['name'], 'NIFTY')
+        assert_equal(row['instrument_token'], 13238786)
+        assert_equal(row['lot_size'], 75)
+        assert_equal(row['expiry'], np.datetime64('2018-06-28', 'D'))
+        self.assertTrue(pd.isnull(index.row(0)['expiry']))
+
+        assert_equal(
+            index.expiries('NFO-OPT', 'BANKNIFTY'),
+            [
+                pd.Timestamp('2018-06-21', tz='UTC'),
+                pd.Timestamp('2018-06-28', tz='UTC'),
+            ],
+        )
+        assert_equal(
+            index.expiries('NFO-FUT', 'NIFTY'),
+            [
+                pd.Timestamp('2018-06-28', tz='UTC'),
+                pd.Timestamp('2018-07-26', tz='UTC'),
+            ],
+        )
+
+    def test_lookups(self):
+        self.check_lookups(self.index)
+
+    def test_round_trip(self):
+        path = self.instance_tmpdir.getpath('instruments')
+        self.index.write(path)
+        index = InstrumentIndex.read(path)
+
+        # the columns are memory mapped and nothing is indexed till the
+        # first lookup.
+        for name in 'instrument_token', 'tradingsymbol', 'expiry':
+            self.assertIsInstance(index.column(name), np.memmap)
+            assert_equal(index.column(name), self.index.column(name))
+        self.assertIsNone(index._by_symbol)
+        self.assertIsNone(index._by_token)
+        self.assertIsNone(index._by_contract)
+        assert_equal(index.created, CREATED)
+
+        self.check_lookups(index)
+
+    def test_round_trip_without_created(self):
+        path = self.instance_tmpdir.getpath('instruments')
+        InstrumentIndex.from_frame(make_instruments()).write(path)
+        assert_equal(InstrumentIndex.read(path).created, None)
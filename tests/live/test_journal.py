@@ -0,0 +1,145 @@
+"""
+Tests for the journal of live orders and fills.
+"""
+import os
+
+from pandas import Timestamp
+
+from zipline.finance.order import Order
+from zipline.finance.transaction import Transaction
+from zipline.live.journal import JOURNAL_FILE, SNAPSHOT_FILE, LiveJournal
+from zipline.testing.fixtures import (
+    WithAssetFinder,
+    WithInstanceTmpDir,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+
+DT = Timestamp('2018-06-01 09:30', tz='UTC')
+
+
+class LiveJournalTestCase(WithAssetFinder,
+                          WithInstanceTmpDir,
+                          ZiplineTestCase):
+    ASSET_FINDER_EQUITY_SIDS = 1, 2
+
+    def init_instance_fixtures(self):
+        super(LiveJournalTestCase, self).init_instance_fixtures()
+        self.root = self.instance_tmpdir.makedir('journal')
+        self.assets = [
+            self.asset_finder.retrieve_asset(sid)
+            for sid in self.ASSET_FINDER_EQUITY_SIDS
+        ]
+
+    def open_journal(self, **kwargs):
+        journal = LiveJournal(self.root, sync=False, **kwargs)
+        self.add_instance_callback(journal.close)
+        return journal
+
+    def fill(self, journal, order, amount, price):
+        order.filled += amount
+        journal.record_fill(
+            order,
+            Transaction(order.asset, amount, DT, price, order.id),
+        )
+
+    def record_events(self, journal):
+        """
+        Record two orders on the first asset, one of them filled in two
+        parts, and an open order on the second asset: 5 events.
+        """
+        first, second = self.assets
+        orders = [
+            Order(DT, first, 10, id='a'),
+            Order(DT, first, -10, id='b'),
+            Order(DT, second, 5, id='c'),
+        ]
+        journal.record_order(orders[0])
+        journal.record_order(orders[2])
+        self.fill(journal, orders[0], 4, 10.0)
+        self.fill(journal, orders[0], 6, 12.0)
+        journal.record_order(orders[1])
+        return orders
+
+    def assert_state(self, state):
+        first, second = self.assets
+        assert_equal(sorted(state.orders), ['a', 'b', 'c'])
+        assert_equal(sorted(o.id for o in state.open_orders), ['b', 'c'])
+        assert_equal(state.orders['a'].filled, 10)
+        assert_equal([txn.amount for txn in state.fills], [4, 6])
+        assert_equal(list(state.positions), [first])
+        position = state.positions[first]
+        assert_equal(position.amount, 10)
+        assert_equal(position.cost_basis, 11.2)
+
+    def test_replay(self):
+        journal = self.open_journal()
+        self.record_events(journal)
+        self.assert_state(journal.state)
+        journal.close()
+
+        recovered = self.open_journal()
+        assert_equal(recovered.seq, 5)
+        self.assert_state(recovered.state)
+        self.assertFalse(os.path.exists(os.path.join(self.root,
+                                                     SNAPSHOT_FILE)))
+
+        # new events follow the recovered ones.
+        recovered.record_order(Order(DT, self.assets[1], 1, id='d'))
+        recovered.close()
+        assert_equal(sorted(self.open_journal().state.orders),
+                     ['a', 'b', 'c', 'd'])
+
+    def test_snapshot_rotation(self):
+        journal = self.open_journal(snapshot_interval=2)
+        self.record_events(journal)
+        journal.close()
+
+        # events 1 to 4 are in the snapshot, only the 5th is in the journal.
+        self.assertTrue(os.path.exists(os.path.join(self.root,
+                                                    SNAPSHOT_FILE)))
+        recovered = self.open_journal(snapshot_interval=2)
+        assert_equal(recovered.seq, 5)
+        assert_equal(recovered._events_since_snapshot, 1)
+        self.assert_state(recovered.state)
+
+    def test_snapshot_before_truncation(self):
+        journal = self.open_journal()
+        self.record_events(journal)
+        with open(os.path.join(self.root, JOURNAL_FILE), 'rb') as f:
+            events = f.read()
+        # the process dies after writing the snapshot, before starting a new
+        # journal.
+        journal.snapshot()
+        journal.close()
+        with open(os.path.join(self.root, JOURNAL_FILE), 'wb') as f:
+            f.write(events)
+
+        recovered = self.open_journal()
+        assert_equal(recovered.seq, 5)
+        self.assert_state(recovered.state)
+
+    def test_torn_record(self):
+        journal = self.open_journal()
+        self.record_events(journal)
+        journal.close()
+
+        path = os.path.join(self.root, JOURNAL_FILE)
+        size = os.path.getsize(path)
+        journal = self.open_journal()
+        journal.record_order(Order(DT, self.assets[1], 1, id='d'))
+        journal.close()
+        # the process dies while writing the last record.
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        recovered = self.open_journal()
+        assert_equal(os.path.getsize(path), size)
+        assert_equal(recovered.seq, 5)
+        self.assert_state(recovered.state)
+
+        # the events recorded after the recovery are readable.
+        recovered.record_order(Order(DT, self.assets[1], 2, id='e'))
+        recovered.close()
+        state = self.open_journal().state
+        assert_equal(sorted(state.orders), ['a', 'b', 'c', 'e'])
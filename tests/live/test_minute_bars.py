@@ -0,0 +1,292 @@
+"""
+Tests for the live minute bars built from a tick stream.
+"""
+import numpy as np
+from numpy import nan
+from pandas import Timedelta, Timestamp
+
+from zipline.data.bar_reader import NoDataOnDate
+from zipline.gens.sim_engine import NANOS_IN_MINUTE
+from zipline.live.data.data_portal import LiveDataPortal
+from zipline.live.data.minute_bars import (
+    LiveMinuteBarBuilder,
+    LiveMinuteBarReader,
+    NO_BAR,
+)
+from zipline.testing.fixtures import (
+    WithAssetFinder,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+
+OPEN = Timestamp('2016-01-05 14:31', tz='UTC')
+
+
+def minute_index(offset):
+    return (OPEN + Timedelta(minutes=offset)).value // NANOS_IN_MINUTE
+
+
+def feed(builder, ticks, start=OPEN):
+    """
+    Push ``ticks`` of (minute offset, sid, price, volume) into ``builder`` as
+    one batch, one second apart within each minute.
+    """
+    dts = [
+        (start + Timedelta(minutes=offset, seconds=i)).value
+        for i, (offset, _, _, _) in enumerate(ticks)
+    ]
+    builder.on_ticks(
+        dts,
+        [sid for _, sid, _, _ in ticks],
+        [price for _, _, price, _ in ticks],
+        [volume for _, _, _, volume in ticks],
+    )
+
+
+class LiveMinuteBarBuilderTestCase(ZiplineTestCase):
+
+    def assert_bar(self, builder, sid, offset, expected):
+        minute = minute_index(offset)
+        assert_equal(
+            [
+                builder.get_value(sid, minute, field)
+                for field in ('open', 'high', 'low', 'close', 'volume')
+            ],
+            list(expected),
+        )
+
+    def test_new_bars(self):
+        builder = LiveMinuteBarBuilder([1, 2])
+        feed(builder, [
+            (0, 1, 10.0, 100),
+            (0, 1, 12.0, 50),
+            (0, 2, 20.0, 1),
+            (0, 1, 9.0, 10),
+            (0, 1, 11.0, 5),
+            (1, 1, 13.0, 7),
+        ])
+
+        self.assert_bar(builder, 1, 0, (10.0, 12.0, 9.0, 11.0, 165))
+        self.assert_bar(builder, 2, 0, (20.0, 20.0, 20.0, 20.0, 1))
+        self.assert_bar(builder, 1, 1, (13.0, 13.0, 13.0, 13.0, 7))
+        self.assert_bar(builder, 2, 1, (nan, nan, nan, nan, 0))
+        assert_equal(builder.last_minute, minute_index(1))
+        assert_equal(builder.dropped_ticks, 0)
+
+    def test_updated_bars(self):
+        ticks = [
+            (0, 1, 10.0, 100),
+            (0, 1, 12.0, 50),
+            (0, 1, 8.0, 10),
+            (0, 1, 11.0, 5),
+        ]
+        batched = LiveMinuteBarBuilder([1])
+        feed(batched, ticks[:2])
+        feed(batched, ticks[2:], start=OPEN + Timedelta(seconds=30))
+        self.assert_bar(batched, 1, 0, (10.0, 12.0, 8.0, 11.0, 165))
+
+        single = LiveMinuteBarBuilder([1])
+        for i, (offset, sid, price, volume) in enumerate(ticks):
+            single.on_tick(
+                OPEN + Timedelta(minutes=offset, seconds=i),
+                sid,
+                price,
+                volume,
+            )
+        self.assert_bar(single, 1, 0, (10.0, 12.0, 8.0, 11.0, 165))
+
+    def test_late_ticks(self):
+        builder = LiveMinuteBarBuilder([1, 2], capacity=2)
+        feed(builder, [(0, 1, 10.0, 1)])
+        # minute 2 takes the slot of minute 0.
+        feed(builder, [(2, 1, 12.0, 1)])
+        feed(builder, [
+            (0, 1, 9.0, 1),
+            (0, 1, 8.0, 1),
+            (0, 2, 5.0, 1),
+        ])
+
+        # every late tick is dropped, not every late bar.
+        assert_equal(builder.dropped_ticks, 2)
+        self.assert_bar(builder, 1, 0, (nan, nan, nan, nan, 0))
+        self.assert_bar(builder, 1, 2, (12.0, 12.0, 12.0, 12.0, 1))
+        self.assert_bar(builder, 2, 0, (5.0, 5.0, 5.0, 5.0, 1))
+
+        builder.on_tick(OPEN, 1, 7.0, 1)
+        assert_equal(builder.dropped_ticks, 3)
+
+    def test_unknown_sids(self):
+        builder = LiveMinuteBarBuilder([1])
+        feed(builder, [
+            (0, 1, 10.0, 1),
+            (0, 99, 5.0, 1),
+            (0, 99, 6.0, 1),
+        ])
+        builder.on_tick(OPEN, 98, 4.0, 1)
+
+        assert_equal(builder.dropped_ticks, 3)
+        self.assertFalse(builder.has_sid(99))
+        self.assert_bar(builder, 1, 0, (10.0, 10.0, 10.0, 10.0, 1))
+
+        close, = builder.load_raw_arrays(['close'], [minute_index(0)], [1, 99])
+        assert_equal(close, np.array([[10.0, nan]]))
+
+    def test_wraparound(self):
+        builder = LiveMinuteBarBuilder([1, 2], capacity=3)
+        for offset in range(5):
+            feed(builder, [(offset, 1, 10.0 + offset, offset + 1)])
+
+        close, volume = builder.load_raw_arrays(
+            ['close', 'volume'],
+            [minute_index(offset) for offset in range(5)],
+            [1, 2],
+        )
+        # the first two minutes were overwritten by the last two.
+        assert_equal(
+            close,
+            np.array([
+                [nan, nan],
+                [nan, nan],
+                [12.0, nan],
+                [13.0, nan],
+                [14.0, nan],
+            ]),
+        )
+        assert_equal(
+            volume,
+            np.array([[0, 0], [0, 0], [3, 0], [4, 0], [5, 0]], dtype='uint32'),
+        )
+
+        assert_equal(
+            builder.get_last_traded_minute(1, minute_index(4)),
+            minute_index(4),
+        )
+        assert_equal(
+            builder.get_last_traded_minute(1, minute_index(3)),
+            minute_index(3),
+        )
+        for sid, offset in (1, 1), (2, 4):
+            assert_equal(
+                builder.get_last_traded_minute(sid, minute_index(offset)),
+                NO_BAR,
+            )
+
+    def test_cumulative_volume(self):
+        builder = LiveMinuteBarBuilder([1], cumulative_volume=True)
+        feed(builder, [
+            (0, 1, 10.0, 100),
+            (0, 1, 10.0, 150),
+            (1, 1, 10.0, 175),
+        ])
+        builder.on_tick(OPEN + Timedelta(minutes=2), 1, 10.0, 180)
+
+        assert_equal(
+            [
+                builder.get_value(1, minute_index(offset), 'volume')
+                for offset in range(3)
+            ],
+            [150, 25, 5],
+        )
+
+
+class LiveDataPortalTestCase(WithTradingCalendars,
+                             WithAssetFinder,
+                             ZiplineTestCase):
+
+    START_DATE = Timestamp('2016-01-04', tz='UTC')
+    END_DATE = Timestamp('2016-01-08', tz='UTC')
+    ASSET_FINDER_EQUITY_SIDS = 1, 2
+    SESSION = Timestamp('2016-01-05', tz='UTC')
+
+    def init_instance_fixtures(self):
+        super(LiveDataPortalTestCase, self).init_instance_fixtures()
+        self.open = self.trading_calendar.open_and_close_for_session(
+            self.SESSION,
+        )[0]
+        self.builder = LiveMinuteBarBuilder([1, 2], capacity=390)
+        self.reader = LiveMinuteBarReader(
+            self.builder,
+            self.trading_calendar,
+            self.SESSION,
+        )
+        feed(
+            self.builder,
+            [(0, 1, 10.0, 100), (0, 2, 20.0, 200), (1, 1, 11.0, 110)],
+            start=self.open,
+        )
+
+    def minute(self, offset):
+        return self.open + Timedelta(minutes=offset)
+
+    def test_reader(self):
+        reader = self.reader
+        assert_equal(reader.get_value(1, self.minute(1), 'close'), 11.0)
+        assert_equal(reader.get_value(2, self.minute(1), 'volume'), 0)
+        with self.assertRaises(NoDataOnDate):
+            reader.get_value(1, self.minute(-1), 'close')
+
+        assert_equal(reader.last_available_dt, self.minute(1))
+        assets = self.asset_finder.retrieve_all([1, 2])
+        assert_equal(
+            reader.get_last_traded_dt(assets[0], self.minute(5)),
+            self.minute(1),
+        )
+        assert_equal(
+            reader.get_last_traded_dt(assets[1], self.minute(5)),
+            self.minute(0),
+        )
+
+        close, = reader.load_raw_arrays(
+            ['close'],
+            self.minute(0),
+            self.minute(2),
+            [1, 2],
+        )
+        assert_equal(
+            close,
+            np.array([[10.0, 20.0], [11.0, nan], [nan, nan]]),
+        )
+
+    def test_data_portal(self):
+        portal = LiveDataPortal(
+            self.asset_finder,
+            self.trading_calendar,
+            self.SESSION,
+            self.reader,
+        )
+        asset = self.asset_finder.retrieve_asset(1)
+
+        assert_equal(
+            portal.get_spot_value(asset, 'close', self.minute(1), 'minute'),
+            11.0,
+        )
+        # the price is forward filled from the last bar.
+        self.assertTrue(np.isnan(
+            portal.get_spot_value(asset, 'close', self.minute(3), 'minute'),
+        ))
+        assert_equal(
+            portal.get_spot_value(asset, 'price', self.minute(3), 'minute'),
+            11.0,
+        )
+
+        window = portal.get_history_window(
+            self.asset_finder.retrieve_all([1, 2]),
+            self.minute(2),
+            3,
+            '1m',
+            'close',
+            'minute',
+            ffill=False,
+        )
+        assert_equal(
+            window.values,
+            np.array([[10.0, 20.0], [11.0, nan], [nan, nan]]),
+        )
+
+        # ticks arriving later are read without caching.
+        feed(self.builder, [(3, 1, 12.0, 1)], start=self.open)
+        assert_equal(
+            portal.get_spot_value(asset, 'close', self.minute(3), 'minute'),
+            12.0,
+        )
@@ -0,0 +1,166 @@
+"""
+Tests for the real time clock of live trading.
+"""
+from mock import patch
+from pandas import Timestamp
+
+from zipline.live.realtime_clock import (
+    ClockEvents,
+    ClockLateness,
+    RealTimeClock,
+)
+from zipline.testing.fixtures import ZiplineTestCase
+from zipline.testing.predicates import assert_equal
+
+
+def epoch(dt):
+    return Timestamp(dt, tz='UTC').value / 1e9
+
+
+class FakeClock(object):
+    """
+    A wall clock and a monotonic clock which only move when slept on or
+    advanced. A pending `jump` moves the wall clock alone on the next sleep,
+    like an adjustment of the system clock.
+    """
+    def __init__(self, now):
+        self.now = now
+        self.offset = 0.0
+        self.jump = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now + self.offset
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        self.offset += self.jump
+        self.jump = 0.0
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class RealTimeClockTestCase(ZiplineTestCase):
+
+    def init_instance_fixtures(self):
+        super(RealTimeClockTestCase, self).init_instance_fixtures()
+        self.clock = clock = FakeClock(epoch('2018-06-01 09:14:30'))
+        module = 'zipline.live.realtime_clock'
+        self.enter_instance_context(patch(module + '.monotonic',
+                                          clock.monotonic))
+        self.enter_instance_context(patch(module + '.time.time', clock.time))
+        self.enter_instance_context(patch(module + '.time.sleep',
+                                          clock.sleep))
+
+    def make_clock(self, **kwargs):
+        return RealTimeClock(minute_aligned=True, heartbeat=5, **kwargs)
+
+    def test_sleep_until(self):
+        rt_clock = self.make_clock()
+        rt_clock.sleep_until(self.clock.time() + 12)
+        assert_equal(self.clock.sleeps, [5, 5, 2])
+
+        # the deadline is kept on the monotonic clock even if the wall clock
+        # is moved back meanwhile.
+        del self.clock.sleeps[:]
+        self.clock.jump = -3600
+        rt_clock.sleep_until(self.clock.time() + 7)
+        assert_equal(self.clock.sleeps, [5, 2])
+
+        # a deadline in the past or a stopped clock does not sleep.
+        del self.clock.sleeps[:]
+        rt_clock.sleep_until(self.clock.time() - 1)
+        rt_clock.pause_clock()
+        rt_clock.sleep_until(self.clock.time() + 10)
+        assert_equal(self.clock.sleeps, [])
+
+    def test_minute_aligned(self):
+        reported = []
+        rt_clock = self.make_clock(
+            on_lateness=lambda dt, event, lateness: reported.append(
+                (event, lateness),
+            ),
+        )
+        events = iter(rt_clock)
+
+        dt, event = next(events)
+        assert_equal(event, ClockEvents.BEFORE_TRADING_START_BAR)
+        assert_equal(dt, Timestamp('2018-06-01 09:14', tz='UTC'))
+        assert_equal(reported, [(ClockEvents.BEFORE_TRADING_START_BAR, 30)])
+
+        # outside market hours the clock beats every heartbeat, till the
+        # market open is within a heartbeat.
+        for _ in range(6):
+            assert_equal(next(events)[1], ClockEvents.HEART_BEAT)
+        assert_equal(self.clock.time(), epoch('2018-06-01 09:14:55'))
+
+        expected = [
+            ('2018-06-01 09:15', ClockEvents.SESSION_START),
+            ('2018-06-01 09:15', ClockEvents.BAR),
+            ('2018-06-01 09:15', ClockEvents.MINUTE_END),
+            ('2018-06-01 09:16', ClockEvents.BAR),
+        ]
+        for expected_dt, expected_event in expected:
+            assert_equal(
+                next(events),
+                (Timestamp(expected_dt, tz='UTC'), expected_event),
+            )
+        assert_equal(self.clock.time(), epoch('2018-06-01 09:16'))
+        assert_equal(
+            [seconds for _, seconds in reported],
+            [30, 0, 0, 0, 0],
+        )
+
+        # a slow consumer gets every missed minute once, stamped with the
+        # scheduled minute and late by the delay.
+        del reported[:]
+        self.clock.advance(150)
+        expected = [
+            ('2018-06-01 09:16', ClockEvents.MINUTE_END, 150),
+            ('2018-06-01 09:17', ClockEvents.BAR, 90),
+            ('2018-06-01 09:17', ClockEvents.MINUTE_END, 90),
+            ('2018-06-01 09:18', ClockEvents.BAR, 30),
+            ('2018-06-01 09:18', ClockEvents.MINUTE_END, 30),
+            ('2018-06-01 09:19', ClockEvents.BAR, 0),
+        ]
+        for expected_dt, expected_event, _ in expected:
+            assert_equal(
+                next(events),
+                (Timestamp(expected_dt, tz='UTC'), expected_event),
+            )
+        assert_equal(
+            reported,
+            [(event, lateness) for _, event, lateness in expected],
+        )
+
+        bars = rt_clock.lateness[ClockEvents.BAR]
+        assert_equal(bars.count, 5)
+        assert_equal(bars.last, 0)
+        assert_equal(bars.max, 90)
+        assert_equal(bars.mean, 24)
+
+        events.close()
+        assert_equal(rt_clock.last_bar_minute, None)
+
+
+class ClockLatenessTestCase(ZiplineTestCase):
+
+    def test_update(self):
+        lateness = ClockLateness()
+        assert_equal(lateness.mean, 0.0)
+
+        for seconds in 0.5, 2.0, 0.5:
+            lateness.update(seconds)
+        assert_equal(lateness.count, 3)
+        assert_equal(lateness.last, 0.5)
+        assert_equal(lateness.max, 2.0)
+        assert_equal(lateness.mean, 1.0)
+        assert_equal(
+            repr(lateness),
+            'ClockLateness(count=3, last=0.500, mean=1.000, max=2.000)',
+        )
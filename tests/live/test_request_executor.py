@@ -0,0 +1,118 @@
+"""
+Tests for the rate limited executor of broker API requests.
+"""
+from threading import Event, Lock
+
+from mock import patch
+
+from zipline.live.brokers.request_executor import RequestExecutor, TokenBucket
+from zipline.testing.fixtures import ZiplineTestCase
+from zipline.testing.predicates import assert_equal, assert_raises
+
+
+class FakeClock(object):
+    """
+    A monotonic clock which only moves when slept on.
+    """
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTestCase(ZiplineTestCase):
+
+    def init_instance_fixtures(self):
+        super(TokenBucketTestCase, self).init_instance_fixtures()
+        self.clock = clock = FakeClock()
+        module = 'zipline.live.brokers.request_executor'
+        self.enter_instance_context(
+            patch(module + '.monotonic', clock.monotonic),
+        )
+        self.enter_instance_context(
+            patch(module + '.time.sleep', clock.sleep),
+        )
+
+    def test_invalid_rate(self):
+        with assert_raises(ValueError):
+            TokenBucket(0)
+
+    def test_refill(self):
+        bucket = TokenBucket(rate=2, capacity=3)
+
+        # the bucket starts full.
+        assert_equal([bucket.try_acquire() for _ in range(3)], [0, 0, 0])
+        assert_equal(bucket.try_acquire(), 0.5)
+
+        self.clock.now += 0.25
+        assert_equal(bucket.try_acquire(), 0.25)
+        self.clock.now += 0.25
+        assert_equal(bucket.try_acquire(), 0)
+
+        # the tokens of a long pause are capped by the capacity.
+        self.clock.now += 100
+        assert_equal([bucket.try_acquire() for _ in range(3)], [0, 0, 0])
+        assert_equal(bucket.try_acquire(), 0.5)
+
+    def test_acquire_blocks(self):
+        bucket = TokenBucket(rate=4, capacity=1)
+        bucket.acquire()
+        assert_equal(self.clock.sleeps, [])
+
+        bucket.acquire()
+        assert_equal(self.clock.sleeps, [0.25])
+        bucket.acquire()
+        assert_equal(self.clock.sleeps, [0.25, 0.25])
+        assert_equal(self.clock.now, 100.5)
+
+
+class RequestExecutorTestCase(ZiplineTestCase):
+
+    def init_instance_fixtures(self):
+        super(RequestExecutorTestCase, self).init_instance_fixtures()
+        self.executor = RequestExecutor(max_workers=4, rate=1000, burst=1000)
+        self.add_instance_callback(self.executor.close)
+
+    def test_coalesce(self):
+        release = Event()
+        calls = []
+        lock = Lock()
+
+        def fetch(name):
+            with lock:
+                calls.append(name)
+            release.wait(5)
+            return name.upper()
+
+        first = self.executor.coalesce('orders', fetch, 'orders')
+        # a fetch of the same key in flight is shared, other keys are not.
+        second = self.executor.coalesce('orders', fetch, 'orders')
+        other = self.executor.coalesce('positions', fetch, 'positions')
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+        release.set()
+        assert_equal(first.get(5), 'ORDERS')
+        assert_equal(other.get(5), 'POSITIONS')
+        assert_equal(sorted(calls), ['orders', 'positions'])
+
+        # once done, the key is fetched again.
+        third = self.executor.coalesce('orders', fetch, 'orders')
+        self.assertIsNot(third, first)
+        assert_equal(third.get(5), 'ORDERS')
+        assert_equal(sorted(calls), ['orders', 'orders', 'positions'])
+
+    def test_coalesce_error(self):
+        def fail():
+            raise ValueError('rate limited')
+
+        with assert_raises(ValueError):
+            self.executor.coalesce('orders', fail).get(5)
+        # a failed fetch is not kept in flight.
+        assert_equal(self.executor.coalesce('orders', lambda: 1).get(5), 1)
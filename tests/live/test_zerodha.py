@@ -0,0 +1,185 @@
+"""
+Tests for the syncing of the books of ZerodhaBroker.
+"""
+from collections import OrderedDict
+
+from pandas import Timestamp
+
+from zipline.finance.execution import LimitOrder, MarketOrder
+from zipline.finance.order import ORDER_STATUS
+from zipline.live.brokers.request_executor import RequestExecutor
+from zipline.live.brokers.zerodha import ZerodhaBroker
+from zipline.live.live_blotter import LiveBlotter
+from zipline.testing.fixtures import WithAssetFinder, ZiplineTestCase
+from zipline.testing.predicates import assert_equal, assert_raises
+
+
+def order_dict(order_id, status='OPEN', filled=0, price=0.0):
+    return {
+        'order_id': order_id,
+        'order_timestamp': '2018-06-01 09:30:00',
+        'exchange_update_timestamp': None,
+        'tradingsymbol': 'A',
+        'quantity': 10,
+        'filled_quantity': filled,
+        'status': status,
+        'trigger_price': None,
+        'price': None,
+        'transaction_type': 'BUY',
+        'tag': None,
+        'average_price': price,
+        'validity': 'DAY',
+        'parent_order_id': None,
+    }
+
+
+class FakeKite(object):
+    """
+    A kite client which returns the orders it is given, and places orders
+    until it is given an error to raise.
+    """
+    VARIETY_REGULAR = 'regular'
+    PRODUCT_NRML = 'NRML'
+    TRANSACTION_TYPE_BUY = 'BUY'
+    TRANSACTION_TYPE_SELL = 'SELL'
+    ORDER_TYPE_MARKET = 'MARKET'
+    ORDER_TYPE_LIMIT = 'LIMIT'
+
+    def __init__(self, orders=()):
+        self.order_list = list(orders)
+        self.placed = []
+        self.error = None
+
+    def orders(self):
+        return list(self.order_list)
+
+    def place_order(self, **order_params):
+        if self.error is not None:
+            raise self.error
+        self.placed.append(order_params)
+        return str(len(self.placed))
+
+
+class ZerodhaBrokerTestCase(WithAssetFinder, ZiplineTestCase):
+    ASSET_FINDER_EQUITY_SIDS = 1,
+    ASSET_FINDER_EQUITY_SYMBOLS = 'A',
+
+    def init_instance_fixtures(self):
+        super(ZerodhaBrokerTestCase, self).init_instance_fixtures()
+        self.executor = RequestExecutor(max_workers=2, rate=1000, burst=1000)
+        self.add_instance_callback(self.executor.close)
+
+    def make_broker(self, kite):
+        # skip the login, the instrument master and the asset db of
+        # ``__init__``.
+        broker = ZerodhaBroker.__new__(ZerodhaBroker)
+        broker.kite = kite
+        broker.executor = self.executor
+        broker.commission = None
+        broker._orderbook = OrderedDict()
+        broker._open_orders = OrderedDict()
+        broker._transactions = []
+        broker._order_fingerprints = {}
+        broker._fills = []
+        broker._symbol_to_asset_cache = {
+            ('A', None): self.asset_finder.retrieve_asset(1),
+        }
+        broker._asset_to_symbol_cache = {}
+        broker.orderbook_needs_update = True
+        broker.positionbook_needs_update = True
+        return broker
+
+    def test_dropped_orders(self):
+        kite = FakeKite([order_dict('1'), order_dict('2')])
+        broker = self.make_broker(kite)
+
+        broker.update_orderbook()
+        assert_equal([o.id for o in broker.open_orders], ['1', '2'])
+        self.assertTrue(broker.orderbook_needs_update)
+
+        # a new trading day: the broker no longer returns yesterday's
+        # orders.
+        kite.order_list = [order_dict('3', status='COMPLETE', filled=10,
+                                      price=5.0)]
+        broker.update_orderbook()
+        assert_equal([o.id for o in broker.orders], ['3'])
+        assert_equal(broker.open_orders, [])
+        assert_equal(list(broker._order_fingerprints), ['3'])
+        self.assertFalse(broker.orderbook_needs_update)
+
+        kite.order_list = []
+        broker.orderbook_needs_update = True
+        broker.update_orderbook()
+        assert_equal(broker.orders, [])
+        assert_equal(broker._order_fingerprints, {})
+        self.assertFalse(broker.orderbook_needs_update)
+
+    def test_dropped_seeded_orders(self):
+        kite = FakeKite([order_dict('1')])
+        broker = self.make_broker(kite)
+        broker.update_orderbook()
+
+        stale = broker.dict_to_order(order_dict('2'))
+        broker.seed_orders(list(broker._orderbook.values()) + [stale])
+        assert_equal(list(broker._open_orders), ['1', '2'])
+
+        broker.update_orderbook()
+        assert_equal([o.id for o in broker.open_orders], ['1'])
+        assert_equal(broker.orders[0].status, ORDER_STATUS.OPEN)
+
+    def test_place_order(self):
+        kite = FakeKite()
+        broker = self.make_broker(kite)
+        asset = self.asset_finder.retrieve_asset(1)
+        broker.orderbook_needs_update = False
+
+        assert_equal(broker.order(asset, 10, MarketOrder(), 'tag'), '1')
+        future = broker.submit_order(asset, -5, LimitOrder(9.5), None)
+        assert_equal(future.get(5), '2')
+        self.assertTrue(broker.orderbook_needs_update)
+        assert_equal(
+            [
+                (p['tradingsymbol'], p['transaction_type'], p['quantity'],
+                 p['order_type'], p['price'])
+                for p in kite.placed
+            ],
+            [
+                ('A', 'BUY', 10, 'MARKET', None),
+                ('A', 'SELL', 5, 'LIMIT', 9.5),
+            ],
+        )
+
+    def test_place_order_error(self):
+        kite = FakeKite()
+        kite.error = ValueError('insufficient margin')
+        broker = self.make_broker(kite)
+        asset = self.asset_finder.retrieve_asset(1)
+        broker.orderbook_needs_update = False
+
+        # the error of the broker is raised by the future of the order.
+        future = broker.submit_order(asset, 10, MarketOrder(), None)
+        with assert_raises(ValueError):
+            future.get(5)
+        with assert_raises(ValueError):
+            broker.order(asset, 10, MarketOrder(), None)
+        assert_equal(kite.placed, [])
+        self.assertFalse(broker.orderbook_needs_update)
+
+    def test_blotter_rejected_order(self):
+        kite = FakeKite()
+        broker = self.make_broker(kite)
+        asset = self.asset_finder.retrieve_asset(1)
+        blotter = LiveBlotter('minute', broker)
+        blotter.set_date(Timestamp('2018-06-01 09:30', tz='UTC'))
+
+        # a rejected order is not placed, and does not raise into the
+        # algorithm.
+        kite.error = ValueError('insufficient margin')
+        assert_equal(blotter.order(asset, 10, MarketOrder(), None), None)
+        assert_equal(blotter.orders, {})
+        assert_equal(blotter.new_orders, [])
+
+        kite.error = None
+        assert_equal(blotter.order(asset, 10, MarketOrder(), None), '1')
+        assert_equal(list(blotter.orders), ['1'])
+        assert_equal([o.id for o in blotter.open_orders[asset]], ['1'])
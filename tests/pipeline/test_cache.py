@@ -0,0 +1,228 @@
+"""
+Tests for the on-disk cache of pipeline terms.
+"""
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from zipline.pipeline import CustomFactor, Pipeline
+from zipline.pipeline.cache import (
+    TermCache,
+    UnstableSignature,
+    term_signature,
+)
+from zipline.pipeline.data import USEquityPricing
+from zipline.pipeline.engine import SimplePipelineEngine
+from zipline.pipeline.factors import Returns, SimpleMovingAverage
+from zipline.pipeline.loaders.synthetic import PrecomputedLoader
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithTradingEnvironment,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal, assert_raises
+
+
+class Range(CustomFactor):
+    inputs = [USEquityPricing.close]
+    window_length = 3
+
+    def compute(self, today, assets, out, close):
+        out[:] = close.max(axis=0) - close.min(axis=0)
+
+
+class Mean(CustomFactor):
+    inputs = [USEquityPricing.close]
+    window_length = 3
+
+    def compute(self, today, assets, out, close):
+        out[:] = close.mean(axis=0)
+
+
+class RecordingLoader(PrecomputedLoader):
+    def __init__(self, *args, **kwargs):
+        super(RecordingLoader, self).__init__(*args, **kwargs)
+        self.load_calls = []
+
+    def load_adjusted_array(self, columns, dates, assets, mask):
+        self.load_calls.append((dates[0], dates[-1]))
+        return super(RecordingLoader, self).load_adjusted_array(
+            columns, dates, assets, mask,
+        )
+
+
+class TermSignatureTestCase(ZiplineTestCase):
+
+    def test_same_definition(self):
+        assert_equal(
+            term_signature(
+                SimpleMovingAverage(
+                    inputs=[USEquityPricing.close],
+                    window_length=3,
+                ),
+            ),
+            term_signature(
+                SimpleMovingAverage(
+                    inputs=[USEquityPricing.close],
+                    window_length=3,
+                ),
+            ),
+        )
+
+    def test_different_definitions(self):
+        signatures = {
+            term_signature(term) for term in (
+                Range(),
+                Mean(),
+                Range(window_length=4),
+                Range(inputs=[USEquityPricing.open]),
+                Range(mask=Returns(window_length=2) > 0),
+                Range() + 1,
+                Range() + 2,
+            )
+        }
+        assert_equal(len(signatures), 7)
+
+    def test_unstable_params(self):
+        class WithParam(CustomFactor):
+            inputs = [USEquityPricing.close]
+            window_length = 3
+            params = ('f',)
+
+            def compute(self, today, assets, out, close, f):
+                out[:] = f(close)
+
+        with assert_raises(UnstableSignature):
+            term_signature(WithParam(f=np.sum))
+
+
+class TermCacheTestCase(WithTradingEnvironment,
+                        WithInstanceTmpDir,
+                        ZiplineTestCase):
+
+    asset_ids = ASSET_FINDER_EQUITY_SIDS = 1, 2, 3
+    START_DATE = pd.Timestamp('2014-01-01', tz='utc')
+    END_DATE = pd.Timestamp('2014-02-01', tz='utc')
+    DATA_TIMESTAMP = pd.Timestamp('2014-02-02', tz='utc')
+
+    @classmethod
+    def init_class_fixtures(cls):
+        super(TermCacheTestCase, cls).init_class_fixtures()
+        cls.dates = pd.date_range(
+            cls.START_DATE,
+            cls.END_DATE,
+            freq='D',
+            tz='UTC',
+        )
+        cls.sids = pd.Int64Index(cls.asset_ids)
+
+    def init_instance_fixtures(self):
+        super(TermCacheTestCase, self).init_instance_fixtures()
+        self.cache = TermCache(
+            self.instance_tmpdir.path,
+            'test',
+            data_timestamp=self.DATA_TIMESTAMP,
+        )
+
+    def make_engine(self, term_cache=None):
+        shape = len(self.dates), len(self.asset_ids)
+        loader = RecordingLoader(
+            constants={
+                USEquityPricing.close: np.arange(
+                    shape[0] * shape[1],
+                    dtype=float,
+                ).reshape(shape) ** 2,
+            },
+            dates=self.dates,
+            sids=self.asset_ids,
+        )
+        engine = SimplePipelineEngine(
+            lambda column: loader,
+            self.dates,
+            self.asset_finder,
+            term_cache=term_cache,
+        )
+        return engine, loader
+
+    def test_set_and_get(self):
+        term = Range()
+        values = np.arange(30, dtype=float).reshape(10, 3)
+        self.cache.set(term, self.dates[:5], self.sids, values[:5])
+        self.cache.set(term, self.dates[5:10], self.sids, values[5:])
+
+        assert_equal(
+            self.cache.get(term, self.dates[2:8], self.sids),
+            values[2:8],
+        )
+        assert_equal(
+            self.cache.covered(term, self.dates[8:12], self.sids).tolist(),
+            [True, True, False, False],
+        )
+        assert_equal(self.cache.get(term, self.dates[8:12], self.sids), None)
+        assert_equal(self.cache.get(Mean(), self.dates[:5], self.sids), None)
+        assert_equal(
+            self.cache.get(term, self.dates[:5], self.sids[:2]),
+            None,
+        )
+        other_data = TermCache(
+            self.cache.root,
+            'test',
+            data_timestamp=self.DATA_TIMESTAMP + pd.Timedelta(days=1),
+        )
+        assert_equal(other_data.get(term, self.dates[:5], self.sids), None)
+
+    def test_run_pipeline(self):
+        pipeline = Pipeline(
+            columns={
+                'range': Range(),
+                'sma': SimpleMovingAverage(
+                    inputs=[USEquityPricing.close],
+                    window_length=3,
+                ),
+            },
+            screen=Mean() > 0,
+        )
+        uncached, _ = self.make_engine()
+        engine, loader = self.make_engine(term_cache=self.cache)
+
+        result = engine.run_pipeline(pipeline, self.dates[10], self.dates[14])
+        assert_frame_equal(
+            result,
+            uncached.run_pipeline(pipeline, self.dates[10], self.dates[14]),
+        )
+        assert_equal(loader.load_calls, [(self.dates[8], self.dates[14])])
+
+        del loader.load_calls[:]
+        assert_frame_equal(
+            engine.run_pipeline(pipeline, self.dates[10], self.dates[14]),
+            result,
+        )
+        assert_equal(loader.load_calls, [])
+
+        # only the dates which are not cached yet are computed.
+        assert_frame_equal(
+            engine.run_pipeline(pipeline, self.dates[10], self.dates[20]),
+            uncached.run_pipeline(pipeline, self.dates[10], self.dates[20]),
+        )
+        assert_equal(loader.load_calls, [(self.dates[13], self.dates[20])])
+
+    def test_run_chunked_pipeline_in_processes(self):
+        pipeline = Pipeline(columns={'range': Range()})
+        uncached, _ = self.make_engine()
+        engine, loader = self.make_engine(term_cache=self.cache)
+        engine.run_pipeline(pipeline, self.dates[10], self.dates[14])
+
+        del loader.load_calls[:]
+        assert_frame_equal(
+            engine.run_chunked_pipeline(
+                pipeline,
+                self.dates[10],
+                self.dates[20],
+                chunksize=30,
+                processes=2,
+            ),
+            uncached.run_pipeline(pipeline, self.dates[10], self.dates[20]),
+        )
+        # the dates which are not cached yet are computed before the chunks
+        # are handed to the workers, which read them all from the cache.
+        assert_equal(loader.load_calls, [(self.dates[13], self.dates[20])])
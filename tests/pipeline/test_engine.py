@@ -15,6 +15,7 @@ from numpy import (
     float64,
     full,
     full_like,
+    isnan,
     log,
     nan,
     tile,
@@ -30,6 +31,7 @@ from pandas import (
     MultiIndex,
     Series,
     Timestamp,
+    concat,
 )
 from pandas.compat.chainmap import ChainMap
 from pandas.util.testing import assert_frame_equal
@@ -37,14 +39,19 @@ from six import iteritems, itervalues
 from toolz import merge
 
 from zipline.assets.synthetic import make_rotating_equity_info
+from zipline.data.us_equity_pricing import SQLiteAdjustmentReader
 from zipline.errors import NoFurtherDataError
 from zipline.lib.adjustment import MULTIPLY
 from zipline.lib.labelarray import LabelArray
 from zipline.pipeline import CustomFactor, Pipeline
 from zipline.pipeline.data import Column, DataSet, USEquityPricing
 from zipline.pipeline.data.testing import TestingDataSet
-from zipline.pipeline.engine import SimplePipelineEngine
+from zipline.pipeline.engine import (
+    IncrementalPipelineEngine,
+    SimplePipelineEngine,
+)
 from zipline.pipeline.factors import (
+    AnnualizedVolatility,
     AverageDollarVolume,
     EWMA,
     EWMSTD,
@@ -52,7 +59,10 @@ from zipline.pipeline.factors import (
     ExponentialWeightedMovingStdDev,
     MaxDrawdown,
     Returns,
+    RollingLinearRegression,
+    RollingPearson,
     SimpleMovingAverage,
+    VWAP,
 )
 from zipline.pipeline.loaders.equity_pricing_loader import (
     USEquityPricingLoader,
@@ -74,6 +84,7 @@ from zipline.testing import (
     OpenPrice,
     parameter_space,
     product_upper_triangle,
+    str_to_seconds,
 )
 from zipline.testing.fixtures import (
     WithAdjustmentReader,
@@ -377,6 +388,63 @@ class ConstantInputTestCase(WithConstantInputs, ZiplineTestCase):
             full(shape, -2 * high_factor.window_length, dtype=float),
         )
 
+    def test_threads(self):
+        loader = self.loader
+        dates = self.dates[10:15]
+
+        def run(threads):
+            engine = SimplePipelineEngine(
+                lambda column: loader,
+                self.dates,
+                self.asset_finder,
+                threads=threads,
+            )
+            short_factor = RollingSumDifference(window_length=3)
+            long_factor = RollingSumDifference(window_length=5)
+            columns = {
+                'short': short_factor,
+                'long': long_factor,
+                # depends on two other factors.
+                'sum': short_factor + long_factor,
+                'sma': SimpleMovingAverage(
+                    inputs=[USEquityPricing.close],
+                    window_length=4,
+                ),
+                'close': USEquityPricing.close.latest,
+            }
+            return engine.run_pipeline(
+                Pipeline(columns=columns, screen=long_factor < 0),
+                dates[0],
+                dates[-1],
+            )
+
+        expected = run(threads=1)
+        assert_frame_equal(run(threads=4), expected)
+        assert_equal(expected['sum'].unique().tolist(), [-8.0])
+
+    def test_threads_raise_errors_of_terms(self):
+        loader = self.loader
+        engine = SimplePipelineEngine(
+            lambda column: loader,
+            self.dates,
+            self.asset_finder,
+            threads=2,
+        )
+
+        class Fails(CustomFactor):
+            inputs = [USEquityPricing.close]
+            window_length = 2
+
+            def compute(self, today, assets, out, closes):
+                raise ValueError('fails')
+
+        pipeline = Pipeline(columns={
+            'fails': Fails(),
+            'ok': RollingSumDifference(window_length=3),
+        })
+        with self.assertRaisesRegexp(ValueError, 'fails'):
+            engine.run_pipeline(pipeline, self.dates[10], self.dates[12])
+
     def test_numeric_factor(self):
         constants = self.constants
         loader = self.loader
@@ -1529,3 +1597,371 @@ class ChunkedPipelineTestCase(WithEquityPricingPipelineEngine,
             chunksize=22
         )
         self.assertTrue(chunked_result.equals(pipeline_result))
+
+    def test_run_chunked_pipeline_in_processes(self):
+        pipe = Pipeline(
+            columns={
+                'close': USEquityPricing.close.latest,
+                'returns': Returns(window_length=2),
+                'categorical': USEquityPricing.close.latest.quantiles(5)
+            },
+        )
+        pipeline_result = self.pipeline_engine.run_pipeline(
+            pipe,
+            start_date=self.PIPELINE_START_DATE,
+            end_date=self.END_DATE,
+        )
+        loaders = []
+
+        def make_loader():
+            loaders.append(None)
+            return self.pipeline_engine._get_loader
+
+        for memory_budget in None, 1:
+            chunked_result = self.pipeline_engine.run_chunked_pipeline(
+                pipeline=pipe,
+                start_date=self.PIPELINE_START_DATE,
+                end_date=self.END_DATE,
+                chunksize=22,
+                processes=2,
+                memory_budget=memory_budget,
+                make_loader=make_loader,
+            )
+            self.assertTrue(chunked_result.equals(pipeline_result))
+
+        # the loaders are made in the workers.
+        assert_equal(loaders, [])
+
+    def test_run_chunked_pipeline_in_processes_default_loaders(self):
+        pipe = Pipeline(
+            columns={
+                'close': USEquityPricing.close.latest,
+                'sma': SimpleMovingAverage(
+                    inputs=[USEquityPricing.close],
+                    window_length=10,
+                ),
+            },
+        )
+        pipeline_result = self.pipeline_engine.run_pipeline(
+            pipe,
+            start_date=self.PIPELINE_START_DATE,
+            end_date=self.END_DATE,
+        )
+        # the workers reopen the sqlite connection of the adjustment reader
+        # of the loader they inherit.
+        chunked_result = self.pipeline_engine.run_chunked_pipeline(
+            pipeline=pipe,
+            start_date=self.PIPELINE_START_DATE,
+            end_date=self.END_DATE,
+            chunksize=22,
+            processes=2,
+        )
+        self.assertTrue(chunked_result.equals(pipeline_result))
+
+        # the connection of this process is still usable.
+        self.assertTrue(
+            self.pipeline_engine.run_pipeline(
+                pipe,
+                start_date=self.PIPELINE_START_DATE,
+                end_date=self.END_DATE,
+            ).equals(pipeline_result),
+        )
+
+
+class RecordingUSEquityPricingLoader(USEquityPricingLoader):
+    def __init__(self, *args, **kwargs):
+        super(RecordingUSEquityPricingLoader, self).__init__(*args, **kwargs)
+        self.load_calls = []
+
+    def load_adjusted_array(self, columns, dates, assets, mask):
+        self.load_calls.append(len(dates))
+        return super(RecordingUSEquityPricingLoader, self).load_adjusted_array(
+            columns, dates, assets, mask,
+        )
+
+
+class IncrementalPipelineTestCase(WithEquityPricingPipelineEngine,
+                                  ZiplineTestCase):
+
+    START_DATE = Timestamp('2006-01-03', tz='UTC')
+    END_DATE = Timestamp('2006-03-31', tz='UTC')
+    PIPELINE_START_DATE = Timestamp('2006-02-01', tz='UTC')
+    PIPELINE_END_DATE = Timestamp('2006-03-10', tz='UTC')
+
+    @classmethod
+    def make_splits_data(cls):
+        return DataFrame.from_records([{
+            'effective_date': str_to_seconds('2006-02-15'),
+            'ratio': 0.5,
+            'sid': ord('A'),
+        }])
+
+    @classmethod
+    def make_mergers_data(cls):
+        return DataFrame.from_records([{
+            'effective_date': str_to_seconds('2006-02-22'),
+            'ratio': 0.9,
+            'sid': ord('B'),
+        }])
+
+    def test_incremental_pipeline(self):
+        loader = RecordingUSEquityPricingLoader(
+            self.bcolz_equity_daily_bar_reader,
+            SQLiteAdjustmentReader(self.adjustments_db_path),
+        )
+        engine = IncrementalPipelineEngine(
+            lambda column: loader,
+            self.nyse_sessions,
+            self.asset_finder,
+        )
+        close = USEquityPricing.close
+        pipe = Pipeline(
+            columns={
+                'close': close.latest,
+                'sma': SimpleMovingAverage(inputs=[close], window_length=10),
+                'volume': SimpleMovingAverage(
+                    inputs=[USEquityPricing.volume],
+                    window_length=5,
+                ),
+                'returns': Returns(window_length=3),
+            },
+        )
+        expected = self.pipeline_engine.run_pipeline(
+            pipe,
+            self.PIPELINE_START_DATE,
+            self.PIPELINE_END_DATE,
+        )
+
+        start, stop = self.nyse_sessions.slice_locs(
+            self.PIPELINE_START_DATE,
+            self.PIPELINE_END_DATE,
+        )
+        sessions = self.nyse_sessions[start:stop]
+        results = [engine.run_pipeline(pipe, s, s) for s in sessions]
+        assert_frame_equal(concat(results), expected)
+
+        # the windows are loaded in full on the first day only.
+        assert_equal(sorted(loader.load_calls[:2]), [5, 10])
+        assert_equal(loader.load_calls[2:], [1] * 2 * (len(sessions) - 1))
+        assert_equal(
+            {window[0] for window in itervalues(engine._windows)},
+            {sessions[-1]},
+        )
+
+        # a skipped day loads the windows again.
+        del loader.load_calls[:]
+        assert_frame_equal(
+            engine.run_pipeline(pipe, sessions[-2], sessions[-2]),
+            expected.loc[[sessions[-2]]],
+        )
+        assert_equal(sorted(loader.load_calls), [5, 10])
+
+    def test_pipelines_sharing_a_column(self):
+        loader = RecordingUSEquityPricingLoader(
+            self.bcolz_equity_daily_bar_reader,
+            SQLiteAdjustmentReader(self.adjustments_db_path),
+        )
+        engine = IncrementalPipelineEngine(
+            lambda column: loader,
+            self.nyse_sessions,
+            self.asset_finder,
+        )
+        pipes = [
+            Pipeline(
+                columns={
+                    'sma': SimpleMovingAverage(
+                        inputs=[USEquityPricing.close],
+                        window_length=window_length,
+                    ),
+                },
+            )
+            for window_length in (10, 5)
+        ]
+        start, stop = self.nyse_sessions.slice_locs(
+            self.PIPELINE_START_DATE,
+            self.PIPELINE_END_DATE,
+        )
+        sessions = self.nyse_sessions[start:stop]
+
+        results = [[], []]
+        for session in sessions:
+            for pipe, result in zip(pipes, results):
+                result.append(engine.run_pipeline(pipe, session, session))
+
+        for pipe, result in zip(pipes, results):
+            assert_frame_equal(
+                concat(result),
+                self.pipeline_engine.run_pipeline(
+                    pipe,
+                    self.PIPELINE_START_DATE,
+                    self.PIPELINE_END_DATE,
+                ),
+            )
+
+        # both windows of the column are rolled after the first day.
+        assert_equal(loader.load_calls[:2], [10, 5])
+        assert_equal(loader.load_calls[2:], [1] * 2 * (len(sessions) - 1))
+
+
+class RollingKernelTestCase(WithEquityPricingPipelineEngine,
+                            ZiplineTestCase):
+
+    START_DATE = Timestamp('2006-01-03', tz='UTC')
+    END_DATE = Timestamp('2006-03-31', tz='UTC')
+    PIPELINE_START_DATE = Timestamp('2006-02-01', tz='UTC')
+    PIPELINE_END_DATE = Timestamp('2006-03-10', tz='UTC')
+
+    ASSET_FINDER_EQUITY_SIDS = ord('A'), ord('B'), ord('C'), ord('D')
+    # the prices of D stop moving, so that the windows of its returns end up
+    # constant after some non-zero returns.
+    FLAT_SID = ord('D')
+    FLAT_START_DATE = Timestamp('2006-02-06', tz='UTC')
+    # C has no bars for a few days, so that nans move into and then out of
+    # its windows.
+    GAP_SID = ord('C')
+    GAP_DATES = date_range('2006-02-13', '2006-02-15', tz='UTC')
+
+    @classmethod
+    def make_equity_daily_bar_data(cls):
+        bar_data = super(
+            RollingKernelTestCase,
+            cls,
+        ).make_equity_daily_bar_data()
+        for sid, bars in bar_data:
+            if sid == cls.FLAT_SID:
+                flat = bars.index >= cls.FLAT_START_DATE
+                price = bars.loc[flat, 'close'].iloc[0]
+                bars.loc[flat, ['open', 'high', 'low', 'close']] = price
+            elif sid == cls.GAP_SID:
+                bars.loc[bars.index.isin(cls.GAP_DATES)] = nan
+            yield sid, bars
+
+    @classmethod
+    def make_splits_data(cls):
+        return DataFrame.from_records([{
+            'effective_date': str_to_seconds('2006-02-15'),
+            'ratio': 0.5,
+            'sid': ord('A'),
+        }])
+
+    @classmethod
+    def make_mergers_data(cls):
+        return DataFrame.from_records([{
+            'effective_date': str_to_seconds('2006-02-22'),
+            'ratio': 0.9,
+            'sid': ord('B'),
+        }])
+
+    def make_factors(self, without_kernel):
+        def factor(cls, **kwargs):
+            if without_kernel:
+                cls = type(cls.__name__, (cls,), {'kernel': None})
+            return cls(**kwargs)
+
+        close = USEquityPricing.close
+        returns = Returns(window_length=2)
+        target = returns[self.asset_finder.retrieve_asset(ord('A'))]
+        regression = factor(
+            RollingLinearRegression,
+            dependent=returns,
+            independent=target,
+            regression_length=10,
+        )
+        return {
+            'sma': factor(
+                SimpleMovingAverage,
+                inputs=[close],
+                window_length=7,
+            ),
+            'vwap': factor(VWAP, window_length=5),
+            'dollar_volume': factor(AverageDollarVolume, window_length=5),
+            'volatility': factor(AnnualizedVolatility, window_length=10),
+            'ewma': factor(
+                EWMA,
+                inputs=[close],
+                window_length=7,
+                decay_rate=0.5,
+            ),
+            'ewmstd': factor(
+                EWMSTD,
+                inputs=[close],
+                window_length=7,
+                decay_rate=0.5,
+            ),
+            'pearson': factor(
+                RollingPearson,
+                base_factor=returns,
+                target=target,
+                correlation_length=10,
+            ),
+            'alpha': regression.alpha,
+            'beta': regression.beta,
+            'r_value': regression.r_value,
+            'p_value': regression.p_value,
+            'stderr': regression.stderr,
+        }
+
+    def test_kernels(self):
+        results = [
+            self.pipeline_engine.run_pipeline(
+                Pipeline(columns=self.make_factors(without_kernel)),
+                self.PIPELINE_START_DATE,
+                self.PIPELINE_END_DATE,
+            )
+            for without_kernel in (False, True)
+        ]
+        assert_frame_equal(*results)
+
+        # as in scipy, the correlation with the constant returns of the flat
+        # asset is nan, and its regression has no fit.
+        flat = self.asset_finder.retrieve_asset(self.FLAT_SID)
+        last = results[0].loc[self.PIPELINE_END_DATE].loc[flat]
+        self.assertTrue(isnan(last['pearson']))
+        assert_equal(last['r_value'], 0.0)
+        assert_equal(last['beta'], 0.0)
+
+    def test_kernels_missing_data(self):
+        result = self.pipeline_engine.run_pipeline(
+            Pipeline(columns=self.make_factors(without_kernel=False)),
+            self.PIPELINE_START_DATE,
+            self.PIPELINE_END_DATE,
+        )
+        gap = result.xs(
+            self.asset_finder.retrieve_asset(self.GAP_SID),
+            level=1,
+        )
+
+        # the factors which are nan on a window with a missing value are nan
+        # while the gap is in the window, and are computed again once it has
+        # left the window.
+        during = gap.loc[Timestamp('2006-02-16', tz='UTC')]
+        after = gap.loc[self.PIPELINE_END_DATE]
+        for name in 'ewma', 'ewmstd', 'pearson', 'beta':
+            self.assertTrue(isnan(during[name]), name)
+            self.assertFalse(isnan(after[name]), name)
+
+    def test_compute_override(self):
+        class Doubled(SimpleMovingAverage):
+            def compute(self, today, assets, out, data):
+                super(Doubled, self).compute(today, assets, out, data)
+                out *= 2
+
+        close = USEquityPricing.close
+        results = self.pipeline_engine.run_pipeline(
+            Pipeline(
+                columns={
+                    'sma': SimpleMovingAverage(
+                        inputs=[close],
+                        window_length=7,
+                    ),
+                    'doubled': Doubled(inputs=[close], window_length=7),
+                },
+            ),
+            self.PIPELINE_START_DATE,
+            self.PIPELINE_END_DATE,
+        )
+        assert_equal(
+            results['doubled'].values,
+            2 * results['sma'].values,
+            array_decimal=6,
+        )
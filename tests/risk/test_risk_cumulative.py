@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import empyrical
 import numpy as np
 import pandas as pd
 import zipline.finance.risk as risk
@@ -133,3 +134,106 @@ class TestRisk(WithTradingCalendars, ZiplineTestCase):
     def test_representation(self):
         assert all(metric in repr(self.cumulative_metrics)
                    for metric in self.cumulative_metrics.METRIC_NAMES)
+
+
+class TestRiskAgainstEmpyrical(WithTradingCalendars, ZiplineTestCase):
+    """The metrics updated online are the ones empyrical computes over all
+    the returns to date.
+    """
+    def init_instance_fixtures(self):
+        super(TestRiskAgainstEmpyrical, self).init_instance_fixtures()
+
+        self.sim_params = SimulationParameters(
+            start_session=pd.Timestamp("2006-01-03", tz='UTC'),
+            end_session=pd.Timestamp("2006-03-31", tz='UTC'),
+            trading_calendar=self.trading_calendar,
+        )
+        rand = np.random.RandomState(1337)
+        n = len(self.sim_params.sessions)
+        self.algo_returns = rand.normal(0.001, 0.02, n)
+        self.benchmark_returns = rand.normal(0.0005, 0.01, n)
+        self.benchmark_returns[5] = np.nan
+
+    def check_metrics(self, metrics, algo_returns, benchmark_returns, loc):
+        alpha, beta = empyrical.alpha_beta_aligned(
+            algo_returns,
+            benchmark_returns,
+        )
+        downside_risk = empyrical.downside_risk(algo_returns)
+        expected = {
+            'algorithm_cumulative_returns':
+                empyrical.cum_returns(algo_returns)[-1],
+            'benchmark_cumulative_returns':
+                empyrical.cum_returns(benchmark_returns)[-1],
+            'algorithm_volatility':
+                empyrical.annual_volatility(algo_returns),
+            'benchmark_volatility':
+                empyrical.annual_volatility(benchmark_returns),
+            'alpha': alpha,
+            'beta': beta,
+            'sharpe': empyrical.sharpe_ratio(algo_returns),
+            'downside_risk': downside_risk,
+            'sortino':
+                empyrical.sortino_ratio(algo_returns,
+                                        _downside_risk=downside_risk),
+            'max_drawdowns': empyrical.max_drawdown(algo_returns),
+        }
+        for name, value in expected.items():
+            np.testing.assert_allclose(
+                getattr(metrics, name)[loc],
+                value,
+                rtol=1e-9,
+                atol=1e-12,
+                err_msg=name,
+            )
+
+    def test_daily(self):
+        metrics = risk.RiskMetricsCumulative(
+            self.sim_params,
+            trading_calendar=self.trading_calendar,
+        )
+        for loc, dt in enumerate(self.sim_params.sessions):
+            metrics.update(
+                dt,
+                self.algo_returns[loc],
+                self.benchmark_returns[loc],
+                0.0,
+            )
+            self.check_metrics(
+                metrics,
+                self.algo_returns[:loc + 1],
+                self.benchmark_returns[:loc + 1],
+                loc,
+            )
+
+    def test_first_day_stats_with_updates_of_the_same_day(self):
+        metrics = risk.RiskMetricsCumulative(
+            self.sim_params,
+            trading_calendar=self.trading_calendar,
+            create_first_day_stats=True,
+        )
+        for loc, dt in enumerate(self.sim_params.sessions):
+            # the returns of a session are updated every minute until the
+            # close.
+            for scale in (0.5, 2.0, 1.0):
+                algo_return = self.algo_returns[loc] * scale
+                benchmark_return = self.benchmark_returns[loc] * scale
+                metrics.update(dt, algo_return, benchmark_return, 0.0)
+
+                algo_returns = np.append(
+                    self.algo_returns[:loc],
+                    algo_return,
+                )
+                benchmark_returns = np.append(
+                    self.benchmark_returns[:loc],
+                    benchmark_return,
+                )
+                if loc == 0:
+                    algo_returns = np.append(0.0, algo_returns)
+                    benchmark_returns = np.append(0.0, benchmark_returns)
+                self.check_metrics(
+                    metrics,
+                    algo_returns,
+                    benchmark_returns,
+                    loc,
+                )
@@ -14,7 +14,8 @@
 # limitations under the License.
 from collections import OrderedDict
 
-from numpy import array, append, nan, full
+from mock import patch
+from numpy import array, append, nan, full, isnan
 from numpy.testing import assert_almost_equal
 import pandas as pd
 from pandas.tslib import Timedelta
@@ -398,6 +399,49 @@ class DataPortalTestBase(WithDataPortal,
         ]
         assert_almost_equal(expected.values.tolist(), result)
 
+    def test_get_spot_values_matches_get_spot_value(self):
+        equities = self.asset_finder.retrieve_all([3, 1, 2])
+        future = self.asset_finder.retrieve_asset(10000)
+        trading_calendar = self.trading_calendars[Equity]
+        dts = trading_calendar.minutes_for_session(self.trading_days[2])
+
+        for assets in (equities, equities + [future]):
+            for dt in (dts[0], dts[1], dts[100], dts[-1]):
+                for field in ('open', 'high', 'low', 'close', 'volume',
+                              'price'):
+                    expected = [
+                        self.data_portal.get_spot_value(
+                            asset, field, dt, 'minute',
+                        )
+                        for asset in assets
+                    ]
+                    result = self.data_portal.get_spot_values(
+                        assets, field, dt, 'minute',
+                    )
+                    assert_almost_equal(expected, list(result))
+
+    def test_get_spot_values_reads_prices_at_once(self):
+        equities = self.asset_finder.retrieve_all([3, 1, 2])
+        trading_calendar = self.trading_calendars[Equity]
+        dts = trading_calendar.minutes_for_session(self.trading_days[2])
+        reader = self.data_portal._get_pricing_reader('minute')
+
+        for dt in (dts[0], dts[1], dts[100], dts[-1]):
+            closes = self.data_portal.get_spot_values(
+                equities, 'close', dt, 'minute',
+            )
+            with patch.object(reader, 'get_values',
+                              wraps=reader.get_values) as get_values, \
+                    patch.object(reader, 'get_value',
+                                 wraps=reader.get_value) as get_value:
+                self.data_portal.get_spot_values(
+                    equities, 'price', dt, 'minute',
+                )
+
+            assert_equal(get_values.call_count, 1)
+            # only the prices which are forward filled are read one at a time.
+            self.assertLessEqual(get_value.call_count, isnan(closes).sum())
+
     @parameter_space(data_frequency=['daily', 'minute'],
                      field=['close', 'price'])
     def test_get_adjustments(self, data_frequency, field):
@@ -16,6 +16,7 @@
 from __future__ import division
 
 import copy
+import json
 from datetime import (
     datetime,
     timedelta,
@@ -30,6 +31,7 @@ import pandas as pd
 import numpy as np
 from six.moves import range, zip
 
+from zipline.algorithm import TradingAlgorithm
 from zipline.assets import Asset
 from zipline.assets.synthetic import make_simple_equity_info
 from zipline.data.us_equity_pricing import (
@@ -54,6 +56,7 @@ from zipline.testing import (
     tmp_trading_env,
 )
 from zipline.testing.fixtures import (
+    WithDataPortal,
     WithInstanceTmpDir,
     WithSimParams,
     WithTmpDir,
@@ -2165,3 +2168,189 @@ class TestPositionTracker(WithTradingEnvironment,
         # Test gross and net exposures.
         self.assertEqual(100, pos_stats.gross_exposure)
         self.assertEqual(100, pos_stats.net_exposure)
+
+    def test_position_rows(self):
+        class SmallPositionTracker(perf.PositionTracker):
+            INITIAL_CAPACITY = 1
+
+        pt = SmallPositionTracker(None)
+        dt = pd.Timestamp('2017/01/04 3:00PM')
+
+        for asset, amount in ((self.EQUITY1, 10),
+                              (self.EQUITY2, -20),
+                              (self.FUTURE3, 30)):
+            pt.update_position(
+                asset, amount=amount, last_sale_date=dt, last_sale_price=10,
+            )
+
+        position = pt.positions[self.EQUITY2]
+        self.assertIsInstance(position, perf.Position)
+        self.assertEqual(position.amount, -20)
+        position.last_sale_price = 12.5
+        self.assertEqual(pt.positions[self.EQUITY2].last_sale_price, 12.5)
+
+        # closing the first position moves the last row into its place.
+        pt.execute_transaction(create_txn(self.EQUITY1, dt, 10, -10))
+        self.assertIsNone(pt.positions[self.EQUITY1])
+        self.assertEqual(pt.positions[self.FUTURE3].amount, 30)
+        self.assertEqual(pt.positions[self.EQUITY2].last_sale_price, 12.5)
+        self.assertEqual(
+            [(p['sid'], p['amount']) for p in pt.get_positions_list()],
+            [(self.EQUITY2, -20), (self.FUTURE3, 30)],
+        )
+
+        pos_stats = pt.stats()
+        self.assertEqual(-250, pos_stats.net_value)
+        self.assertEqual(-250 + 300000, pos_stats.net_exposure)
+        self.assertEqual(1, pos_stats.longs_count)
+        self.assertEqual(1, pos_stats.shorts_count)
+
+
+class TestPerfResults(WithSimParams,
+                      WithDataPortal,
+                      WithInstanceTmpDir,
+                      ZiplineTestCase):
+    START_DATE = pd.Timestamp('2006-01-03', tz='utc')
+    END_DATE = pd.Timestamp('2006-01-31', tz='utc')
+    ASSET_FINDER_EQUITY_SIDS = 1, 2
+
+    TABLES = 'positions', 'transactions', 'orders'
+
+    def run_algo(self, **kwargs):
+        def initialize(context):
+            context.incr = 0
+
+        def handle_data(context, data):
+            context.incr += 1
+            asset = context.sid(1 if context.incr % 2 else 2)
+            context.order(asset, 10 if context.incr % 3 else -5)
+            context.record(incr=context.incr)
+
+        algo = TradingAlgorithm(
+            initialize=initialize,
+            handle_data=handle_data,
+            sim_params=self.sim_params,
+            env=self.env,
+            **kwargs
+        )
+        return algo.run(self.data_portal)
+
+    def check_scalars(self, expected, result):
+        for name in expected.columns.difference(self.TABLES):
+            if name in ('period_open', 'period_close', 'period_label'):
+                self.assertEqual(list(result[name]), list(expected[name]))
+            else:
+                np.testing.assert_array_almost_equal(
+                    result[name].values.astype(float),
+                    expected[name].values.astype(float),
+                    err_msg=name,
+                )
+
+    def test_same_frame(self):
+        expected = self.run_algo()
+        result = self.run_algo(perf_results=perf.PerfResults())
+
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertTrue(result.index.equals(expected.index))
+        self.check_scalars(expected, result)
+        for name in self.TABLES:
+            self.assertEqual(list(result[name]), list(expected[name]), name)
+
+    def test_spill(self):
+        expected = self.run_algo()
+        results = perf.PerfResults(
+            spill_path=self.instance_tmpdir.getpath('results.h5'),
+            spill_format='hdf5',
+            spill_rows=4,
+        )
+        result = self.run_algo(perf_results=results)
+
+        self.assertFalse(set(self.TABLES) & set(result.columns))
+        self.check_scalars(expected, result)
+
+        transactions = results.transactions()
+        expected_transactions = [
+            txn for txns in expected['transactions'] for txn in txns
+        ]
+        self.assertEqual(len(transactions), len(expected_transactions))
+        self.assertEqual(
+            list(transactions['sid']),
+            [int(txn['sid']) for txn in expected_transactions],
+        )
+        self.assertEqual(
+            list(transactions['amount']),
+            [txn['amount'] for txn in expected_transactions],
+        )
+
+        positions = results.positions()
+        self.assertEqual(
+            len(positions),
+            sum(map(len, expected['positions'])),
+        )
+        self.assertEqual(
+            list(positions.groupby('date').size()),
+            [len(p) for p in expected['positions'] if p],
+        )
+
+    def test_stream(self):
+        expected = self.run_algo()
+        rows = []
+        self.assertIsNone(
+            self.run_algo(perf_sink=perf.CallbackSink(rows.append)),
+        )
+
+        result = pd.DataFrame(
+            rows,
+            index=pd.DatetimeIndex([r['period_close'] for r in rows]),
+        )
+        self.assertEqual(
+            sorted(result.columns),
+            sorted(expected.columns),
+        )
+        self.check_scalars(expected, result)
+        for name in self.TABLES:
+            self.assertEqual(list(result[name]), list(expected[name]), name)
+
+    def test_stream_json_lines(self):
+        expected = self.run_algo()
+        path = self.instance_tmpdir.getpath('perf.jsonl')
+        self.run_algo(perf_sink=perf.JSONLinesSink(path))
+
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), len(expected))
+        self.assertEqual(
+            [r['portfolio_value'] for r in rows],
+            list(expected['portfolio_value']),
+        )
+        self.assertEqual(
+            [[p['sid'] for p in r['positions']] for r in rows],
+            [[int(p['sid']) for p in ps] for ps in expected['positions']],
+        )
+
+    def test_stream_analyze(self):
+        analyzed = []
+        self.run_algo(
+            perf_sink=perf.CallbackSink(lambda perf: None),
+            analyze=lambda context, perf: analyzed.append(perf),
+        )
+        # the sessions are not kept to build a frame to analyze.
+        self.assertEqual(analyzed, [None])
+
+    def test_sink_closed_on_error(self):
+        path = self.instance_tmpdir.getpath('perf.jsonl')
+        with self.assertRaises(ValueError):
+            with perf.JSONLinesSink(path) as sink:
+                raise ValueError('setup failed')
+        self.assertTrue(sink._file.closed)
+
+    def test_results_and_sink(self):
+        with self.assertRaises(ValueError):
+            self.run_algo(
+                perf_results=perf.PerfResults(),
+                perf_sink=perf.CallbackSink(lambda perf: None),
+            )
+
+    def test_invalid_spill_format(self):
+        with self.assertRaises(ValueError):
+            perf.PerfResults(spill_path='results', spill_format='csv')
@@ -0,0 +1,77 @@
+import os
+import sqlite3
+
+from mock import Mock, patch
+
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
+from zipline.testing.predicates import assert_equal, assert_raises
+from zipline.utils.pool import (
+    fork_pool,
+    prepare_fork,
+    reopen_sqlite_connections,
+)
+
+# set before forking the workers of ``ForkPoolTestCase``.
+_inherited = None
+
+
+def _read_inherited(_):
+    return _inherited
+
+
+class Reader(object):
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class Loader(object):
+    def __init__(self, reader):
+        self.reader = reader
+
+
+class PrepareForkTestCase(WithInstanceTmpDir, ZiplineTestCase):
+
+    def test_reopen_sqlite_connections(self):
+        path = os.path.join(self.instance_tmpdir.path, 'test.sqlite')
+        reader = Reader(sqlite3.connect(path))
+        self.add_instance_callback(lambda: reader.conn.close())
+        reader.conn.execute('CREATE TABLE t (x INTEGER)')
+        reader.conn.execute('INSERT INTO t VALUES (1)')
+        reader.conn.commit()
+        in_memory = Reader(sqlite3.connect(':memory:'))
+
+        # the reader is found once, both directly and held by a loader, and
+        # the in-memory database is left alone.
+        readers = prepare_fork([reader, Loader(reader), Loader(in_memory)])
+        assert_equal(len(readers), 1)
+        assert_equal(readers[0][0] is reader, True)
+        assert_equal(os.path.realpath(readers[0][1]), os.path.realpath(path))
+
+        old = reader.conn
+        reopen_sqlite_connections(readers)
+        self.assertIsNot(reader.conn, old)
+        old.close()
+        assert_equal(reader.conn.execute('SELECT x FROM t').fetchall(), [(1,)])
+
+
+class ForkPoolTestCase(ZiplineTestCase):
+
+    def test_inherit_state(self):
+        global _inherited
+        _inherited = 'state'
+        try:
+            pool = fork_pool(2)
+            try:
+                assert_equal(pool.map(_read_inherited, range(2)),
+                             ['state', 'state'])
+            finally:
+                pool.terminate()
+                pool.join()
+        finally:
+            _inherited = None
+
+    def test_no_fork(self):
+        with patch('zipline.utils.pool.get_context', None), \
+                patch('zipline.utils.pool.sys', Mock(platform='win32')), \
+                assert_raises(ValueError):
+            fork_pool(2)
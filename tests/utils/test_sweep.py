@@ -0,0 +1,119 @@
+from collections import OrderedDict
+
+import pandas as pd
+
+from zipline.api import attach_pipeline, pipeline_output
+from zipline.pipeline import Pipeline
+from zipline.pipeline.data import USEquityPricing
+from zipline.testing.fixtures import (
+    WithDataPortal,
+    WithSimParams,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+from zipline.utils.sweep import (
+    SweepAlgorithm,
+    _pipeline_key,
+    expand_grid,
+    summarize_perf,
+)
+
+
+def make_pipeline():
+    return Pipeline({'close': USEquityPricing.close.latest})
+
+
+class ExpandGridTestCase(ZiplineTestCase):
+
+    def test_expand_grid(self):
+        grid = OrderedDict([('a', [1, 2]), ('b', 'xy')])
+        assert_equal(
+            expand_grid(grid),
+            [
+                OrderedDict([('a', 1), ('b', 'x')]),
+                OrderedDict([('a', 1), ('b', 'y')]),
+                OrderedDict([('a', 2), ('b', 'x')]),
+                OrderedDict([('a', 2), ('b', 'y')]),
+            ],
+        )
+
+    def test_expand_empty_values(self):
+        assert_equal(expand_grid({'a': [1, 2], 'b': []}), [])
+
+    def test_summarize_perf(self):
+        perf = pd.DataFrame({
+            'portfolio_value': [100.0, 110.0],
+            'sharpe': [float('nan'), 1.5],
+            'transactions': [[], [{}, {}]],
+        })
+        assert_equal(
+            summarize_perf(perf),
+            OrderedDict([
+                ('portfolio_value', 110.0),
+                ('sharpe', 1.5),
+                ('transactions', 2),
+            ]),
+        )
+
+
+class SweepAlgorithmTestCase(WithSimParams,
+                             WithDataPortal,
+                             ZiplineTestCase):
+
+    START_DATE = pd.Timestamp('2016-01-05', tz='utc')
+    END_DATE = pd.Timestamp('2016-01-08', tz='utc')
+    ASSET_FINDER_EQUITY_SIDS = 1, 2
+
+    def make_algorithm(self, precomputed_pipelines, **kwargs):
+        def get_loader(column):
+            raise AssertionError('the pipeline should not be computed')
+
+        return SweepAlgorithm(
+            precomputed_pipelines=precomputed_pipelines,
+            env=self.env,
+            get_pipeline_loader=get_loader,
+            sim_params=self.sim_params,
+            **kwargs
+        )
+
+    def test_attached_pipelines(self):
+        def initialize(context):
+            attach_pipeline(make_pipeline(), 'test')
+
+        algo = self.make_algorithm({}, initialize=initialize)
+        pipelines = algo.attached_pipelines()
+        assert_equal(len(pipelines), 1)
+        assert_equal(
+            _pipeline_key(pipelines[0]),
+            _pipeline_key(make_pipeline()),
+        )
+
+    def test_precomputed_pipeline(self):
+        sessions = self.sim_params.sessions
+        assets = self.asset_finder.retrieve_all([1, 2])
+        precomputed = pd.DataFrame(
+            {'close': range(len(sessions) * len(assets))},
+            index=pd.MultiIndex.from_product([sessions, assets]),
+            dtype=float,
+        )
+        outputs = []
+
+        def initialize(context):
+            attach_pipeline(make_pipeline(), 'test')
+
+        def before_trading_start(context, data):
+            outputs.append(pipeline_output('test')['close'].tolist())
+
+        algo = self.make_algorithm(
+            {_pipeline_key(make_pipeline()): precomputed},
+            initialize=initialize,
+            before_trading_start=before_trading_start,
+            params={'window': 3},
+        )
+        algo.run(self.data_portal)
+
+        assert_equal(algo.params, {'window': 3})
+        assert_equal(
+            outputs,
+            [[2.0 * i, 2.0 * i + 1] for i in range(len(sessions))],
+        )
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 import errno
 import os
 import json
@@ -8,10 +9,13 @@ import pandas as pd
 from six import text_type
 
 from zipline.data import bundles as bundles_module
+from zipline.finance.performance.sinks import JSONLinesSink
 from zipline.utils.calendars.calendar_utils import get_calendar
 from zipline.utils.compat import wraps
+from zipline.utils.context_tricks import nop_context
 from zipline.utils.cli import Date, Timestamp
 from zipline.utils.run_algo import _run, load_extensions
+from zipline.utils.sweep import expand_grid, run_sweep
 from zipline.utils.save_to_json import convert_zipline_results_to_json
 
 try:
@@ -187,6 +191,15 @@ def ipython_only(option):
     default=False,
     help='Print the algorithm to stdout.',
 )
+@click.option(
+    '--stream/--no-stream',
+    is_flag=True,
+    default=False,
+    help='Write the performance of each session to the output as a line of'
+    ' json as soon as the session closes, instead of the summary at the end'
+    ' of the simulation. Only the state of the current session is kept in'
+    ' memory.',
+)
 @ipython_only(click.option(
     '--local-namespace/--no-local-namespace',
     is_flag=True,
@@ -207,6 +220,7 @@ def run(ctx,
         output,
         trading_calendar,
         print_algo,
+        stream,
         local_namespace):
     """Run a backtest for the given algorithm.
     """
@@ -231,27 +245,32 @@ def run(ctx,
 
     trading_calendar = get_calendar(trading_calendar)
 
-    perf = _run(
-        initialize=None,
-        handle_data=None,
-        before_trading_start=None,
-        analyze=None,
-        algofile=algofile,
-        algotext=algotext,
-        defines=define,
-        data_frequency=data_frequency,
-        capital_base=capital_base,
-        data=None,
-        bundle=bundle,
-        bundle_timestamp=bundle_timestamp,
-        start=start,
-        end=end,
-        output=output,
-        trading_calendar=trading_calendar,
-        print_algo=print_algo,
-        local_namespace=local_namespace,
-        environ=os.environ,
-    )
+    sink = JSONLinesSink(output) if stream else nop_context
+    with sink as perf_sink:
+        perf = _run(
+            initialize=None,
+            handle_data=None,
+            before_trading_start=None,
+            analyze=None,
+            algofile=algofile,
+            algotext=algotext,
+            defines=define,
+            data_frequency=data_frequency,
+            capital_base=capital_base,
+            data=None,
+            bundle=bundle,
+            bundle_timestamp=bundle_timestamp,
+            start=start,
+            end=end,
+            output=output,
+            trading_calendar=trading_calendar,
+            print_algo=print_algo,
+            local_namespace=local_namespace,
+            environ=os.environ,
+            perf_sink=perf_sink,
+        )
+    if stream:
+        return None
 
     perf = convert_zipline_results_to_json(perf)
     if output == '-':
@@ -265,6 +284,184 @@ def run(ctx,
     return perf
 
 
+def _eval_assignments(assignments, namespace, option):
+    for assign in assignments:
+        try:
+            name, value = assign.split('=', 1)
+        except ValueError:
+            raise click.BadParameter(
+                'invalid assignment %r, should be of the form name=value' %
+                assign,
+                param_hint=option,
+            )
+        try:
+            namespace[name] = eval(value, namespace)
+        except Exception as e:
+            raise click.BadParameter(
+                'failed to execute definition for name %r: %s' % (name, e),
+                param_hint=option,
+            )
+        yield name
+
+
+@main.command()
+@click.option(
+    '-f',
+    '--algofile',
+    default=None,
+    type=click.File('r'),
+    help='The file that contains the algorithm to run.',
+)
+@click.option(
+    '-t',
+    '--algotext',
+    help='The algorithm script to run.',
+)
+@click.option(
+    '-D',
+    '--define',
+    multiple=True,
+    help="Define a name to be bound in the namespace of every variant before"
+    " executing the algotext. For example '-Dname=value'.",
+)
+@click.option(
+    '-G',
+    '--grid',
+    multiple=True,
+    help="A parameter to sweep and the values it takes, bound in the"
+    " namespace of each variant. For example '-Gwindow=range(10, 50, 10)'."
+    " The value may be any python expression evaluating to an iterable, the"
+    " variants are every combination of the values.",
+)
+@click.option(
+    '--data-frequency',
+    type=click.Choice({'daily', 'minute'}),
+    default='daily',
+    show_default=True,
+    help='The data frequency of the simulation.',
+)
+@click.option(
+    '--capital-base',
+    type=float,
+    default=10e6,
+    show_default=True,
+    help='The starting capital for the simulation.',
+)
+@click.option(
+    '-b',
+    '--bundle',
+    default='quandl',
+    metavar='BUNDLE-NAME',
+    show_default=True,
+    help='The data bundle to use for the simulation.',
+)
+@click.option(
+    '--bundle-timestamp',
+    type=Timestamp(),
+    default=pd.Timestamp.utcnow(),
+    show_default=False,
+    help='The date to lookup data on or before.\n'
+    '[default: <current-time>]'
+)
+@click.option(
+    '-s',
+    '--start',
+    type=Date(tz='utc', as_timestamp=True),
+    help='The start date of the simulation.',
+)
+@click.option(
+    '-e',
+    '--end',
+    type=Date(tz='utc', as_timestamp=True),
+    help='The end date of the simulation.',
+)
+@click.option(
+    '-o',
+    '--output',
+    default='-',
+    metavar='FILENAME',
+    show_default=True,
+    help="The location to write the results as csv, one row per variant. If"
+    " this is '-' the results will be written to stdout.",
+)
+@click.option(
+    '-p',
+    '--processes',
+    type=int,
+    default=None,
+    help='The number of worker processes. [default: <number of cpus>]',
+)
+@click.option(
+    '--precompute-pipelines/--no-precompute-pipelines',
+    is_flag=True,
+    default=True,
+    help='Compute the pipelines attached by the algorithm once for every'
+    ' variant.',
+)
+@click.pass_context
+def sweep(ctx,
+          algofile,
+          algotext,
+          define,
+          grid,
+          data_frequency,
+          capital_base,
+          bundle,
+          bundle_timestamp,
+          start,
+          end,
+          output,
+          processes,
+          precompute_pipelines):
+    """Run a backtest for every combination of the given parameters.
+    """
+    if start is None or end is None:
+        ctx.fail(
+            "must specify dates with '-s' / '--start' and '-e' / '--end'",
+        )
+    if (algotext is not None) == (algofile is not None):
+        ctx.fail(
+            "must specify exactly one of '-f' / '--algofile' or"
+            " '-t' / '--algotext'",
+        )
+    if not grid:
+        ctx.fail("must specify at least one '-G' / '--grid'")
+
+    namespace = {}
+    defines = {
+        name: namespace[name]
+        for name in _eval_assignments(define, namespace, "'-D' / '--define'")
+    }
+    values = OrderedDict(
+        (name, namespace.pop(name))
+        for name in list(
+            _eval_assignments(grid, namespace, "'-G' / '--grid'"),
+        )
+    )
+
+    results = run_sweep(
+        expand_grid(values),
+        start,
+        end,
+        bundle,
+        algotext=algotext if algofile is None else algofile.read(),
+        algo_filename=getattr(algofile, 'name', '<algorithm>'),
+        defines=defines,
+        capital_base=capital_base,
+        data_frequency=data_frequency,
+        bundle_timestamp=bundle_timestamp,
+        processes=processes,
+        precompute_pipelines=precompute_pipelines,
+    )
+
+    if output == '-':
+        click.echo(results.to_csv(index=False))
+    elif output != os.devnull:
+        results.to_csv(output, index=False)
+
+    return results
+
+
 def zipline_magic(line, cell=None):
     """The zipline IPython cell magic.
     """
@@ -92,6 +92,7 @@ from zipline.gens.tradesimulation import AlgorithmSimulator
 from zipline.pipeline import Pipeline
 from zipline.pipeline.engine import (
     ExplodingPipelineEngine,
+    IncrementalPipelineEngine,
     SimplePipelineEngine,
 )
 from zipline.utils.api_support import (
@@ -197,6 +198,12 @@ class TradingAlgorithm(object):
         equities_metadata, but will be traded by this TradingAlgorithm.
     get_pipeline_loader : callable[BoundColumn -> PipelineLoader], optional
         The function that maps pipeline columns to their loaders.
+    incremental_pipelines : bool, optional
+        Compute the attached pipelines one day at a time with an
+        :class:`~zipline.pipeline.engine.IncrementalPipelineEngine`, which
+        rolls the windows of pricing data forward from day to day instead of
+        loading them again. This is meant for live trading, where the
+        pipeline is needed for one new day every morning.
     create_event_context : callable[BarData -> context manager], optional
         A function used to create a context mananger that wraps the
         execution of all events that are scheduled for a bar.
@@ -250,6 +257,14 @@ class TradingAlgorithm(object):
             identifiers : List
                 Any asset identifiers that are not provided in the
                 equities_metadata, but will be traded by this TradingAlgorithm
+            perf_results : PerfResults
+                Collect the results into columns instead of perf packets,
+                optionally spilling positions, transactions and orders to
+                disk.
+            perf_sink : PerfSink
+                Stream the performance of each session to this sink as it
+                closes instead of returning a perf frame from ``run``. The
+                ``analyze`` function is then called with None.
         """
         self.sources = []
 
@@ -303,10 +318,24 @@ class TradingAlgorithm(object):
             )
 
         self.perf_tracker = None
+        # Optional columnar collector of the results, see
+        # zipline.finance.performance.results.PerfResults.
+        self.perf_results = kwargs.pop('perf_results', None)
+        # Optional sink the performance of each session is streamed to, see
+        # zipline.finance.performance.sinks.PerfSink.
+        self.perf_sink = kwargs.pop('perf_sink', None)
+        if self.perf_results is not None and self.perf_sink is not None:
+            raise ValueError(
+                'cannot pass both `perf_results` and `perf_sink`',
+            )
         # Pull in the environment's new AssetFinder for quick reference
         self.asset_finder = self.trading_environment.asset_finder
 
         # Initialize Pipeline API data.
+        self._incremental_pipelines = kwargs.pop(
+            'incremental_pipelines',
+            False,
+        )
         self.init_engine(kwargs.pop('get_pipeline_loader', None))
         self._pipelines = {}
 
@@ -431,7 +460,11 @@ class TradingAlgorithm(object):
         If get_loader is None, constructs an ExplodingPipelineEngine
         """
         if get_loader is not None:
-            self.engine = SimplePipelineEngine(
+            if self._incremental_pipelines:
+                engine_type = IncrementalPipelineEngine
+            else:
+                engine_type = SimplePipelineEngine
+            self.engine = engine_type(
                 get_loader,
                 self.trading_calendar.all_sessions,
                 self.asset_finder,
@@ -570,6 +603,7 @@ class TradingAlgorithm(object):
                 sim_params=self.sim_params,
                 trading_calendar=self.trading_calendar,
                 asset_finder=self.asset_finder,
+                results=self.perf_results,
             )
 
             # Set the dt initially to the period start by forcing it to change.
@@ -614,8 +648,9 @@ class TradingAlgorithm(object):
             source : DataPortal
 
         :Returns:
-            daily_stats : pandas.DataFrame
-              Daily performance metrics such as returns, alpha etc.
+            daily_stats : pandas.DataFrame or None
+              Daily performance metrics such as returns, alpha etc. None
+              when the performance is streamed to a ``perf_sink``.
 
         """
         self._assets_from_source = []
@@ -717,6 +752,13 @@ class TradingAlgorithm(object):
         # Create zipline and loop through simulated_trading.
         # Each iteration returns a perf dictionary
         try:
+            if self.perf_sink is not None:
+                self._stream_perfs(self.perf_sink)
+                # The sessions were written to the sink, there is no frame
+                # of them to analyze.
+                self.analyze(None)
+                return None
+
             perfs = []
             for perf in self.get_generator():
                 perfs.append(perf)
@@ -730,6 +772,21 @@ class TradingAlgorithm(object):
 
         return daily_stats
 
+    def _stream_perfs(self, sink):
+        """
+        Write the performance of each session to ``sink`` as it closes,
+        keeping none of the perf packets.
+        """
+        try:
+            for perf in self.get_generator():
+                if 'daily_perf' in perf:
+                    sink.write(self._daily_perf_row(perf))
+                elif 'minute_perf' not in perf and \
+                        'capital_change' not in perf:
+                    self.risk_report = perf
+        finally:
+            sink.close()
+
     def _write_and_map_id_index_to_sids(self, identifiers, as_of_date):
         # Build new Assets for identifiers that can't be resolved as
         # sids/Assets
@@ -835,6 +892,16 @@ class TradingAlgorithm(object):
             identifiers, as_of_date,
         )
 
+    @staticmethod
+    def _daily_perf_row(perf):
+        """
+        The row of the perf frame for a daily perf packet.
+        """
+        daily_perf = perf['daily_perf']
+        daily_perf.update(daily_perf.pop('recorded_vars'))
+        daily_perf.update(perf['cumulative_risk_metrics'])
+        return daily_perf
+
     def _create_daily_stats(self, perfs):
         # create daily and cumulative stats dataframe
         daily_perfs = []
@@ -843,15 +910,14 @@ class TradingAlgorithm(object):
         # warning.
         for perf in perfs:
             if 'daily_perf' in perf:
-
-                perf['daily_perf'].update(
-                    perf['daily_perf'].pop('recorded_vars')
-                )
-                perf['daily_perf'].update(perf['cumulative_risk_metrics'])
-                daily_perfs.append(perf['daily_perf'])
+                daily_perfs.append(self._daily_perf_row(perf))
             else:
                 self.risk_report = perf
 
+        if self.perf_results is not None:
+            # the sessions were recorded into columns instead of packets.
+            return self.perf_results.to_frame()
+
         daily_dts = pd.DatetimeIndex(
             [p['period_close'] for p in daily_perfs], tz='UTC'
         )
@@ -2432,7 +2498,11 @@ class TradingAlgorithm(object):
         --------
         :func:`zipline.api.pipeline_output`
         """
-        if chunks is None:
+        if chunks is None and self._incremental_pipelines:
+            # The windows are rolled forward from one day to the next, there
+            # is nothing to gain from computing the future days ahead.
+            chunks = repeat(0)
+        elif chunks is None:
             # Make the first chunk smaller to get more immediate results:
             # (one week, then every half year)
             chunks = chain([5], repeat(126))
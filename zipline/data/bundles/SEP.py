@@ -13,11 +13,15 @@ from pandas import read_csv, Timedelta
 
 from zipline.utils.calendars import deregister_calendar, get_calendar, register_calendar
 from zipline.utils.cli import maybe_show_progress
+from zipline.utils.pool import SequentialPool
 from zipline.utils.calendars import ExchangeCalendarFromDate
 from zipline.assets import AssetDBWriter
 from zipline.data.minute_bars import BcolzMinuteBarWriter
 from zipline.data.us_equity_pricing import BcolzDailyBarWriter, SQLiteAdjustmentWriter, BcolzDailyBarReader
 from zipline.data.bundles.ingest_utilities import get_ohlcv
+from zipline.data.bundles.ingest_utilities import ingest_pool, ordered_imap
+from zipline.data.bundles.incremental import (append_daily_bars, assign_sids,
+    last_daily_session, previous_sids, upsert_adjustments, upsert_equities)
 from . import core as bundles
 
 handler = StreamHandler(sys.stdout, format_string=" | {record.message}")
@@ -85,6 +89,8 @@ class CSVDIRBundleSEP:
             self.cal_session_start=config["SESSION_START"]
             self.cal_session_end=config["SESSION_END"]
             self.cal_minutes_per_day=config["MINUTES_PER_DAY"]
+            self.ingest_processes=config.get("INGEST_PROCESSES",1)
+            self.incremental=config.get("INCREMENTAL",False)
         
     def __init__(self, configpath=None):
         self._read_config(configpath)
@@ -177,7 +183,9 @@ class CSVDIRBundleSEP:
                       self.syms,
                       self.bizdays,
                       self.cal_minutes_per_day,
-                      self.benchmar_symbol)
+                      self.benchmar_symbol,
+                      self.ingest_processes,
+                      self.incremental)
 
 
 @bundles.register("SEP", create_writers=False)
@@ -202,7 +210,9 @@ def sep_bundle(environ,
                   syms = None,
                   bizdays = None,
                   minutes_per_day = None,
-                  benchmark_symbol = None):
+                  benchmark_symbol = None,
+                  processes = 1,
+                  incremental = False):
     """
     Build a zipline data bundle from the directory with csv files.
     """
@@ -225,17 +235,41 @@ def sep_bundle(environ,
                                              end_session)
     asset_db_writer = AssetDBWriter(asset_db_path)
     
-    daily_bar_writer.write(_pricing_iter(csvdir, syms, meta_data, bizdays,
-                show_progress),show_progress=show_progress)
+    since = None
+    if incremental and os.path.isdir(daily_bar_path) and isfile(asset_db_path):
+        since = last_daily_session(daily_bar_path)
 
-    meta_data = meta_data.dropna()
-    meta_data = meta_data.reset_index(drop=True)
-    
-    _write_meta_data(asset_db_writer,asset_db_path,meta_data)
+    if since is not None:
+        # append the new sessions to the existing bars, keeping the sids
+        # of the symbols already in the bundle.
+        previous = previous_sids(asset_db_path)
+        sids = assign_sids(meta_data['symbol'].dropna(), previous)
+        meta_data.index = [sids.get(s, -1) for s in meta_data['symbol']]
+        with ingest_pool(processes) as pool:
+            append_daily_bars(daily_bar_path, calendar, end_session,
+                              _pricing_iter(csvdir, syms, meta_data, bizdays,
+                                            show_progress, pool, sids,
+                                            since=since.tz_localize(None),
+                                            previous=previous),
+                              show_progress=show_progress)
+        meta_data = meta_data.dropna().sort_index()
+    else:
+        with ingest_pool(processes) as pool:
+            daily_bar_writer.write(_pricing_iter(csvdir, syms, meta_data, bizdays,
+                        show_progress, pool),show_progress=show_progress)
+
+        meta_data = meta_data.dropna()
+        meta_data = meta_data.reset_index(drop=True)
+
+    _write_meta_data(asset_db_writer,asset_db_path,meta_data,since)
     _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
-                           calendar.all_sessions, bizdays, meta_path)
+                           calendar.all_sessions, bizdays, meta_path, since)
+
+def _write_meta_data(asset_db_writer,asset_db_path,meta_data,since=None):
+    if since is not None:
+        upsert_equities(asset_db_path, meta_data)
+        return
 
-def _write_meta_data(asset_db_writer,asset_db_path,meta_data):
     try:
         os.remove(asset_db_path)
     except:
@@ -244,18 +278,8 @@ def _write_meta_data(asset_db_writer,asset_db_path,meta_data):
     asset_db_writer.write(equities=meta_data)
     
 def _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
-                           cal_sessions,bizdays, meta_path):
-    try:
-        os.remove(adjustment_db_path)
-    except:
-        pass
-    
-    adjustment_writer = SQLiteAdjustmentWriter(adjustment_db_path,
-                                               BcolzDailyBarReader(daily_bar_path),
-                                               cal_sessions,
-                                               overwrite=True)
-    
-    meta_dict = dict(zip(meta_data['symbol'].tolist(),range(len(meta_data))))
+                           cal_sessions,bizdays, meta_path, since=None):
+    meta_dict = dict(zip(meta_data['symbol'].tolist(),meta_data.index))
     
     splits = pd.read_csv(join(meta_path,"splits.csv"),parse_dates=[0])
     splits['effective_date'] = pd.to_datetime(splits['effective_date'])
@@ -272,49 +296,99 @@ def _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
     dividends =dividends.drop(['symbol'],axis=1)
     dividends = dividends[dividends['sid'] != -1]
     
+    if since is not None:
+        upsert_adjustments(adjustment_db_path,
+                           BcolzDailyBarReader(daily_bar_path),
+                           cal_sessions,
+                           since,
+                           splits=splits,
+                           dividends=dividends)
+        return
+
+    try:
+        os.remove(adjustment_db_path)
+    except:
+        pass
+
+    adjustment_writer = SQLiteAdjustmentWriter(adjustment_db_path,
+                                               BcolzDailyBarReader(daily_bar_path),
+                                               cal_sessions,
+                                               overwrite=True)
     adjustment_writer.write(splits=splits,
                             dividends=dividends)
 
 
 
-def _pricing_iter(csvdir, symbols, meta_data, bizdays, show_progress):
+def _pricing_iter(csvdir, symbols, meta_data, bizdays, show_progress,
+                  pool=None, sids=None, since=None, previous=()):
+    """
+    Yield (sid, frame) for each symbol with data. The csv files are read
+    and cleaned in `pool` (in parallel for a process pool), and the frames
+    come back in symbol order so that sids are assigned as before, unless
+    `sids` maps the symbols to the sids to use. The frames of the symbols
+    in `previous` only hold the sessions after `since`.
+    """
+    if pool is None:
+        pool = SequentialPool()
+
+    new_bizdays = bizdays
+    if since is not None:
+        new_bizdays = [dt for dt in bizdays if dt > since]
+
     with maybe_show_progress(symbols, show_progress,
                              label='Loading custom pricing data: ') as it:
         files = os.listdir(csvdir)
+
+        def load_args():
+            for symbol in it:
+                try:
+                    fname = [fname for fname in files
+                             if '%s.csv' % symbol in fname][0]
+                except IndexError:
+                    raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
+                start_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'start_date'])
+                end_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'end_date'])
+                if symbol in previous:
+                    after, days = since, new_bizdays
+                else:
+                    after, days = None, bizdays
+                yield (symbol, os.path.join(csvdir, fname), start_date,
+                       end_date, days, after)
+
         sid = -1
-        for sid_count, symbol in enumerate(it):
-            logger.debug('%s: sid %s' % (symbol, sid_count))
-
-            try:
-                fname = [fname for fname in files
-                         if '%s.csv' % symbol in fname][0]
-            except IndexError:
-                raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
-
-            dfr = read_csv(os.path.join(csvdir, fname),
-                           parse_dates=[0],
-                           infer_datetime_format=True,
-                           index_col=0).sort_index()
-            
-            if len(dfr) == 0:
-                print('removing {} as we have no data rows'.format(symbol))
-                meta_data.loc[meta_data.symbol==symbol,'symbol'] = np.nan
-                continue
-            
-            dfr['adj_ratio'] = dfr['close']/dfr['closeunadj']
-            dfr = pd.concat( [dfr[['open','high','low','close']].div(dfr['adj_ratio'],axis=0),dfr[['volume']]],axis=1)
-            #dfr = get_ohlcv(dfr)
-            start_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'start_date'])
-            end_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'end_date'])
-            dfr = ensure_all_days(dfr,start_date,end_date, bizdays)
-            if len(dfr) == 0:
+        for symbol, dfr in ordered_imap(_load_symbol, load_args(), pool):
+            if dfr is None:
                 print('removing {} as we have no data rows'.format(symbol))
                 meta_data.loc[meta_data.symbol==symbol,'symbol'] = np.nan
                 continue
-            
-            sid = sid  + 1
+
+            sid = sid  + 1 if sids is None else sids[symbol]
+            logger.debug('%s: sid %s' % (symbol, sid))
             yield sid, dfr
 
+def _load_symbol(args):
+    """
+    Read and clean the csv of one symbol. Runs in the ingest pool workers.
+    Returns (symbol, frame), the frame is None if there is no data. Only
+    the sessions after `after` are kept, if given.
+    """
+    symbol, path, start_date, end_date, bizdays, after = args
+    dfr = read_csv(path,
+                   parse_dates=[0],
+                   infer_datetime_format=True,
+                   index_col=0).sort_index()
+    if after is not None:
+        dfr = dfr[dfr.index > after].copy()
+    if len(dfr) == 0:
+        return symbol, None
+    dfr['adj_ratio'] = dfr['close']/dfr['closeunadj']
+    dfr = pd.concat( [dfr[['open','high','low','close']].div(dfr['adj_ratio'],axis=0),dfr[['volume']]],axis=1)
+    #dfr = get_ohlcv(dfr)
+    dfr = ensure_all_days(dfr,start_date,end_date, bizdays)
+    if len(dfr) == 0:
+        return symbol, None
+    return symbol, dfr
+
 def ensure_all_days(dfr, start_date, end_date, bizdays):
     start_date = start_date.iloc[0]
     end_date = end_date.iloc[0]
@@ -13,17 +13,21 @@ from pandas import read_csv, Timedelta
 
 from zipline.utils.calendars import deregister_calendar, get_calendar, register_calendar
 from zipline.utils.cli import maybe_show_progress
+from zipline.utils.pool import SequentialPool
 from zipline.utils.calendars import ExchangeCalendarFromDate
 from zipline.assets import AssetDBWriter
 from zipline.data.minute_bars import BcolzMinuteBarWriter
 from zipline.data.us_equity_pricing import BcolzDailyBarWriter, SQLiteAdjustmentWriter, BcolzDailyBarReader
+from zipline.data.bundles.ingest_utilities import ingest_pool, ordered_imap
+from zipline.data.bundles.incremental import (append_daily_bars, assign_sids,
+    last_daily_session, previous_sids, upsert_adjustments, upsert_equities)
 from . import core as bundles
 
 handler = StreamHandler(sys.stdout, format_string=" | {record.message}")
 logger = Logger(__name__)
 logger.handlers.append(handler)
 
-def xnse_equities(configpath=None):
+def xnse_equities(configpath=None, bars=None):
     """
     Generate an ingest function for custom data bundle
     This function can be used in ~/.zipline/extension.py
@@ -48,6 +52,14 @@ def xnse_equities(configpath=None):
     ingest : callable
         The bundle ingest function
 
+    Notes
+    -----
+    `bars` optionally maps symbols to their daily bars, as returned by
+    `ingest_utilities.split_frames`. These are written directly, the csv
+    files are only read for the other symbols. Without `bars`, e.g. when
+    registered in extension.py, every symbol is read from its csv file,
+    which the ingest loop only writes with KEEP_CSVS set in its config.
+
     Examples
     --------
     This code should be added to ~/.zipline/extension.py
@@ -58,7 +70,7 @@ def xnse_equities(configpath=None):
                 '/full/path/to/the/csvdir/directory'))
     """
 
-    return CSVDIRBundleXNSE(configpath).ingest
+    return CSVDIRBundleXNSE(configpath, bars).ingest
 
 
 class CSVDIRBundleXNSE:
@@ -84,9 +96,12 @@ class CSVDIRBundleXNSE:
             self.cal_session_start=config["SESSION_START"]
             self.cal_session_end=config["SESSION_END"]
             self.cal_minutes_per_day=config["MINUTES_PER_DAY"]
+            self.ingest_processes=config.get("INGEST_PROCESSES",1)
+            self.incremental=config.get("INCREMENTAL",False)
 
-    def __init__(self, configpath=None):
+    def __init__(self, configpath=None, bars=None):
         self._read_config(configpath)
+        self.bars = bars
         self.bizdays = self._read_bizdays(join(self.meta_path,self.bizdays_file))
         self.calendar = self._create_calendar(
                 self.calendar_name,
@@ -177,7 +192,10 @@ class CSVDIRBundleXNSE:
                       self.syms,
                       self.bizdays,
                       self.cal_minutes_per_day,
-                      self.benchmar_symbol)
+                      self.benchmar_symbol,
+                      self.ingest_processes,
+                      self.incremental,
+                      self.bars)
 
 
 @bundles.register("XNSE", create_writers=False)
@@ -202,7 +220,10 @@ def xnse_bundle(environ,
                   syms = None,
                   bizdays = None,
                   minutes_per_day = None,
-                  benchmark_symbol = None):
+                  benchmark_symbol = None,
+                  processes = 1,
+                  incremental = False,
+                  bars = None):
     """
     Build a zipline data bundle from the directory with csv files.
     """
@@ -225,17 +246,41 @@ def xnse_bundle(environ,
                                              end_session)
     asset_db_writer = AssetDBWriter(asset_db_path)
 
-    daily_bar_writer.write(_pricing_iter(csvdir, syms, meta_data, bizdays,
-                show_progress),show_progress=show_progress)
-
-    meta_data = meta_data.dropna()
-    meta_data = meta_data.reset_index(drop=True)
-    
-    _write_meta_data(asset_db_writer,asset_db_path,meta_data)
+    since = None
+    if incremental and os.path.isdir(daily_bar_path) and isfile(asset_db_path):
+        since = last_daily_session(daily_bar_path)
+
+    if since is not None:
+        # append the new sessions to the existing bars, keeping the sids
+        # of the symbols already in the bundle.
+        previous = previous_sids(asset_db_path)
+        sids = assign_sids(meta_data['symbol'].dropna(), previous)
+        meta_data.index = [sids.get(s, -1) for s in meta_data['symbol']]
+        with ingest_pool(processes) as pool:
+            append_daily_bars(daily_bar_path, calendar, end_session,
+                              _pricing_iter(csvdir, syms, meta_data, bizdays,
+                                            show_progress, pool, sids, bars,
+                                            since=since.tz_localize(None),
+                                            previous=previous),
+                              show_progress=show_progress)
+        meta_data = meta_data.dropna().sort_index()
+    else:
+        with ingest_pool(processes) as pool:
+            daily_bar_writer.write(_pricing_iter(csvdir, syms, meta_data, bizdays,
+                        show_progress, pool, bars=bars),show_progress=show_progress)
+
+        meta_data = meta_data.dropna()
+        meta_data = meta_data.reset_index(drop=True)
+
+    _write_meta_data(asset_db_writer,asset_db_path,meta_data,since)
     _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
-                           calendar.all_sessions, bizdays, meta_path)
+                           calendar.all_sessions, bizdays, meta_path, since)
+
+def _write_meta_data(asset_db_writer,asset_db_path,meta_data,since=None):
+    if since is not None:
+        upsert_equities(asset_db_path, meta_data)
+        return
 
-def _write_meta_data(asset_db_writer,asset_db_path,meta_data):
     try:
         os.remove(asset_db_path)
     except:
@@ -244,18 +289,8 @@ def _write_meta_data(asset_db_writer,asset_db_path,meta_data):
     asset_db_writer.write(equities=meta_data)
 
 def _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
-                           cal_sessions,bizdays, meta_path):
-    try:
-        os.remove(adjustment_db_path)
-    except:
-        pass
-
-    adjustment_writer = SQLiteAdjustmentWriter(adjustment_db_path,
-                                               BcolzDailyBarReader(daily_bar_path),
-                                               cal_sessions,
-                                               overwrite=True)
-
-    meta_dict = dict(zip(meta_data['symbol'].tolist(),range(len(meta_data))))
+                           cal_sessions,bizdays, meta_path, since=None):
+    meta_dict = dict(zip(meta_data['symbol'].tolist(),meta_data.index))
 
     mergers = pd.read_csv(join(meta_path,"mergers.csv"),parse_dates=[0])
     mergers['effective_date'] = pd.to_datetime(mergers['effective_date'])
@@ -278,45 +313,107 @@ def _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
     dividends =dividends.drop(['symbol'],axis=1)
     dividends = dividends[dividends['sid'] != -1]
 
+    if since is not None:
+        upsert_adjustments(adjustment_db_path,
+                           BcolzDailyBarReader(daily_bar_path),
+                           cal_sessions,
+                           since,
+                           splits=splits,
+                           mergers=mergers,
+                           dividends=dividends)
+        return
+
+    try:
+        os.remove(adjustment_db_path)
+    except:
+        pass
+
+    adjustment_writer = SQLiteAdjustmentWriter(adjustment_db_path,
+                                               BcolzDailyBarReader(daily_bar_path),
+                                               cal_sessions,
+                                               overwrite=True)
     adjustment_writer.write(splits=splits,
                             mergers=mergers,
                             dividends=dividends)
 
 
 
-def _pricing_iter(csvdir, symbols, meta_data, bizdays, show_progress):
+def _pricing_iter(csvdir, symbols, meta_data, bizdays, show_progress,
+                  pool=None, sids=None, bars=None, since=None, previous=()):
+    """
+    Yield (sid, frame) for each symbol with data. The csv files are read
+    and cleaned in `pool` (in parallel for a process pool), and the frames
+    come back in symbol order so that sids are assigned as before, unless
+    `sids` maps the symbols to the sids to use. Symbols in `bars` are taken
+    from there instead of their csv file. The frames of the symbols in
+    `previous` only hold the sessions after `since`.
+    """
+    if pool is None:
+        pool = SequentialPool()
+
+    new_bizdays = bizdays
+    if since is not None:
+        new_bizdays = [dt for dt in bizdays if dt > since]
+
     with maybe_show_progress(symbols, show_progress,
                              label='Loading custom pricing data: ') as it:
         files = os.listdir(csvdir)
+
+        def load_args():
+            for symbol in it:
+                start_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'start_date'])
+                end_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'end_date'])
+                if symbol in previous:
+                    after, days = since, new_bizdays
+                else:
+                    after, days = None, bizdays
+                if bars is not None and symbol in bars:
+                    yield (symbol, bars[symbol], start_date, end_date,
+                           days, after)
+                    continue
+                try:
+                    fname = [fname for fname in files
+                             if '%s.csv' % symbol in fname][0]
+                except IndexError:
+                    raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
+                yield (symbol, os.path.join(csvdir, fname), start_date,
+                       end_date, days, after)
+
         sid = -1
-        for sid_count, symbol in enumerate(it):
-            logger.debug('%s: sid %s' % (symbol, sid_count))
-
-            try:
-                fname = [fname for fname in files
-                         if '%s.csv' % symbol in fname][0]
-            except IndexError:
-                raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
-
-            dfr = read_csv(os.path.join(csvdir, fname),
-                           parse_dates=[0],
-                           infer_datetime_format=True,
-                           index_col=0).sort_index()
-            if len(dfr) == 0:
-                print('removing {} as we have no data rows'.format(symbol))
-                meta_data.loc[meta_data.symbol==symbol,'symbol'] = np.nan
-                continue
-            start_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'start_date'])
-            end_date = pd.to_datetime(meta_data.loc[meta_data.symbol==symbol,'end_date'])
-            dfr = ensure_all_days(dfr,start_date,end_date, bizdays)
-            if len(dfr) == 0:
+        for symbol, dfr in ordered_imap(_load_symbol, load_args(), pool):
+            if dfr is None:
                 print('removing {} as we have no data rows'.format(symbol))
                 meta_data.loc[meta_data.symbol==symbol,'symbol'] = np.nan
                 continue
-            
-            sid = sid  + 1
+
+            sid = sid  + 1 if sids is None else sids[symbol]
+            logger.debug('%s: sid %s' % (symbol, sid))
             yield sid, dfr
 
+def _load_symbol(args):
+    """
+    Read and clean the bars of one symbol, from its csv file or from the
+    frame passed in its place. Runs in the ingest pool workers. Returns
+    (symbol, frame), the frame is None if there is no data. Only the
+    sessions after `after` are kept, if given.
+    """
+    symbol, source, start_date, end_date, bizdays, after = args
+    if isinstance(source, pd.DataFrame):
+        dfr = source.sort_index()
+    else:
+        dfr = read_csv(source,
+                       parse_dates=[0],
+                       infer_datetime_format=True,
+                       index_col=0).sort_index()
+    if after is not None:
+        dfr = dfr[dfr.index > after]
+    if len(dfr) == 0:
+        return symbol, None
+    dfr = ensure_all_days(dfr,start_date,end_date, bizdays)
+    if len(dfr) == 0:
+        return symbol, None
+    return symbol, dfr
+
 def ensure_all_days(dfr, start_date, end_date, bizdays):
     start_date = start_date.iloc[0]
     end_date = end_date.iloc[0]
@@ -16,6 +16,7 @@ from pandas import read_csv, Timedelta
 
 from zipline.utils.calendars import deregister_calendar, get_calendar, register_calendar
 from zipline.utils.cli import maybe_show_progress
+from zipline.utils.pool import SequentialPool
 from zipline.utils.calendars import ExchangeCalendarFromDate
 from zipline.data.minute_bars import BcolzMinuteBarWriter, BcolzMinuteOverlappingData
 from zipline.assets import AssetDBWriter
@@ -23,6 +24,10 @@ from zipline.data.us_equity_pricing import BcolzDailyBarWriter, SQLiteAdjustment
 from zipline.assets.asset_db_schema import asset_db_table_names
 
 
+from zipline.data.bundles.ingest_utilities import ingest_pool, ordered_imap
+from zipline.data.bundles.incremental import (append_daily_bars,
+    append_minute_bars, last_daily_session, upsert_adjustments,
+    upsert_equities)
 from . import core as bundles
 
 handler = StreamHandler(sys.stdout, format_string=" | {record.message}")
@@ -91,6 +96,8 @@ class CSVDIRBundleGDFL:
             self.cal_session_start=config["SESSION_START"]
             self.cal_session_end=config["SESSION_END"]
             self.cal_minutes_per_day=config["MINUTES_PER_DAY"]
+            self.ingest_processes=config.get("INGEST_PROCESSES",1)
+            self.incremental=config.get("INCREMENTAL",False)
 
     def __init__(self, configpath=None):
         self._read_config(configpath)
@@ -194,7 +201,9 @@ class CSVDIRBundleGDFL:
                       self.bizdays,
                       self.cal_minutes_per_day,
                       self.benchmar_symbol,
-                      self.daily_path)
+                      self.daily_path,
+                      self.ingest_processes,
+                      self.incremental)
 
 
 @bundles.register("GDFL",create_writers=False)
@@ -220,7 +229,9 @@ def gdfl_bundle(environ,
                   bizdays = None,
                   minutes_per_day = None,
                   benchmark_symbol = None,
-                  save_daily_path = None):
+                  save_daily_path = None,
+                  processes = 1,
+                  incremental = False):
     """
     Build a zipline data bundle from the directory with csv files.
     """
@@ -246,21 +257,41 @@ def gdfl_bundle(environ,
     asset_db_writer = AssetDBWriter(asset_db_path)
 
 
-    try:
-        minute_bar_writer.write(_minute_data_iter(csvdir, meta_data,calendar, syms, bizdays,"NSE",save_daily_path),
-                 show_progress=show_progress)
-    except BcolzMinuteOverlappingData:
-        pass
+    since = None
+    if incremental and os.path.isdir(daily_bar_path) and isfile(asset_db_path):
+        since = last_daily_session(daily_bar_path)
+
+    if since is not None:
+        # append today's minutes, and the daily bars made from them, to the
+        # existing bars instead of reading back every daily csv file.
+        with ingest_pool(processes) as pool:
+            minute_data = list(_minute_data_iter(csvdir, meta_data,calendar, syms, bizdays,"NSE",save_daily_path,pool))
+        append_minute_bars(minute_bar_path, end_session, minute_data,
+                           show_progress=show_progress)
+        append_daily_bars(daily_bar_path, calendar, end_session,
+                          ((sid, to_daily(dfr)) for sid, dfr in minute_data),
+                          show_progress=show_progress)
+    else:
+        with ingest_pool(processes) as pool:
+            try:
+                minute_bar_writer.write(_minute_data_iter(csvdir, meta_data,calendar, syms, bizdays,"NSE",save_daily_path,pool),
+                         show_progress=show_progress)
+            except BcolzMinuteOverlappingData:
+                pass
 
-    daily_bar_writer.write(_pricing_iter(save_daily_path, meta_data['symbol'].tolist(),
-                                         show_progress),show_progress=show_progress)
+            daily_bar_writer.write(_pricing_iter(save_daily_path, meta_data['symbol'].tolist(),
+                                                 show_progress, pool),show_progress=show_progress)
 
-    _write_meta_data(asset_db_writer,asset_db_path, meta_data)
+    _write_meta_data(asset_db_writer,asset_db_path, meta_data,since)
     _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
-                           calendar.all_sessions,bizdays, meta_path)
+                           calendar.all_sessions,bizdays, meta_path, since)
+
 
+def _write_meta_data(asset_db_writer,asset_db_path,meta_data,since=None):
+    if since is not None:
+        upsert_equities(asset_db_path, meta_data)
+        return
 
-def _write_meta_data(asset_db_writer,asset_db_path,meta_data):
     try:
         os.remove(asset_db_path)
     except:
@@ -269,17 +300,7 @@ def _write_meta_data(asset_db_writer,asset_db_path,meta_data):
     asset_db_writer.write(equities=meta_data)
 
 def _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
-                           cal_sessions,bizdays, meta_path):
-    try:
-        os.remove(adjustment_db_path)
-    except:
-        pass
-
-    adjustment_writer = SQLiteAdjustmentWriter(adjustment_db_path,
-                                               BcolzDailyBarReader(daily_bar_path),
-                                               cal_sessions,
-                                               overwrite=True)
-
+                           cal_sessions,bizdays, meta_path, since=None):
     first_available_day = bizdays[0]
     last_available_day = bizdays[-1]
     meta_dict = dict(zip(meta_data['symbol'].tolist(),range(len(meta_data))))
@@ -320,33 +341,60 @@ def _write_adjustment_data(adjustment_db_path,meta_data,syms,daily_bar_path,
     dividends =dividends.drop(['symbol'],axis=1)
     dividends = dividends[dividends['sid'] != -1]
 
+    if since is not None:
+        upsert_adjustments(adjustment_db_path,
+                           BcolzDailyBarReader(daily_bar_path),
+                           cal_sessions,
+                           since,
+                           splits=splits,
+                           mergers=mergers,
+                           dividends=dividends)
+        return
+
+    try:
+        os.remove(adjustment_db_path)
+    except:
+        pass
+
+    adjustment_writer = SQLiteAdjustmentWriter(adjustment_db_path,
+                                               BcolzDailyBarReader(daily_bar_path),
+                                               cal_sessions,
+                                               overwrite=True)
     adjustment_writer.write(splits=splits,
                             mergers=mergers,
                             dividends=dividends)
 
-def _pricing_iter(csvdir, symbols, show_progress):
+def _pricing_iter(csvdir, symbols, show_progress, pool=None):
+    if pool is None:
+        pool = SequentialPool()
+
     with maybe_show_progress(symbols, show_progress,
                              label='Loading custom pricing data: ') as it:
         files = os.listdir(csvdir)
-        for sid, symbol in enumerate(it):
-            logger.debug('%s: sid %s' % (symbol, sid))
-
-            try:
-                fname = [fname for fname in files
-                         if '%s.csv' % symbol in fname][0]
-            except IndexError:
-                raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
-
-            dfr = read_csv(os.path.join(csvdir, fname),
-                           parse_dates=[0],
-                           infer_datetime_format=True,
-                           index_col=0).sort_index()
 
+        def paths():
+            for symbol in it:
+                try:
+                    fname = [fname for fname in files
+                             if '%s.csv' % symbol in fname][0]
+                except IndexError:
+                    raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
+                yield os.path.join(csvdir, fname)
+
+        for sid, dfr in enumerate(ordered_imap(_read_daily_csv, paths(), pool)):
+            logger.debug('%s: sid %s' % (symbols[sid], sid))
             yield sid, dfr
 
+def _read_daily_csv(path):
+    return read_csv(path,
+                    parse_dates=[0],
+                    infer_datetime_format=True,
+                    index_col=0).sort_index()
+
 def _minute_data_iter(data_path,meta_data,calendar, syms, bizdays,
-                      exchange,save_daily_path):
-    dateparse = lambda x: datetime.strptime(x, '%d/%m/%Y').strftime('%Y-%m-%d')
+                      exchange,save_daily_path, pool=None):
+    if pool is None:
+        pool = SequentialPool()
     files = listdir(data_path)
     symbols = [f.split('.csv')[0] for f in files if f.endswith('.csv')]
     print("total tickers {}".format(len(symbols)))
@@ -360,27 +408,15 @@ def _minute_data_iter(data_path,meta_data,calendar, syms, bizdays,
     except:
         meta_dict = {}
 
-    for s in symbols:
-        try:
-            dfr = pd.read_csv(os.path.join(data_path, s+".csv"),converters={ 'Date': dateparse })
-            dfr = fixup_minute_df(dfr, calendar)
-            dfr = dfr[~dfr.index.duplicated(keep='last')]
-            dfr = get_equal_sized_df(dfr,idx)
-            if(len(dfr)==0):
-                print("{} moves out?".format(s))
-                dfr = make_dummy_df(s,idx,save_daily_path)
-        except pd.io.common.EmptyDataError:
-            print("carrying over last day prices for {}".format(s))
-            dfr = make_dummy_df(s,idx,save_daily_path)
-
-        if len(dfr) == 0:
+    # read, clean up and save the daily bars of each symbol in the pool,
+    # the meta data and sids are updated here, in symbol order.
+    load_args = ((s, data_path, calendar.tz, idx, save_daily_path)
+                 for s in symbols)
+    for s, dfr in ordered_imap(_load_minute_csv, load_args, pool):
+        if dfr is None:
             print('failed to carry over last data for {}'.format(s))
             continue
 
-#        s = ticker_cleanup(s)
-#        if not check_sym(s,syms):
-#            continue
-
         if s in meta_dict:
             sid = meta_dict[s]
             if meta_data.loc[sid,'start_date'] > current_session.value:
@@ -392,21 +428,48 @@ def _minute_data_iter(data_path,meta_data,calendar, syms, bizdays,
             sid = len(meta_data)
             meta_data.loc[sid] = s, names_dict.get(s,s), current_session.value,current_session.value,(current_session + Timedelta(days=1)).value, exchange
 
-        save_as_daily(join(save_daily_path,s+".csv"),dfr)
         yield sid, dfr
 
 
+def _parse_date(x):
+    return datetime.strptime(x, '%d/%m/%Y').strftime('%Y-%m-%d')
+
+def _load_minute_csv(args):
+    """
+    Read the minute csv of one symbol, align it to the session minutes and
+    save the daily bar. Runs in the ingest pool workers. Returns (symbol,
+    frame), the frame is None if nothing could be carried over either.
+    """
+    s, data_path, tz, idx, save_daily_path = args
+    try:
+        dfr = pd.read_csv(os.path.join(data_path, s+".csv"),converters={ 'Date': _parse_date })
+        dfr = fixup_minute_df(dfr, tz)
+        dfr = dfr[~dfr.index.duplicated(keep='last')]
+        dfr = get_equal_sized_df(dfr,idx)
+        if(len(dfr)==0):
+            print("{} moves out?".format(s))
+            dfr = make_dummy_df(s,idx,save_daily_path)
+    except pd.io.common.EmptyDataError:
+        print("carrying over last day prices for {}".format(s))
+        dfr = make_dummy_df(s,idx,save_daily_path)
+
+    if len(dfr) == 0:
+        return s, None
+
+    save_as_daily(join(save_daily_path,s+".csv"),dfr)
+    return s, dfr
+
 def ticker_cleanup(s):
     return s
 
-def fixup_minute_df(data, calendar):
+def fixup_minute_df(data, tz):
     ticker_col = np.where(data.columns.to_series().str.lower().str.contains('ticker') == True)[0][0]
     dt_col = np.where(data.columns.to_series().str.lower().str.contains('date') == True)[0][0]
     time_col = np.where(data.columns.to_series().str.lower().str.contains('time') == True)[0][0]
     oi_col = np.where(data.columns.to_series().str.lower().str.contains('open interest') == True)[0][0]
     idx = pd.to_datetime(data.iloc[:,dt_col] + " " + data.iloc[:,time_col])
     data = data.set_index(idx)
-    data.index = data.index.tz_localize(calendar.tz)
+    data.index = data.index.tz_localize(tz)
     dropcols = [ticker_col,dt_col,time_col,oi_col]
     data = data.drop(data.columns[dropcols],axis=1)
     data = data.rename(columns={
@@ -433,13 +496,16 @@ def check_sym(s,syms):
 #    return True if s in syms else False
 
 
-def save_as_daily(strpath,df):
-    df = df.resample('1D').agg({'open': 'first',
+def to_daily(df):
+    df = df.astype(np.float64).resample('1D').agg({'open': 'first',
                'high': 'max',
                'low': 'min',
                'close': 'last',
                'volume':'sum'})
-    df = df[['open','high','low','close','volume']]
+    return df[['open','high','low','close','volume']]
+
+def save_as_daily(strpath,df):
+    df = to_daily(df)
     if not isfile(strpath):
         ddf = df
     else:
@@ -23,7 +23,7 @@ sys.path.insert(0, zp_path)
 
 from zipline.data.bundles import register
 from zipline.data.bundles.gdfl import gdfl_minutedata
-from zipline.data.bundles.ingest_utilities import clean_up, touch
+from zipline.data.bundles.ingest_utilities import clean_up, touch, TickerFrames
 
 from zipline.data import bundles as bundles_module
 
@@ -40,9 +40,7 @@ def ticker_cleanup(s):
     return s
 
 def split_csvs(dfr, strpath):
-    syms = set(dfr['Ticker'].tolist())
-    for s in syms:
-        dfs = dfr.loc[dfr['Ticker']==s]
+    for s, dfs in TickerFrames(dfr, 'Ticker').items():
         dfs.to_csv(os.path.join(strpath,s+".csv"), index=False)
 
 def get_latest_symlist(date):
@@ -0,0 +1,455 @@
+"""
+Append-only ingestion: extend the bars and adjustments of an existing
+ingestion by the new sessions, instead of rebuilding them from the whole
+history.
+
+Every function takes the path to write and, optionally, the path of the
+previous ingestion as ``src``. Without ``src`` the data is updated in
+place, through a staging copy which replaces the original only once the
+update succeeded. Files which are not modified are hard-linked into the
+output rather than copied, so the cost of an update follows the size of
+the new data and not of the history.
+"""
+import os
+import shutil
+import sqlite3
+
+import bcolz
+from bcolz import ctable
+import numpy as np
+import pandas as pd
+from six import iteritems
+
+from zipline.assets import AssetDBWriter
+from zipline.data.minute_bars import (
+    BcolzMinuteBarMetadata,
+    BcolzMinuteBarWriter,
+    _sid_subdir_path,
+)
+from zipline.data.us_equity_pricing import (
+    BcolzDailyBarWriter,
+    SQLiteAdjustmentWriter,
+    US_EQUITY_PRICING_BCOLZ_COLUMNS,
+)
+from zipline.utils.paths import ensure_directory
+
+STAGING_SUFFIX = '.incremental'
+REPLACED_SUFFIX = '.replaced'
+
+DAILY_BAR_COLUMNS = tuple(
+    c for c in US_EQUITY_PRICING_BCOLZ_COLUMNS if c != 'id'
+)
+
+EQUITY_SYMBOL_MAPPING_COLUMNS = (
+    'sid, symbol, company_symbol, share_class_symbol, start_date, end_date'
+)
+
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _staging_path(path):
+    staging = path + STAGING_SUFFIX
+    _remove(staging)
+    return staging
+
+
+def _replace(staged, path):
+    """Move ``staged`` to ``path``, replacing what is there.
+    """
+    replaced = path + REPLACED_SUFFIX
+    _remove(replaced)
+    if os.path.exists(path):
+        os.rename(path, replaced)
+    os.rename(staged, path)
+    _remove(replaced)
+
+
+def _seconds(dt):
+    return pd.Timestamp(dt).value // 10 ** 9
+
+
+def link_tree(src, dst, copy=None):
+    """Recreate the tree at ``src`` under ``dst`` with hard links.
+
+    Parameters
+    ----------
+    src : str
+        The directory to link from.
+    dst : str
+        The directory to link into, created if missing.
+    copy : callable, optional
+        Called with the path of each file relative to ``src``. The file is
+        copied instead of linked if this returns True. Files which will be
+        modified in ``dst`` must be copied, a hard link shares its content
+        with ``src``.
+
+    Notes
+    -----
+    Falls back to copying where hard links are not available, e.g. across
+    devices.
+    """
+    for root, _, files in os.walk(src):
+        reldir = os.path.relpath(root, src)
+        target = os.path.normpath(os.path.join(dst, reldir))
+        ensure_directory(target)
+        for name in files:
+            source = os.path.join(root, name)
+            dest = os.path.join(target, name)
+            if copy is not None and copy(
+                    os.path.normpath(os.path.join(reldir, name))):
+                shutil.copy2(source, dest)
+                continue
+            try:
+                os.link(source, dest)
+            except (AttributeError, OSError):
+                shutil.copy2(source, dest)
+
+
+def last_daily_session(rootdir):
+    """The last session written to the daily bars at ``rootdir``.
+
+    Returns
+    -------
+    session : pd.Timestamp or None
+        The session, or None if there is no data.
+    """
+    table = bcolz.open(rootdir, mode='r')
+    last_row = table.attrs['last_row']
+    if not last_row:
+        return None
+    days = table['day'][:]
+    return pd.Timestamp(
+        days[list(last_row.values())].max(), unit='s', tz='UTC',
+    )
+
+
+def previous_sids(asset_db_path):
+    """Map each symbol in the assets db at ``asset_db_path`` to its sid.
+    """
+    conn = sqlite3.connect(asset_db_path)
+    try:
+        return dict(conn.execute(
+            'SELECT symbol, sid FROM equity_symbol_mappings'
+        ).fetchall())
+    finally:
+        conn.close()
+
+
+def assign_sids(symbols, previous):
+    """Keep the sids of known symbols and number new ones after them.
+
+    Parameters
+    ----------
+    symbols : iterable[str]
+        The symbols to assign sids to.
+    previous : dict[str -> int]
+        The sids of the previous ingestion.
+
+    Returns
+    -------
+    sids : dict[str -> int]
+    """
+    sids = dict(previous)
+    next_sid = max(sids.values()) + 1 if sids else 0
+    for symbol in symbols:
+        if symbol not in sids:
+            sids[symbol] = next_sid
+            next_sid += 1
+    return sids
+
+
+def upsert_equities(path, equities, src=None):
+    """Add the new equities, and update the changed ones, in the assets db
+    at ``src``.
+
+    Parameters
+    ----------
+    path : str
+        The assets db to write.
+    equities : pd.DataFrame
+        The equities, indexed by sid, in the format taken by
+        ``AssetDBWriter.write``.
+    src : str, optional
+        The assets db to update. Defaults to ``path``.
+
+    Notes
+    -----
+    The rows are compared in sqlite with the ones of a db written from
+    ``equities``, only the rows which differ are written. Equities of the
+    db which are not in ``equities`` are kept, their bars still are.
+    """
+    if src is not None and os.path.abspath(src) != os.path.abspath(path):
+        shutil.copy2(src, path)
+
+    staged = _staging_path(path)
+    writer = AssetDBWriter(staged)
+    try:
+        writer.write(equities=equities)
+        writer.engine.dispose()
+
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute('ATTACH DATABASE ? AS new', (staged,))
+            with conn:
+                for table in ('futures_exchanges', 'equities', 'asset_router'):
+                    conn.execute(
+                        'INSERT OR REPLACE INTO main.{0} '
+                        'SELECT * FROM new.{0} '
+                        'EXCEPT SELECT * FROM main.{0}'.format(table)
+                    )
+                changed = [(sid,) for sid, in conn.execute(
+                    'SELECT DISTINCT sid FROM ('
+                    'SELECT {0} FROM new.equity_symbol_mappings '
+                    'EXCEPT SELECT {0} FROM main.equity_symbol_mappings'
+                    ')'.format(EQUITY_SYMBOL_MAPPING_COLUMNS)
+                ).fetchall()]
+                conn.executemany(
+                    'DELETE FROM main.equity_symbol_mappings WHERE sid = ?',
+                    changed,
+                )
+                conn.executemany(
+                    'INSERT INTO main.equity_symbol_mappings ({0}) '
+                    'SELECT {0} FROM new.equity_symbol_mappings '
+                    'WHERE sid = ?'.format(EQUITY_SYMBOL_MAPPING_COLUMNS),
+                    changed,
+                )
+            conn.execute('DETACH DATABASE new')
+        finally:
+            conn.close()
+    finally:
+        writer.engine.dispose()
+        _remove(staged)
+
+
+def append_daily_bars(rootdir,
+                      calendar,
+                      end_session,
+                      data,
+                      src=None,
+                      show_progress=False,
+                      invalid_data_behavior='warn'):
+    """Append new sessions to the daily bars at ``src``.
+
+    Parameters
+    ----------
+    rootdir : str
+        The daily bars to write.
+    calendar : TradingCalendar
+        The calendar of the bars.
+    end_session : pd.Timestamp
+        The new last session.
+    data : iterable[(int, pd.DataFrame)]
+        The new bars of each sid, in the format taken by
+        ``BcolzDailyBarWriter.write``. Rows up to the last session already
+        written for a sid are ignored, so a sid not seen before can pass
+        its whole history.
+    src : str, optional
+        The daily bars to append to. Defaults to ``rootdir``.
+    show_progress : bool, optional
+        Whether or not to show a progress bar while writing.
+    invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+        What to do when data is outside the range of a uint32.
+
+    Notes
+    -----
+    The rows of a sid are contiguous in the table, so it is rewritten. The
+    stored rows are copied one sid at a time from their integer columns,
+    without going back to the source files, and only the new rows of
+    ``data`` are converted.
+    """
+    in_place = src is None or os.path.abspath(src) == \
+        os.path.abspath(rootdir)
+    table = bcolz.open(rootdir if src is None else src, mode='r')
+    start_session = pd.Timestamp(table.attrs['start_session_ns'], tz='UTC')
+    first_row = table.attrs['first_row']
+    last_row = table.attrs['last_row']
+    days = table.cols['day']
+    last_day = {int(key): days[row] for key, row in iteritems(last_row)}
+
+    out = _staging_path(rootdir) if in_place else rootdir
+    writer = BcolzDailyBarWriter(out, calendar, start_session, end_session)
+    new = {}
+    for sid, df in data:
+        rows = _daily_rows_after(writer,
+                                 df,
+                                 last_day.get(sid),
+                                 invalid_data_behavior)
+        if rows is not None:
+            new[sid] = rows
+
+    def tables():
+        for sid in sorted(set(last_day) | set(new)):
+            key = str(sid)
+            columns = []
+            for c in DAILY_BAR_COLUMNS:
+                parts = []
+                if key in first_row:
+                    parts.append(
+                        table.cols[c][first_row[key]:last_row[key] + 1],
+                    )
+                if sid in new:
+                    parts.append(new[sid][c])
+                columns.append(np.concatenate(parts))
+            yield sid, ctable(columns=columns, names=list(DAILY_BAR_COLUMNS))
+
+    result = writer.write(tables(), show_progress=show_progress)
+    if in_place:
+        _replace(out, rootdir)
+    return result
+
+
+def _daily_rows_after(writer, df, after, invalid_data_behavior):
+    """The rows of ``df`` after the day ``after`` (in seconds), converted to
+    the stored columns, or None if there are none.
+    """
+    if after is not None and not isinstance(df, ctable):
+        days = df.index.values.astype('datetime64[s]').astype(np.int64)
+        df = df[days > after].copy()
+    if not len(df):
+        return None
+    rows = writer.to_ctable(df, invalid_data_behavior)[:]
+    if after is not None:
+        rows = rows[rows['day'] > after]
+    return rows if len(rows) else None
+
+
+def append_minute_bars(rootdir,
+                       end_session,
+                       data,
+                       src=None,
+                       show_progress=False,
+                       invalid_data_behavior='warn'):
+    """Append new sessions to the minute bars at ``src``.
+
+    Parameters
+    ----------
+    rootdir : str
+        The minute bars to write.
+    end_session : pd.Timestamp
+        The new last session.
+    data : iterable[(int, pd.DataFrame)]
+        The new bars of each sid, in the format taken by
+        ``BcolzMinuteBarWriter.write``. Minutes up to the close of the last
+        session already written for a sid are ignored.
+    src : str, optional
+        The minute bars to append to. Defaults to ``rootdir``.
+    show_progress : bool, optional
+        Whether or not to show a progress bar while writing.
+    invalid_data_behavior : {'warn', 'raise', 'ignore'}, optional
+        What to do when data is outside the range of a uint32.
+
+    Notes
+    -----
+    Only the tables of the sids in ``data`` and the metadata are copied,
+    the tables of every other sid are hard-linked.
+    """
+    data = list(data)
+    in_place = src is None or os.path.abspath(src) == \
+        os.path.abspath(rootdir)
+    if src is None:
+        src = rootdir
+    out = _staging_path(rootdir) if in_place else rootdir
+
+    metadata = BcolzMinuteBarMetadata.read(src)
+    metadata_name = os.path.relpath(
+        BcolzMinuteBarMetadata.metadata_path(src), src,
+    )
+    written = {_sid_subdir_path(sid) for sid, _ in data}
+
+    def copy(relpath):
+        return (relpath == metadata_name or
+                os.path.join(*relpath.split(os.sep)[:3]) in written)
+
+    link_tree(src, out, copy=copy)
+
+    writer = BcolzMinuteBarWriter.open(out, end_session)
+    calendar = metadata.calendar
+
+    def new_minutes():
+        for sid, df in data:
+            last = writer.last_date_in_output_for_sid(sid)
+            if not pd.isnull(last):
+                df = df[df.index > calendar.session_close(last)]
+            if len(df):
+                yield sid, df
+
+    writer.write(new_minutes(),
+                 show_progress=show_progress,
+                 invalid_data_behavior=invalid_data_behavior)
+    if in_place:
+        _replace(out, rootdir)
+
+
+def _after(frame, column, since):
+    if frame is None:
+        return None
+    dts = frame[column].values.astype('datetime64[s]').astype(np.int64)
+    return frame[dts > since]
+
+
+def upsert_adjustments(path,
+                       equity_daily_bar_reader,
+                       sessions,
+                       since,
+                       splits=None,
+                       mergers=None,
+                       dividends=None,
+                       stock_dividends=None,
+                       src=None):
+    """Replace the adjustments after ``since`` in the db at ``src``.
+
+    Parameters
+    ----------
+    path : str
+        The adjustments db to write.
+    equity_daily_bar_reader : BcolzDailyBarReader
+        The daily bars, including the new sessions, used to compute the
+        dividend ratios.
+    sessions : pd.DatetimeIndex
+        The sessions of the calendar.
+    since : pd.Timestamp
+        The last session of the previous ingestion. Adjustments effective
+        after it are replaced by the ones in the frames, earlier ones are
+        kept as they are.
+    splits, mergers, dividends, stock_dividends : pd.DataFrame, optional
+        The adjustments, in the format taken by
+        ``SQLiteAdjustmentWriter.write``. They may hold the whole history,
+        only rows after ``since`` are written.
+    src : str, optional
+        The adjustments db to update. Defaults to ``path``.
+    """
+    in_place = src is None or os.path.abspath(src) == os.path.abspath(path)
+    out = _staging_path(path) if in_place else path
+    shutil.copy2(path if src is None else src, out)
+
+    since = _seconds(since)
+    conn = sqlite3.connect(out)
+    with conn:
+        for table in ('splits', 'mergers', 'dividends'):
+            conn.execute(
+                'DELETE FROM %s WHERE effective_date > ?' % table, (since,),
+            )
+        for table in ('dividend_payouts', 'stock_dividend_payouts'):
+            conn.execute(
+                'DELETE FROM %s WHERE ex_date > ?' % table, (since,),
+            )
+
+    with SQLiteAdjustmentWriter(conn,
+                                equity_daily_bar_reader,
+                                sessions) as writer:
+        writer.write_frame('splits', _after(splits, 'effective_date', since))
+        writer.write_frame('mergers',
+                           _after(mergers, 'effective_date', since))
+        writer.write_dividend_data(
+            _after(dividends, 'ex_date', since),
+            _after(stock_dividends, 'ex_date', since),
+        )
+        writer.conn.commit()
+
+    if in_place:
+        _replace(out, path)
@@ -13,6 +13,11 @@ import requests
 from bs4 import BeautifulSoup
 import bisect
 import numpy as np
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+from zipline.utils.pool import SequentialPool
 
 def touch(fname, fpath, times=None):
     with open(os.path.join(fpath,fname), 'a'):
@@ -52,34 +57,107 @@ def get_ohlcv(dfr, ticker=None):
         dfr = dfr[ticker]
     return dfr.loc[:,['open','high','low','close','volume']]
 
-def split_csvs(dfr, strpath, maps=None, OHLCV=True):
-    cols = list(dfr.columns.values)
-    #cols.remove('ticker')
-    syms = set(dfr['ticker'].tolist())
-    for s in syms:
-        dfs = dfr.loc[dfr['ticker']==s,cols].set_index('date')
-        dfs.index = pd.to_datetime(dfs.index)
-        if maps is not None:
-            start_date = pd.to_datetime(maps.loc[maps.symbol==s,'start_date'].tolist())[-1]
-            end_date = pd.to_datetime(maps.loc[maps.symbol==s,'end_date'].tolist())[-1]
-            dfs = dfs[start_date:end_date]
-        if OHLCV:
-            dfs = get_ohlcv(dfs)
+class TickerFrames(object):
+    """
+    The rows of a bulk frame grouped by ticker. The frame is sorted once by
+    ticker, with a stable sort so that rows keep their order within a
+    ticker, and each ticker is a slice of the sorted frame. This replaces
+    a boolean mask over the whole frame for every ticker.
+    """
+    def __init__(self, dfr, ticker_col='ticker'):
+        codes, tickers = pd.factorize(dfr[ticker_col])
+        valid = codes >= 0
+        dfr, codes = dfr[valid], codes[valid]
+        order = np.argsort(codes, kind='mergesort')
+        counts = np.bincount(codes, minlength=len(tickers))
+        ends = np.cumsum(counts)
+        self._dfr = dfr.iloc[order]
+        self._slices = dict(zip(list(tickers), zip(ends - counts, ends)))
+        self.tickers = list(tickers)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __iter__(self):
+        return iter(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._slices
+
+    def __getitem__(self, ticker):
+        start, end = self._slices[ticker]
+        return self._dfr.iloc[start:end]
+
+    def items(self):
+        for ticker in self.tickers:
+            yield ticker, self[ticker]
+
+def _ticker_frame(dfs, s, maps=None, OHLCV=True):
+    dfs = dfs.set_index('date')
+    dfs.index = pd.to_datetime(dfs.index)
+    if maps is not None:
+        start_date = pd.to_datetime(maps.loc[maps.symbol==s,'start_date'].tolist())[-1]
+        end_date = pd.to_datetime(maps.loc[maps.symbol==s,'end_date'].tolist())[-1]
+        dfs = dfs[start_date:end_date]
+    if OHLCV:
+        dfs = get_ohlcv(dfs)
+    return dfs
+
+def split_frames(dfr, maps=None, OHLCV=True):
+    """
+    The in-memory equivalent of `split_csvs`, to feed the bar writers
+    without going through a csv file per ticker.
+    """
+    return {s: _ticker_frame(dfs, s, maps, OHLCV)
+            for s, dfs in TickerFrames(dfr).items()}
+
+def write_csvs(frames, strpath):
+    """
+    Write the frames returned by `split_frames` to a csv per ticker, as
+    `split_csvs` does.
+    """
+    for s, dfs in frames.items():
+        dfs.to_csv(os.path.join(strpath,s+".csv"))
 
+def split_csvs(dfr, strpath, maps=None, OHLCV=True):
+    for s, dfs in TickerFrames(dfr).items():
+        dfs = _ticker_frame(dfs, s, maps, OHLCV)
         dfs.to_csv(os.path.join(strpath,s+".csv"))
 
 def update_csvs(dfr,strpath, OHLCV=True):
     items = os.listdir(strpath)
     syms = [f.split(".csv")[0] for f in items if f.endswith(".csv")]
+    frames = TickerFrames(dfr)
+    # only the tickers with new rows need to be rewritten
     for s in syms:
+        if s not in frames:
+            continue
         dfs_o = pd.read_csv(os.path.join(strpath,s+".csv"),parse_dates=[0],index_col=0).sort_index()
-        dfs_n = dfr.loc[dfr['ticker']==s].set_index('date')
+        dfs_n = frames[s].set_index('date')
         if OHLCV:
             dfs_n = get_ohlcv(dfs_n)
         dfs = pd.concat([dfs_o,dfs_n])
         dfs.to_csv(os.path.join(strpath,s+".csv"))
 
-def read_big_csv(strpath,tickers, pattern="", header = 0, ticker_col=0):
+def read_bulk_csv(path, tickers=None, ticker_col=0, chunksize=500000,
+                  **kwargs):
+    """
+    Read a bulk vendor file in chunks, keeping only the rows of `tickers`.
+    Keyword arguments go to `pd.read_csv`, pass `names`, `dtype` and
+    `parse_dates` to type the columns while parsing.
+    """
+    reader = pd.read_csv(path, iterator=True, chunksize=chunksize, **kwargs)
+    chunks = []
+    for chunk in reader:
+        if tickers is not None:
+            col = (chunk.iloc[:,ticker_col] if isinstance(ticker_col, int)
+                   else chunk[ticker_col])
+            chunk = chunk[col.isin(tickers)]
+        chunks.append(chunk)
+    return pd.concat(chunks, ignore_index=True)
+
+def read_big_csv(strpath,tickers, pattern="", header = 0, ticker_col=0,
+                 **kwargs):
     items = os.listdir(strpath)
     files = [f for f in items if f.endswith(".csv") and pattern in f]
 
@@ -88,13 +166,50 @@ def read_big_csv(strpath,tickers, pattern="", header = 0, ticker_col=0):
 
     datafile = files[idx]
     print("reading {}".format(datafile))
-    reader = pd.read_csv(os.path.join(strpath,datafile), header=header, iterator=True, chunksize=1000)
-    dfr = pd.concat([chunk[chunk.iloc[:,ticker_col].isin(tickers)] for chunk in reader])
+    dfr = read_bulk_csv(os.path.join(strpath,datafile), tickers,
+                        ticker_col, header=header, **kwargs)
 
     print("read total {} rows".format(len(dfr)))
 
     return dfr
 
+@contextmanager
+def ingest_pool(processes=1):
+    """
+    A process pool for parallel ingestion, or a SequentialPool if only one
+    process is asked for.
+    """
+    if not processes or processes <= 1:
+        yield SequentialPool()
+        return
+
+    pool = Pool(processes)
+    try:
+        yield pool
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+def ordered_imap(f, iterable, pool, max_in_flight=None):
+    """
+    Lazily apply `f` to each element of `iterable` in `pool` and yield the
+    results in input order. At most `max_in_flight` calls are pending at
+    any time, which bounds the memory held by results that are ready but
+    not yet consumed (e.g. frames waiting for the bcolz writer).
+    """
+    if max_in_flight is None:
+        max_in_flight = 2*getattr(pool, '_processes', 1)
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.apply_async(f, (item,)))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
 def download_spx_changes(wiki_url):
     req = requests.get(wiki_url)
     soup = BeautifulSoup(req.content, 'lxml')
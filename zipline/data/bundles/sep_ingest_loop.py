@@ -57,6 +57,7 @@ class IngestLoop:
             self.benchmark_file=config["BENCHMARKDATA"]
             self.bundle_name=config["BUNDLE_NAME"]
             self.bundle_path=config["BUNDLE_PATH"]
+            self.incremental=config.get("INCREMENTAL",False)
 
     def ensure_codes(self, date):
         if not os.path.isfile(os.path.join(self.meta_path,self.code_file)):
@@ -299,8 +300,9 @@ class IngestLoop:
                  create_writers=False)
 
     def call_ingest(self):
-        clean_up(os.path.join(self.bundle_path,"minute"))
-        clean_up(os.path.join(self.bundle_path,"daily"))
+        if not self.incremental:
+            clean_up(os.path.join(self.bundle_path,"minute"))
+            clean_up(os.path.join(self.bundle_path,"daily"))
         print("calling ingest function")
         self.register_bundle()
         bundles_module.ingest(self.bundle_name,os.environ,pd.Timestamp.utcnow())
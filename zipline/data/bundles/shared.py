@@ -0,0 +1,198 @@
+"""
+Bundles materialized once per host in shared memory.
+
+``share_bundle`` writes the daily bars of an ingestion as memory-mapped
+columns, and copies its assets and adjustments dbs, into a directory of a
+memory backed filesystem (``/dev/shm`` where there is one). The minute bars
+can be converted to the memory-mapped format as well. ``attach_bundle``
+returns readers over that directory. Every process attached to it maps the
+same pages, so the data is in memory once per host instead of once per
+backtest.
+"""
+from hashlib import md5
+import json
+import os
+import shutil
+import tempfile
+
+from zipline.assets import AssetFinder, ASSET_DB_VERSION
+from zipline.data.minute_bars import BcolzMinuteBarReader
+from zipline.data.mmap_daily_bars import (
+    MmapDailyBarReader,
+    convert_bcolz_daily_bars,
+)
+from zipline.data.mmap_minute_bars import (
+    MmapMinuteBarReader,
+    convert_bcolz_minute_bars,
+)
+from zipline.data.us_equity_pricing import SQLiteAdjustmentReader
+from .core import BundleData
+
+MANIFEST_FILENAME = 'shared.json'
+
+DAILY_DIRNAMES = ('daily_equities.bcolz', 'daily')
+MINUTE_DIRNAMES = ('minute_equities.bcolz', 'minute')
+ASSET_DB_FILENAME = 'assets-%d.sqlite' % ASSET_DB_VERSION
+ADJUSTMENT_DB_FILENAME = 'adjustments.sqlite'
+
+
+def default_shared_root():
+    """The directory under which bundles are shared by default.
+    """
+    if os.path.isdir('/dev/shm'):
+        return os.path.join('/dev/shm', 'zipline')
+    return os.path.join(tempfile.gettempdir(), 'zipline-shared')
+
+
+def _find(path, names):
+    for name in names:
+        candidate = os.path.join(path, name)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def shared_bundle_path(path, root=None):
+    """The directory ``share_bundle`` uses for the ingestion at ``path``.
+
+    The name depends on the modification time of the daily bars, so a new
+    ingestion in place gets a new directory.
+    """
+    if root is None:
+        root = default_shared_root()
+    path = os.path.abspath(path)
+    daily = _find(path, DAILY_DIRNAMES)
+    key = '{0}:{1}'.format(
+        path,
+        os.path.getmtime(daily) if daily is not None else 0,
+    )
+    return os.path.join(
+        root,
+        '{0}-{1}'.format(
+            os.path.basename(path),
+            md5(key.encode('utf-8')).hexdigest()[:12],
+        ),
+    )
+
+
+def share_bundle(path, root=None, minute=False, show_progress=False):
+    """Materialize the ingestion at ``path`` in shared memory.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the ingestion, as passed to ``load``.
+    root : str, optional
+        The directory to share bundles under. Defaults to
+        ``default_shared_root()``.
+    minute : bool, optional
+        Whether to convert the minute bars to the memory-mapped format.
+        Otherwise attached processes read the bcolz minute bars at
+        ``path``.
+    show_progress : bool, optional
+        Whether or not to show a progress bar while converting.
+
+    Returns
+    -------
+    shared_path : str
+        The directory to pass to ``attach_bundle``. If the ingestion is
+        already shared, it is not written again.
+    """
+    path = os.path.abspath(path)
+    shared_path = shared_bundle_path(path, root)
+    if os.path.exists(os.path.join(shared_path, MANIFEST_FILENAME)):
+        return shared_path
+
+    daily = _find(path, DAILY_DIRNAMES)
+    if daily is None:
+        raise ValueError('no daily bars in {0}'.format(path))
+    minute_path = _find(path, MINUTE_DIRNAMES)
+
+    staging = '{0}.{1}.tmp'.format(shared_path, os.getpid())
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    os.makedirs(staging)
+    try:
+        convert_bcolz_daily_bars(daily, os.path.join(staging, 'daily'))
+        shutil.copy2(
+            os.path.join(path, ASSET_DB_FILENAME),
+            os.path.join(staging, ASSET_DB_FILENAME),
+        )
+        shutil.copy2(
+            os.path.join(path, ADJUSTMENT_DB_FILENAME),
+            os.path.join(staging, ADJUSTMENT_DB_FILENAME),
+        )
+        minute = minute and minute_path is not None
+        if minute:
+            convert_bcolz_minute_bars(
+                minute_path,
+                os.path.join(staging, 'minute'),
+                show_progress=show_progress,
+            )
+        with open(os.path.join(staging, MANIFEST_FILENAME), 'w') as fp:
+            json.dump(
+                {
+                    'source': path,
+                    'minute': minute,
+                    'minute_source': minute_path,
+                },
+                fp,
+            )
+        os.rename(staging, shared_path)
+    except OSError:
+        # another process shared the same ingestion first.
+        if not os.path.exists(os.path.join(shared_path, MANIFEST_FILENAME)):
+            raise
+    finally:
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+
+    return shared_path
+
+
+def attach_bundle(shared_path):
+    """Load the readers of a bundle shared by ``share_bundle``.
+
+    Parameters
+    ----------
+    shared_path : str
+        The directory returned by ``share_bundle``.
+
+    Returns
+    -------
+    bundle_data : BundleData
+        The raw data readers for this bundle.
+    """
+    with open(os.path.join(shared_path, MANIFEST_FILENAME)) as fp:
+        manifest = json.load(fp)
+
+    if manifest['minute']:
+        minute_reader = MmapMinuteBarReader(
+            os.path.join(shared_path, 'minute'),
+        )
+    elif manifest['minute_source'] is not None:
+        minute_reader = BcolzMinuteBarReader(manifest['minute_source'])
+    else:
+        minute_reader = None
+
+    return BundleData(
+        asset_finder=AssetFinder(
+            os.path.join(shared_path, ASSET_DB_FILENAME),
+        ),
+        equity_minute_bar_reader=minute_reader,
+        equity_daily_bar_reader=MmapDailyBarReader(
+            os.path.join(shared_path, 'daily'),
+        ),
+        adjustment_reader=SQLiteAdjustmentReader(
+            os.path.join(shared_path, ADJUSTMENT_DB_FILENAME),
+        ),
+    )
+
+
+def release_bundle(shared_path):
+    """Remove a bundle shared by ``share_bundle``.
+
+    Processes still attached keep their mappings, the memory is freed once
+    they exit.
+    """
+    shutil.rmtree(shared_path, ignore_errors=True)
@@ -24,7 +24,11 @@ sys.path.insert(0, zp_path)
 from zipline.data import bundles as bundles_module
 from zipline.data.bundles import register
 from zipline.data.bundles.XNSE import xnse_equities
-from zipline.data.bundles.ingest_utilities import read_big_csv,split_csvs,unzip_to_directory,clean_up,get_ohlcv, find_interval, upsert_pandas, update_ticker_change, if_csvs_in_dir, ensure_data_between_dates
+from zipline.data.bundles.ingest_utilities import read_big_csv,split_frames,write_csvs,unzip_to_directory,clean_up,get_ohlcv, find_interval, upsert_pandas, update_ticker_change, if_csvs_in_dir, ensure_data_between_dates
+
+XNSE_DTYPES = {'ticker':object,'open':np.float64,'high':np.float64,
+               'low':np.float64,'close':np.float64,'volume':np.float64,
+               'adj_factor':np.float64,'adj_type':np.float64}
 
 def subset_adjustment(dfr, meta_data):
     meta_data['start_date'] = pd.to_datetime(meta_data['start_date'])
@@ -118,6 +122,8 @@ class IngestLoop:
             self.quandl_table_name = config["QUANDL_TABLE_NAME"]
             self.bundle_name=config["BUNDLE_NAME"]
             self.bundle_path=config["BUNDLE_PATH"]
+            self.incremental=config.get("INCREMENTAL",False)
+            self.keep_csvs=config.get("KEEP_CSVS",False)
             self.calendar_name=config["CALENDAR_NAME"]
             self.calendar_tz=config["CALENDAR_TZ"]
             self.meta_path=config["META_PATH"]
@@ -134,6 +140,7 @@ class IngestLoop:
             self.benchmark_download_sym = config['BENCHMARK_DOWNLOAD_SYM']
             self.code_file = config["QUANDLE_TICKER_MAP"]
             self.ticker_change_file = config["TICKER_CHANGE_FILE"]
+        self.bars = None
         self.ensure_codes()
         self.ensure_data()
         self.tickers = load_quandl_tickers(os.path.join(self.meta_path,config["QUANDLE_TICKER_MAP"]))
@@ -275,12 +282,19 @@ class IngestLoop:
                                     'volume','adj_factor','adj_type']
         print("reading data from disk...")
         syms = nse_to_quandl_tickers(self.symlist['symbol'],self.tickers,strip_prefix=True)
-        dfr = read_big_csv(self.download_path, syms,"XNSE", header=None)
-        dfr.columns = colnames
+        dfr = read_big_csv(self.download_path, syms,"XNSE", header=None,
+                           names=colnames, dtype=XNSE_DTYPES,
+                           parse_dates=['date'])
         qsyms = dfr.ticker.tolist()
         dfr.ticker = quandl_to_nse_tickers(qsyms,self.tickers,add_prefix=True, add_suffix=False)
-        print("saving csvs to disk for ingestion...")
-        split_csvs(dfr,self.daily_path, maps=self.symlist)
+        # the bundle takes the bars from memory instead of parsing a csv
+        # per ticker back. Set KEEP_CSVS in the config to also write the
+        # csvs, e.g. for a standalone ingest of the bundle registered in
+        # extension.py.
+        self.bars = split_frames(dfr, maps=self.symlist)
+        if self.keep_csvs:
+            print("saving csvs to disk...")
+            write_csvs(self.bars, self.daily_path)
         dts = dfr['date']
         print("updating date lists...")
         self.create_bizdays_list(dts)
@@ -355,13 +369,14 @@ class IngestLoop:
 
     def register_bundle(self):
         dts = (self.get_bizdays()).tz_localize(self.calendar_tz)
-        register(self.bundle_name, xnse_equities(self.config_path),calendar_name=self.calendar_name,
+        register(self.bundle_name, xnse_equities(self.config_path, self.bars),calendar_name=self.calendar_name,
                  start_session=None,end_session=None,
                  create_writers=False)
 
     def call_ingest(self):
-        clean_up(os.path.join(self.bundle_path,"minute"))
-        clean_up(os.path.join(self.bundle_path,"daily"))
+        if not self.incremental:
+            clean_up(os.path.join(self.bundle_path,"minute"))
+            clean_up(os.path.join(self.bundle_path,"daily"))
         print("calling ingest function")
         self.register_bundle()
         bundles_module.ingest(self.bundle_name,os.environ,pd.Timestamp.utcnow())
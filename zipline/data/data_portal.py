@@ -529,6 +529,73 @@ class DataPortal(object):
         else:
             return list(map(get_single_asset_value, assets))
 
+    def get_spot_values(self, assets, field, dt, data_frequency):
+        """
+        Returns the spot values of ``field`` for many assets at ``dt``, as
+        ``get_spot_value`` does for each of them.
+
+        Parameters
+        ----------
+        assets : iterable of Asset or ContinuousFuture
+            The assets whose data is desired.
+        field : {'open', 'high', 'low', 'close', 'volume',
+                 'price', 'last_traded'}
+            The desired field of the assets.
+        dt : pd.Timestamp
+            The timestamp for the desired values.
+        data_frequency : str
+            The frequency of the data to query; i.e. whether the data is
+            'daily' or 'minute' bars
+
+        Returns
+        -------
+        values : np.ndarray or list
+            The spot value for each asset. OHLCV fields and prices of minute
+            data are read for all the assets at once and returned as an array,
+            other fields as the list ``get_spot_value`` returns. Only the
+            prices of the assets which did not trade at ``dt``, which are
+            forward filled, are read one asset at a time.
+        """
+        assets = list(assets)
+        batched = field in OHLCV_FIELDS or field == 'price'
+        if data_frequency != 'minute' or not batched or \
+                not all(isinstance(asset, Asset) for asset in assets):
+            return [self.get_spot_value(asset, field, dt, data_frequency)
+                    for asset in assets]
+
+        session_label = self.trading_calendar.minute_to_session_label(dt)
+        alive = np.array([
+            not (dt < asset.start_date or session_label > asset.end_date)
+            for asset in assets
+        ], dtype=bool)
+
+        if field == 'volume':
+            out = np.zeros(len(assets), dtype=int64)
+        else:
+            out = np.full(len(assets), nan)
+
+        if alive.any():
+            reader = self._get_pricing_reader('minute')
+            try:
+                out[alive] = reader.get_values(
+                    [asset for asset, a in zip(assets, alive) if a],
+                    dt,
+                    'close' if field == 'price' else field,
+                )
+            except NoDataOnDate:
+                pass
+
+            if field == 'price':
+                for i in np.flatnonzero(alive & np.isnan(out)):
+                    out[i] = self._get_minute_spot_value(
+                        assets[i],
+                        'close',
+                        dt,
+                        ffill=True,
+                    )
+
+        return out
+
     def get_adjustments(self, assets, field, dt, perspective_dt):
         """
         Returns a list of adjustments between the dt and perspective_dt for the
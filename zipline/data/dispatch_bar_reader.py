@@ -22,6 +22,7 @@ from numpy import (
 )
 from six import iteritems, with_metaclass
 
+from zipline.data.bar_reader import NoDataOnDate
 from zipline.utils.memoize import lazyval
 
 
@@ -96,6 +97,47 @@ class AssetDispatchBarReader(with_metaclass(ABCMeta)):
         r = self._readers[type(asset)]
         return r.get_value(asset, dt, field)
 
+    def get_values(self, assets, dt, field):
+        """
+        Retrieve the value of ``field`` at ``dt`` for many assets, with one
+        call to the reader of each type of asset which supports it.
+
+        Returns
+        -------
+        out : np.ndarray
+            The value for each asset, np.nan (or 0 for volume) where there
+            is none.
+        """
+        sid_groups = {}
+        out_pos = {}
+        for i, asset in enumerate(assets):
+            t = type(asset)
+            sid_groups.setdefault(t, []).append(asset)
+            out_pos.setdefault(t, []).append(i)
+
+        out = self._make_raw_array_out(field, len(assets))
+        for t, group in iteritems(sid_groups):
+            r = self._readers[t]
+            try:
+                get_values = r.get_values
+            except AttributeError:
+                values = [self._get_value_or_missing(r, asset, dt, field)
+                          for asset in group]
+            else:
+                try:
+                    values = get_values(group, dt, field)
+                except NoDataOnDate:
+                    continue
+            out[out_pos[t]] = values
+        return out
+
+    @staticmethod
+    def _get_value_or_missing(reader, asset, dt, field):
+        try:
+            return reader.get_value(asset, dt, field)
+        except NoDataOnDate:
+            return 0 if field == 'volume' else nan
+
     def get_last_traded_dt(self, asset, dt):
         r = self._readers[type(asset)]
         return r.get_last_traded_dt(asset, dt)
@@ -21,7 +21,6 @@ from textwrap import dedent
 from lru import LRU
 import bcolz
 from bcolz import ctable
-from intervaltree import IntervalTree
 import logbook
 import numpy as np
 import pandas as pd
@@ -195,8 +194,12 @@ class BcolzMinuteBarMetadata(object):
         The last trading session in the data set.
     minutes_per_day : int
         The number of minutes per each period.
+    session_lengths : np.ndarray[int64], optional
+        The number of market minutes of each session, as of when the data
+        was written. Sessions shorter than ``minutes_per_day`` are early
+        closes.
     """
-    FORMAT_VERSION = 3
+    FORMAT_VERSION = 4
 
     METADATA_FILENAME = 'metadata.json'
 
@@ -250,6 +253,14 @@ class BcolzMinuteBarMetadata(object):
             else:
                 ohlc_ratios_per_sid = None
 
+            if version >= 4:
+                session_lengths = np.array(
+                    raw_data['session_lengths'],
+                    dtype=np.int64,
+                )
+            else:
+                session_lengths = None
+
             return cls(
                 default_ohlc_ratio,
                 ohlc_ratios_per_sid,
@@ -259,6 +270,7 @@ class BcolzMinuteBarMetadata(object):
                 minutes_per_day,
                 bm_symbol,
                 version=version,
+                session_lengths=session_lengths,
             )
 
     def __init__(
@@ -271,6 +283,7 @@ class BcolzMinuteBarMetadata(object):
         minutes_per_day,
         benchmark = None,
         version=FORMAT_VERSION,
+        session_lengths=None,
     ):
         self.calendar = calendar
         self.start_session = start_session
@@ -280,6 +293,7 @@ class BcolzMinuteBarMetadata(object):
         self.minutes_per_day = minutes_per_day
         self.bm_symbol = benchmark
         self.version = version
+        self.session_lengths = session_lengths
 
     def write(self, rootdir):
         """
@@ -309,6 +323,9 @@ class BcolzMinuteBarMetadata(object):
         end_session : datetime
             'YYYY-MM-DD' formatted representation of the last trading
             session in the data set.
+        session_lengths : list
+            List of int64 values representing the number of market minutes
+            of each session in the data set.
 
         Deprecated, but included for backwards compatibility:
 
@@ -331,6 +348,10 @@ class BcolzMinuteBarMetadata(object):
         schedule = calendar.schedule[slicer]
         market_opens = schedule.market_open
         market_closes = schedule.market_close
+        market_open_values = market_opens.values.astype('datetime64[m]').\
+            astype(np.int64)
+        market_close_values = market_closes.values.astype('datetime64[m]').\
+            astype(np.int64)
 
         metadata = {
             'version': self.version,
@@ -341,14 +362,13 @@ class BcolzMinuteBarMetadata(object):
             'benchmark_symbol': self.bm_symbol,
             'start_session': str(self.start_session.date()),
             'end_session': str(self.end_session.date()),
+            'session_lengths': (
+                market_close_values - market_open_values + 1
+            ).tolist(),
             # Write these values for backwards compatibility
             'first_trading_day': str(self.start_session.date()),
-            'market_opens': (
-                market_opens.values.astype('datetime64[m]').
-                astype(np.int64).tolist()),
-            'market_closes': (
-                market_closes.values.astype('datetime64[m]').
-                astype(np.int64).tolist()),
+            'market_opens': market_open_values.tolist(),
+            'market_closes': market_close_values.tolist(),
         }
         with open(self.metadata_path(rootdir), 'w+') as fp:
             json.dump(metadata, fp)
@@ -940,11 +960,31 @@ class BcolzMinuteBarReader(MinuteBarReader):
 
         self._minutes_per_day = metadata.minutes_per_day
 
+        # The number of market minutes of each session, as persisted when
+        # the data was written, which is how the minutes are laid out in the
+        # carrays. Older data is assumed to follow the current calendar.
+        session_lengths = metadata.session_lengths
+        if session_lengths is None or \
+                len(session_lengths) != len(self._market_open_values):
+            session_lengths = (
+                self._market_close_values - self._market_open_values + 1
+            )
+        else:
+            self._market_close_values = \
+                self._market_open_values + session_lengths - 1
+        self._session_lengths = session_lengths
+
         self._carrays = {
             field: LRU(sid_cache_size)
             for field in self.FIELDS
         }
-        
+        # The session of raw values around the last position read for each
+        # sid by ``get_values``, as (start position, values).
+        self._session_blocks = {
+            field: LRU(sid_cache_size)
+            for field in self.FIELDS
+        }
+
         self.bm_symbol = metadata.bm_symbol
         self._last_get_value_dt_position = None
         self._last_get_value_dt_value = None
@@ -984,61 +1024,25 @@ class BcolzMinuteBarReader(MinuteBarReader):
         # fallback to the default.
         return self._default_ohlc_inverse
 
-    def _minutes_to_exclude(self):
-        """
-        Calculate the minutes which should be excluded when a window
-        occurs on days which had an early close, i.e. days where the close
-        based on the regular period of minutes per day and the market close
-        do not match.
-
-        Returns
-        -------
-        List of DatetimeIndex representing the minutes to exclude because
-        of early closes.
-        """
-        market_opens = self._market_opens.values.astype('datetime64[m]')
-        market_closes = self._market_closes.values.astype('datetime64[m]')
-        minutes_per_day = (market_closes - market_opens).astype(np.int64)
-        early_indices = np.where(
-            minutes_per_day != self._minutes_per_day - 1)[0]
-        early_opens = self._market_opens[early_indices]
-        early_closes = self._market_closes[early_indices]
-        minutes = [(market_open, early_close)
-                   for market_open, early_close
-                   in zip(early_opens, early_closes)]
-        return minutes
-
     @lazyval
-    def _minute_exclusion_tree(self):
+    def _exclusion_ranges(self):
         """
-        Build an interval tree keyed by the start and end of each range
-        of positions should be dropped from windows. (These are the minutes
-        between an early close and the minute which would be the close based
-        on the regular period if there were no early close.)
-        The value of each node is the same start and end position stored as
-        a tuple.
-
-        The data is stored as such in support of a fast answer to the question,
-        does a given start and end position overlap any of the exclusion spans?
+        The sorted, inclusive start and end positions of each range of
+        positions which should be dropped from windows. (These are the
+        minutes between an early close and the minute which would be the
+        close based on the regular period if there were no early close.)
 
         Returns
         -------
-        IntervalTree containing nodes which represent the minutes to exclude
-        because of early closes.
+        (starts, ends) : (np.ndarray[int64], np.ndarray[int64])
+            The positions of the ranges of minutes to exclude because of
+            early closes.
         """
-        itree = IntervalTree()
-        for market_open, early_close in self._minutes_to_exclude():
-            start_pos = self._find_position_of_minute(early_close) + 1
-            end_pos = (
-                self._find_position_of_minute(market_open)
-                +
-                self._minutes_per_day
-                -
-                1
-            )
-            data = (start_pos, end_pos)
-            itree[start_pos:end_pos + 1] = data
-        return itree
+        early = np.flatnonzero(self._session_lengths != self._minutes_per_day)
+        session_starts = early * self._minutes_per_day
+        starts = session_starts + self._session_lengths[early]
+        ends = session_starts + self._minutes_per_day - 1
+        return starts, ends
 
     def _exclusion_indices_for_range(self, start_idx, end_idx):
         """
@@ -1047,15 +1051,15 @@ class BcolzMinuteBarReader(MinuteBarReader):
         List of tuples of (start, stop) which represent the ranges of minutes
         which should be excluded when a market minute window is requested.
         """
-        itree = self._minute_exclusion_tree
-        if itree.overlaps(start_idx, end_idx):
-            ranges = []
-            intervals = itree[start_idx:end_idx]
-            for interval in intervals:
-                ranges.append(interval.data)
-            return sorted(ranges)
-        else:
+        starts, ends = self._exclusion_ranges
+        # the ranges ending at or after start_idx and starting before
+        # end_idx.
+        first = ends.searchsorted(start_idx, side='left')
+        last = starts.searchsorted(end_idx, side='left')
+        if first >= last:
             return None
+        return list(zip(starts[first:last].tolist(),
+                        ends[first:last].tolist()))
 
     def _get_carray_path(self, sid, field):
         sid_subdir = _sid_subdir_path(sid)
@@ -1119,16 +1123,7 @@ class BcolzMinuteBarReader(MinuteBarReader):
             Returns the integer value of the volume.
             (A volume of 0 signifies no trades for the given dt.)
         """
-        if self._last_get_value_dt_value == dt.value:
-            minute_pos = self._last_get_value_dt_position
-        else:
-            try:
-                minute_pos = self._find_position_of_minute(dt)
-            except ValueError:
-                raise NoDataOnDate()
-
-            self._last_get_value_dt_value = dt.value
-            self._last_get_value_dt_position = minute_pos
+        minute_pos = self._get_value_position(dt)
 
         try:
             value = self._open_minute_file(field, sid)[minute_pos]
@@ -1144,6 +1139,82 @@ class BcolzMinuteBarReader(MinuteBarReader):
             value *= self._ohlc_ratio_inverse_for_sid(sid)
         return value
 
+    def _get_value_position(self, dt):
+        if self._last_get_value_dt_value == dt.value:
+            return self._last_get_value_dt_position
+
+        try:
+            minute_pos = self._find_position_of_minute(dt)
+        except ValueError:
+            raise NoDataOnDate()
+
+        self._last_get_value_dt_value = dt.value
+        self._last_get_value_dt_position = minute_pos
+        return minute_pos
+
+    def _session_block(self, field, sid, minute_pos):
+        blocks = self._session_blocks[field]
+        try:
+            start, values = blocks[sid]
+        except KeyError:
+            start, values = -1, None
+
+        if not start <= minute_pos < start + self._minutes_per_day:
+            start = minute_pos - minute_pos % self._minutes_per_day
+            values = self._open_minute_file(field, sid)[
+                start:start + self._minutes_per_day
+            ]
+            blocks[sid] = start, values
+
+        return start, values
+
+    def get_values(self, sids, dt, field):
+        """
+        Retrieve the pricing info for many sids at the same dt.
+
+        Parameters
+        ----------
+        sids : iterable[int]
+            Asset identifiers.
+        dt : datetime-like
+            The datetime at which the trades occurred.
+        field : string
+            The type of pricing data to retrieve.
+            ('open', 'high', 'low', 'close', 'volume')
+
+        Returns
+        -------
+        out : np.ndarray[float64|int64]
+            The values ``get_value`` returns for each sid, i.e. np.nan for
+            OHLC, or 0 for volume, where no trade occurred.
+
+        Notes
+        -----
+        The values of each sid are read a session at a time and kept, so
+        the calls for the following minutes of the session don't touch the
+        carrays.
+        """
+        sids = [int(sid) for sid in sids]
+        minute_pos = self._get_value_position(dt)
+
+        raw = np.zeros(len(sids), dtype=np.uint32)
+        for i, sid in enumerate(sids):
+            start, values = self._session_block(field, sid, minute_pos)
+            offset = minute_pos - start
+            if offset < len(values):
+                raw[i] = values[offset]
+
+        if field == 'volume':
+            return raw.astype(np.int64)
+
+        ratios = np.array(
+            [self._ohlc_ratio_inverse_for_sid(sid) for sid in sids],
+            dtype=np.float64,
+        )
+        out = raw * ratios
+        out[raw == 0] = np.nan
+        return out
+
     def get_last_traded_dt(self, asset, dt):
         minute_pos = self._find_last_traded_position(asset, dt)
         if minute_pos == -1:
@@ -1253,9 +1324,10 @@ class BcolzMinuteBarReader(MinuteBarReader):
         indices_to_exclude = self._exclusion_indices_for_range(
             start_idx, end_idx)
         if indices_to_exclude is not None:
+            keep = np.ones(num_minutes, dtype=bool)
             for excl_start, excl_stop in indices_to_exclude:
-                length = excl_stop - excl_start + 1
-                num_minutes -= length
+                keep[excl_start - start_idx:excl_stop - start_idx + 1] = False
+            num_minutes = keep.sum()
 
         shape = num_minutes, len(sids)
 
@@ -1269,10 +1341,7 @@ class BcolzMinuteBarReader(MinuteBarReader):
                 carray = self._open_minute_file(field, sid)
                 values = carray[start_idx:end_idx + 1]
                 if indices_to_exclude is not None:
-                    for excl_start, excl_stop in indices_to_exclude[::-1]:
-                        excl_slice = np.s_[
-                            excl_start - start_idx:excl_stop - start_idx + 1]
-                        values = np.delete(values, excl_slice)
+                    values = values[keep[:len(values)]]
 
                 where = values != 0
                 # first slice down to len(where) because we might not have
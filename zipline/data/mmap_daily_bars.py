@@ -0,0 +1,142 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Uncompressed, memory-mapped daily bars.
+
+The columns of a bcolz daily bar table are stored as ``.npy`` files next to
+a json file with the table attributes. The rows are the same as in the
+bcolz table, so the attributes describing them are kept as they are.
+"""
+import json
+import os
+
+from bcolz import ctable
+import numpy as np
+
+from zipline.data.us_equity_pricing import BcolzDailyBarReader
+from zipline.utils.memoize import lazyval
+from zipline.utils.paths import ensure_directory
+
+ATTRS_FILENAME = 'attrs.json'
+PRICE_COLUMNS = frozenset(['open', 'high', 'low', 'close'])
+
+
+def _column_path(rootdir, name):
+    return os.path.join(rootdir, '{0}.npy'.format(name))
+
+
+def convert_bcolz_daily_bars(src, dest):
+    """Write the bcolz daily bar table at ``src`` as memory-mapped columns.
+
+    Parameters
+    ----------
+    src : str or bcolz.ctable
+        The daily bar table, or its root directory.
+    dest : str
+        The directory to write, created if missing.
+    """
+    table = src if isinstance(src, ctable) else ctable(rootdir=src, mode='r')
+    ensure_directory(dest)
+    for name in table.names:
+        np.save(_column_path(dest, name), table[name][:])
+
+    # the attributes go last, a directory without them is not readable.
+    with open(os.path.join(dest, ATTRS_FILENAME), 'w') as fp:
+        json.dump(dict(table.attrs.attrs), fp)
+
+
+class _Attrs(dict):
+    """The attributes of a table, with the interface of ``bcolz.attrs``.
+    """
+    @property
+    def attrs(self):
+        return self
+
+
+class _MappedTable(object):
+    """The columns of a daily bar table, mapped on first access.
+    """
+    def __init__(self, rootdir):
+        self._rootdir = rootdir
+        with open(os.path.join(rootdir, ATTRS_FILENAME)) as fp:
+            self.attrs = _Attrs(json.load(fp))
+        self._columns = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._columns[name]
+        except KeyError:
+            path = _column_path(self._rootdir, name)
+            try:
+                column = np.load(path, mmap_mode='r')
+            except ValueError:
+                # an empty array can not be mapped.
+                column = np.load(path)
+            self._columns[name] = column
+            return column
+
+
+class MmapDailyBarReader(BcolzDailyBarReader):
+    """
+    Reader for daily bars written by ``convert_bcolz_daily_bars``.
+
+    Parameters
+    ----------
+    rootdir : str
+        The directory of the columns.
+
+    Notes
+    -----
+    The columns are mapped read only, so processes reading the same
+    directory share one copy of the data, and reading all of a column
+    costs no memory of its own.
+
+    See Also
+    --------
+    zipline.data.mmap_daily_bars.convert_bcolz_daily_bars
+    """
+    @lazyval
+    def _table(self):
+        return _MappedTable(self._maybe_table_rootdir)
+
+    def load_raw_arrays(self, columns, start_date, end_date, assets):
+        start_idx = self.sessions.get_loc(start_date)
+        end_idx = self.sessions.get_loc(end_date)
+        first_rows, last_rows, offsets = self._compute_slices(
+            start_idx,
+            end_idx,
+            assets,
+        )
+        shape = end_idx - start_idx + 1, len(assets)
+
+        results = []
+        for column in columns:
+            data = self._table[column]
+            out = np.zeros(shape, dtype=np.uint32)
+            for i in range(len(assets)):
+                first_row = first_rows[i]
+                last_row = last_rows[i]
+                if first_row > last_row:
+                    continue
+                offset = offsets[i]
+                out[offset:offset + last_row + 1 - first_row, i] = \
+                    data[first_row:last_row + 1]
+
+            if column in PRICE_COLUMNS:
+                where_nan = out == 0
+                out = out * self.PRICE_ADJUSTMENT_FACTOR
+                out[where_nan] = np.nan
+            results.append(out)
+        return results
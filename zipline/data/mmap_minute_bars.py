@@ -0,0 +1,241 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Uncompressed, memory-mapped minute bars.
+
+Each field is a single file of uint32 values with one row per minute
+position and one column per sid, so the bars of every sid at a minute are
+contiguous. Minute positions are the same as in the bcolz format, i.e.
+``minutes_per_day`` slots per session, and the prices are stored with the
+same OHLC ratios.
+
+The files are mapped read only: reads are page cache hits instead of chunk
+decompression, and processes reading the same files share one copy of the
+data.
+"""
+import json
+import os
+from glob import glob
+
+import bcolz
+import numpy as np
+
+from zipline.data.bar_reader import NoDataForSid
+from zipline.data.minute_bars import (
+    BcolzMinuteBarMetadata,
+    BcolzMinuteBarReader,
+    _sid_subdir_path,
+)
+from zipline.utils.cli import maybe_show_progress
+from zipline.utils.paths import ensure_directory
+
+LAYOUT_FILENAME = 'mmap_layout.json'
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _field_path(rootdir, field):
+    return os.path.join(rootdir, '{0}.u32'.format(field))
+
+
+def _read_layout(rootdir):
+    with open(os.path.join(rootdir, LAYOUT_FILENAME)) as fp:
+        return json.load(fp)
+
+
+def bcolz_minute_bar_sids(rootdir):
+    """The sids with data in the bcolz minute bars at ``rootdir``.
+    """
+    paths = glob(os.path.join(rootdir, '*', '*', '*.bcolz'))
+    return sorted(
+        int(os.path.basename(path).split('.')[0]) for path in paths
+    )
+
+
+def convert_bcolz_minute_bars(src,
+                              dest,
+                              sids=None,
+                              sessions_per_block=20,
+                              show_progress=False):
+    """Write the bcolz minute bars at ``src`` as memory-mapped minute bars.
+
+    Parameters
+    ----------
+    src : str
+        The root directory of the bcolz minute bars.
+    dest : str
+        The directory to write, created if missing.
+    sids : iterable[int], optional
+        The sids to convert. Defaults to every sid in ``src``.
+    sessions_per_block : int, optional
+        The number of sessions converted at a time. Each field is built a
+        block of rows at a time, which takes
+        ``sessions_per_block * minutes_per_day * len(sids) * 4`` bytes.
+    show_progress : bool, optional
+        Whether or not to show a progress bar while converting.
+    """
+    metadata = BcolzMinuteBarMetadata.read(src)
+    if sids is None:
+        sids = bcolz_minute_bar_sids(src)
+    sids = sorted(int(sid) for sid in sids)
+
+    sessions = metadata.calendar.sessions_in_range(
+        metadata.start_session,
+        metadata.end_session,
+    )
+    num_minutes = len(sessions) * metadata.minutes_per_day
+    block_len = sessions_per_block * metadata.minutes_per_day
+
+    ensure_directory(dest)
+    ctx = maybe_show_progress(
+        FIELDS,
+        show_progress=show_progress,
+        item_show_func=lambda e: e,
+        label='Converting minute bars:',
+    )
+    with ctx as it:
+        for field in it:
+            carrays = [
+                bcolz.carray(
+                    rootdir=os.path.join(src, _sid_subdir_path(sid), field),
+                    mode='r',
+                )
+                for sid in sids
+            ]
+            if not sids or not num_minutes:
+                open(_field_path(dest, field), 'wb').close()
+                continue
+
+            out = np.memmap(
+                _field_path(dest, field),
+                dtype=np.uint32,
+                mode='w+',
+                shape=(num_minutes, len(sids)),
+            )
+            for start in range(0, num_minutes, block_len):
+                stop = min(start + block_len, num_minutes)
+                block = np.zeros((stop - start, len(sids)), dtype=np.uint32)
+                for i, carray in enumerate(carrays):
+                    values = carray[start:stop]
+                    block[:len(values), i] = values
+                out[start:stop] = block
+            out.flush()
+            del out
+
+    with open(os.path.join(dest, LAYOUT_FILENAME), 'w') as fp:
+        json.dump({'sids': sids, 'num_minutes': num_minutes}, fp)
+
+    # the metadata goes last, a directory without it is not readable.
+    metadata.write(dest)
+
+
+class MmapMinuteBarReader(BcolzMinuteBarReader):
+    """
+    Reader for minute bars written by ``convert_bcolz_minute_bars``.
+
+    Parameters
+    ----------
+    rootdir : string
+        The root directory containing the metadata and the field files.
+
+    Notes
+    -----
+    The data of a sid is a strided view on the mapped file, so everything
+    the bcolz reader does with a carray works on it unchanged. Reads for
+    many sids at once index the rows of the files directly.
+
+    See Also
+    --------
+    zipline.data.mmap_minute_bars.convert_bcolz_minute_bars
+    """
+    def __init__(self, rootdir, sid_cache_size=1550):
+        super(MmapMinuteBarReader, self).__init__(rootdir, sid_cache_size)
+
+        layout = _read_layout(rootdir)
+        self._sids = np.array(layout['sids'], dtype=np.int64)
+        shape = layout['num_minutes'], len(self._sids)
+        if len(self._sids) and shape[0]:
+            self._arrays = {
+                field: np.memmap(
+                    _field_path(rootdir, field),
+                    dtype=np.uint32,
+                    mode='r',
+                    shape=shape,
+                )
+                for field in self.FIELDS
+            }
+        else:
+            # an empty file can not be mapped.
+            self._arrays = {
+                field: np.zeros(shape, dtype=np.uint32)
+                for field in self.FIELDS
+            }
+
+    def _sid_positions(self, sids):
+        sids = np.asarray(sids, dtype=np.int64)
+        positions = np.searchsorted(self._sids, sids)
+        found = positions < len(self._sids)
+        found[found] = self._sids[positions[found]] == sids[found]
+        if not found.all():
+            raise NoDataForSid(
+                'No minute data for sid {}.'.format(sids[~found][0])
+            )
+        return positions
+
+    def _open_minute_file(self, field, sid):
+        return self._arrays[field][:, self._sid_positions([int(sid)])[0]]
+
+    def _ohlc_ratio_inverses(self, sids):
+        return np.array(
+            [self._ohlc_ratio_inverse_for_sid(int(sid)) for sid in sids],
+            dtype=np.float64,
+        )
+
+    def get_values(self, sids, dt, field):
+        sids = [int(sid) for sid in sids]
+        minute_pos = self._get_value_position(dt)
+        positions = self._sid_positions(sids)
+
+        raw = self._arrays[field][minute_pos, positions]
+        if field == 'volume':
+            return raw.astype(np.int64)
+
+        out = raw * self._ohlc_ratio_inverses(sids)
+        out[raw == 0] = np.nan
+        return out
+
+    def load_raw_arrays(self, fields, start_dt, end_dt, sids):
+        start_idx = self._find_position_of_minute(start_dt)
+        end_idx = self._find_position_of_minute(end_dt)
+        positions = self._sid_positions([int(sid) for sid in sids])
+
+        indices_to_exclude = self._exclusion_indices_for_range(
+            start_idx, end_idx)
+        rows = np.arange(start_idx, end_idx + 1)
+        if indices_to_exclude is not None:
+            keep = np.ones(len(rows), dtype=bool)
+            for excl_start, excl_stop in indices_to_exclude:
+                keep[excl_start - start_idx:excl_stop - start_idx + 1] = False
+            rows = rows[keep]
+
+        results = []
+        for field in fields:
+            raw = self._arrays[field][rows[:, np.newaxis], positions]
+            if field != 'volume':
+                out = raw * self._ohlc_ratio_inverses(sids)
+                out[raw == 0] = np.nan
+            else:
+                out = raw
+            results.append(out)
+        return results
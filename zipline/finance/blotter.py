@@ -13,10 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from logbook import Logger
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from copy import copy
 
-from six import iteritems
+from six import iteritems, itervalues
 
 from zipline.assets import Equity, Future, Asset
 from zipline.finance.order import Order
@@ -360,11 +360,24 @@ class Blotter(object):
         commissions = []
 
         if self.open_orders:
+            # the assets of each slippage model are simulated together.
+            orders_by_model = OrderedDict()
             for asset, asset_orders in iteritems(self.open_orders):
                 slippage = self.slippage_models[type(asset)]
+                try:
+                    orders_by_model[id(slippage)][1].append(
+                        (asset, asset_orders),
+                    )
+                except KeyError:
+                    orders_by_model[id(slippage)] = (
+                        slippage,
+                        [(asset, asset_orders)],
+                    )
 
+            for slippage, orders_by_asset in itervalues(orders_by_model):
                 for order, txn in \
-                        slippage.simulate(bar_data, asset, asset_orders):
+                        slippage.simulate_many(bar_data, orders_by_asset):
+                    asset = order.asset
                     commission = self.commission_models[type(asset)]
                     additional_commission = commission.calculate(order, txn)
 
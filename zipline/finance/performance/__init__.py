@@ -17,10 +17,16 @@ from . tracker import PerformanceTracker
 from . period import PerformancePeriod
 from . position import Position
 from . position_tracker import PositionTracker
+from . results import PerfResults
+from . sinks import CallbackSink, JSONLinesSink, PerfSink
 
 __all__ = [
+    'CallbackSink',
+    'JSONLinesSink',
     'PerformanceTracker',
     'PerformancePeriod',
+    'PerfResults',
+    'PerfSink',
     'Position',
     'PositionTracker',
 ]
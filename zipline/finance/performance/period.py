@@ -398,7 +398,7 @@ class PerformancePeriod(object):
     def position_amounts(self):
         return self.position_tracker.position_amounts
 
-    def __core_dict(self):
+    def _core_dict(self):
         pos_stats = self.position_tracker.stats()
         period_stats = calc_period_stats(pos_stats, self.ending_cash)
 
@@ -437,7 +437,7 @@ class PerformancePeriod(object):
         Kwargs:
             dt (datetime): If present, only return transactions for the dt.
         """
-        rval = self.__core_dict()
+        rval = self._core_dict()
 
         if self.serialize_positions:
             positions = self.position_tracker.get_positions_list()
@@ -20,8 +20,6 @@ import numpy as np
 from collections import namedtuple
 from math import isnan
 
-from six import iteritems, itervalues
-
 from zipline.finance.performance.position import Position
 from zipline.finance.transaction import Transaction
 from zipline.utils.input_validation import expect_types
@@ -63,7 +61,7 @@ def calc_position_values(positions):
 
 def calc_net(values):
     # Returns 0.0 if there are no values.
-    return sum(values, np.float64())
+    return np.asarray(values, dtype=np.float64).sum()
 
 
 def calc_position_exposures(positions):
@@ -81,27 +79,35 @@ def calc_position_exposures(positions):
 
 
 def calc_long_value(position_values):
-    return sum(i for i in position_values if i > 0)
+    values = np.asarray(position_values, dtype=np.float64)
+    return values[values > 0].sum()
 
 
 def calc_short_value(position_values):
-    return sum(i for i in position_values if i < 0)
+    values = np.asarray(position_values, dtype=np.float64)
+    return values[values < 0].sum()
 
 
 def calc_long_exposure(position_exposures):
-    return sum(i for i in position_exposures if i > 0)
+    exposures = np.asarray(position_exposures, dtype=np.float64)
+    return exposures[exposures > 0].sum()
 
 
 def calc_short_exposure(position_exposures):
-    return sum(i for i in position_exposures if i < 0)
+    exposures = np.asarray(position_exposures, dtype=np.float64)
+    return exposures[exposures < 0].sum()
 
 
 def calc_longs_count(position_exposures):
-    return sum(1 for i in position_exposures if i > 0)
+    return int(np.count_nonzero(
+        np.asarray(position_exposures, dtype=np.float64) > 0
+    ))
 
 
 def calc_shorts_count(position_exposures):
-    return sum(1 for i in position_exposures if i < 0)
+    return int(np.count_nonzero(
+        np.asarray(position_exposures, dtype=np.float64) < 0
+    ))
 
 
 def calc_gross_exposure(long_exposure, short_exposure):
@@ -112,7 +118,60 @@ def calc_gross_value(long_value, short_value):
     return long_value + abs(short_value)
 
 
+def _column(name):
+    def fget(self):
+        tracker = self._tracker
+        value = getattr(tracker, name)[tracker._rows[self.asset]]
+        if isinstance(value, np.generic):
+            # return python scalars, like the attributes of a Position.
+            return value.item()
+        return value
+
+    def fset(self, value):
+        tracker = self._tracker
+        getattr(tracker, name)[tracker._rows[self.asset]] = value
+
+    return property(fget, fset)
+
+
+class PositionView(Position):
+    """
+    A Position whose state is a row of the arrays of a PositionTracker.
+
+    The methods of Position read and write the row, so the tracker updates
+    each position with them as it did when it held Position objects.
+    """
+    def __init__(self, tracker, asset):
+        self._tracker = tracker
+        self.asset = asset
+
+    amount = _column('_amounts')
+    cost_basis = _column('_cost_bases')
+    last_sale_price = _column('_last_sale_prices')
+    last_sale_date = _column('_last_sale_dates')
+
+
 class PositionTracker(object):
+    """
+    The positions of a simulation.
+
+    The state of the positions is kept in arrays with a row per position,
+    so the prices of every position are synced, and their values and
+    exposures computed, in one operation. ``positions`` maps each asset to
+    a ``PositionView`` of its row.
+    """
+    # the number of rows allocated at first.
+    INITIAL_CAPACITY = 16
+
+    # the arrays holding the state of the positions.
+    _columns = (
+        '_amounts',
+        '_cost_bases',
+        '_last_sale_prices',
+        '_last_sale_dates',
+        '_is_future',
+        '_multipliers',
+    )
 
     def __init__(self, data_frequency):
         # asset => position object
@@ -123,14 +182,86 @@ class PositionTracker(object):
 
         self.data_frequency = data_frequency
 
+        # asset => row, the rows in use are the first len(self._assets).
+        self._rows = {}
+        self._assets = []
+        capacity = self.INITIAL_CAPACITY
+        self._amounts = np.zeros(capacity, dtype=np.int64)
+        self._cost_bases = np.zeros(capacity, dtype=np.float64)
+        self._last_sale_prices = np.zeros(capacity, dtype=np.float64)
+        self._last_sale_dates = np.full(capacity, None, dtype=object)
+        # futures have no value, and their exposure is scaled by their
+        # multiplier.
+        self._is_future = np.zeros(capacity, dtype=bool)
+        self._multipliers = np.ones(capacity, dtype=np.float64)
+
+    def _add_position(self, asset):
+        row = len(self._assets)
+        if row == len(self._amounts):
+            for name in self._columns:
+                column = getattr(self, name)
+                grown = np.empty(2 * len(column), dtype=column.dtype)
+                grown[:row] = column
+                setattr(self, name, grown)
+
+        self._amounts[row] = 0
+        self._cost_bases[row] = 0.0
+        self._last_sale_prices[row] = 0.0
+        self._last_sale_dates[row] = None
+        is_future = isinstance(asset, Future)
+        self._is_future[row] = is_future
+        self._multipliers[row] = asset.multiplier if is_future else 1.0
+
+        self._assets.append(asset)
+        self._rows[asset] = row
+        position = self.positions[asset] = PositionView(self, asset)
+        return position
+
+    def _position(self, asset):
+        position = self.positions[asset]
+        if position is None:
+            position = self._add_position(asset)
+        return position
+
+    def _remove_position(self, asset):
+        del self.positions[asset]
+        row = self._rows.pop(asset)
+        # move the last row into the freed one.
+        last = len(self._assets) - 1
+        last_asset = self._assets.pop()
+        if row != last:
+            for name in self._columns:
+                column = getattr(self, name)
+                column[row] = column[last]
+            self._assets[row] = last_asset
+            self._rows[last_asset] = row
+        self._last_sale_dates[last] = None
+
+    def _position_rows(self):
+        """
+        Iterate over the (asset, amount, cost_basis, last_sale_price,
+        last_sale_date) of each position, in the order they were opened.
+        """
+        count = len(self._assets)
+        amounts = self._amounts[:count].tolist()
+        cost_bases = self._cost_bases[:count].tolist()
+        last_sale_prices = self._last_sale_prices[:count].tolist()
+        last_sale_dates = self._last_sale_dates[:count]
+        rows = self._rows
+        for asset in self.positions:
+            row = rows[asset]
+            yield (
+                asset,
+                amounts[row],
+                cost_bases[row],
+                last_sale_prices[row],
+                last_sale_dates[row],
+            )
+
     @expect_types(asset=Asset)
     def update_position(self, asset, amount=None, last_sale_price=None,
                         last_sale_date=None, cost_basis=None):
-        if asset not in self.positions:
-            position = Position(asset)
-            self.positions[asset] = position
-        else:
-            position = self.positions[asset]
+        position = self._position(asset)
 
         if amount is not None:
             position.amount = amount
@@ -145,17 +276,11 @@ class PositionTracker(object):
         # Update Position
         # ----------------
         asset = txn.asset
-
-        if asset not in self.positions:
-            position = Position(asset)
-            self.positions[asset] = position
-        else:
-            position = self.positions[asset]
-
+        position = self._position(asset)
         position.update(txn)
 
         if position.amount == 0:
-            del self.positions[asset]
+            self._remove_position(asset)
 
             try:
                 # if this position exists in our user-facing dictionary,
@@ -261,12 +386,7 @@ class PositionTracker(object):
             share_count = stock_payment['share_count']
             # note we create a Position for stock dividend if we don't
             # already own the asset
-            if payment_asset in self.positions:
-                position = self.positions[payment_asset]
-            else:
-                position = self.positions[payment_asset] = \
-                    Position(payment_asset)
-
+            position = self._position(payment_asset)
             position.amount += share_count
 
         return net_cash_payment
@@ -297,9 +417,13 @@ class PositionTracker(object):
 
         positions = self._positions_store
 
-        for asset, pos in iteritems(self.positions):
+        for (asset,
+             amount,
+             cost_basis,
+             last_sale_price,
+             last_sale_date) in self._position_rows():
 
-            if pos.amount == 0:
+            if amount == 0:
                 # Clear out the position if it has become empty since the last
                 # time get_positions was called.  Catching the KeyError is
                 # faster than checking `if asset in positions`, and this can be
@@ -311,10 +435,10 @@ class PositionTracker(object):
                 continue
 
             position = zp.Position(asset)
-            position.amount = pos.amount
-            position.cost_basis = pos.cost_basis
-            position.last_sale_price = pos.last_sale_price
-            position.last_sale_date = pos.last_sale_date
+            position.amount = amount
+            position.cost_basis = cost_basis
+            position.last_sale_price = last_sale_price
+            position.last_sale_date = last_sale_date
 
             # Adds the new position if we didn't have one before, or overwrite
             # one we have currently
@@ -323,45 +447,57 @@ class PositionTracker(object):
         return positions
 
     def get_positions_list(self):
-        positions = []
-        for asset, pos in iteritems(self.positions):
-            if pos.amount != 0:
-                positions.append(pos.to_dict())
-        return positions
+        return [
+            {
+                'sid': asset,
+                'amount': amount,
+                'cost_basis': cost_basis,
+                'last_sale_price': last_sale_price,
+            }
+            for asset, amount, cost_basis, last_sale_price, _
+            in self._position_rows()
+            if amount != 0
+        ]
 
     def sync_last_sale_prices(self, dt, handle_non_market_minutes,
                               data_portal):
-        if not handle_non_market_minutes:
-            for asset, position in iteritems(self.positions):
-                last_sale_price = data_portal.get_spot_value(
-                    asset, 'price', dt, self.data_frequency
-                )
+        assets = self._assets
+        if not assets:
+            return
 
-                if not np.isnan(last_sale_price):
-                    position.last_sale_price = last_sale_price
+        if not handle_non_market_minutes:
+            prices = data_portal.get_spot_values(
+                assets, 'price', dt, self.data_frequency
+            )
         else:
-            for asset, position in iteritems(self.positions):
-                last_sale_price = data_portal.get_adjusted_value(
+            previous_minute = data_portal.trading_calendar.previous_minute(dt)
+            prices = [
+                data_portal.get_adjusted_value(
                     asset,
                     'price',
-                    data_portal.trading_calendar.previous_minute(dt),
+                    previous_minute,
                     dt,
                     self.data_frequency
                 )
+                for asset in assets
+            ]
 
-                if not np.isnan(last_sale_price):
-                    position.last_sale_price = last_sale_price
+        prices = np.asarray(prices, dtype=np.float64)
+        has_price = ~np.isnan(prices)
+        self._last_sale_prices[:len(assets)][has_price] = prices[has_price]
 
     def stats(self):
-        amounts = []
-        last_sale_prices = []
-        for pos in itervalues(self.positions):
-            amounts.append(pos.amount)
-            last_sale_prices.append(pos.last_sale_price)
-
-        position_values = calc_position_values(itervalues(self.positions))
-        position_exposures = calc_position_exposures(
-            itervalues(self.positions)
+        count = len(self._assets)
+        position_exposures = (
+            self._amounts[:count] *
+            self._last_sale_prices[:count] *
+            self._multipliers[:count]
+        )
+        # Futures don't have an inherent position value.
+        position_values = np.where(
+            self._is_future[:count],
+            0.0,
+            self._amounts[:count] * self._last_sale_prices[:count],
         )
 
         long_value = calc_long_value(position_values)
@@ -0,0 +1,534 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Columnar performance results.
+
+``PerfResults`` collects what the daily perf packets of a simulation hold
+directly from the performance tracker. The metrics of each session go into
+arrays preallocated for the whole simulation, and the positions,
+transactions and orders into growing columns. The perf frame is built from
+those columns once, at the end of the simulation, instead of from a list of
+nested dicts kept for every bar.
+
+For long simulations the positions, transactions and orders can be spilled
+to disk, as Parquet or HDF5, whenever more than ``spill_rows`` of them are
+buffered. The perf frame then leaves them out, they are read back as flat
+tables with ``positions``, ``transactions`` and ``orders``.
+"""
+from collections import OrderedDict
+from numbers import Integral, Real
+import os
+
+import numpy as np
+import pandas as pd
+from six import iteritems, itervalues
+
+from zipline.utils.paths import ensure_directory
+
+# The fields of the perf packets which are always integers.
+INTEGER_FIELDS = frozenset(['longs_count', 'shorts_count', 'trading_days'])
+
+SPILL_FORMATS = frozenset(['parquet', 'hdf5'])
+
+# The columns of the tables, ``session`` is the row of the perf frame.
+POSITION_COLUMNS = (
+    ('session', np.int64),
+    ('sid', object),
+    ('amount', np.int64),
+    ('cost_basis', np.float64),
+    ('last_sale_price', np.float64),
+)
+TRANSACTION_COLUMNS = (
+    ('session', np.int64),
+    ('sid', object),
+    ('amount', np.int64),
+    ('dt', np.int64),
+    ('price', np.float64),
+    ('order_id', object),
+    ('commission', object),
+)
+ORDER_COLUMNS = (
+    ('session', np.int64),
+    ('id', object),
+    ('dt', np.int64),
+    ('reason', object),
+    ('created', np.int64),
+    ('sid', object),
+    ('amount', np.int64),
+    ('filled', np.int64),
+    ('commission', object),
+    ('stop', object),
+    ('limit', object),
+    ('stop_reached', np.bool_),
+    ('limit_reached', np.bool_),
+    ('status', np.int64),
+    ('broker_order_id', object),
+)
+
+# Columns holding nanoseconds since the epoch.
+_DATETIME_COLUMNS = frozenset(['dt', 'created'])
+# Object columns holding a float or None.
+_OPTIONAL_FLOAT_COLUMNS = frozenset(['commission', 'stop', 'limit'])
+
+
+class _Table(object):
+    """Columns which grow a row at a time.
+    """
+    def __init__(self, columns, capacity=64):
+        self.names = [name for name, _ in columns]
+        self._dtypes = OrderedDict(columns)
+        self._arrays = [
+            np.empty(capacity, dtype=dtype) for dtype in itervalues(
+                self._dtypes,
+            )
+        ]
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def append(self, *row):
+        n = self._len
+        if n == len(self._arrays[0]):
+            for i, array in enumerate(self._arrays):
+                grown = np.empty(2 * n, dtype=array.dtype)
+                grown[:n] = array
+                self._arrays[i] = grown
+        for array, value in zip(self._arrays, row):
+            array[n] = value
+        self._len = n + 1
+
+    def columns(self):
+        return OrderedDict(
+            (name, array[:self._len])
+            for name, array in zip(self.names, self._arrays)
+        )
+
+    def clear(self):
+        for array in self._arrays:
+            if array.dtype == object:
+                # drop the references held by the old rows.
+                array[:self._len] = None
+        self._len = 0
+
+
+class _ParquetSpill(object):
+    """Tables appended to a directory of Parquet files.
+    """
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError(
+                "spilling results to parquet requires the 'pyarrow' package",
+            )
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._writers = {}
+        ensure_directory(path)
+
+    def _table_path(self, name):
+        return os.path.join(self._path, '{0}.parquet'.format(name))
+
+    def write(self, name, frame):
+        table = self._pa.Table.from_pandas(frame, preserve_index=False)
+        try:
+            writer = self._writers[name]
+        except KeyError:
+            writer = self._writers[name] = self._pq.ParquetWriter(
+                self._table_path(name),
+                table.schema,
+            )
+        writer.write_table(table)
+
+    def close(self):
+        for writer in itervalues(self._writers):
+            writer.close()
+        self._writers.clear()
+
+    def read(self, name):
+        path = self._table_path(name)
+        if not os.path.exists(path):
+            return None
+        return self._pq.read_table(path).to_pandas()
+
+
+class _HDFSpill(object):
+    """Tables appended to an HDF5 file.
+    """
+    # strings longer than this can not be appended to a table.
+    MIN_ITEMSIZE = 128
+
+    def __init__(self, path):
+        ensure_directory(os.path.dirname(os.path.abspath(path)))
+        self._path = path
+        self._store = pd.HDFStore(path, mode='w')
+
+    def write(self, name, frame):
+        self._store.append(
+            name,
+            frame,
+            format='table',
+            index=False,
+            min_itemsize={'values': self.MIN_ITEMSIZE},
+        )
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def read(self, name):
+        with pd.HDFStore(self._path, mode='r') as store:
+            if name not in store:
+                return None
+            return store.select(name)
+
+
+class PerfResults(object):
+    """Collects the results of a simulation into columns.
+
+    Parameters
+    ----------
+    spill_path : str, optional
+        Where to spill the positions, transactions and orders. A directory
+        for the ``'parquet'`` format, a file for ``'hdf5'``. By default they
+        are kept in memory.
+    spill_format : {'parquet', 'hdf5'}, optional
+        The format of the spilled tables. Parquet requires ``pyarrow`` and
+        HDF5 requires ``tables``.
+    spill_rows : int, optional
+        The number of rows of a table buffered before they are spilled.
+
+    Notes
+    -----
+    Pass an instance as ``perf_results`` to ``TradingAlgorithm``. The
+    performance tracker then records each session into it instead of
+    emitting perf packets, and ``TradingAlgorithm.run`` returns
+    ``to_frame()``.
+    """
+    def __init__(self, spill_path=None, spill_format='parquet',
+                 spill_rows=100000):
+        if spill_format not in SPILL_FORMATS:
+            raise ValueError(
+                'invalid spill format %r, must be one of %s' % (
+                    spill_format,
+                    ', '.join(sorted(SPILL_FORMATS)),
+                ),
+            )
+        self.spill_path = spill_path
+        self.spill_format = spill_format
+        self.spill_rows = spill_rows
+        self.start(pd.DatetimeIndex([], tz='UTC'))
+
+    def start(self, sessions):
+        """Reset the results for a simulation over ``sessions``.
+        """
+        self._num_sessions = len(sessions)
+        self._row = 0
+        self._fields = OrderedDict()
+        self._closes = np.empty(len(sessions), dtype=np.int64)
+        self._tables = OrderedDict([
+            ('positions', _Table(POSITION_COLUMNS)),
+            ('transactions', _Table(TRANSACTION_COLUMNS)),
+            ('orders', _Table(ORDER_COLUMNS)),
+        ])
+        self._spill = None
+        self._spilled = False
+        if self.spill_path is not None:
+            if self.spill_format == 'parquet':
+                self._spill = _ParquetSpill(self.spill_path)
+            else:
+                self._spill = _HDFSpill(self.spill_path)
+
+    def __len__(self):
+        return self._row
+
+    def _allocate(self, name, value):
+        n = self._num_sessions
+        if isinstance(value, pd.Timestamp):
+            array = np.full(n, pd.NaT.value, dtype=np.int64)
+            kind = 'datetime'
+        elif (isinstance(value, Integral) and
+                not isinstance(value, bool) and
+                name in INTEGER_FIELDS):
+            array = np.zeros(n, dtype=np.int64)
+            kind = 'value'
+        elif value is None or (isinstance(value, Real) and
+                               not isinstance(value, bool)):
+            array = np.full(n, np.nan)
+            kind = 'value'
+        else:
+            array = np.full(n, None, dtype=object)
+            kind = 'value'
+        self._fields[name] = field = [kind, array]
+        return field
+
+    def _set(self, name, value):
+        try:
+            field = self._fields[name]
+        except KeyError:
+            field = self._allocate(name, value)
+
+        kind, array = field
+        if kind == 'datetime':
+            if isinstance(value, pd.Timestamp):
+                array[self._row] = value.value
+                return
+            # not a datetime after all.
+            field[0] = kind = 'value'
+            field[1] = array = np.array(
+                [None if v == pd.NaT.value else pd.Timestamp(v, tz='UTC')
+                 for v in array],
+                dtype=object,
+            )
+
+        if value is None and array.dtype != object:
+            value = np.nan
+        try:
+            array[self._row] = value
+        except (TypeError, ValueError):
+            field[1] = array = array.astype(object)
+            array[self._row] = value
+
+    def record_session(self, tracker):
+        """Record the session ending in ``tracker``.
+
+        This is called by the tracker at the close of each session, before
+        it rolls over to the next one.
+        """
+        if self._row == self._num_sessions:
+            raise ValueError('all of the sessions are already recorded')
+
+        period = tracker.todays_performance
+        for name, value in iteritems(period._core_dict()):
+            self._set(name, value)
+        for name, value in iteritems(
+                tracker.cumulative_risk_metrics.to_dict()):
+            self._set(name, value)
+        self._closes[self._row] = period.period_close.value
+
+        row = self._row
+        positions = self._tables['positions']
+        for asset, position in iteritems(
+                tracker.position_tracker.positions):
+            if position.amount != 0:
+                positions.append(
+                    row,
+                    asset,
+                    position.amount,
+                    position.cost_basis,
+                    position.last_sale_price,
+                )
+
+        transactions = self._tables['transactions']
+        for txns in itervalues(period.processed_transactions):
+            for txn in txns:
+                transactions.append(
+                    row,
+                    txn.asset,
+                    txn.amount,
+                    txn.dt.value,
+                    txn.price,
+                    txn.order_id,
+                    txn.commission,
+                )
+
+        orders = self._tables['orders']
+        for order in itervalues(period.orders_by_id):
+            orders.append(
+                row,
+                order.id,
+                order.dt.value,
+                order.reason,
+                order.created.value,
+                order.asset,
+                order.amount,
+                order.filled,
+                order.commission,
+                order.stop,
+                order.limit,
+                order.stop_reached,
+                order.limit_reached,
+                order.status,
+                order.broker_order_id,
+            )
+
+        self._row += 1
+        if self._spill is not None:
+            for name, table in iteritems(self._tables):
+                if len(table) >= self.spill_rows:
+                    self._spill_table(name, table)
+
+    def record_vars(self, recorded_vars):
+        """Record the variables recorded by the algorithm in the last
+        recorded session.
+        """
+        self._row -= 1
+        try:
+            for name, value in iteritems(recorded_vars):
+                self._set(name, value)
+        finally:
+            self._row += 1
+
+    def _flat_frame(self, table):
+        columns = table.columns()
+        data = OrderedDict()
+        data['date'] = pd.DatetimeIndex(
+            self._closes[columns.pop('session')],
+        ).tz_localize('UTC')
+        for name, values in iteritems(columns):
+            if name == 'sid':
+                values = np.array(
+                    [int(asset) for asset in values],
+                    dtype=np.int64,
+                )
+            elif name in _DATETIME_COLUMNS:
+                values = pd.DatetimeIndex(values).tz_localize('UTC')
+            elif name in _OPTIONAL_FLOAT_COLUMNS:
+                values = np.array(
+                    [np.nan if v is None else v for v in values],
+                    dtype=np.float64,
+                )
+            elif values.dtype == object:
+                values = np.array(
+                    [u'' if v is None else v for v in values],
+                    dtype=object,
+                )
+            data[name] = values
+        return pd.DataFrame(data, columns=list(data))
+
+    def _spill_table(self, name, table):
+        if len(table):
+            self._spill.write(name, self._flat_frame(table))
+            table.clear()
+        self._spilled = True
+
+    def finish(self):
+        """Spill the rows still buffered, if spilling.
+        """
+        if self._spill is not None:
+            for name, table in iteritems(self._tables):
+                self._spill_table(name, table)
+            self._spill.close()
+
+    def _table(self, name):
+        table = self._tables[name]
+        if self._spill is None:
+            return self._flat_frame(table)
+
+        self.finish()
+        frame = self._spill.read(name)
+        if frame is None:
+            return self._flat_frame(table)
+        return frame
+
+    def positions(self):
+        """The positions held at the close of each session.
+
+        Returns
+        -------
+        positions : pd.DataFrame
+            A row per position and session, with the sid of the asset.
+        """
+        return self._table('positions')
+
+    def transactions(self):
+        """The transactions of each session.
+
+        Returns
+        -------
+        transactions : pd.DataFrame
+            A row per transaction, with the sid of the asset.
+        """
+        return self._table('transactions')
+
+    def orders(self):
+        """The orders open or modified in each session, as of its close.
+
+        Returns
+        -------
+        orders : pd.DataFrame
+            A row per order and session, with the sid of the asset.
+        """
+        return self._table('orders')
+
+    def _nested(self, name, to_dict):
+        out = [[] for _ in range(self._row)]
+        columns = self._tables[name].columns()
+        sessions = columns.pop('session')
+        names = list(columns)
+        for i, values in enumerate(zip(*columns.values())):
+            out[sessions[i]].append(to_dict(dict(zip(names, values))))
+        return out
+
+    def to_frame(self):
+        """Build the perf frame of the sessions recorded.
+
+        Returns
+        -------
+        perf : pd.DataFrame
+            The same frame as ``TradingAlgorithm.run`` builds from the perf
+            packets. If the tables were spilled, it has no ``positions``,
+            ``transactions`` or ``orders`` column.
+        """
+        n = self._row
+        data = {}
+        for name, (kind, array) in iteritems(self._fields):
+            if kind == 'datetime':
+                data[name] = pd.DatetimeIndex(array[:n]).tz_localize('UTC')
+            else:
+                data[name] = array[:n]
+
+        if self._spill is None:
+            data['positions'] = self._nested('positions', _position_dict)
+            data['transactions'] = self._nested(
+                'transactions',
+                _transaction_dict,
+            )
+            data['orders'] = self._nested('orders', _order_dict)
+        else:
+            self.finish()
+
+        index = pd.DatetimeIndex(self._closes[:n]).tz_localize('UTC')
+        return pd.DataFrame(data, index=index, columns=sorted(data))
+
+
+def _position_dict(row):
+    row['amount'] = int(row['amount'])
+    row['cost_basis'] = float(row['cost_basis'])
+    row['last_sale_price'] = float(row['last_sale_price'])
+    return row
+
+
+def _transaction_dict(row):
+    row['amount'] = int(row['amount'])
+    row['price'] = float(row['price'])
+    row['dt'] = pd.Timestamp(row['dt'], tz='UTC')
+    return row
+
+
+def _order_dict(row):
+    for name in ('amount', 'filled', 'status'):
+        row[name] = int(row[name])
+    for name in ('stop_reached', 'limit_reached'):
+        row[name] = bool(row[name])
+    for name in _DATETIME_COLUMNS:
+        row[name] = pd.Timestamp(row[name], tz='UTC')
+    if row['broker_order_id'] is None:
+        del row['broker_order_id']
+    return row
@@ -0,0 +1,126 @@
+#
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Sinks for streaming the performance of a simulation.
+
+When ``TradingAlgorithm`` is given a ``perf_sink``, the performance of each
+session is written to it as soon as the session closes, instead of being
+kept until the end of the simulation to build the perf frame. Each session
+is a dict with the keys of a row of that frame.
+"""
+from datetime import datetime
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+from six import iteritems, string_types
+
+from zipline.assets import Asset
+
+
+class PerfSink(object):
+    """A destination for the performance of each session.
+
+    A sink is a context manager which closes it on exit, so it is closed
+    even if the simulation fails before it starts.
+    """
+    def write(self, perf):
+        """Write the performance of a session.
+
+        Parameters
+        ----------
+        perf : dict
+            The row of the perf frame for the session.
+        """
+        raise NotImplementedError('write')
+
+    def close(self):
+        """Called once the simulation is over.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excinfo):
+        self.close()
+
+
+class CallbackSink(PerfSink):
+    """Call a function with the performance of each session.
+
+    Parameters
+    ----------
+    callback : callable[dict -> any]
+        The function to call.
+    """
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, perf):
+        self.callback(perf)
+
+
+def jsonable(value):
+    """Convert a value of a perf row into something ``json.dumps`` takes.
+
+    Assets become their sid, datetimes are written in iso format and
+    missing floats become ``None``.
+    """
+    if isinstance(value, dict):
+        return {k: jsonable(v) for k, v in iteritems(value)}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(v) for v in value]
+    if isinstance(value, Asset):
+        return int(value)
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+class JSONLinesSink(PerfSink):
+    """Write the performance of each session as a line of json.
+
+    Parameters
+    ----------
+    out : str or file
+        The path of the file to write, ``'-'`` for stdout, or an open file,
+        e.g. a pipe. The output is flushed after every session.
+    """
+    def __init__(self, out):
+        if out == '-':
+            self._file = sys.stdout
+            self._owned = False
+        elif isinstance(out, string_types):
+            self._file = open(out, 'w')
+            self._owned = True
+        else:
+            self._file = out
+            self._owned = False
+
+    def write(self, perf):
+        self._file.write(json.dumps(jsonable(perf), sort_keys=True))
+        self._file.write('\n')
+        self._file.flush()
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+            self._owned = False
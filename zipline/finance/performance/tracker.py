@@ -77,7 +77,8 @@ class PerformanceTracker(object):
     """
     Tracks the performance of the algorithm.
     """
-    def __init__(self, sim_params, trading_calendar, asset_finder):
+    def __init__(self, sim_params, trading_calendar, asset_finder,
+                 results=None):
         self.sim_params = sim_params
         self.trading_calendar = trading_calendar
         self.asset_finder = asset_finder
@@ -164,6 +165,12 @@ class PerformanceTracker(object):
         self.account_needs_update = True
         self._account = None
 
+        # When set, the sessions are recorded into these columnar results
+        # instead of being emitted as perf packets.
+        self.results = results
+        if results is not None:
+            results.start(self.sim_params.sessions)
+
     def __repr__(self):
         return "%s(%r)" % (
             self.__class__.__name__,
@@ -352,6 +359,9 @@ class PerformanceTracker(object):
                                             bench_since_open,
                                             account.leverage)
 
+        if self.results is not None:
+            return None
+
         minute_packet = self.to_dict(emission_type='minute')
         return minute_packet
 
@@ -402,7 +412,11 @@ class PerformanceTracker(object):
 
         # Take a snapshot of our current performance to return to the
         # browser.
-        daily_update = self.to_dict(emission_type='daily')
+        if self.results is None:
+            daily_update = self.to_dict(emission_type='daily')
+        else:
+            self.results.record_session(self)
+            daily_update = None
 
         # On the last day of the test, don't create tomorrow's performance
         # period.  We may not be able to find the next trading day if we're at
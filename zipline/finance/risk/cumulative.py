@@ -27,15 +27,8 @@ from . risk import (
     choose_treasury
 )
 
-from empyrical import (
-    alpha_beta_aligned,
-    annual_volatility,
-    cum_returns,
-    downside_risk,
-    max_drawdown,
-    sharpe_ratio,
-    sortino_ratio,
-)
+# The annualization factor empyrical uses for daily returns.
+ANNUALIZATION_FACTOR = 252
 
 log = logbook.Logger('Risk Cumulative')
 
@@ -44,11 +37,185 @@ choose_treasury = functools.partial(choose_treasury, lambda *args: '10year',
                                     compound=False)
 
 
+class _Moments(object):
+    """The count, mean and sum of squared deviations of a series, updated
+    with Welford's method. Missing values are skipped.
+    """
+    __slots__ = ('n', 'mean', 'm2')
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    def plus(self, x):
+        """The moments with ``x`` added, ``self`` is left unchanged.
+        """
+        if np.isnan(x):
+            return self
+        n = self.n + 1
+        delta = x - self.mean
+        mean = self.mean + delta / n
+        return _Moments(n, mean, self.m2 + delta * (x - mean))
+
+    def std(self, ddof):
+        if self.n - ddof <= 0:
+            return np.nan
+        return np.sqrt(self.m2 / (self.n - ddof))
+
+
+class _CoMoments(object):
+    """The count, means, sum of squared deviations of ``y`` and co-moment of
+    the pairs of a series ``x`` and ``y`` where neither is missing.
+    """
+    __slots__ = ('n', 'mean_x', 'mean_y', 'm2_y', 'c')
+
+    def __init__(self, n=0, mean_x=0.0, mean_y=0.0, m2_y=0.0, c=0.0):
+        self.n = n
+        self.mean_x = mean_x
+        self.mean_y = mean_y
+        self.m2_y = m2_y
+        self.c = c
+
+    def plus(self, x, y):
+        """The co-moments with ``(x, y)`` added, ``self`` is left unchanged.
+        """
+        if np.isnan(x) or np.isnan(y):
+            return self
+        n = self.n + 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        mean_x = self.mean_x + dx / n
+        mean_y = self.mean_y + dy / n
+        return _CoMoments(
+            n,
+            mean_x,
+            mean_y,
+            self.m2_y + dy * (y - mean_y),
+            self.c + dx * (y - mean_y),
+        )
+
+
+class _ReturnsState(object):
+    """What the cumulative metrics need to know about a prefix of the
+    algorithm and benchmark returns.
+
+    Each metric of ``RiskMetricsCumulative`` is computed from this state in
+    constant time instead of over the whole history of returns, and
+    matches what empyrical computes over the returns, up to rounding.
+    """
+    __slots__ = (
+        'algorithm',
+        'benchmark',
+        'pairs',
+        'downside_squares',
+        'algorithm_value',
+        'benchmark_value',
+        'peak',
+        'max_drawdown',
+    )
+
+    def __init__(self):
+        self.algorithm = _Moments()
+        self.benchmark = _Moments()
+        self.pairs = _CoMoments()
+        # the sum of the squares of the negative returns.
+        self.downside_squares = 0.0
+        # the value of 1 invested at the start, missing returns count as 0.
+        self.algorithm_value = 1.0
+        self.benchmark_value = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+
+    def plus(self, algorithm_return, benchmark_return):
+        """The state with a pair of returns added, ``self`` is left
+        unchanged.
+        """
+        state = _ReturnsState.__new__(_ReturnsState)
+        state.algorithm = self.algorithm.plus(algorithm_return)
+        state.benchmark = self.benchmark.plus(benchmark_return)
+        state.pairs = self.pairs.plus(algorithm_return, benchmark_return)
+
+        if algorithm_return < 0:
+            state.downside_squares = \
+                self.downside_squares + algorithm_return ** 2
+        else:
+            state.downside_squares = self.downside_squares
+
+        if np.isnan(algorithm_return):
+            state.algorithm_value = self.algorithm_value
+        else:
+            state.algorithm_value = \
+                self.algorithm_value * (1 + algorithm_return)
+        if np.isnan(benchmark_return):
+            state.benchmark_value = self.benchmark_value
+        else:
+            state.benchmark_value = \
+                self.benchmark_value * (1 + benchmark_return)
+
+        state.peak = max(self.peak, state.algorithm_value)
+        state.max_drawdown = min(
+            self.max_drawdown,
+            (state.algorithm_value - state.peak) / state.peak,
+        )
+        return state
+
+    # The metrics below follow empyrical, where ``length`` is the length of
+    # the returns including missing values.
+
+    def annual_volatility(self, moments, length):
+        if length < 2:
+            return np.nan
+        return moments.std(ddof=1) * np.sqrt(ANNUALIZATION_FACTOR)
+
+    def beta(self, length):
+        pairs = self.pairs
+        if length < 2 or pairs.n < 2:
+            return np.nan
+        if np.absolute(pairs.m2_y / pairs.n) < 1.0e-30:
+            return np.nan
+        return pairs.c / pairs.m2_y
+
+    def alpha(self, length, beta):
+        pairs = self.pairs
+        if length < 2 or pairs.n == 0:
+            return np.nan
+        return (pairs.mean_x - beta * pairs.mean_y) * ANNUALIZATION_FACTOR
+
+    def sharpe(self, length):
+        if length < 2:
+            return np.nan
+        std = self.algorithm.std(ddof=1)
+        if std == 0:
+            return np.nan
+        return self.algorithm.mean / std * np.sqrt(ANNUALIZATION_FACTOR)
+
+    def downside_risk(self):
+        n = self.algorithm.n
+        if n == 0:
+            return np.nan
+        return np.sqrt(self.downside_squares / n) * \
+            np.sqrt(ANNUALIZATION_FACTOR)
+
+    def sortino(self, length, downside_risk):
+        if length < 2 or self.algorithm.n == 0:
+            return np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.float64(
+                self.algorithm.mean * ANNUALIZATION_FACTOR,
+            ) / downside_risk
+
+
 class RiskMetricsCumulative(object):
     """
     :Usage:
         Instantiate RiskMetricsCumulative once.
         Call update() method on each dt to update the metrics.
+
+    The metrics are updated from running moments of the returns, so each
+    call to update() takes constant time however long the simulation.
+    update() may be called again for the latest dt, as it is every minute
+    in minute emission, which replaces the returns of that dt.
     """
 
     METRIC_NAMES = (
@@ -140,6 +307,24 @@ class RiskMetricsCumulative(object):
 
         self.num_trading_days = 0
 
+        # The running state of the returns up to, and excluding,
+        # ``_state_loc``. The returns of later dts may still be replaced.
+        self._state = _ReturnsState()
+        self._state_loc = 0
+
+    def _state_through(self, dt_loc):
+        """The running state of the returns before ``dt_loc``.
+        """
+        state = self._state
+        for loc in range(self._state_loc, dt_loc):
+            state = state.plus(
+                self.algorithm_returns_cont[loc],
+                self.benchmark_returns_cont[loc],
+            )
+        self._state = state
+        self._state_loc = max(dt_loc, self._state_loc)
+        return state
+
     def update(self, dt, algorithm_returns, benchmark_returns, leverage):
         # Keep track of latest dt for use in to_dict and other methods
         # that report current state.
@@ -156,9 +341,17 @@ class RiskMetricsCumulative(object):
             if len(self.algorithm_returns) == 1:
                 self.algorithm_returns = np.append(0.0, self.algorithm_returns)
 
-        self.algorithm_cumulative_returns[dt_loc] = cum_returns(
-            self.algorithm_returns
-        )[-1]
+        state = self._state_through(dt_loc)
+        if self.create_first_day_stats and dt_loc == 0:
+            # the first day is measured against a zero return.
+            state = state.plus(0.0, 0.0)
+            length = 2
+        else:
+            length = dt_loc + 1
+        state = state.plus(algorithm_returns, benchmark_returns)
+
+        self.algorithm_cumulative_returns[dt_loc] = \
+            state.algorithm_value - 1
 
         algo_cumulative_returns_to_date = \
             self.algorithm_cumulative_returns[:dt_loc + 1]
@@ -187,9 +380,8 @@ class RiskMetricsCumulative(object):
             if len(self.benchmark_returns) == 1:
                 self.benchmark_returns = np.append(0.0, self.benchmark_returns)
 
-        self.benchmark_cumulative_returns[dt_loc] = cum_returns(
-            self.benchmark_returns
-        )[-1]
+        self.benchmark_cumulative_returns[dt_loc] = \
+            state.benchmark_value - 1
 
         benchmark_cumulative_returns_to_date = \
             self.benchmark_cumulative_returns[:dt_loc + 1]
@@ -229,11 +421,13 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
             raise Exception(message)
 
         self.update_current_max()
-        self.benchmark_volatility[dt_loc] = annual_volatility(
-            self.benchmark_returns
+        self.benchmark_volatility[dt_loc] = state.annual_volatility(
+            state.benchmark,
+            length,
         )
-        self.algorithm_volatility[dt_loc] = annual_volatility(
-            self.algorithm_returns
+        self.algorithm_volatility[dt_loc] = state.annual_volatility(
+            state.algorithm,
+            length,
         )
 
         # caching the treasury rates for the minutely case is a
@@ -250,23 +444,16 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
         self.treasury_period_return = self.daily_treasury[treasury_end]
         self.excess_returns[dt_loc] = 0
 
-        self.alpha[dt_loc], self.beta[dt_loc] = alpha_beta_aligned(
-            self.algorithm_returns,
-            self.benchmark_returns,
-        )
-        self.sharpe[dt_loc] = sharpe_ratio(
-            self.algorithm_returns,
-        )
-        self.downside_risk[dt_loc] = downside_risk(
-            self.algorithm_returns
-        )
-        self.sortino[dt_loc] = sortino_ratio(
-            self.algorithm_returns,
-            _downside_risk=self.downside_risk[dt_loc]
-        )
-        self.max_drawdown = max_drawdown(
-            self.algorithm_returns
+        beta = state.beta(length)
+        self.beta[dt_loc] = beta
+        self.alpha[dt_loc] = state.alpha(length, beta)
+        self.sharpe[dt_loc] = state.sharpe(length)
+        self.downside_risk[dt_loc] = state.downside_risk()
+        self.sortino[dt_loc] = state.sortino(
+            length,
+            self.downside_risk[dt_loc],
         )
+        self.max_drawdown = state.max_drawdown
         self.max_drawdowns[dt_loc] = self.max_drawdown
         self.max_leverage = self.calculate_max_leverage()
         self.max_leverages[dt_loc] = self.max_leverage
@@ -27,7 +27,6 @@ from zipline.errors import HistoryWindowStartsBeforeData
 from zipline.finance.constants import ROOT_SYMBOL_TO_ETA
 from zipline.finance.shared import AllowedAssetMarker, FinancialModelMeta
 from zipline.finance.transaction import create_transaction
-from zipline.utils.cache import ExpiringCache
 from zipline.utils.dummy import DummyMapping
 from zipline.utils.input_validation import (expect_bounded,
                                             expect_strictly_bounded)
@@ -80,6 +79,39 @@ def fill_price_worse_than_limit_price(fill_price, order):
     return False
 
 
+def fill_prices_worse_than_limit_prices(fill_prices, directions, limits):
+    """
+    Vectorized ``fill_price_worse_than_limit_price``.
+
+    Parameters
+    ----------
+    fill_prices : np.ndarray[float]
+        The prices to check.
+    directions : np.ndarray[float]
+        The directions of the orders, 1 for a buy and -1 for a sell.
+    limits : np.ndarray[float]
+        The limit prices of the orders, nan for the orders without one.
+
+    Returns
+    -------
+    np.ndarray[bool]: Whether each fill price is worse than the limit price
+    of its order.
+    """
+    # as in fill_price_worse_than_limit_price, a limit of 0 is no limit.
+    has_limit = ~np.isnan(limits) & (limits != 0)
+    with np.errstate(invalid='ignore'):
+        return has_limit & (
+            ((directions > 0) & (fill_prices > limits)) |
+            ((directions < 0) & (fill_prices < limits))
+        )
+
+
+def _defining_class(cls, name):
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return klass
+
+
 class SlippageModel(with_metaclass(FinancialModelMeta)):
     """Abstract interface for defining a slippage model.
     """
@@ -165,6 +197,110 @@ class SlippageModel(with_metaclass(FinancialModelMeta)):
                 self._volume_for_bar += abs(txn.amount)
                 yield order, txn
 
+    def simulate_many(self, data, orders_by_asset):
+        """Simulate the open orders of many assets for the current bar.
+
+        Parameters
+        ----------
+        data : BarData
+            The data for the given bar.
+        orders_by_asset : iterable[(Asset, iterable[Order])]
+            The open orders of each asset.
+
+        Yields
+        ------
+        (order, txn) : (Order, Transaction)
+            The transactions of each asset, in the order ``simulate`` yields
+            them.
+
+        Notes
+        -----
+        Models implementing ``_batch_fills`` get the prices and volumes of
+        every asset in one call and fill the orders of all the assets at
+        once. Other models, and subclasses overriding ``simulate`` or
+        ``process_order``, simulate each asset with ``simulate``.
+        """
+        cls = type(self)
+        if _defining_class(cls, 'simulate') is not SlippageModel or \
+                '_batch_fills' not in vars(
+                    _defining_class(cls, 'process_order'),
+                ):
+            for asset, orders in orders_by_asset:
+                for order, txn in self.simulate(data, asset, orders):
+                    yield order, txn
+            return
+
+        orders_by_asset = list(orders_by_asset)
+        assets = [asset for asset, _ in orders_by_asset]
+        volumes = np.asarray(data.current(assets, 'volume'), dtype=float)
+        prices = np.asarray(data.current(assets, 'close'), dtype=float)
+        dt = data.current_dt
+
+        # The orders of an asset are filled in turn, because each one takes
+        # from the volume left by the ones before it. Each round fills the
+        # next triggered order of every asset which still has volume.
+        remaining = [
+            (i, iter(orders_by_asset[i][1]))
+            for i in np.flatnonzero((volumes != 0) & ~np.isnan(prices))
+        ]
+        volume_for_bar = np.zeros(len(assets))
+        fills = [[] for _ in assets]
+        while remaining:
+            batch = []
+            for i, orders in remaining:
+                for order in orders:
+                    if order.open_amount == 0:
+                        continue
+
+                    order.check_triggers(prices[i], dt)
+                    if order.triggered:
+                        batch.append((i, orders, order))
+                        break
+            if not batch:
+                break
+
+            locs = np.array([i for i, _, _ in batch], dtype=int)
+            batch_orders = [order for _, _, order in batch]
+            execution_prices, execution_amounts, exceeded = \
+                self._batch_fills(
+                    prices[locs],
+                    volumes[locs],
+                    volume_for_bar[locs],
+                    np.array([o.amount for o in batch_orders], dtype=float),
+                    np.array(
+                        [o.open_amount for o in batch_orders],
+                        dtype=float,
+                    ),
+                    np.array(
+                        [o.direction for o in batch_orders],
+                        dtype=float,
+                    ),
+                    np.array(
+                        [np.nan if o.limit is None else o.limit
+                         for o in batch_orders],
+                        dtype=float,
+                    ),
+                )
+
+            remaining = []
+            for (i, orders, order), price, amount, stop in zip(
+                    batch,
+                    execution_prices,
+                    execution_amounts,
+                    exceeded):
+                if stop:
+                    # LiquidityExceeded, the asset takes no more orders.
+                    continue
+                if not np.isnan(price):
+                    txn = create_transaction(order, dt, price, amount)
+                    volume_for_bar[i] += abs(txn.amount)
+                    fills[i].append((order, txn))
+                remaining.append((i, orders))
+
+        for asset_fills in fills:
+            for order, txn in asset_fills:
+                yield order, txn
+
     def asdict(self):
         return self.__dict__
 
@@ -253,6 +389,46 @@ class VolumeShareSlippage(SlippageModel):
             math.copysign(cur_volume, order.direction)
         )
 
+    def _batch_fills(self,
+                     prices,
+                     volumes,
+                     volume_for_bar,
+                     amounts,
+                     open_amounts,
+                     directions,
+                     limits):
+        """
+        ``process_order`` for one order of each of many assets.
+
+        Returns the execution prices, nan where there is no fill, the
+        execution amounts, and where the volume of the bar is exhausted.
+        """
+        max_volume = self.volume_limit * volumes
+        remaining_volume = max_volume - volume_for_bar
+        exceeded = remaining_volume < 1
+
+        cur_volume = np.floor(
+            np.minimum(remaining_volume, np.abs(open_amounts)),
+        )
+        total_volume = volume_for_bar + cur_volume
+        volume_share = np.minimum(total_volume / volumes, self.volume_limit)
+
+        simulated_impact = volume_share ** 2 \
+            * np.copysign(self.price_impact, directions) \
+            * prices
+        impacted_prices = prices + simulated_impact
+
+        filled = (cur_volume >= 1) & ~fill_prices_worse_than_limit_prices(
+            impacted_prices,
+            directions,
+            limits,
+        )
+        return (
+            np.where(filled, impacted_prices, np.nan),
+            np.copysign(cur_volume, directions),
+            exceeded,
+        )
+
 
 class FixedSlippage(SlippageModel):
     """
@@ -280,6 +456,20 @@ class FixedSlippage(SlippageModel):
             order.amount
         )
 
+    def _batch_fills(self,
+                     prices,
+                     volumes,
+                     volume_for_bar,
+                     amounts,
+                     open_amounts,
+                     directions,
+                     limits):
+        return (
+            prices + (self.spread / 2.0 * directions),
+            amounts,
+            np.zeros(len(prices), dtype=bool),
+        )
+
 
 class MarketImpactBase(SlippageModel):
     """
@@ -289,9 +479,17 @@ class MarketImpactBase(SlippageModel):
 
     NO_DATA_VOLATILITY_SLIPPAGE_IMPACT = 10.0 / 10000
 
+    # The number of days of history for the mean volume and volatility.
+    WINDOW_LENGTH = 20
+
     def __init__(self):
         super(MarketImpactBase, self).__init__()
-        self._window_data_cache = ExpiringCache()
+        # The mean volume and volatility of the assets seen in the current
+        # session, at the location of each asset in ``_window_locs``.
+        self._window_session = None
+        self._window_locs = {}
+        self._mean_volumes = np.array([])
+        self._volatilities = np.array([])
 
     @abstractmethod
     def get_txn_volume(self, data, order):
@@ -340,7 +538,9 @@ class MarketImpactBase(SlippageModel):
             return None, None
 
         minute_data = data.current(order.asset, ['volume', 'high', 'low'])
-        mean_volume, volatility = self._get_window_data(data, order.asset, 20)
+        mean_volume, volatility = self._get_window_data(
+            data, order.asset, self.WINDOW_LENGTH,
+        )
 
         # Price to use is the average of the minute bar's open and close.
         price = np.mean([minute_data['high'], minute_data['low']])
@@ -380,6 +580,75 @@ class MarketImpactBase(SlippageModel):
 
         return impacted_price, math.copysign(txn_volume, order.direction)
 
+    def simulate_many(self, data, orders_by_asset):
+        orders_by_asset = list(orders_by_asset)
+        # load the window data of all the assets together, instead of with
+        # the first order of each asset.
+        self._load_window_data(
+            data,
+            [asset for asset, _ in orders_by_asset],
+            self.WINDOW_LENGTH,
+        )
+        return super(MarketImpactBase, self).simulate_many(
+            data,
+            orders_by_asset,
+        )
+
+    def _load_window_data(self, data, assets, window_length):
+        """
+        Compute the trailing mean volume and volatility of close prices of
+        the assets not yet seen in the current session, with one history
+        call per field.
+
+        Parameters
+        ----------
+        data : The BarData from which to fetch the daily windows.
+        assets : The Assets whose data we are fetching.
+        window_length : Number of days of history used to calculate the mean
+            volume and close price volatility.
+        """
+        session = data.current_session
+        if session != self._window_session:
+            self._window_session = session
+            self._window_locs = {}
+            self._mean_volumes = np.array([])
+            self._volatilities = np.array([])
+
+        assets = [
+            asset for asset in set(assets) if asset not in self._window_locs
+        ]
+        if not assets:
+            return
+
+        try:
+            # Add a day because we want 'window_length' complete days,
+            # excluding the current day.
+            volume_history = data.history(
+                assets, 'volume', window_length + 1, '1d',
+            )
+            close_history = data.history(
+                assets, 'close', window_length + 1, '1d',
+            )
+        except HistoryWindowStartsBeforeData:
+            # If there is not enough data to do a full history call, use
+            # values as if there was no data.
+            mean_volumes = np.zeros(len(assets))
+            volatilities = np.full(len(assets), np.nan)
+        else:
+            # Exclude the first value of the percent change array because it
+            # is always just NaN.
+            close_volatility = close_history[:-1].pct_change()[1:].std(
+                skipna=False,
+            )
+            mean_volumes = volume_history[:-1].mean().reindex(assets).values
+            volatilities = (close_volatility * SQRT_252).reindex(assets).values
+
+        start = len(self._mean_volumes)
+        self._mean_volumes = np.concatenate([self._mean_volumes, mean_volumes])
+        self._volatilities = np.concatenate([self._volatilities, volatilities])
+        for loc, asset in enumerate(assets, start):
+            self._window_locs[asset] = loc
+
     def _get_window_data(self, data, asset, window_length):
         """
         Internal utility method to return the trailing mean volume over the
@@ -397,35 +666,9 @@ class MarketImpactBase(SlippageModel):
         -------
         (mean volume, volatility)
         """
-        try:
-            values = self._window_data_cache.get(asset, data.current_session)
-        except KeyError:
-            try:
-                # Add a day because we want 'window_length' complete days,
-                # excluding the current day.
-                volume_history = data.history(
-                    asset, 'volume', window_length + 1, '1d',
-                )
-                close_history = data.history(
-                    asset, 'close', window_length + 1, '1d',
-                )
-            except HistoryWindowStartsBeforeData:
-                # If there is not enough data to do a full history call, return
-                # values as if there was no data.
-                return 0, np.NaN
-
-            # Exclude the first value of the percent change array because it is
-            # always just NaN.
-            close_volatility = close_history[:-1].pct_change()[1:].std(
-                skipna=False,
-            )
-            values = {
-                'volume': volume_history[:-1].mean(),
-                'close': close_volatility * SQRT_252,
-            }
-            self._window_data_cache.set(asset, values, data.current_session)
-
-        return values['volume'], values['close']
+        self._load_window_data(data, [asset], window_length)
+        loc = self._window_locs[asset]
+        return self._mean_volumes[loc], self._volatilities[loc]
 
 
 class VolatilityVolumeShare(MarketImpactBase):
@@ -565,3 +808,22 @@ class FixedBasisPointsSlippage(SlippageModel):
             price + price * (self.percentage * order.direction),
             shares_to_fill * order.direction
         )
+
+    def _batch_fills(self,
+                     prices,
+                     volumes,
+                     volume_for_bar,
+                     amounts,
+                     open_amounts,
+                     directions,
+                     limits):
+        max_volume = np.floor(self.volume_limit * volumes)
+        shares_to_fill = np.minimum(
+            np.abs(open_amounts),
+            max_volume - volume_for_bar,
+        )
+        return (
+            prices + prices * (self.percentage * directions),
+            shares_to_fill * directions,
+            shares_to_fill == 0,
+        )
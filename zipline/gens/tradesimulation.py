@@ -231,7 +231,10 @@ class AlgorithmSimulator(object):
                     execute_order_cancellation_policy()
                     algo.validate_account_controls()
 
-                    yield self._get_daily_message(dt, algo, perf_tracker)
+                    daily_msg = \
+                        self._get_daily_message(dt, algo, perf_tracker)
+                    if daily_msg is not None:
+                        yield daily_msg
                 elif action == BEFORE_TRADING_START_BAR:
                     self.simulation_dt = dt
                     algo.on_dt_changed(dt)
@@ -241,7 +244,8 @@ class AlgorithmSimulator(object):
                     minute_msg = \
                         self._get_minute_message(dt, algo, perf_tracker)
 
-                    yield minute_msg
+                    if minute_msg is not None:
+                        yield minute_msg
 
         risk_message = perf_tracker.handle_simulation_end()
         yield risk_message
@@ -298,6 +302,10 @@ class AlgorithmSimulator(object):
         perf_message = perf_tracker.handle_market_close(
             dt, self.data_portal,
         )
+        if perf_message is None:
+            # the session went into the tracker's columnar results.
+            perf_tracker.results.record_vars(algo.recorded_vars)
+            return None
         perf_message['daily_perf']['recorded_vars'] = algo.recorded_vars
         return perf_message
 
@@ -310,6 +318,8 @@ class AlgorithmSimulator(object):
         minute_message = perf_tracker.handle_minute_close(
             dt, self.data_portal,
         )
+        if minute_message is None:
+            return None
 
         minute_message['minute_perf']['recorded_vars'] = rvars
         return minute_message
@@ -36,12 +36,17 @@ cdef class AdjustedArrayWindow:
     The `rounding_places` attribute is an integer used to specify the number of
     decimal places to which the data should be rounded, given that the data is
     of dtype float. If `rounding_places` is None, no rounding occurs.
+
+    The `applied_adjustments` attribute is the number of adjustments applied
+    to the data so far. When it does not change from one window to the next,
+    the rows shared by the two windows hold the same values.
     """
     cdef:
         # ctype must be defined by the file into which this is being copied.
         readonly databuffer data
         readonly dict view_kwargs
         readonly Py_ssize_t window_length
+        readonly Py_ssize_t applied_adjustments
         Py_ssize_t anchor, max_anchor, next_adj
         Py_ssize_t perspective_offset
         object rounding_places
@@ -77,6 +82,7 @@ cdef class AdjustedArrayWindow:
         self.max_anchor = data.shape[0]
 
         self.next_adj = self.pop_next_adj()
+        self.applied_adjustments = 0
         self.output = None
 
     cdef pop_next_adj(self):
@@ -131,6 +137,7 @@ cdef class AdjustedArrayWindow:
 
             for adjustment in self.adjustments[self.next_adj]:
                 adjustment.mutate(self.data)
+                self.applied_adjustments += 1
 
             self.next_adj = self.pop_next_adj()
 
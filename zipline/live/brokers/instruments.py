@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory index of a broker's instrument master, persisted as one .npy
+file per column so that it can be memory-mapped and loaded lazily.
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+
+INSTRUMENT_COLUMNS = {
+    'instrument_token': np.int64,
+    'tradingsymbol': np.unicode_,
+    'name': np.unicode_,
+    'exchange': np.unicode_,
+    'segment': np.unicode_,
+    'instrument_type': np.unicode_,
+    'expiry': 'datetime64[D]',
+    'strike': np.float64,
+    'lot_size': np.int64,
+    'tick_size': np.float64,
+}
+
+METADATA_FILE = 'metadata.json'
+
+
+class InstrumentIndex(object):
+    """
+    Lookup of instruments by tradingsymbol, by instrument token and by
+    (name, expiry, strike, instrument_type). Lookups return the row number
+    of the instrument, use `row` to get the instrument details.
+
+    Parameters
+    ----------
+    columns : dict[str -> np.ndarray]
+        The instrument master, one array per column in
+        `INSTRUMENT_COLUMNS`.
+    created : pd.Timestamp, optional
+        The time the instrument list was downloaded.
+    """
+    def __init__(self, columns, created=None):
+        self._columns = columns
+        self.created = created
+        self._by_symbol = None
+        self._by_token = None
+        self._by_contract = None
+
+    @classmethod
+    def from_frame(cls, df, created=None):
+        """
+        Build the index from the instrument lists as returned by the
+        broker API.
+        """
+        columns = {}
+        for name, dtype in INSTRUMENT_COLUMNS.items():
+            if name == 'expiry':
+                values = pd.to_datetime(df[name].replace('', np.nan)).values
+            elif dtype is np.unicode_:
+                values = df[name].fillna('').astype(str).values
+            else:
+                values = df[name].fillna(0).values
+            columns[name] = np.asarray(values).astype(dtype)
+        return cls(columns, created=created)
+
+    def write(self, path):
+        """
+        Persist the index as one .npy file per column under `path`.
+        """
+        if not os.path.exists(path):
+            os.makedirs(path)
+        for name, values in self._columns.items():
+            np.save(os.path.join(path, name + '.npy'), values)
+        created = None if self.created is None else str(self.created)
+        with open(os.path.join(path, METADATA_FILE), 'w') as f:
+            json.dump({'created': created,
+                       'columns': sorted(self._columns)}, f)
+
+    @classmethod
+    def read(cls, path):
+        """
+        Memory-map an index persisted by `write`. Nothing is parsed till
+        the first lookup.
+        """
+        with open(os.path.join(path, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        columns = {name: np.load(os.path.join(path, name + '.npy'),
+                                 mmap_mode='r')
+                   for name in metadata['columns']}
+        created = metadata['created']
+        if created is not None:
+            created = pd.Timestamp(created)
+        return cls(columns, created=created)
+
+    def __len__(self):
+        return len(self._columns['tradingsymbol'])
+
+    def column(self, name):
+        return self._columns[name]
+
+    @property
+    def by_symbol(self):
+        if self._by_symbol is None:
+            self._by_symbol = {
+                (exchange, symbol): i
+                for i, (exchange, symbol) in enumerate(zip(
+                    self._columns['exchange'].tolist(),
+                    self._columns['tradingsymbol'].tolist()))
+            }
+        return self._by_symbol
+
+    @property
+    def by_token(self):
+        if self._by_token is None:
+            self._by_token = {
+                token: i
+                for i, token in enumerate(
+                    self._columns['instrument_token'].tolist())
+            }
+        return self._by_token
+
+    @property
+    def by_contract(self):
+        if self._by_contract is None:
+            self._by_contract = {
+                key: i
+                for i, key in enumerate(zip(
+                    self._columns['name'].tolist(),
+                    self._columns['expiry'].tolist(),
+                    self._columns['strike'].tolist(),
+                    self._columns['instrument_type'].tolist()))
+            }
+        return self._by_contract
+
+    def lookup_symbol(self, tradingsymbol, exchange):
+        return self.by_symbol.get((exchange, tradingsymbol))
+
+    def lookup_token(self, instrument_token):
+        return self.by_token.get(instrument_token)
+
+    def lookup_contract(self, name, expiry, strike, instrument_type):
+        """
+        Look up a derivative contract. `expiry` can be anything accepted
+        by pd.Timestamp, `strike` is 0 for futures.
+        """
+        expiry = pd.Timestamp(expiry).date()
+        return self.by_contract.get(
+            (name, expiry, float(strike), instrument_type))
+
+    def row(self, i):
+        """
+        Returns
+        -------
+        dict
+            The instrument details at row `i`.
+        """
+        return {name: values[i] for name, values in self._columns.items()}
+
+    def expiries(self, segment, symbol_contains):
+        """
+        Sorted unique expiries of contracts in `segment` whose trading
+        symbols contain `symbol_contains`.
+        """
+        symbols = np.asarray(self._columns['tradingsymbol'])
+        mask = ((np.asarray(self._columns['segment']) == segment) &
+                (np.char.find(symbols, symbol_contains) >= 0))
+        expiries = np.unique(self._columns['expiry'][mask])
+        expiries = expiries[~pd.isnull(expiries)]
+        return sorted(pd.to_datetime(expiries).tz_localize('Etc/UTC'))
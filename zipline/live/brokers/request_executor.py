@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Thread pool backed executor for broker API requests, with a token bucket
+rate limiter shared across all endpoints and coalescing of identical
+in-flight requests.
+"""
+import time
+from threading import Lock
+from multiprocessing.pool import ThreadPool
+
+from zipline.utils.compat import monotonic
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket rate limiter.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added to the bucket per second, i.e. the sustained request
+        rate.
+    capacity : int
+        Maximum tokens in the bucket, i.e. the allowed burst size.
+    """
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError('rate must be positive, got {}'.format(rate))
+        self.rate = float(rate)
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last_refill = monotonic()
+        self._lock = Lock()
+
+    def _refill(self):
+        now = monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed*self.rate)
+
+    def try_acquire(self, tokens=1):
+        """
+        Take `tokens` from the bucket if available. Returns 0 on success,
+        else the time (in seconds) to wait before they will be available.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens = self._tokens - tokens
+                return 0
+            return (tokens - self._tokens)/self.rate
+
+    def acquire(self, tokens=1):
+        """
+        Block till `tokens` can be taken from the bucket.
+        """
+        wait = self.try_acquire(tokens)
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.try_acquire(tokens)
+
+
+class RequestExecutor(object):
+    """
+    Runs broker API calls on a pool of worker threads. Every call takes a
+    token from a shared rate limiter before it hits the network, so
+    requests are spread at the allowed rate instead of serialized behind
+    fixed sleeps.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of worker threads.
+    rate : float
+        Sustained requests per second across all endpoints.
+    burst : int
+        Number of requests allowed back to back.
+
+    Notes
+    -----
+    The futures returned are :class:`multiprocessing.pool.AsyncResult`
+    objects: call ``get`` to wait for (or re-raise from) the request.
+    """
+    def __init__(self, max_workers=4, rate=3, burst=3):
+        self.rate_limiter = TokenBucket(rate, burst)
+        self._pool = ThreadPool(max_workers)
+        self._in_flight = {}
+        self._lock = Lock()
+
+    def _rate_limited(self, f, args, kwargs):
+        self.rate_limiter.acquire()
+        return f(*args, **kwargs)
+
+    def submit(self, f, *args, **kwargs):
+        """
+        Schedule the call ``f(*args, **kwargs)`` and return a future.
+        """
+        return self._pool.apply_async(self._rate_limited, (f, args, kwargs))
+
+    def _coalesced(self, key, f, args, kwargs):
+        try:
+            return self._rate_limited(f, args, kwargs)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def coalesce(self, key, f, *args, **kwargs):
+        """
+        Schedule the call ``f(*args, **kwargs)`` unless a request with the
+        same `key` is already in flight, in which case the future of that
+        request is returned, so concurrent callers share one fetch.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._pool.apply_async(self._coalesced,
+                                                (key, f, args, kwargs))
+                self._in_flight[key] = future
+        return future
+
+    def call(self, f, *args, **kwargs):
+        """
+        Run ``f(*args, **kwargs)`` on the pool and wait for the result.
+        """
+        return self.submit(f, *args, **kwargs).get()
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
@@ -5,6 +5,7 @@ import os
 import pandas as pd
 import time
 import logging
+from collections import OrderedDict
 from sqlalchemy import create_engine
 
 from kiteconnect import KiteConnect
@@ -16,6 +17,8 @@ sys.path.insert(0, zp_path)
 # TODO: End of hack part
 
 from zipline.live.brokers.brokers import Broker, AuthenticationError, OrdersError, InstrumentsError
+from zipline.live.brokers.request_executor import RequestExecutor
+from zipline.live.brokers.instruments import InstrumentIndex
 from zipline.live.finance.order import LiveOrder
 from zipline.live.finance.assets import TradeOnlyAsset, AssetType
 
@@ -30,6 +33,8 @@ logging.basicConfig(level=logging.DEBUG)
 
 ZERODHA_MINIMUM_COST_PER_EQUITY_TRADE = 0.0
 ZERODHA_MINIMUM_COST_PER_FUTURE_TRADE = 20.0
+ZERODHA_API_RATE_LIMIT = 3
+ZERODHA_INSTRUMENTS = 'zerodha_instruments'
 WORKSPACE = 'C:/Users/academy.academy-72/Desktop/dev platform/data/LIVE/WORKSPACE'
 
 
@@ -47,12 +52,23 @@ class ZerodhaBroker(Broker):
         
         self.kite = KiteConnect(api_key=self.api_key)
         self.login_is_valid = False
-        self.initialize(*args, **kwargs)
         
-        self._orderbook = []
-        self._open_orders = []
-        self._positionbook = []
+        # all kite calls go through the executor, which rate limits them
+        # with a token bucket shared across the end-points.
+        self.executor = RequestExecutor(
+                max_workers=kwargs.pop('max_workers', 4),
+                rate=kwargs.pop('api_rate_limit', ZERODHA_API_RATE_LIMIT),
+                burst=kwargs.pop('api_burst', ZERODHA_API_RATE_LIMIT))
+        
+        # books are keyed by broker order ID / position key and kept in
+        # sync incrementally, see `update_orderbook`.
+        self._orderbook = OrderedDict()
+        self._open_orders = OrderedDict()
+        self._positionbook = OrderedDict()
         self._transactions = []
+        self._order_fingerprints = {}
+        self._position_fingerprints = {}
+        self._fills = []
         
         self.workspace = WORKSPACE
         self.bundle_path = kwargs.pop('bundle_path', None)
@@ -60,13 +76,16 @@ class ZerodhaBroker(Broker):
         engine = create_engine(asset_db_path)
         self.asset_finder = AssetFinder(engine)
         
-        self.last_api_call_dt = pd.Timestamp.now()
-        self.time_since_last_api_call = None
-        self.call_rate_limit_in_seconds = 2
+        # instrument master, and resolved symbols/assets for the session
+        self.instruments = None
+        self._symbol_to_asset_cache = {}
+        self._asset_to_symbol_cache = {}
         
         self.orderbook_needs_update = True
         self.positionbook_needs_update = True
         self.account_needs_update = True
+        
+        self.initialize(*args, **kwargs)
             
     @property
     def name(self):
@@ -85,14 +104,14 @@ class ZerodhaBroker(Broker):
         if self.orderbook_needs_update:
             self.update_orderbook()
             
-        return self._orderbook
+        return list(self._orderbook.values())
     
     @property
     def open_orders(self):
         if self.orderbook_needs_update:
             self.update_orderbook()
             
-        return self._open_orders
+        return list(self._open_orders.values())
     
     @property
     def transactions(self):
@@ -106,7 +125,7 @@ class ZerodhaBroker(Broker):
         if self.positionbook_needs_update:
             self.update_positionbook()
             
-        return self._positionbook
+        return list(self._positionbook.values())
     
     def initialize(self, *args, **kwargs):
         if not self.validate_login():
@@ -115,14 +134,17 @@ class ZerodhaBroker(Broker):
         if not self.validate_login():
             raise AuthenticationError('Cannot log in to Kite')
             
+        # the orderbook is synced on first use, after any orders recovered
+        # from a journal are seeded, see `seed_orders`.
         try:
-            self.save_instruments_list()
-            self.update_orderbook()
+            self.load_instruments_list()
             self.update_positionbook()
-            self.update_transactions()
             self.update_account()
         except:
             logging.warning("Initialization was not complete")
+            
+    def close(self):
+        self.executor.close()
     
     def authenticate(self, *args, **kwargs):
         request_token = kwargs.pop('request_token', self.request_token)
@@ -152,7 +174,7 @@ class ZerodhaBroker(Broker):
         
         if self.kite.access_token:
             try:
-                self.kite.margins('NSE')
+                self.executor.call(self.kite.margins, 'NSE')
                 login_is_valid = True
                 self.login_is_valid = login_is_valid
             except KiteExceptions.TokenException:
@@ -163,6 +185,28 @@ class ZerodhaBroker(Broker):
         return self.login_is_valid
             
     def order(self, asset, amount, style, tag):
+        """
+        Place an order and wait for the broker order ID. Use `submit_order`
+        to place orders (e.g. legs of a basket) without waiting. Raises the
+        error of the broker if the order placement failed.
+        """
+        return self.submit_order(asset, amount, style, tag).get()
+    
+    def submit_order(self, asset, amount, style, tag):
+        """
+        Parameters
+        ----------
+        asset : asset to be ordered
+        amount: amount in terms of notionals
+        style: style of the order - market, limit, stop, stop-limit etc.
+        tag: tag for the order
+
+        Returns
+        -------
+        future
+            An AsyncResult which resolves to the broker order ID. Its `get`
+            re-raises the error of the broker if the order placement failed.
+        """
         is_buy = amount>0
         
         tradingsymbol = self.asset_to_symbol(asset)
@@ -186,113 +230,251 @@ class ZerodhaBroker(Broker):
             order_type = self.kite.ORDER_TYPE_STOP
         else:
             raise OrdersError("stop limit orders are not supported at present")
-       
+        
+        return self.executor.submit(self._place_order,
+                                    variety = self.kite.VARIETY_REGULAR,
+                                    exchange=exchange,
+                                    tradingsymbol=tradingsymbol,
+                                    transaction_type=transaction_type,
+                                    quantity=abs(amount),
+                                    product=product,
+                                    order_type=order_type,
+                                    price=limit, tag=tag)
+        
+    def _place_order(self, **order_params):
         try:
-            self.api_time_out()
-            order_id = self.kite.place_order(variety = self.kite.VARIETY_REGULAR,
-                            exchange=exchange,
-                            tradingsymbol=tradingsymbol,
-                            transaction_type=transaction_type,
-                            quantity=abs(amount),
-                            product=product,
-                            order_type=order_type,
-                            price=limit, tag=tag)
+            order_id = self.kite.place_order(**order_params)
 
             self.orderbook_needs_update = True
             self.positionbook_needs_update = True
             logging.info("Order placed. ID is: {}".format(order_id))
-        except Exception as e:
-            logging.warning("Order placement failed: {}".format(e.message))
+            return order_id
+        except Exception:
+            logging.exception("Order placement failed")
             self.handle_order_error()
+            raise
             
     def cancel(self, order_id):
         try:
-            self.api_time_out()
-            order_id = self.kite.cancel_order(self, 
+            order_id = self.executor.call(self.kite.cancel_order,
                         self.kite.VARIETY_REGULAR, 
                         order_id)
+            self.orderbook_needs_update = True
             logging.info("Order ID {} cancel request placed".format(order_id))
         except Exception as e:
-            logging.warning("Order cancellation failed: {}".format(e.message))
+            logging.warning("Order cancellation failed: {}".format(e))
             self.handle_order_error(order_id=order_id)
             
     def handle_order_error(self, *args, **kwargs):
         pass
     
     def update_positionbook(self):        
-        self._positionbook = []
+        # fetch both concurrently, and share in-flight fetches with any
+        # other caller asking for the same book.
+        positions = self.executor.coalesce('positions', self.kite.positions)
+        holdings = self.executor.coalesce('holdings', self.kite.holdings)
         
-        self.api_time_out()
-        positions = self.kite.positions()['net']
+        seen = set()
+        positions = positions.get()['net']
         if positions:
             for p in positions:
-                self._positionbook.append(self.dict_to_position(p))
+                seen.add(self._sync_position(('net', p['tradingsymbol'],
+                                              p.get('product')), p))
             
         # TODO: test it!
-        self.api_time_out()
-        holdings = self.kite.holdings()
+        holdings = holdings.get()
         if holdings:
             for p in holdings:
-                self._positionbook.append(self.dict_to_position(p))
+                seen.add(self._sync_position(('holdings', p['tradingsymbol'],
+                                              p.get('product')), p))
+        
+        for key in list(self._positionbook.keys()):
+            if key not in seen:
+                del self._positionbook[key]
+                del self._position_fingerprints[key]
             
         if not self._open_orders:
             self.positionbook_needs_update =False
+            
+    def _sync_position(self, key, position_dict):
+        """
+        Re-materialize a position only if its quantity or average price
+        changed, else just mark it to the latest price.
+        """
+        fingerprint = (position_dict['quantity'], position_dict['average_price'])
+        if self._position_fingerprints.get(key) == fingerprint:
+            self._positionbook[key].last_sale_price = position_dict['last_price']
+        else:
+            self._positionbook[key] = self.dict_to_position(position_dict)
+            self._position_fingerprints[key] = fingerprint
+        return key
 
     def update_orderbook(self):
-        self._orderbook = []
-        self._open_orders = []
+        """
+        Sync the orderbook with the broker. Orders are keyed by the broker
+        order ID and a fingerprint of their status and filled quantity, so
+        only new or changed orders are touched. Any increase in filled
+        quantity is recorded as a fill, see `pop_fills`. Orders the broker
+        no longer returns (e.g. those of an earlier trading day, or seeded
+        from a journal) are dropped from the books.
+        """
+        orders = self.executor.coalesce('orders', self.kite.orders).get()
+        orders = orders or []
         
-        self.api_time_out()
-        orders = self.kite.orders()
-        if not orders:
-            self.orderbook_needs_update = False
-            return
+        seen = set(o['order_id'] for o in orders)
+        for order_id in list(self._orderbook.keys()):
+            if order_id not in seen:
+                del self._orderbook[order_id]
+                self._open_orders.pop(order_id, None)
+                self._order_fingerprints.pop(order_id, None)
         
         for o in orders:
-            order = self.dict_to_order(o)
-            self._orderbook.append(order)
+            order_id = o['order_id']
+            fingerprint = self.order_fingerprint(o)
+            if self._order_fingerprints.get(order_id) == fingerprint:
+                continue
+            
+            order = self._orderbook.get(order_id)
+            if order is None:
+                order = self.dict_to_order(o)
+                self._orderbook[order_id] = order
+                prev_filled, prev_price = 0, 0
+            else:
+                prev_filled, prev_price = order.filled, order.price
+                self.update_order(order, o)
+            self._order_fingerprints[order_id] = fingerprint
+            
+            if order.filled > prev_filled:
+                self.record_fill(order, prev_filled, prev_price)
+            
             if order.status == ORDER_STATUS.OPEN:
-                self._open_orders.append(o)
+                self._open_orders[order_id] = order
+            else:
+                self._open_orders.pop(order_id, None)
         
         if not self._open_orders:
             self.orderbook_needs_update = False
+            
+    def order_fingerprint(self, order_dict):
+        return (order_dict['status'], order_dict['filled_quantity'])
+    
+    def update_order(self, order, order_dict):
+        """
+        Update an existing order in place from the broker order dict.
+        """
+        order.filled = order_dict['filled_quantity']*order_dict.get('multiplier',1)
+        order.status = self.order_status_map(order_dict['status'])
+        order.price = order_dict['average_price']
+        dt = order_dict.get('exchange_update_timestamp')
+        if dt:
+            order.dt = pd.Timestamp(dt).to_datetime()
+        
+    def record_fill(self, order, prev_filled, prev_price):
+        """
+        Record the increase in filled quantity of `order` as a transaction.
+        The average price reported by the broker is cumulative, so the
+        price of this fill is backed out from the previous average.
+        """
+        amount = order.filled - prev_filled
+        price = (order.price*order.filled - prev_price*prev_filled)/amount
+        txn = Transaction(order.asset, order.direction*amount, order.dt,
+                          price, order.id, self.commission)
+        self._transactions.append(txn)
+        self._fills.append((order, txn))
+        
+    def seed_orders(self, orders):
+        """
+        Reconcile the orderbook with orders recovered after a restart
+        (e.g. from a journal). Fills of these orders up to their recovered
+        filled quantity are not reported again; anything filled since is
+        reported as a fill on the next sync. Pending fills of orders not
+        in `orders` are dropped.
+        """
+        self._fills = []
+        for order in orders:
+            current = self._orderbook.get(order.id)
+            if current is None:
+                self._orderbook[order.id] = order
+                # no fingerprint: compared against the broker on next sync
+                self._order_fingerprints[order.id] = None
+                if order.open:
+                    self._open_orders[order.id] = order
+            elif current.filled > order.filled:
+                self.record_fill(current, order.filled, order.price)
+        self.orderbook_needs_update = True
         
-    def update_transactions(self):
-        self._transactions = []
-        
+    def pop_fills(self):
+        """
+        Returns
+        -------
+        list
+            A list of (order, transaction) tuples for the fills since the
+            last call.
+        """
         if self.orderbook_needs_update:
             self.update_orderbook()
         
-        if not self._orderbook:
-            return
+        fills, self._fills = self._fills, []
+        return fills
         
-        for o in self._orderbook:
-            self._transactions.append(self.transaction_from_order(o))
+    def update_transactions(self):
+        # transactions are recorded as fills while syncing the orderbook
+        if self.orderbook_needs_update:
+            self.update_orderbook()
             
     def update_account(self):
         pass
     
     def save_instruments_list(self):
         try:
-            cash = self.kite.instruments(exchange='NSE')
-            cash = pd.DataFrame(cash)
+            cash = self.executor.submit(self.kite.instruments, exchange='NSE')
+            fno = self.executor.submit(self.kite.instruments, exchange='NFO')
+            cash = pd.DataFrame(cash.get())
             cash = cash.loc[cash.segment=='NSE']
             
-            self.api_time_out()
-            fno = self.kite.instruments(exchange='NFO')
-            fno = pd.DataFrame(fno)
-            nifty = fno.loc[(fno.tradingsymbol.str.contains('NIFTY')) & (fno.segment=='NFO-FUT')]
-            expiries = sorted(set(pd.to_datetime(nifty.expiry.tolist()).tz_localize('Etc/UTC')))
-            self.monthly_expiries = expiries
-            banknifty = fno.loc[(fno.tradingsymbol.str.contains('BANKNIFTY')) & (fno.segment=='NFO-OPT')]
-            expiries = sorted(set(pd.to_datetime(banknifty.expiry.tolist()).tz_localize('Etc/UTC'))-set(expiries))
-            self.weekly_expiries = expiries
-            self.expiry = self.monthly_expiries[0]
+            fno = pd.DataFrame(fno.get())
             cash.to_csv(os.path.join(self.workspace,'zerodha_cash.csv.gz'),compression='gzip')
             fno.to_csv(os.path.join(self.workspace,'zerodha_fno.csv.gz'),compression='gzip')
+            
+            instruments = InstrumentIndex.from_frame(
+                    pd.concat([cash, fno], ignore_index=True),
+                    created=pd.Timestamp.now(tz=self.timezone))
+            instruments.write(os.path.join(self.workspace, ZERODHA_INSTRUMENTS))
         except:
             raise InstrumentsError('Failed to save instruments lists')
+        
+        self.set_instruments(instruments)
+            
+    def load_instruments_list(self):
+        """
+        Memory-map the instrument index saved earlier today, else download
+        and save a fresh one.
+        """
+        path = os.path.join(self.workspace, ZERODHA_INSTRUMENTS)
+        today = pd.Timestamp.now(tz=self.timezone).date()
+        try:
+            instruments = InstrumentIndex.read(path)
+        except (IOError, OSError, ValueError, KeyError):
+            instruments = None
+            
+        if instruments is None or instruments.created is None or \
+                instruments.created.date() != today:
+            self.save_instruments_list()
+        else:
+            self.set_instruments(instruments)
+            
+    def set_instruments(self, instruments):
+        self.instruments = instruments
+        self._symbol_to_asset_cache = {}
+        self._asset_to_symbol_cache = {}
+        
+        monthly = instruments.expiries('NFO-FUT', 'NIFTY')
+        self.monthly_expiries = monthly
+        weekly = instruments.expiries('NFO-OPT', 'BANKNIFTY')
+        self.weekly_expiries = sorted(set(weekly)-set(monthly))
+        self.expiry = self.monthly_expiries[0]
     
+
     def symbol_to_asset(self, tradingsymbol, expiry=None):
         """
         Parameters
@@ -304,17 +486,35 @@ class ZerodhaBroker(Broker):
         asset
             An object of type zipline Asset.
         """
+        key = (tradingsymbol, expiry)
+        try:
+            return self._symbol_to_asset_cache[key]
+        except KeyError:
+            pass
+        
+        asset = self._symbol_to_asset(tradingsymbol, expiry)
+        self._symbol_to_asset_cache[key] = asset
+        return asset
+    
+    def _symbol_to_asset(self, tradingsymbol, expiry=None):
         if not expiry:
             expiry = self.expiry
         
         segment_ticker = tradingsymbol.split(':')
         if len(segment_ticker) == 1:
             symbol = segment_ticker[0]
+            exchange = None
         elif len(segment_ticker) == 2:
+            exchange = segment_ticker[0]
             symbol = segment_ticker[1]
         else:
             raise OrdersError('Illegal trading symbol')
         
+        symbol = self._symbol_from_instruments(symbol, exchange, expiry)
+        if symbol is not None:
+            return self.asset_finder.lookup_symbol(symbol,pd.Timestamp.now().tz_localize('Etc/UTC'))
+        
+        symbol = segment_ticker[-1]
         symbol_expiry = symbol.split(expiry.strftime('%y%b').upper())
         if len(symbol_expiry) == 1:
             symbol = symbol_expiry[0]
@@ -354,6 +554,31 @@ class ZerodhaBroker(Broker):
         
         asset = self.asset_finder.lookup_symbol(symbol,pd.Timestamp.now().tz_localize('Etc/UTC'))
         return asset
+    
+    def _symbol_from_instruments(self, symbol, exchange, expiry):
+        """
+        Resolve a trading symbol to the zipline symbol using the instrument
+        index. Returns None if the index cannot resolve it.
+        """
+        if self.instruments is None:
+            return None
+        
+        exchanges = [exchange] if exchange else ['NSE', 'NFO']
+        for exchange in exchanges:
+            row = self.instruments.lookup_symbol(symbol, exchange)
+            if row is not None:
+                break
+        else:
+            return None
+        
+        instrument = self.instruments.row(row)
+        instrument_type = instrument['instrument_type']
+        if instrument_type == 'EQ':
+            return symbol
+        if instrument_type == 'FUT' and \
+                pd.Timestamp(instrument['expiry']).date() == expiry.date():
+            return instrument['name'] + '-I'
+        return None
             
     def asset_to_symbol(self, asset, with_segment=False):
         """
@@ -366,17 +591,30 @@ class ZerodhaBroker(Broker):
         tradingsymbol
             A string with the instrument symbol
         """
+        key = (asset, with_segment)
+        try:
+            return self._asset_to_symbol_cache[key]
+        except KeyError:
+            pass
         
         symbol = asset.symbol
         segment = 'NSE'
         
         if symbol[-2:] == '-I':
             segment = 'NFO'
-            symbol = symbol[:-2]+self.expiry.strftime('%y%b').upper()+'FUT'
+            row = None
+            if self.instruments is not None:
+                row = self.instruments.lookup_contract(symbol[:-2],
+                                                       self.expiry, 0, 'FUT')
+            if row is not None:
+                symbol = self.instruments.row(row)['tradingsymbol']
+            else:
+                symbol = symbol[:-2]+self.expiry.strftime('%y%b').upper()+'FUT'
             
         if(with_segment):
             symbol = segment+':'+symbol
         
+        self._asset_to_symbol_cache[key] = symbol
         return symbol
     
     def asset_to_exchange(self, asset):
@@ -400,22 +638,14 @@ class ZerodhaBroker(Broker):
         return segment
 
     def api_time_out(self,n=0):
+        """
+        Block till the shared rate limiter allows another API call. Calls
+        made through `self.executor` do this already.
+        """
         if n > 0:
             time.sleep(n)
         
-        if self.time_since_last_api_call:
-            return
-        
-        dt = pd.Timestamp.now()
-        self.time_since_last_api_call = pd.Timedelta(dt-self.last_api_call_dt).seconds
-        if self.time_since_last_api_call > self.call_rate_limit_in_seconds:
-            return
-        
-        sleep_time = self.call_rate_limit_in_seconds - self.time_since_last_api_call
-        if sleep_time > 0:
-            time.sleep(sleep_time)
-            
-        return
+        self.executor.rate_limiter.acquire()
     
     def order_status_map(self, order_status):
         if order_status == 'COMPLETE':
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+A DataPortal serving today's live minute bars on top of the bundle.
+"""
+import numpy as np
+
+from zipline.assets import Equity
+from zipline.data.data_portal import (
+    DataPortal,
+    DEFAULT_MINUTE_HISTORY_PREFETCH,
+)
+from zipline.data.dispatch_bar_reader import AssetDispatchMinuteBarReader
+from zipline.data.history_loader import MinuteHistoryLoader
+
+
+class LiveDataPortal(DataPortal):
+    """
+    A DataPortal for live trading. Spot values and minute history for the
+    current session come from the bars built from the live tick stream,
+    earlier minutes from the bundle.
+
+    Parameters
+    ----------
+    asset_finder : zipline.assets.assets.AssetFinder
+        The AssetFinder instance used to resolve assets.
+    trading_calendar: zipline.utils.calendar.exchange_calendar.TradingCalendar
+        The calendar instance used to provide minute->session information.
+    first_trading_day : pd.Timestamp
+        The first trading day for the simulation.
+    live_minute_reader : zipline.live.data.minute_bars.LiveMinuteBarReader
+        The reader of the live minute bars, used as the equity minute
+        reader.
+    **kwargs
+        Forwarded to DataPortal.
+    """
+    def __init__(self,
+                 asset_finder,
+                 trading_calendar,
+                 first_trading_day,
+                 live_minute_reader,
+                 **kwargs):
+        self._live_reader = live_minute_reader
+        super(LiveDataPortal, self).__init__(
+            asset_finder,
+            trading_calendar,
+            first_trading_day,
+            equity_minute_reader=live_minute_reader,
+            **kwargs
+        )
+
+        # The history loader caches (and prefetches) windows, which must
+        # not happen for bars still being built. Serve it from the bundle
+        # only, the current session is read from the live bars directly.
+        history_reader = live_minute_reader._history_reader
+        if history_reader is not None:
+            self._minute_history_loader = MinuteHistoryLoader(
+                self.trading_calendar,
+                AssetDispatchMinuteBarReader(
+                    self.trading_calendar,
+                    self.asset_finder,
+                    {Equity: history_reader},
+                    history_reader.last_available_dt,
+                ),
+                self._adjustment_reader,
+                self.asset_finder,
+                self._roll_finders,
+                prefetch_length=kwargs.get('minute_history_prefetch_length',
+                                           DEFAULT_MINUTE_HISTORY_PREFETCH),
+            )
+
+    def set_session(self, session):
+        """
+        Roll the live bars to a new session.
+        """
+        self._live_reader.set_session(session)
+
+    def _get_minute_window_data(self, assets, field, minutes_for_window):
+        session_open = self._live_reader.session_open
+        split = minutes_for_window.searchsorted(session_open)
+        if split == len(minutes_for_window):
+            return super(LiveDataPortal, self)._get_minute_window_data(
+                assets, field, minutes_for_window)
+
+        live = self._live_reader.load_raw_arrays(
+            [field],
+            minutes_for_window[split],
+            minutes_for_window[-1],
+            assets,
+        )[0]
+        if split == 0:
+            return live
+
+        history = super(LiveDataPortal, self)._get_minute_window_data(
+            assets, field, minutes_for_window[:split])
+        # adjust the history as seen from the end of the window, i.e.
+        # apply anything going ex today.
+        ratios = self.get_adjustments(assets, field,
+                                      minutes_for_window[split - 1],
+                                      minutes_for_window[-1])
+        return np.vstack([history * np.array(ratios), live])
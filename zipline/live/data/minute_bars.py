@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Aggregation of a live tick stream into minute bars, and a minute bar
+reader that serves those bars for the current session on top of the
+bundle's historical minute bars.
+"""
+import numpy as np
+import pandas as pd
+from logbook import Logger
+
+from zipline.data.bar_reader import NoDataOnDate
+from zipline.data.minute_bars import MinuteBarReader
+from zipline.gens.sim_engine import NANOS_IN_MINUTE
+
+log = Logger('LiveMinuteBars')
+
+OHLC = ('open', 'high', 'low', 'close')
+
+# sentinel for a ring buffer slot without a bar
+NO_BAR = -1
+
+
+class LiveMinuteBarBuilder(object):
+    """
+    Aggregates ticks into OHLCV minute bars, kept in preallocated ring
+    buffers of `capacity` minutes per sid. The slot of a minute is its
+    minute index (minutes since epoch) modulo `capacity`, and the minute
+    index of the bar held in each slot is stamped next to it, so reads and
+    writes of any minute are O(1) and old bars are overwritten in place.
+
+    Parameters
+    ----------
+    sids : iterable of int
+        The sids to build bars for. Ticks for any other sid are dropped.
+    capacity : int, optional
+        The number of minutes kept per sid. Defaults to one NSE session.
+    cumulative_volume : bool, optional
+        If True, the volume on the ticks is the cumulative volume for the
+        day (as sent by most broker feeds) rather than the traded quantity.
+    """
+    def __init__(self, sids, capacity=375, cumulative_volume=False):
+        self.sids = np.unique(np.asarray(list(sids), dtype=np.int64))
+        self.capacity = capacity
+        self.cumulative_volume = cumulative_volume
+        self._sid_rows = {sid: i for i, sid in enumerate(self.sids.tolist())}
+
+        shape = len(self.sids), capacity
+        self._prices = {field: np.full(shape, np.nan) for field in OHLC}
+        self._volume = np.zeros(shape, dtype=np.int64)
+        self._stamps = np.full(shape, NO_BAR, dtype=np.int64)
+
+        self._last_traded = np.full(len(self.sids), NO_BAR, dtype=np.int64)
+        self._day_volume = np.zeros(len(self.sids), dtype=np.int64)
+        self.last_minute = NO_BAR
+        self.dropped_ticks = 0
+
+    def reset(self):
+        """
+        Drop all bars, e.g. at the start of a new session.
+        """
+        for values in self._prices.values():
+            values.fill(np.nan)
+        self._volume.fill(0)
+        self._stamps.fill(NO_BAR)
+        self._last_traded.fill(NO_BAR)
+        self._day_volume.fill(0)
+        self.last_minute = NO_BAR
+
+    def _rows(self, sids):
+        if not len(self.sids):
+            return np.zeros(len(sids), dtype=np.int64), \
+                np.zeros(len(sids), dtype=bool)
+        rows = np.searchsorted(self.sids, sids)
+        rows[rows == len(self.sids)] = 0
+        return rows, self.sids[rows] == sids
+
+    def on_tick(self, dt, sid, price, volume):
+        """
+        Add a single tick to the bars.
+
+        Parameters
+        ----------
+        dt : pd.Timestamp
+            The time of the tick.
+        sid : int
+            The sid of the asset.
+        price : float
+            The traded price.
+        volume : int
+            The traded quantity, or the cumulative day volume if
+            `cumulative_volume` is set.
+        """
+        try:
+            row = self._sid_rows[sid]
+        except KeyError:
+            self.dropped_ticks += 1
+            return
+
+        if self.cumulative_volume:
+            volume, self._day_volume[row] = \
+                max(volume - self._day_volume[row], 0), volume
+
+        minute = dt.value // NANOS_IN_MINUTE
+        slot = minute % self.capacity
+        stamp = self._stamps[row, slot]
+        prices = self._prices
+
+        if stamp == minute:
+            if price > prices['high'][row, slot]:
+                prices['high'][row, slot] = price
+            if price < prices['low'][row, slot]:
+                prices['low'][row, slot] = price
+            prices['close'][row, slot] = price
+            self._volume[row, slot] += volume
+        elif stamp < minute:
+            for field in OHLC:
+                prices[field][row, slot] = price
+            self._volume[row, slot] = volume
+            self._stamps[row, slot] = minute
+        else:
+            # older than anything we keep
+            self.dropped_ticks += 1
+            return
+
+        if minute > self._last_traded[row]:
+            self._last_traded[row] = minute
+        if minute > self.last_minute:
+            self.last_minute = minute
+
+    def on_ticks(self, dts, sids, prices, volumes):
+        """
+        Add a batch of ticks to the bars. The ticks are grouped by
+        (sid, minute) with one sort, and each group is merged into the ring
+        buffers with a single vectorized update.
+
+        Parameters
+        ----------
+        dts : np.ndarray[int64]
+            The times of the ticks, in nanoseconds since epoch, in the
+            order they were received.
+        sids : np.ndarray[int64]
+        prices : np.ndarray[float64]
+        volumes : np.ndarray[int64]
+        """
+        dts = np.asarray(dts, dtype=np.int64)
+        sids = np.asarray(sids, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.int64)
+        if not len(dts):
+            return
+
+        rows, known = self._rows(sids)
+        if not known.all():
+            self.dropped_ticks += int((~known).sum())
+            dts, rows = dts[known], rows[known]
+            prices, volumes = prices[known], volumes[known]
+            if not len(dts):
+                return
+
+        minutes = dts // NANOS_IN_MINUTE
+        # stable sort by row, then minute, keeping the arrival order
+        order = np.lexsort((np.arange(len(dts)), minutes, rows))
+        rows, minutes = rows[order], minutes[order]
+        prices, volumes = prices[order], volumes[order]
+
+        if self.cumulative_volume:
+            volumes = self._volume_deltas(rows, volumes)
+
+        starts = np.flatnonzero(np.r_[
+            True, (rows[1:] != rows[:-1]) | (minutes[1:] != minutes[:-1])
+        ])
+        ends = np.r_[starts[1:], len(rows)] - 1
+
+        g_rows, g_minutes = rows[starts], minutes[starts]
+        g_open, g_close = prices[starts], prices[ends]
+        g_high = np.maximum.reduceat(prices, starts)
+        g_low = np.minimum.reduceat(prices, starts)
+        g_volume = np.add.reduceat(volumes, starts)
+
+        slots = g_minutes % self.capacity
+        stamps = self._stamps[g_rows, slots]
+
+        new = stamps < g_minutes
+        if new.any():
+            r, s = g_rows[new], slots[new]
+            self._prices['open'][r, s] = g_open[new]
+            self._prices['high'][r, s] = g_high[new]
+            self._prices['low'][r, s] = g_low[new]
+            self._prices['close'][r, s] = g_close[new]
+            self._volume[r, s] = g_volume[new]
+            self._stamps[r, s] = g_minutes[new]
+
+        update = stamps == g_minutes
+        if update.any():
+            r, s = g_rows[update], slots[update]
+            high, low = self._prices['high'], self._prices['low']
+            high[r, s] = np.fmax(high[r, s], g_high[update])
+            low[r, s] = np.fmin(low[r, s], g_low[update])
+            self._prices['close'][r, s] = g_close[update]
+            self._volume[r, s] += g_volume[update]
+
+        late = stamps > g_minutes
+        if late.any():
+            self.dropped_ticks += int((ends - starts + 1)[late].sum())
+
+        np.maximum.at(self._last_traded, g_rows, g_minutes)
+        self.last_minute = max(self.last_minute, int(g_minutes.max()))
+
+    def _volume_deltas(self, rows, volumes):
+        """
+        Convert cumulative day volumes, sorted by row, into traded
+        quantities per tick.
+        """
+        deltas = np.empty_like(volumes)
+        deltas[1:] = volumes[1:] - volumes[:-1]
+        firsts = np.r_[True, rows[1:] != rows[:-1]]
+        deltas[firsts] = volumes[firsts] - self._day_volume[rows[firsts]]
+        lasts = np.r_[rows[1:] != rows[:-1], True]
+        self._day_volume[rows[lasts]] = volumes[lasts]
+        return np.maximum(deltas, 0)
+
+    def has_sid(self, sid):
+        return sid in self._sid_rows
+
+    def get_value(self, sid, minute, field):
+        """
+        The value of `field` for the bar of `sid` at minute index `minute`.
+        Returns nan (0 for volume) if there is no bar.
+        """
+        row = self._sid_rows[sid]
+        slot = minute % self.capacity
+        if self._stamps[row, slot] != minute:
+            return 0 if field == 'volume' else np.nan
+        if field == 'volume':
+            return self._volume[row, slot]
+        return self._prices[field][row, slot]
+
+    def get_last_traded_minute(self, sid, minute):
+        """
+        The minute index of the last bar of `sid` at or before `minute`,
+        or NO_BAR if there is none in the buffers.
+        """
+        row = self._sid_rows[sid]
+        if self._last_traded[row] <= minute:
+            return self._last_traded[row]
+
+        stamps = self._stamps[row]
+        traded = stamps[(stamps <= minute) & (stamps != NO_BAR)]
+        if not len(traded):
+            return NO_BAR
+        return traded.max()
+
+    def load_raw_arrays(self, fields, minutes, sids):
+        """
+        Gather the bars at the minute indices `minutes` for `sids`.
+
+        Returns
+        -------
+        list of np.ndarray
+            One (len(minutes), len(sids)) array per field, nan (0 for
+            volume) where there is no bar.
+        """
+        minutes = np.asarray(minutes, dtype=np.int64)
+        sids = np.asarray(sids, dtype=np.int64)
+        rows, known = self._rows(sids)
+        slots = minutes % self.capacity
+
+        rows = rows[np.newaxis, :]
+        slots = slots[:, np.newaxis]
+        present = ((self._stamps[rows, slots] == minutes[:, np.newaxis]) &
+                   known[np.newaxis, :])
+
+        results = []
+        for field in fields:
+            if field == 'volume':
+                out = np.zeros(present.shape, dtype=np.uint32)
+                out[present] = self._volume[rows, slots][present]
+            else:
+                out = np.full(present.shape, np.nan)
+                out[present] = self._prices[field][rows, slots][present]
+            results.append(out)
+        return results
+
+
+class LiveMinuteBarReader(MinuteBarReader):
+    """
+    A MinuteBarReader serving the bars of a LiveMinuteBarBuilder for the
+    current session, and the bars of `history_reader` for earlier minutes.
+
+    Parameters
+    ----------
+    builder : LiveMinuteBarBuilder
+        The builder aggregating the live ticks.
+    trading_calendar : TradingCalendar
+        The calendar of the data.
+    session : pd.Timestamp
+        The current session label.
+    history_reader : MinuteBarReader, optional
+        The reader for minutes before the current session.
+    """
+    def __init__(self, builder, trading_calendar, session,
+                 history_reader=None):
+        self._builder = builder
+        self._trading_calendar = trading_calendar
+        self._history_reader = history_reader
+        self.set_session(session)
+
+    def set_session(self, session):
+        """
+        Roll the reader to a new session. Bars of the builder are only
+        served for minutes of this session.
+        """
+        self.session = session
+        self.session_open, self.session_close = \
+            self._trading_calendar.open_and_close_for_session(session)
+        self._open_minute = self.session_open.value // NANOS_IN_MINUTE
+
+    @property
+    def trading_calendar(self):
+        return self._trading_calendar
+
+    @property
+    def last_available_dt(self):
+        last_minute = self._builder.last_minute
+        if last_minute >= self._open_minute:
+            return pd.Timestamp(last_minute, tz='UTC', unit='m')
+        if self._history_reader is not None:
+            return self._history_reader.last_available_dt
+        return self.session_open
+
+    @property
+    def first_trading_day(self):
+        if self._history_reader is not None:
+            return self._history_reader.first_trading_day
+        return self.session
+
+    def _is_live(self, dt):
+        return dt >= self.session_open
+
+    def get_value(self, sid, dt, field):
+        if not self._is_live(dt):
+            if self._history_reader is None:
+                raise NoDataOnDate()
+            return self._history_reader.get_value(sid, dt, field)
+        if dt > self.session_close:
+            raise NoDataOnDate()
+        if not self._builder.has_sid(sid):
+            return 0 if field == 'volume' else np.nan
+        return self._builder.get_value(
+            int(sid), dt.value // NANOS_IN_MINUTE, field)
+
+    def get_last_traded_dt(self, asset, dt):
+        if self._is_live(dt) and self._builder.has_sid(int(asset)):
+            minute = self._builder.get_last_traded_minute(
+                int(asset), dt.value // NANOS_IN_MINUTE)
+            if minute >= self._open_minute:
+                return pd.Timestamp(minute, tz='UTC', unit='m')
+        if self._history_reader is None:
+            return pd.NaT
+        return self._history_reader.get_last_traded_dt(
+            asset, min(dt, self.session_open - pd.Timedelta(minutes=1)))
+
+    def load_raw_arrays(self, fields, start_dt, end_dt, sids):
+        minutes = self._trading_calendar.minutes_in_range(start_dt, end_dt)
+        split = minutes.searchsorted(self.session_open)
+
+        parts = []
+        if split > 0:
+            if self._history_reader is not None:
+                parts.append(self._history_reader.load_raw_arrays(
+                    fields, minutes[0], minutes[split - 1], sids))
+            else:
+                parts.append([
+                    np.zeros((split, len(sids)), dtype=np.uint32)
+                    if field == 'volume' else
+                    np.full((split, len(sids)), np.nan)
+                    for field in fields
+                ])
+        if split < len(minutes):
+            parts.append(self._builder.load_raw_arrays(
+                fields,
+                minutes[split:].asi8 // NANOS_IN_MINUTE,
+                [int(sid) for sid in sids]))
+
+        if len(parts) == 1:
+            return parts[0]
+        return [np.vstack(arrays) for arrays in zip(*parts)]
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Tick sources for the live minute bar builder.
+"""
+import numpy as np
+import pandas as pd
+
+
+class ReplayTickSource(object):
+    """
+    Replays ticks recorded in a CSV file, as a stand-in for a broker
+    market data feed.
+
+    Parameters
+    ----------
+    path : str
+        A CSV file with the columns `timestamp`, `sid`, `price` and
+        `volume`. Timestamps without a timezone are taken as UTC.
+
+    Notes
+    -----
+    Ticks are released in time order up to the time asked for by `feed`,
+    so the replay can be driven by the live clock or stepped through in
+    a test.
+    """
+    def __init__(self, path):
+        ticks = pd.read_csv(path, usecols=['timestamp', 'sid', 'price',
+                                           'volume'])
+        dts = pd.to_datetime(ticks['timestamp'], utc=True)
+        order = np.argsort(dts.values.astype(np.int64), kind='mergesort')
+
+        self.dts = dts.values.astype(np.int64)[order]
+        self.sids = ticks['sid'].values.astype(np.int64)[order]
+        self.prices = ticks['price'].values.astype(np.float64)[order]
+        self.volumes = ticks['volume'].values.astype(np.int64)[order]
+        self._pos = 0
+
+    def __len__(self):
+        return len(self.dts)
+
+    @property
+    def exhausted(self):
+        return self._pos >= len(self.dts)
+
+    def rewind(self):
+        self._pos = 0
+
+    def feed(self, builder, until):
+        """
+        Push all ticks up to and including `until` into `builder`.
+
+        Parameters
+        ----------
+        builder : LiveMinuteBarBuilder
+            The bar builder to feed.
+        until : pd.Timestamp
+            Release ticks up to this time.
+
+        Returns
+        -------
+        int
+            The number of ticks pushed.
+        """
+        end = self.dts.searchsorted(until.value, side='right')
+        start, self._pos = self._pos, max(self._pos, end)
+        if end <= start:
+            return 0
+        builder.on_ticks(self.dts[start:end],
+                         self.sids[start:end],
+                         self.prices[start:end],
+                         self.volumes[start:end])
+        return end - start
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only journal of live trading events with periodic snapshots, to
+rebuild the state of a live algorithm quickly after a restart.
+"""
+import os
+import pickle
+from logbook import Logger
+
+from zipline.finance.performance.position import Position
+from zipline.utils.cache import working_file
+from zipline.utils.paths import ensure_directory
+
+log = Logger('LiveJournal')
+
+JOURNAL_FILE = 'journal.pkl'
+SNAPSHOT_FILE = 'snapshot.pkl'
+
+# event kinds
+ORDER = 'order'
+FILL = 'fill'
+
+
+class LiveState(object):
+    """
+    The state rebuilt from a journal: orders by id, fills in the order they
+    happened and the positions that follow from the fills, by asset.
+    """
+    def __init__(self):
+        self.orders = {}
+        self.fills = []
+        self.positions = {}
+
+    def apply(self, kind, payload):
+        if kind == ORDER:
+            self.orders[payload.id] = payload
+        elif kind == FILL:
+            order, txn = payload
+            self.orders[order.id] = order
+            self.fills.append(txn)
+            position = self.positions.get(txn.asset)
+            if position is None:
+                position = Position(txn.asset)
+            position.update(txn)
+            if position.amount == 0:
+                self.positions.pop(position.asset, None)
+            else:
+                self.positions[position.asset] = position
+        else:
+            raise ValueError('Unknown journal event {}'.format(kind))
+
+    @property
+    def open_orders(self):
+        return [o for o in self.orders.values() if o.open]
+
+
+class LiveJournal(object):
+    """
+    Records order and fill events to an append-only journal, and
+    compacts it into a snapshot of the state every `snapshot_interval`
+    events.
+
+    Parameters
+    ----------
+    root : str
+        The directory for the journal and snapshot files.
+    snapshot_interval : int, optional
+        Number of events between snapshots.
+    sync : bool, optional
+        If True, fsync the journal after every event, so that events
+        survive a crash of the machine and not just of the process.
+
+    Notes
+    -----
+    Every event carries a sequence number and the snapshot records the
+    last one it includes, so a crash between writing a snapshot and
+    truncating the journal never applies an event twice. A torn last
+    record (the process died mid-write) is ignored on recovery.
+    """
+    def __init__(self, root, snapshot_interval=1000, sync=True):
+        ensure_directory(root)
+        self.root = root
+        self.snapshot_interval = snapshot_interval
+        self.sync = sync
+
+        self._torn_at = None
+        self.state, self.seq, self._events_since_snapshot = self._recover()
+        if self._torn_at is not None:
+            # drop the torn record, or everything appended after it would
+            # be unreadable.
+            with open(self._path(JOURNAL_FILE), 'r+b') as f:
+                f.truncate(self._torn_at)
+        self._journal = open(self._path(JOURNAL_FILE), 'ab')
+
+    def _path(self, name):
+        return os.path.join(self.root, name)
+
+    def _recover(self):
+        state, seq = LiveState(), 0
+        try:
+            with open(self._path(SNAPSHOT_FILE), 'rb') as f:
+                seq, state = pickle.load(f)
+        except (IOError, OSError):
+            pass
+
+        tail = 0
+        for event_seq, kind, payload in self._read_journal():
+            if event_seq <= seq:
+                continue
+            state.apply(kind, payload)
+            seq = event_seq
+            tail += 1
+
+        log.info('recovered live state at event {} ({} from the journal)'
+                 .format(seq, tail))
+        return state, seq, tail
+
+    def _read_journal(self):
+        try:
+            f = open(self._path(JOURNAL_FILE), 'rb')
+        except (IOError, OSError):
+            return
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            while True:
+                pos = f.tell()
+                if pos == size:
+                    return
+                try:
+                    yield pickle.load(f)
+                except Exception:
+                    log.warning('dropping a torn journal record at byte {}'
+                                .format(pos))
+                    self._torn_at = pos
+                    return
+
+    def record(self, kind, payload):
+        """
+        Append an event to the journal and apply it to the state.
+        """
+        self.seq += 1
+        pickle.dump((self.seq, kind, payload), self._journal,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+        self._journal.flush()
+        if self.sync:
+            os.fsync(self._journal.fileno())
+
+        self.state.apply(kind, payload)
+        self._events_since_snapshot += 1
+        if self._events_since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def record_order(self, order):
+        self.record(ORDER, order)
+
+    def record_fill(self, order, txn):
+        self.record(FILL, (order, txn))
+
+    def snapshot(self):
+        """
+        Write the state atomically to the snapshot file and start a new
+        journal.
+        """
+        with working_file(self._path(SNAPSHOT_FILE), dir=self.root) as wf:
+            with open(wf.path, 'wb') as f:
+                pickle.dump((self.seq, self.state), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._journal.close()
+        self._journal = open(self._path(JOURNAL_FILE), 'wb')
+        self._events_since_snapshot = 0
+
+    def close(self):
+        self._journal.close()
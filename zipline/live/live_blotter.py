@@ -6,21 +6,24 @@ Created on Thu May 10 14:36:16 2018
 """
 from logbook import Logger
 from collections import defaultdict
-from logbook import Logger
 
 from zipline.finance.blotter import Blotter
 from zipline.utils.input_validation import expect_types
 from zipline.assets import Asset
 from zipline.finance.cancel_policy import EODCancel
+from zipline.live.finance.order import LiveOrder
 
 
 log = Logger('LiveBlotter')
 warning_logger = Logger('LiveAlgoWarning')
 
 class LiveBlotter(Blotter):
-    def __init__(self, data_frequency, broker):
+    def __init__(self, data_frequency, broker, journal=None):
         self.broker = broker
         self.data_frequency = data_frequency
+        # optional zipline.live.journal.LiveJournal to record orders and
+        # fills to, see `restore`.
+        self.journal = journal
 
         # these orders are aggregated by asset
         self.open_orders = defaultdict(list)
@@ -75,7 +78,7 @@ class LiveBlotter(Blotter):
         -------
         order_id : str or None
             The unique identifier for this order, or None if no order was
-            placed.
+            placed, e.g. if the broker rejected it.
 
         Notes
         -----
@@ -100,10 +103,51 @@ class LiveBlotter(Blotter):
             raise OverflowError("Can't order more than %d shares" %
                                 self.max_shares)
 
-        order_id = self.broker.order(asset, amount, style, tag)
+        try:
+            order_id = self.broker.order(asset, amount, style, tag)
+        except Exception as e:
+            # a rejected order (margin, circuit limits, unknown symbol...)
+            # must not stop the algorithm.
+            log.warning('order of {} {} rejected by the broker: {}'.format(
+                amount, asset, e))
+            return None
+        if order_id is None:
+            return None
+
+        # same convention as the broker orders: unsigned amounts with
+        # the side in the direction.
+        is_buy = amount > 0
+        order = LiveOrder(self.current_dt, asset, abs(amount),
+                          stop=style.get_stop_price(is_buy),
+                          limit=style.get_limit_price(is_buy),
+                          id=order_id, tag=tag)
+        order.direction = 1 if is_buy else -1
+        order.broker_order_id = order_id
+
+        self.open_orders[asset].append(order)
+        self.orders[order_id] = order
+        self.new_orders.append(order)
+
+        if self.journal is not None:
+            self.journal.record_order(order)
 
         return order_id
 
+    def restore(self):
+        """
+        Rebuild the orders from the journal after a restart, then hand
+        them to the broker so that syncing its orderbook only reports the
+        fills that happened since they were journaled.
+        """
+        state = self.journal.state
+
+        self.orders = dict(state.orders)
+        self.open_orders = defaultdict(list)
+        for order in state.open_orders:
+            self.open_orders[order.asset].append(order)
+
+        self.broker.seed_orders(state.orders.values())
+
     def cancel(self, order_id, relay_status=True):
         if order_id not in self.orders:
             return
@@ -158,29 +202,25 @@ class LiveBlotter(Blotter):
 
     def get_transactions(self, bar_data):
         """
-        Creates a list of transactions based on the current open orders,
-        slippage model, and commission model.
+        Creates a list of transactions from the fills reported by the
+        broker since the last call. The broker syncs its orderbook
+        incrementally and only reports the change in filled quantity of
+        each order, so nothing is simulated here.
 
         Parameters
         ----------
         bar_data: zipline._protocol.BarData
 
-        Notes
-        -----
-        This method book-keeps the blotter's open_orders dictionary, so that
-         it is accurate by the time we're done processing open orders.
-
         Returns
         -------
         transactions_list: List
-            transactions_list: list of transactions resulting from the current
-            open orders.  If there were no open orders, an empty list is
+            transactions_list: list of transactions resulting from the fills
+            since the last call. If there were no fills, an empty list is
             returned.
 
         commissions_list: List
-            commissions_list: list of commissions resulting from filling the
-            open orders.  A commission is an object with "asset" and "cost"
-            parameters.
+            commissions_list: list of commissions resulting from the fills.
+            A commission is an object with "asset" and "cost" parameters.
 
         closed_orders: List
             closed_orders: list of all the orders that have filled.
@@ -190,31 +230,29 @@ class LiveBlotter(Blotter):
         transactions = []
         commissions = []
 
-        if self.open_orders:
-            for asset, asset_orders in iteritems(self.open_orders):
-                slippage = self.slippage_models[type(asset)]
-
-                for order, txn in \
-                        slippage.simulate(bar_data, asset, asset_orders):
-                    commission = self.commission_models[type(asset)]
-                    additional_commission = commission.calculate(order, txn)
-
-                    if additional_commission > 0:
-                        commissions.append({
-                            "asset": order.asset,
-                            "order": order,
-                            "cost": additional_commission
-                        })
-
-                    order.filled += txn.amount
-                    order.commission += additional_commission
-
-                    order.dt = txn.dt
-
-                    transactions.append(txn)
-
-                    if not order.open:
-                        closed_orders.append(order)
+        for order, txn in self.broker.pop_fills():
+            self.orders[order.id] = order
+            if self.journal is not None:
+                self.journal.record_fill(order, txn)
+
+            additional_commission = self.broker.commission.calculate(order, txn)
+            if additional_commission > 0:
+                commissions.append({
+                    "asset": order.asset,
+                    "order": order,
+                    "cost": additional_commission
+                })
+            order.commission += additional_commission
+
+            transactions.append(txn)
+
+            # the broker materializes its own order objects, replace ours
+            asset_orders = self.open_orders[order.asset]
+            asset_orders[:] = [o for o in asset_orders if o.id != order.id]
+            if order.open:
+                asset_orders.append(order)
+            else:
+                closed_orders.append(order)
 
         return transactions, commissions, closed_orders
 
@@ -10,6 +10,10 @@ import datetime
 import pytz
 import pandas as pd
 
+from zipline.utils.compat import monotonic
+
+SECONDS_IN_MINUTE = 60
+
 class ClockEvents(Enum):
     BAR = 0
     SESSION_START = 1
@@ -19,16 +23,55 @@ class ClockEvents(Enum):
     HEART_BEAT = 5
     END_CLOCK = 6
 
+
+class ClockLateness(object):
+    """
+    Running lateness statistics (in seconds) of the events emitted by the
+    clock, measured against the scheduled time of the event.
+    """
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self):
+        if self.count == 0:
+            return 0.0
+        return self.total/self.count
+
+    def update(self, lateness):
+        self.count = self.count + 1
+        self.last = lateness
+        self.total = self.total + lateness
+        self.max = max(self.max, lateness)
+
+    def __repr__(self):
+        return ('ClockLateness(count={}, last={:.3f}, mean={:.3f}, '
+                'max={:.3f})'.format(self.count, self.last, self.mean,
+                                     self.max))
+
+
 class RealTimeClock:
     def __init__(self,*args, **kwargs):
         self.lifetime = kwargs.pop('lifetime', 200)
         self.heartbeat = kwargs.pop('heartbeat', 5)
         self.timezone = kwargs.pop('timezone', 'Etc/UTC')
         self.market_open_time = kwargs.pop('market_open',datetime.time(9,15,0))
-        self.market_close_time = kwargs.pop('market_open',datetime.time(15,30,0))
+        self.market_close_time = kwargs.pop('market_close',
+                                            datetime.time(15, 30, 0))
         self.before_trading_start_minute = kwargs.pop('before_trading_start_minute',datetime.time(8,45,0))
         self.is_market_open = kwargs.pop('is_market_open', lambda x:True)
         self.minute_emission = kwargs.pop('minute_emission', True)
+        # if True, sleep till the exact minute boundaries instead of polling
+        # every heartbeat, and emit exactly one BAR per market minute.
+        self.minute_aligned = kwargs.pop('minute_aligned', False)
+        # optional callable(timestamp, event, lateness) to report lateness
+        self.on_lateness = kwargs.pop('on_lateness', None)
+
+        self.lateness = {}
+        self.last_bar_minute = None
         
         self.timestamp = None
         self.date = None
@@ -40,12 +83,41 @@ class RealTimeClock:
         
         self.get_time_now()
         
-    def get_time_now(self):
+    def get_time_now(self, epoch=None):
         tz = pytz.timezone(self.timezone)
-        dt = datetime.datetime.now(tz)
-        self.timestamp = pd.Timestamp(dt, tz= 'Etc/UTC')
+        if epoch is None:
+            dt = datetime.datetime.now(tz)
+        else:
+            dt = datetime.datetime.fromtimestamp(epoch, tz)
+        self.timestamp = pd.Timestamp(dt).tz_convert('Etc/UTC')
         self.date = dt.date()
         self.time = dt.time()
+
+    def record_lateness(self, event, scheduled):
+        """
+        Record how late (in seconds) an event is emitted compared to its
+        scheduled wall clock time (epoch seconds).
+        """
+        lateness = max(0.0, time.time() - scheduled)
+        if event not in self.lateness:
+            self.lateness[event] = ClockLateness()
+        self.lateness[event].update(lateness)
+        if self.on_lateness is not None:
+            self.on_lateness(self.timestamp, event, lateness)
+        return lateness
+
+    def sleep_until(self, epoch):
+        """
+        Sleep till the wall clock time `epoch` (seconds). The wait is
+        tracked on the monotonic clock so that system clock adjustments
+        or rounding of the sleep time do not make the clock drift.
+        """
+        deadline = monotonic() + (epoch - time.time())
+        while not self.kill:
+            time_left = deadline - monotonic()
+            if time_left <= 0:
+                return
+            time.sleep(min(time_left, self.heartbeat))
     
     def is_active_session(self):
         return self.is_market_open(self.date)
@@ -77,6 +149,7 @@ class RealTimeClock:
     def reset_clock(self):
         self.before_trading_start = True
         self.current_date = None
+        self.last_bar_minute = None
         self.kill = False
         
     def pause_clock(self):
@@ -87,6 +160,11 @@ class RealTimeClock:
         raise GeneratorExit
     
     def __iter__(self):
+        if self.minute_aligned:
+            return self._minute_aligned_events()
+        return self._heartbeat_events()
+
+    def _heartbeat_events(self):
         try:
             while not self.kill:
                 self.get_time_now()
@@ -125,6 +203,65 @@ class RealTimeClock:
         self.reset_clock()
         return
 
+    def _minute_aligned_events(self):
+        """
+        Emit events scheduled on exact minute boundaries. The clock wakes
+        up at each minute boundary (or at every heartbeat outside market
+        hours) and stamps events with the scheduled minute, not the time
+        it actually woke up. Minutes missed because the consumer was slow
+        are emitted once each, in order, and show up in the lateness.
+        """
+        try:
+            now = time.time()
+            scheduled = now - now % SECONDS_IN_MINUTE
+            while not self.kill:
+                self.get_time_now(scheduled)
+
+                if self.is_before_trading_start():
+                    self.before_trading_start = False
+                    self.record_lateness(
+                        ClockEvents.BEFORE_TRADING_START_BAR, scheduled)
+                    yield self.timestamp, ClockEvents.BEFORE_TRADING_START_BAR
+                if self.is_session_start():
+                    self.current_date = self.date
+                    self.record_lateness(ClockEvents.SESSION_START, scheduled)
+                    yield self.timestamp, ClockEvents.SESSION_START
+                if self.is_session_end():
+                    self.current_date = None
+                    self.before_trading_start = True
+                    self.record_lateness(ClockEvents.SESSION_END, scheduled)
+                    yield self.timestamp, ClockEvents.SESSION_END
+
+                in_session = self.is_in_session()
+                if in_session and self.last_bar_minute != scheduled:
+                    self.last_bar_minute = scheduled
+                    self.record_lateness(ClockEvents.BAR, scheduled)
+                    yield self.timestamp, ClockEvents.BAR
+                    if self.minute_emission:
+                        self.record_lateness(ClockEvents.MINUTE_END, scheduled)
+                        yield self.timestamp, ClockEvents.MINUTE_END
+                elif not in_session:
+                    self.get_time_now()
+                    yield self.timestamp, ClockEvents.HEART_BEAT
+
+                next_minute = scheduled + SECONDS_IN_MINUTE
+                now = time.time()
+                if in_session or next_minute - now <= self.heartbeat:
+                    # in session, every minute must be emitted once, even
+                    # if we are already past it.
+                    scheduled = next_minute
+                    self.sleep_until(scheduled)
+                else:
+                    self.sleep_until(now + self.heartbeat)
+                    now = time.time()
+                    scheduled = now - now % SECONDS_IN_MINUTE
+        except GeneratorExit:
+            self.reset_clock()
+            return
+        finally:
+            self.reset_clock()
+            return
+
 #realtime_clock = RealTimeClock(timezone='Asia/Calcutta')
 #i = 0
 #for t,e in realtime_clock:
@@ -2,7 +2,7 @@ from __future__ import print_function
 from zipline.assets import AssetFinder
 
 from .classifiers import Classifier, CustomClassifier
-from .engine import SimplePipelineEngine
+from .engine import IncrementalPipelineEngine, SimplePipelineEngine
 from .factors import Factor, CustomFactor
 from .filters import Filter, CustomFilter
 from .term import Term
@@ -56,6 +56,7 @@ __all__ = (
     'ExecutionPlan',
     'Factor',
     'Filter',
+    'IncrementalPipelineEngine',
     'Pipeline',
     'SimplePipelineEngine',
     'Term',
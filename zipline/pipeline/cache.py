@@ -0,0 +1,319 @@
+"""
+On-disk cache of the values of pipeline terms.
+
+The values of a term are stored as ``.npy`` files, one per range of dates
+computed, which are memory mapped when read back. They are stored under a
+key built from the signature of the term, the calendar, the assets and the
+timestamp of the data, so a term is only read back for the same definition
+computed over the same data.
+"""
+from hashlib import sha1
+import os
+from weakref import WeakKeyDictionary
+
+import numpy as np
+import pandas as pd
+from six import iteritems
+
+from zipline.assets import Asset
+from zipline.utils.cache import working_file
+from zipline.utils.paths import ensure_directory
+
+from .term import LoadableTerm, Term
+
+DATES_SUFFIX = '.dates.npy'
+
+
+class UnstableSignature(Exception):
+    """
+    Raised when a term depends on a value whose repr is not the same in every
+    process, e.g. a function passed as a param.
+    """
+
+
+def _code_signature(code):
+    parts = [repr(code.co_code), repr(code.co_names)]
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            parts.append(_code_signature(const))
+        else:
+            parts.append(repr(const))
+    return '(%s)' % ','.join(parts)
+
+
+def _class_signature(cls):
+    parts = ['%s.%s' % (cls.__module__, cls.__name__)]
+    # Editing the compute function of a custom term changes its values.
+    for name in 'compute', '_compute':
+        method = getattr(cls, name, None)
+        code = getattr(getattr(method, '__func__', method), '__code__', None)
+        if code is not None:
+            parts.append(_code_signature(code))
+    return '<%s>' % ','.join(parts)
+
+
+def _stable_repr(value, memo):
+    if isinstance(value, Term):
+        return term_signature(value, memo)
+    if isinstance(value, type):
+        return _class_signature(value)
+    if isinstance(value, Asset):
+        return 'Asset(%d)' % value.sid
+    if isinstance(value, (tuple, list)):
+        return '(%s)' % ','.join(_stable_repr(v, memo) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return '{%s}' % ','.join(sorted(_stable_repr(v, memo) for v in value))
+    if isinstance(value, dict):
+        return '{%s}' % ','.join(sorted(
+            '%s:%s' % (_stable_repr(k, memo), _stable_repr(v, memo))
+            for k, v in iteritems(value)
+        ))
+    if isinstance(value, np.dtype):
+        return str(value)
+
+    out = repr(value)
+    if ' at 0x' in out:
+        raise UnstableSignature(out)
+    return out
+
+
+def term_signature(term, memo=None):
+    """
+    Compute a signature of ``term`` which is the same in every process.
+
+    The signature is built from the identity of the term, which is what makes
+    two terms the same object within a process, with the inputs, mask and
+    other terms of the identity replaced by their own signature.
+
+    Parameters
+    ----------
+    term : zipline.pipeline.Term
+        The term to sign.
+
+    Returns
+    -------
+    signature : str
+        A hex digest.
+
+    Raises
+    ------
+    UnstableSignature
+        Raised when the identity of the term holds a value which can't be
+        represented the same way in another process.
+    """
+    if memo is None:
+        memo = {}
+    try:
+        return memo[term]
+    except KeyError:
+        pass
+    identity = getattr(term, '_identity', None)
+    if identity is None:
+        raise UnstableSignature(term)
+    out = memo[term] = sha1(
+        _stable_repr(identity, memo).encode('utf-8'),
+    ).hexdigest()
+    return out
+
+
+class TermCache(object):
+    """
+    A directory of the values of pipeline terms.
+
+    Parameters
+    ----------
+    root : str
+        The directory to store the values in.
+    calendar_name : str
+        The name of the calendar of the engine using the cache.
+    data_timestamp : pd.Timestamp
+        The time the data of the pipeline loaders was written, e.g. the
+        timestamp of the ingestion of the bundle. Values computed from other
+        data are not read back.
+
+    Notes
+    -----
+    Loadable terms and terms whose values are not plain numpy arrays, like
+    the ``LabelArray`` of string classifiers, are not cached.
+
+    The definition of a custom term is signed with the bytecode of its
+    ``compute`` method only. Editing a function that ``compute`` calls does
+    not change the signature, so the values stored before the edit are still
+    read back: clear the directory of the cache after such an edit.
+    """
+    def __init__(self, root, calendar_name, data_timestamp):
+        self.root = root
+        self.calendar_name = calendar_name
+        self.data_timestamp = pd.Timestamp(data_timestamp).value
+        self._signatures = WeakKeyDictionary()
+
+    def key(self, term, assets):
+        """
+        The key of the values of ``term`` for ``assets``.
+
+        Returns
+        -------
+        key : str or None
+            The name of the directory of the values of the term, or None if
+            the term can't be cached.
+        """
+        if isinstance(term, LoadableTerm):
+            return None
+        try:
+            signature = term_signature(term, self._signatures)
+        except UnstableSignature:
+            return None
+
+        out = sha1()
+        out.update(('%s|%s|%s|' % (
+            signature,
+            self.calendar_name,
+            self.data_timestamp,
+        )).encode('utf-8'))
+        out.update(np.asarray(assets, dtype='int64').tostring())
+        return out.hexdigest()
+
+    def _segments(self, key):
+        try:
+            names = os.listdir(os.path.join(self.root, key))
+        except OSError:
+            return []
+
+        out = []
+        for name in names:
+            if name.endswith(DATES_SUFFIX):
+                path = os.path.join(self.root, key, name)
+                out.append((np.load(path), path[:-len(DATES_SUFFIX)] + '.npy'))
+        return out
+
+    def _pieces(self, key, dates):
+        """
+        Find the stored ranges which cover ``dates``.
+
+        Returns
+        -------
+        pieces : list[(str, int, int)]
+            The path of a file of values with the rows to read from it, in the
+            order of ``dates``.
+        covered : np.ndarray[bool]
+            Whether each of ``dates`` is in one of ``pieces``.
+        """
+        dates = dates.values
+        segments = self._segments(key)
+        pieces = []
+        covered = np.zeros(len(dates), dtype=bool)
+        pos = 0
+        while pos < len(dates):
+            best = None
+            for segment_dates, path in segments:
+                start = segment_dates.searchsorted(dates[pos])
+                n = min(len(segment_dates) - start, len(dates) - pos)
+                if n <= 0 or (best is not None and n <= best[2] - best[1]):
+                    continue
+                if (segment_dates[start:start + n] ==
+                        dates[pos:pos + n]).all():
+                    best = path, start, start + n
+
+            if best is None:
+                pos += 1
+                continue
+            pieces.append(best)
+            n = best[2] - best[1]
+            covered[pos:pos + n] = True
+            pos += n
+
+        return pieces, covered
+
+    def covered(self, term, dates, assets):
+        """
+        Find the dates for which the values of ``term`` are stored.
+
+        Parameters
+        ----------
+        term : zipline.pipeline.Term
+            The term to look up.
+        dates : pd.DatetimeIndex
+            Consecutive sessions of the calendar.
+        assets : pd.Int64Index
+            The columns of the values.
+
+        Returns
+        -------
+        covered : np.ndarray[bool]
+            Whether the value of each of ``dates`` is stored.
+        """
+        key = self.key(term, assets)
+        if key is None:
+            return np.zeros(len(dates), dtype=bool)
+        return self._pieces(key, dates)[1]
+
+    def get(self, term, dates, assets):
+        """
+        Read the values of ``term``.
+
+        Parameters
+        ----------
+        term : zipline.pipeline.Term
+            The term to look up.
+        dates : pd.DatetimeIndex
+            Consecutive sessions of the calendar.
+        assets : pd.Int64Index
+            The columns of the values.
+
+        Returns
+        -------
+        values : np.ndarray or None
+            The values of ``term``, or None if they are not stored for every
+            one of ``dates``. Values read from a single file are a read-only
+            memory map of it.
+        """
+        key = self.key(term, assets)
+        if key is None:
+            return None
+        pieces, covered = self._pieces(key, dates)
+        if not covered.all():
+            return None
+
+        arrays = [
+            np.asarray(np.load(path, mmap_mode='r')[start:stop])
+            for path, start, stop in pieces
+        ]
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.concatenate(arrays)
+
+    def set(self, term, dates, assets, values):
+        """
+        Store the values of ``term``.
+
+        Parameters
+        ----------
+        term : zipline.pipeline.Term
+            The term computed.
+        dates : pd.DatetimeIndex
+            Consecutive sessions of the calendar, the rows of ``values``.
+        assets : pd.Int64Index
+            The columns of ``values``.
+        values : np.ndarray
+            The values of ``term``.
+        """
+        if type(values) is not np.ndarray or values.dtype == object:
+            return
+        key = self.key(term, assets)
+        if key is None:
+            return
+
+        directory = os.path.join(self.root, key)
+        ensure_directory(directory)
+        path = os.path.join(
+            directory,
+            '%d-%d' % (dates[0].value, dates[-1].value),
+        )
+        if os.path.exists(path + DATES_SUFFIX):
+            return
+
+        # The dates are written last, a range is only read once they exist.
+        for suffix, array in ('.npy', values), (DATES_SUFFIX, dates.values):
+            with working_file(path + suffix, dir=directory) as wf:
+                with open(wf.path, 'wb') as f:
+                    np.save(f, array)
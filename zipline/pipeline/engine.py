@@ -5,18 +5,29 @@ from abc import (
     ABCMeta,
     abstractmethod,
 )
+from collections import deque
+from multiprocessing.pool import ThreadPool
+import sys
 from uuid import uuid4
 
 from six import (
     iteritems,
+    itervalues,
+    reraise,
     with_metaclass,
 )
-from numpy import array
+from six.moves.queue import Queue
+from numpy import array, concatenate, diff, flatnonzero, ones
 from pandas import DataFrame, MultiIndex
 from toolz import groupby, juxt
 from toolz.curried.operator import getitem
 
-from zipline.lib.adjusted_array import ensure_adjusted_array, ensure_ndarray
+from zipline.lib.adjusted_array import (
+    AdjustedArray,
+    ensure_adjusted_array,
+    ensure_ndarray,
+)
+from zipline.lib.labelarray import LabelArray
 from zipline.errors import NoFurtherDataError
 from zipline.utils.numpy_utils import (
     as_column,
@@ -25,11 +36,16 @@ from zipline.utils.numpy_utils import (
 )
 from zipline.utils.pandas_utils import explode
 
+from .loaders import USEquityPricingLoader
 from .term import AssetExists, InputDates, LoadableTerm
 
 from zipline.utils.date_utils import compute_date_range_chunks
 from zipline.utils.pandas_utils import categorical_df_concat
-from zipline.utils.sharedoc import copydoc
+from zipline.utils.pool import (
+    fork_pool,
+    prepare_fork,
+    reopen_sqlite_connections,
+)
 
 
 class PipelineEngine(with_metaclass(ABCMeta)):
@@ -163,6 +179,25 @@ def default_populate_initial_workspace(initial_workspace,
     return initial_workspace
 
 
+# The engine, plans, loader factory and sqlite readers of the chunks computed
+# by the worker processes of ``SimplePipelineEngine.run_chunked_pipeline``,
+# set before the workers are forked.
+_chunk_state = None
+
+
+def _init_chunk_worker():
+    engine, _, make_loader, readers = _chunk_state
+    if make_loader is not None:
+        engine._get_loader = make_loader()
+        return
+    reopen_sqlite_connections(readers)
+
+
+def _run_chunk(index):
+    engine, plans, _, _ = _chunk_state
+    return engine._run_plan(plans[index])
+
+
 class SimplePipelineEngine(PipelineEngine):
     """
     PipelineEngine class that computes each term independently.
@@ -183,6 +218,14 @@ class SimplePipelineEngine(PipelineEngine):
         computing a pipeline. See
         :func:`zipline.pipeline.engine.default_populate_initial_workspace`
         for more info.
+    threads : int, optional
+        The number of threads used to compute terms which don't depend on
+        each other at the same time. Most of the work of a term happens in
+        numpy, which releases the GIL. Defaults to 1, which computes the terms
+        one after another.
+    term_cache : zipline.pipeline.cache.TermCache, optional
+        A cache of the values of terms. Terms found in it are not computed
+        again, and the terms computed are stored in it.
 
     See Also
     --------
@@ -195,13 +238,17 @@ class SimplePipelineEngine(PipelineEngine):
         '_root_mask_term',
         '_root_mask_dates_term',
         '_populate_initial_workspace',
+        '_threads',
+        '_term_cache',
     )
 
     def __init__(self,
                  get_loader,
                  calendar,
                  asset_finder,
-                 populate_initial_workspace=None):
+                 populate_initial_workspace=None,
+                 threads=1,
+                 term_cache=None):
         self._get_loader = get_loader
         self._calendar = calendar
         self._finder = asset_finder
@@ -212,6 +259,8 @@ class SimplePipelineEngine(PipelineEngine):
         self._populate_initial_workspace = (
             populate_initial_workspace or default_populate_initial_workspace
         )
+        self._threads = threads
+        self._term_cache = term_cache
 
     def run_pipeline(self, pipeline, start_date, end_date):
         """
@@ -281,6 +330,35 @@ class SimplePipelineEngine(PipelineEngine):
                 "start_date=%s, end_date=%s" % (start_date, end_date)
             )
 
+        plan = self._plan_pipeline(pipeline, start_date, end_date)
+        if self._term_cache is not None:
+            self._fill_term_cache(pipeline, plan)
+        return self._run_plan(plan)
+
+    def _plan_pipeline(self, pipeline, start_date, end_date, assets=None):
+        """
+        Build everything needed to compute ``pipeline`` between
+        ``start_date`` and ``end_date`` besides the terms themselves.
+
+        Parameters
+        ----------
+        pipeline : zipline.pipeline.Pipeline
+            The pipeline to run.
+        start_date : pd.Timestamp
+            Start date of the computed matrix.
+        end_date : pd.Timestamp
+            End date of the computed matrix.
+        assets : pd.Int64Index, optional
+            The columns of the root mask. Defaults to the assets which existed
+            between the dates.
+
+        Returns
+        -------
+        plan : tuple
+            The execution plan, the dates and assets of the root mask, the
+            initial workspace, the name of the screen column and the number
+            of extra rows of the root mask, as taken by ``_run_plan``.
+        """
         screen_name = uuid4().hex
         graph = pipeline.to_execution_plan(
             screen_name,
@@ -291,6 +369,8 @@ class SimplePipelineEngine(PipelineEngine):
         )
         extra_rows = graph.extra_rows[self._root_mask_term]
         root_mask = self._compute_root_mask(start_date, end_date, extra_rows)
+        if assets is not None:
+            root_mask = root_mask.reindex(columns=assets, fill_value=False)
         dates, assets, root_mask_values = explode(root_mask)
 
         initial_workspace = self._populate_initial_workspace(
@@ -303,7 +383,49 @@ class SimplePipelineEngine(PipelineEngine):
             dates,
             assets,
         )
+        return graph, dates, assets, initial_workspace, screen_name, extra_rows
 
+    def _fill_term_cache(self, pipeline, plan):
+        """
+        Compute the outputs of ``pipeline`` for the dates of ``plan`` which are
+        missing from the term cache, when it already has the others.
+
+        The missing ranges are computed for the assets of ``plan``, so that
+        the plan then finds all of its outputs in the cache.
+        """
+        graph, dates, assets, _, _, extra_rows = plan
+        sessions = dates[extra_rows:]
+        covered = ones(len(sessions), dtype=bool)
+        for term in itervalues(graph.outputs):
+            if term is self._root_mask_term:
+                continue
+            term_extra_rows = graph.extra_rows[term]
+            covered &= self._term_cache.covered(
+                term,
+                dates[extra_rows - term_extra_rows:],
+                assets,
+            )[term_extra_rows:]
+
+        if covered.all() or not covered.any():
+            return
+
+        # The boundaries of the runs of missing sessions.
+        changes = flatnonzero(diff(concatenate([[1], covered, [1]])))
+        for start, stop in zip(changes[::2], changes[1::2]):
+            missing = self._plan_pipeline(
+                pipeline,
+                sessions[start],
+                sessions[stop - 1],
+                assets=assets,
+            )
+            self.compute_chunk(*missing[:4])
+
+    def _run_plan(self, plan):
+        """
+        Compute the terms of a plan built by ``_plan_pipeline`` and return
+        the frame of results.
+        """
+        graph, dates, assets, initial_workspace, screen_name, extra_rows = plan
         results = self.compute_chunk(
             graph,
             dates,
@@ -319,15 +441,83 @@ class SimplePipelineEngine(PipelineEngine):
             assets,
         )
 
-    @copydoc(PipelineEngine.run_chunked_pipeline)
-    def run_chunked_pipeline(self, pipeline, start_date, end_date, chunksize):
+    def run_chunked_pipeline(self,
+                             pipeline,
+                             start_date,
+                             end_date,
+                             chunksize,
+                             processes=1,
+                             memory_budget=None,
+                             make_loader=None):
+        """
+        Compute values for `pipeline` in number of days equal to `chunksize`
+        and return stitched up result. Computing in chunks is useful for
+        pipelines computed over a long period of time.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline to run.
+        start_date : pd.Timestamp
+            The start date to run the pipeline for.
+        end_date : pd.Timestamp
+            The end date to run the pipeline for.
+        chunksize : int
+            The number of days to execute at a time.
+        processes : int, optional
+            The number of worker processes computing the chunks. The workers
+            are forked from this process, so more than one process requires
+            the 'fork' start method, which Windows does not have. Defaults to
+            1, which computes the chunks in this process, one after another.
+        memory_budget : int, optional
+            The number of bytes the chunks computed at the same time may use.
+            A chunk is assumed to use 8 bytes per day, asset and term of the
+            pipeline. At least one chunk is always computed at a time.
+            Defaults to no limit besides ``processes``.
+        make_loader : callable, optional
+            A function taking no arguments, called once in each worker process
+            to build the ``get_loader`` it uses, for example to open its own
+            connections to the data.
+            Defaults to the ``get_loader`` of this engine, inherited by the
+            workers, which reopen the sqlite connections of its loaders.
+
+        Returns
+        -------
+        result : pd.DataFrame
+            A frame of computed results.
+
+            The ``result`` columns correspond to the entries of
+            `pipeline.columns`, which should be a dictionary mapping strings to
+            instances of :class:`zipline.pipeline.term.Term`.
+
+            For each date between ``start_date`` and ``end_date``, ``result``
+            will contain a row for each asset that passed `pipeline.screen`.
+            A screen of ``None`` indicates that a row should be returned for
+            each asset that existed each day.
+
+        See Also
+        --------
+        :meth:`zipline.pipeline.engine.PipelineEngine.run_pipeline`
+        """
         ranges = compute_date_range_chunks(
             self._calendar,
             start_date,
             end_date,
             chunksize,
         )
-        chunks = [self.run_pipeline(pipeline, s, e) for s, e in ranges]
+        if processes > 1:
+            plans = [self._plan_pipeline(pipeline, s, e) for s, e in ranges]
+            if self._term_cache is not None:
+                for plan in plans:
+                    self._fill_term_cache(pipeline, plan)
+            chunks = list(self._run_chunks_in_processes(
+                plans,
+                processes,
+                memory_budget,
+                make_loader,
+            ))
+        else:
+            chunks = [self.run_pipeline(pipeline, s, e) for s, e in ranges]
 
         if len(chunks) == 1:
             # OPTIMIZATION: Don't make an extra copy in `categorical_df_concat`
@@ -336,6 +526,56 @@ class SimplePipelineEngine(PipelineEngine):
 
         return categorical_df_concat(chunks, inplace=True)
 
+    def _run_chunks_in_processes(self,
+                                 plans,
+                                 processes,
+                                 memory_budget,
+                                 make_loader):
+        """
+        Compute the plans of the chunks of a pipeline in a pool of forked
+        processes, yielding their results in date order.
+        """
+        global _chunk_state
+
+        in_flight = processes
+        if memory_budget is not None:
+            chunk_nbytes = max(
+                len(dates) * len(assets) * 8 * len(graph.graph)
+                for graph, dates, assets, _, _, _ in plans
+            )
+            in_flight = max(1, min(in_flight, memory_budget // chunk_nbytes))
+
+        loaders = []
+        if make_loader is None:
+            loaders = [
+                self._get_loader(term)
+                for graph, _, _, _, _, _ in plans
+                for term in graph.graph
+                if isinstance(term, LoadableTerm)
+            ]
+        readers = prepare_fork(loaders, self._finder)
+
+        # The plans are inherited by the workers, which are only sent the
+        # index of the chunk to compute.
+        _chunk_state = self, plans, make_loader, readers
+        try:
+            pool = fork_pool(in_flight, _init_chunk_worker)
+        except Exception:
+            _chunk_state = None
+            raise
+        try:
+            pending = deque()
+            for index in range(len(plans)):
+                if len(pending) == in_flight:
+                    yield pending.popleft().get()
+                pending.append(pool.apply_async(_run_chunk, (index,)))
+            while pending:
+                yield pending.popleft().get()
+        finally:
+            pool.terminate()
+            pool.join()
+            _chunk_state = None
+
     def _compute_root_mask(self, start_date, end_date, extra_rows):
         """
         Compute a lifetimes matrix from our AssetFinder, then drop columns that
@@ -470,6 +710,8 @@ class SimplePipelineEngine(PipelineEngine):
 
         # Copy the supplied initial workspace so we don't mutate it in place.
         workspace = initial_workspace.copy()
+        if self._term_cache is not None:
+            self._read_term_cache(graph, dates, assets, workspace)
         refcounts = graph.initial_refcounts(workspace)
         execution_order = graph.execution_order(refcounts)
 
@@ -486,6 +728,120 @@ class SimplePipelineEngine(PipelineEngine):
             (t for t in execution_order if t in loadable_terms),
         )
 
+        if self._threads > 1:
+            self._compute_terms_in_threads(
+                graph,
+                dates,
+                assets,
+                workspace,
+                refcounts,
+                loader_groups,
+                loader_group_key,
+            )
+        else:
+            self._compute_terms(
+                graph,
+                dates,
+                assets,
+                workspace,
+                refcounts,
+                loader_groups,
+                loader_group_key,
+            )
+
+        out = {}
+        graph_extra_rows = graph.extra_rows
+        for name, term in iteritems(graph.outputs):
+            # Truncate off extra rows from outputs.
+            out[name] = workspace[term][graph_extra_rows[term]:]
+        return out
+
+    def _dates_for_term(self, graph, dates, term):
+        return dates[
+            graph.extra_rows[self._root_mask_term] - graph.extra_rows[term]:
+        ]
+
+    def _read_term_cache(self, graph, dates, assets, workspace):
+        """
+        Add the terms found in the term cache to ``workspace``.
+
+        Only the terms needed to compute the outputs of ``graph`` are looked
+        up: the dependencies of a term found in the cache are not.
+        """
+        cache = self._term_cache
+        seen = set()
+        stack = list(itervalues(graph.outputs))
+        while stack:
+            term = stack.pop()
+            if term in seen or term in workspace:
+                continue
+            seen.add(term)
+
+            values = cache.get(
+                term,
+                self._dates_for_term(graph, dates, term),
+                assets,
+            )
+            if values is not None:
+                workspace[term] = values
+            else:
+                stack.extend(graph.graph.predecessors(term))
+
+    def _write_term_cache(self, term, dates, assets, values):
+        if self._term_cache is not None:
+            self._term_cache.set(term, dates, assets, values)
+
+    def _load_terms(self,
+                    term,
+                    loader_groups,
+                    loader_group_key,
+                    mask_dates,
+                    assets,
+                    mask):
+        """
+        Load ``term`` along with the terms sharing its loader and extra rows.
+        """
+        to_load = sorted(
+            loader_groups[loader_group_key(term)],
+            key=lambda t: t.dataset
+        )
+        return self._load_columns(
+            self.get_loader(term),
+            to_load,
+            mask_dates,
+            assets,
+            mask,
+        )
+
+    @staticmethod
+    def _load_columns(loader, columns, dates, assets, mask):
+        loaded = loader.load_adjusted_array(columns, dates, assets, mask)
+        assert set(loaded) == set(columns), (
+            'loader did not return an AdjustedArray for each column\n'
+            'expected: %r\n'
+            'got:      %r' % (sorted(columns), sorted(loaded))
+        )
+        return loaded
+
+    @staticmethod
+    def _check_computed(term, result, mask):
+        if term.ndim == 2:
+            assert result.shape == mask.shape
+        else:
+            assert result.shape == (mask.shape[0], 1)
+
+    def _compute_terms(self,
+                       graph,
+                       dates,
+                       assets,
+                       workspace,
+                       refcounts,
+                       loader_groups,
+                       loader_group_key):
+        """
+        Compute the terms of ``graph`` one after another, in topological
+        order.
+        """
         for term in graph.execution_order(refcounts):
             # `term` may have been supplied in `initial_workspace`, and in the
             # future we may pre-compute loadable terms coming from the same
@@ -504,20 +860,14 @@ class SimplePipelineEngine(PipelineEngine):
             )
 
             if isinstance(term, LoadableTerm):
-                to_load = sorted(
-                    loader_groups[loader_group_key(term)],
-                    key=lambda t: t.dataset
-                )
-                loader = get_loader(term)
-                loaded = loader.load_adjusted_array(
-                    to_load, mask_dates, assets, mask,
-                )
-                assert set(loaded) == set(to_load), (
-                    'loader did not return an AdjustedArray for each column\n'
-                    'expected: %r\n'
-                    'got:      %r' % (sorted(to_load), sorted(loaded))
-                )
-                workspace.update(loaded)
+                workspace.update(self._load_terms(
+                    term,
+                    loader_groups,
+                    loader_group_key,
+                    mask_dates,
+                    assets,
+                    mask,
+                ))
             else:
                 workspace[term] = term._compute(
                     self._inputs_for_term(term, workspace, graph),
@@ -525,22 +875,125 @@ class SimplePipelineEngine(PipelineEngine):
                     assets,
                     mask,
                 )
-                if term.ndim == 2:
-                    assert workspace[term].shape == mask.shape
-                else:
-                    assert workspace[term].shape == (mask.shape[0], 1)
+                self._check_computed(term, workspace[term], mask)
+                self._write_term_cache(
+                    term,
+                    mask_dates,
+                    assets,
+                    workspace[term],
+                )
 
                 # Decref dependencies of ``term``, and clear any terms whose
                 # refcounts hit 0.
                 for garbage_term in graph.decref_dependencies(term, refcounts):
                     del workspace[garbage_term]
 
-        out = {}
-        graph_extra_rows = graph.extra_rows
-        for name, term in iteritems(graph.outputs):
-            # Truncate off extra rows from outputs.
-            out[name] = workspace[term][graph_extra_rows[term]:]
-        return out
+    def _compute_terms_in_threads(self,
+                                  graph,
+                                  dates,
+                                  assets,
+                                  workspace,
+                                  refcounts,
+                                  loader_groups,
+                                  loader_group_key):
+        """
+        Compute the terms of ``graph`` in a pool of ``self._threads`` threads.
+
+        A term is started as soon as all of its inputs are in the workspace.
+        Loads, and every read or write of ``workspace`` and ``refcounts``,
+        happen in the calling thread; the threads only run ``Term._compute``.
+        The inputs of a term are removed from the workspace as soon as the
+        last term using them is computed.
+        """
+        dag = graph.graph
+        # The number of inputs of each term left to compute which are not
+        # yet in the workspace.
+        waiting = {
+            term: sum(1 for parent in dag.predecessors(term)
+                      if parent not in workspace)
+            for term in graph.execution_order(refcounts)
+            if term not in workspace
+        }
+        ready = [term for term, count in iteritems(waiting) if not count]
+        done = Queue()
+
+        def compute(term, inputs, mask_dates, mask):
+            try:
+                result = term._compute(inputs, mask_dates, assets, mask)
+            except BaseException:
+                done.put((term, None, mask, sys.exc_info()))
+            else:
+                done.put((term, result, mask, None))
+
+        def finished(terms):
+            for term in terms:
+                del waiting[term]
+            for term in terms:
+                for child in dag.successors(term):
+                    if child in waiting:
+                        waiting[child] -= 1
+                        if not waiting[child]:
+                            ready.append(child)
+
+        pool = ThreadPool(self._threads)
+        try:
+            while waiting:
+                while ready:
+                    term = ready.pop()
+                    if term in workspace:
+                        # Loaded along with another term of its group.
+                        continue
+
+                    mask, mask_dates = graph.mask_and_dates_for_term(
+                        term,
+                        self._root_mask_term,
+                        workspace,
+                        dates,
+                    )
+                    if isinstance(term, LoadableTerm):
+                        loaded = self._load_terms(
+                            term,
+                            loader_groups,
+                            loader_group_key,
+                            mask_dates,
+                            assets,
+                            mask,
+                        )
+                        workspace.update(loaded)
+                        finished([t for t in loaded if t in waiting])
+                    else:
+                        pool.apply_async(
+                            compute,
+                            (
+                                term,
+                                self._inputs_for_term(term, workspace, graph),
+                                mask_dates,
+                                mask,
+                            ),
+                        )
+
+                if not waiting:
+                    break
+
+                term, result, mask, exc_info = done.get()
+                if exc_info is not None:
+                    reraise(*exc_info)
+
+                self._check_computed(term, result, mask)
+                workspace[term] = result
+                self._write_term_cache(
+                    term,
+                    self._dates_for_term(graph, dates, term),
+                    assets,
+                    result,
+                )
+                for garbage_term in graph.decref_dependencies(term, refcounts):
+                    del workspace[garbage_term]
+                finished([term])
+        finally:
+            # Don't wait for the terms still running when one of them failed.
+            pool.terminate()
+            pool.join()
 
     def _to_narrow(self, terms, data, mask, dates, assets):
         """
@@ -636,3 +1089,187 @@ class SimplePipelineEngine(PipelineEngine):
                     implied=implied_shape,
                 )
             )
+
+
+def _move_adjustment(adjustment, first_row, last_row, first_col, last_col):
+    """
+    Copy ``adjustment`` to apply it to other rows and columns.
+    """
+    type_, args = adjustment.__reduce__()
+    return type_(first_row, last_row, first_col, last_col, *args[4:])
+
+
+class IncrementalPipelineEngine(SimplePipelineEngine):
+    """
+    PipelineEngine which computes a pipeline one day at a time, rolling the
+    windows of pricing data forward from one day to the next.
+
+    The windows of the columns loaded by a
+    :class:`~zipline.pipeline.loaders.USEquityPricingLoader` are kept after
+    each day. The next day, only the newest row and the adjustments which
+    take effect on that day are loaded, and the window is rolled forward
+    instead of being loaded again. Columns of other loaders are loaded in full
+    every day.
+
+    This is meant for live trading, where the pipeline is computed every
+    morning for the new day. It takes the same parameters as
+    :class:`~zipline.pipeline.engine.SimplePipelineEngine`.
+
+    Notes
+    -----
+    A window is loaded again when a day is skipped or when an asset enters the
+    universe. The windows of each length a column is used with are kept
+    apart.
+    """
+    __slots__ = ('_windows',)
+
+    def __init__(self, *args, **kwargs):
+        super(IncrementalPipelineEngine, self).__init__(*args, **kwargs)
+        # Map from column and number of rows to the last date, the assets and
+        # the AdjustedArray of its window. Pipelines using the same column
+        # over windows of different lengths each keep their own.
+        self._windows = {}
+
+    def run_pipeline(self, pipeline, start_date, end_date):
+        if end_date < start_date:
+            return super(IncrementalPipelineEngine, self).run_pipeline(
+                pipeline,
+                start_date,
+                end_date,
+            )
+
+        start, stop = self._calendar.slice_locs(start_date, end_date)
+        chunks = [
+            super(IncrementalPipelineEngine, self).run_pipeline(
+                pipeline,
+                session,
+                session,
+            )
+            for session in self._calendar[start:stop]
+        ]
+        if len(chunks) == 1:
+            return chunks[0]
+        return categorical_df_concat(chunks, inplace=True)
+
+    def _load_columns(self, loader, columns, dates, assets, mask):
+        load = super(IncrementalPipelineEngine, self)._load_columns
+        if not isinstance(loader, USEquityPricingLoader):
+            return load(loader, columns, dates, assets, mask)
+
+        rolling = [c for c in columns if self._can_roll(c, dates, assets)]
+        out = {}
+        if len(rolling) < len(columns):
+            out.update(load(
+                loader,
+                [c for c in columns if c not in rolling],
+                dates,
+                assets,
+                mask,
+            ))
+        if rolling:
+            newest = load(loader, rolling, dates[-1:], assets, mask[-1:])
+            for column in rolling:
+                out[column] = self._roll(
+                    column,
+                    newest[column],
+                    len(dates),
+                    assets,
+                )
+
+        for column, window in iteritems(out):
+            self._windows[column, len(dates)] = dates[-1], assets, window
+        return out
+
+    def _can_roll(self, column, dates, assets):
+        """
+        Whether the window of ``column`` can be rolled forward to end at the
+        last of ``dates``.
+        """
+        try:
+            last_date, window_assets, window = self._windows[
+                column,
+                len(dates),
+            ]
+        except KeyError:
+            return False
+
+        loc = self._calendar.get_loc(dates[-1])
+        if loc == 0 or self._calendar[loc - 1] != last_date:
+            return False
+        if isinstance(window.data, LabelArray):
+            return False
+        if assets.equals(window_assets):
+            return True
+        if not assets.isin(window_assets).all():
+            return False
+        # Adjustments spanning several assets can't be moved when some of
+        # the assets leave the window.
+        return all(
+            adjustment.first_col == adjustment.last_col
+            for adjustments in itervalues(window.adjustments)
+            for adjustment in adjustments
+        )
+
+    def _roll(self, column, newest, rows, assets):
+        """
+        Roll the window of ``column`` forward by the row of ``newest``.
+
+        Returns
+        -------
+        window : AdjustedArray
+            The same array the loader would return for the last ``rows``
+            dates.
+        """
+        _, window_assets, window = self._windows[column, rows]
+        drop = len(window.data) - (rows - 1)
+        if assets.equals(window_assets):
+            columns = None
+            data = window.data[drop:]
+        else:
+            positions = window_assets.get_indexer(assets)
+            data = window.data[drop:, positions]
+            columns = dict(zip(positions, range(len(assets))))
+
+        adjustments = {}
+        for row, old in iteritems(window.adjustments):
+            moved = []
+            for adjustment in old:
+                last_row = adjustment.last_row - drop
+                if last_row < 0:
+                    continue
+                first_col = adjustment.first_col
+                last_col = adjustment.last_col
+                if columns is not None:
+                    if first_col not in columns:
+                        continue
+                    first_col = last_col = columns[first_col]
+                moved.append(_move_adjustment(
+                    adjustment,
+                    max(adjustment.first_row - drop, 0),
+                    last_row,
+                    first_col,
+                    last_col,
+                ))
+            if moved:
+                adjustments[row - drop] = moved
+
+        # The loader sees the newest row as the first of its window, the
+        # adjustments taking effect that day apply to every row before it.
+        last = rows - 1
+        for row, new in iteritems(newest.adjustments):
+            adjustments.setdefault(row + last, []).extend(
+                _move_adjustment(
+                    adjustment,
+                    adjustment.first_row + last if adjustment.first_row else 0,
+                    adjustment.last_row + last,
+                    adjustment.first_col,
+                    adjustment.last_col,
+                )
+                for adjustment in new
+            )
+
+        return AdjustedArray(
+            concatenate([data, newest.data]),
+            adjustments,
+            window.missing_value,
+        )
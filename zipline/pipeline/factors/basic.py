@@ -29,6 +29,14 @@ from zipline.utils.numpy_utils import (
 )
 
 from .factor import CustomFactor
+from .kernels import (
+    AnnualizedVolatilityKernel,
+    AverageDollarVolumeKernel,
+    EWMAKernel,
+    EWMSTDKernel,
+    NanMeanKernel,
+    WeightedNanMeanKernel,
+)
 from ..mixins import SingleInputMixin
 
 
@@ -77,6 +85,7 @@ class SimpleMovingAverage(CustomFactor, SingleInputMixin):
     # nans, but they still returns the desired value (nan), so we ignore the
     # warning.
     ctx = ignore_nanwarnings()
+    kernel = NanMeanKernel
 
     def compute(self, today, assets, out, data):
         out[:] = nanmean(data, axis=0)
@@ -90,6 +99,8 @@ class WeightedAverageValue(CustomFactor):
 
     **Default Window Length:** None
     """
+    kernel = WeightedNanMeanKernel
+
     def compute(self, today, assets, out, base, weight):
         out[:] = nansum(base * weight, axis=0) / nansum(weight, axis=0)
 
@@ -135,6 +146,7 @@ class AverageDollarVolume(CustomFactor):
     **Default Window Length:** None
     """
     inputs = [EquityPricing.close, EquityPricing.volume]
+    kernel = AverageDollarVolumeKernel
 
     def compute(self, today, assets, out, close, volume):
         out[:] = nansum(close * volume, axis=0) / len(close)
@@ -358,6 +370,8 @@ class ExponentialWeightedMovingAverage(_ExponentialWeightedFactor):
     --------
     :func:`pandas.ewma`
     """
+    kernel = EWMAKernel
+
     def compute(self, today, assets, out, data, decay_rate):
         out[:] = average(
             data,
@@ -396,6 +410,7 @@ class ExponentialWeightedMovingStdDev(_ExponentialWeightedFactor):
     --------
     :func:`pandas.ewmstd`
     """
+    kernel = EWMSTDKernel
 
     def compute(self, today, assets, out, data, decay_rate):
         weights = exponential_weights(len(data), decay_rate)
@@ -456,6 +471,7 @@ class AnnualizedVolatility(CustomFactor):
     inputs = [Returns(window_length=2)]
     params = {'annualization_factor': 252.0}
     window_length = 252
+    kernel = AnnualizedVolatilityKernel
 
     def compute(self, today, assets, out, returns, annualization_factor):
         out[:] = nanstd(returns, axis=0) * (annualization_factor ** .5)
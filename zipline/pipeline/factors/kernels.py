@@ -0,0 +1,348 @@
+"""
+Incremental kernels for rolling-window factors.
+
+A kernel holds the state of a rolling-window computation over every column of
+the inputs of a factor. It is built from the full windows with ``reset`` and
+then moved forward one row at a time with ``update``, which is O(1) work per
+asset instead of the O(window_length) work of calling ``compute`` on every
+window.
+
+See Also
+--------
+zipline.pipeline.mixins.CustomTermMixin._compute_with_kernel
+"""
+from __future__ import division
+
+from numpy import (
+    abs,
+    arange,
+    clip,
+    float64,
+    isnan,
+    nan,
+    newaxis,
+    sqrt,
+    where,
+    zeros_like,
+)
+from scipy.stats import t as t_distribution
+
+
+# Variances smaller than this fraction of the mean of the squares are within
+# the rounding error of the running sums, e.g. on a window of constant values
+# summed with a stale shift, and are taken to be zero.
+_RELATIVE_EPSILON = 1.0e-10
+
+
+def _nan_to_zero(array):
+    return where(isnan(array), 0.0, array)
+
+
+def _variance(mean, mean_square):
+    variance = mean_square - mean ** 2
+    return where(variance <= _RELATIVE_EPSILON * mean_square, 0.0, variance)
+
+
+class RollingKernel(object):
+    """
+    Base class for kernels whose state is a set of sums over the rows of the
+    window.
+
+    Parameters
+    ----------
+    window_length : int
+        The number of rows in the window.
+    **params
+        The params of the factor.
+
+    Notes
+    -----
+    Subclasses implement ``_terms``, which maps rows of the inputs to the rows
+    to sum, and ``values``, which computes the outputs of the factor from
+    ``self.sums``. The sums flagged in ``decayed`` weigh a row ``k`` rows
+    older than the newest row by ``decay_rate ** k``.
+    """
+    decayed = ()
+
+    def __init__(self, window_length, **params):
+        self.window_length = window_length
+        self.params = params
+        if 'decay_rate' in params:
+            self.weights = (
+                params['decay_rate'] ** arange(window_length - 1, -1, -1.0)
+            )
+        self.sums = None
+
+    def _prepare(self, *windows):
+        """
+        Called with the full windows before the sums are computed from them.
+        """
+        pass
+
+    def _terms(self, *arrays):
+        """
+        Map rows of the inputs to the rows to sum.
+
+        Returns
+        -------
+        terms : tuple[np.ndarray]
+            An array with a row for each row of ``arrays`` for each sum.
+        """
+        raise NotImplementedError('_terms')
+
+    def values(self):
+        """
+        Compute the outputs of the factor for the current window.
+
+        Returns
+        -------
+        values : np.ndarray or dict[str -> np.ndarray]
+            The value for each column, or the values of each output of a
+            factor with multiple outputs.
+        """
+        raise NotImplementedError('values')
+
+    def reset(self, *windows):
+        """
+        Compute the sums from the full windows of the inputs.
+        """
+        self._prepare(*windows)
+        sums = []
+        for i, term in enumerate(self._terms(*windows)):
+            if i < len(self.decayed) and self.decayed[i]:
+                term = term * self.weights[:, newaxis]
+            sums.append(term.sum(axis=0))
+        self.sums = sums
+
+    def update(self, entering, leaving):
+        """
+        Move the window forward by a row.
+
+        Parameters
+        ----------
+        entering : list[np.ndarray]
+            The newest row of each input, as an array with a single row.
+        leaving : list[np.ndarray]
+            The row of each input which is no longer in the window, as an
+            array with a single row.
+        """
+        new = self._terms(*entering)
+        old = self._terms(*leaving)
+        sums = self.sums
+        for i in range(len(sums)):
+            if i < len(self.decayed) and self.decayed[i]:
+                decay_rate = self.params['decay_rate']
+                sums[i] = (
+                    decay_rate * (sums[i] - self.weights[0] * old[i][0]) +
+                    new[i][0]
+                )
+            else:
+                sums[i] = sums[i] + (new[i][0] - old[i][0])
+
+
+class NanMeanKernel(RollingKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.SimpleMovingAverage`.
+    """
+    def _terms(self, data):
+        missing = isnan(data)
+        return where(missing, 0.0, data), (~missing).astype(float64)
+
+    def values(self):
+        total, count = self.sums
+        return total / count
+
+
+class WeightedNanMeanKernel(RollingKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.WeightedAverageValue`.
+    """
+    def _terms(self, base, weight):
+        return _nan_to_zero(base * weight), _nan_to_zero(weight)
+
+    def values(self):
+        total, weight = self.sums
+        return total / weight
+
+
+class AverageDollarVolumeKernel(RollingKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.AverageDollarVolume`.
+    """
+    def _terms(self, close, volume):
+        return _nan_to_zero(close * volume),
+
+    def values(self):
+        return self.sums[0] / self.window_length
+
+
+class AnnualizedVolatilityKernel(RollingKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.AnnualizedVolatility`.
+    """
+    def _prepare(self, returns):
+        # Summing the distance to a value close to the mean avoids losing the
+        # precision of the variance to the difference of two large numbers.
+        self.shift = _nan_to_zero(returns[-1])
+
+    def _terms(self, returns):
+        missing = isnan(returns)
+        shifted = where(missing, 0.0, returns - self.shift)
+        return (~missing).astype(float64), shifted, shifted ** 2
+
+    def values(self):
+        count, total, squares = self.sums
+        variance = _variance(total / count, squares / count)
+        return sqrt(variance * self.params['annualization_factor'])
+
+
+class EWMAKernel(RollingKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.EWMA`.
+    """
+    decayed = (True, False)
+
+    def _terms(self, data):
+        missing = isnan(data)
+        return where(missing, 0.0, data), missing.astype(float64)
+
+    def values(self):
+        total, missing = self.sums
+        return where(missing > 0, nan, total / self.weights.sum())
+
+
+class EWMSTDKernel(RollingKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.EWMSTD`.
+    """
+    decayed = (True, True, False)
+
+    def _prepare(self, data):
+        self.shift = _nan_to_zero(data[-1])
+
+    def _terms(self, data):
+        missing = isnan(data)
+        shifted = where(missing, 0.0, data - self.shift)
+        return shifted, shifted ** 2, missing.astype(float64)
+
+    def values(self):
+        total, squares, missing = self.sums
+        weights = self.weights
+        weight_sum = weights.sum()
+
+        variance = _variance(total / weight_sum, squares / weight_sum)
+
+        squared_weight_sum = weight_sum ** 2
+        bias_correction = (
+            squared_weight_sum / (squared_weight_sum - (weights ** 2).sum())
+        )
+        return where(missing > 0, nan, sqrt(variance * bias_correction))
+
+
+class _CrossProductKernel(RollingKernel):
+    """
+    Base class for kernels of two inputs computed from their running sums,
+    sums of squares and sums of cross-products.
+
+    The second input may have a single column, which is paired with every
+    column of the first.
+    """
+    def _prepare(self, x, y):
+        self.shifts = _nan_to_zero(x[-1]), _nan_to_zero(y[-1])
+
+    def _terms(self, x, y):
+        x_shift, y_shift = self.shifts
+        x = x - x_shift
+        y = y - y_shift
+        missing = isnan(x * y)
+        x = where(missing, 0.0, x)
+        y = where(missing, 0.0, y)
+        return x, y, x * y, x ** 2, y ** 2, missing.astype(float64)
+
+    def _moments(self):
+        """
+        Returns
+        -------
+        x_mean, y_mean, x_var, y_var, cov, missing : np.ndarray
+            The means, biased variances and covariance of the columns of the
+            inputs, and the number of rows in which either is missing. A
+            variance within the rounding error of the sums is zero, and so is
+            the covariance with a column of zero variance.
+        """
+        x, y, xy, xx, yy, missing = self.sums
+        n = self.window_length
+        x_shift, y_shift = self.shifts
+        x_mean = x / n
+        y_mean = y / n
+        x_var = _variance(x_mean, xx / n)
+        y_var = _variance(y_mean, yy / n)
+        cov = where(
+            (x_var == 0.0) | (y_var == 0.0),
+            0.0,
+            xy / n - x_mean * y_mean,
+        )
+        return x_mean + x_shift, y_mean + y_shift, x_var, y_var, cov, missing
+
+
+class PearsonKernel(_CrossProductKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.RollingPearson`.
+    """
+    def values(self):
+        _, _, x_var, y_var, cov, missing = self._moments()
+        r_den = sqrt(x_var * y_var)
+        # as in scipy.stats.pearsonr, the correlation with a constant column
+        # is nan.
+        undefined = (missing > 0) | (r_den == 0.0)
+        r_value = clip(cov / where(undefined, 1.0, r_den), -1.0, 1.0)
+        return where(undefined, nan, r_value)
+
+
+class LinearRegressionKernel(_CrossProductKernel):
+    """
+    Kernel of :class:`zipline.pipeline.factors.RollingLinearRegression`.
+
+    The first input is the dependent variable, the second the independent
+    one. The values are computed as in :func:`scipy.stats.linregress`.
+    """
+    def _prepare(self, dependent, independent):
+        super(LinearRegressionKernel, self)._prepare(independent, dependent)
+
+    def _terms(self, dependent, independent):
+        return super(LinearRegressionKernel, self)._terms(
+            independent,
+            dependent,
+        )
+
+    def values(self):
+        x_mean, y_mean, x_var, y_var, cov, missing = self._moments()
+
+        r_den = sqrt(x_var * y_var)
+        r_value = clip(
+            where(r_den == 0.0, 0.0, cov / r_den),
+            -1.0,
+            1.0,
+        )
+        beta = cov / x_var
+        alpha = y_mean - beta * x_mean
+
+        df = self.window_length - 2
+        if df == 0:
+            p_value = where(y_var == 0.0, 1.0, 0.0)
+            stderr = zeros_like(r_value)
+        else:
+            tiny = 1.0e-20
+            t = r_value * sqrt(
+                df / ((1.0 - r_value + tiny) * (1.0 + r_value + tiny)),
+            )
+            p_value = 2 * t_distribution.sf(abs(t), df)
+            stderr = sqrt((1 - r_value ** 2) * y_var / x_var / df)
+
+        missing = missing > 0
+        return {
+            'alpha': where(missing, nan, alpha),
+            'beta': where(missing, nan, beta),
+            'r_value': where(missing, nan, r_value),
+            'p_value': where(missing, nan, p_value),
+            'stderr': where(missing, nan, stderr),
+        }
@@ -26,6 +26,7 @@ from zipline.utils.numpy_utils import (
 
 
 from .basic import Returns
+from .kernels import LinearRegressionKernel, PearsonKernel
 
 
 ALLOWED_DTYPES = (float64_dtype, int64_dtype)
@@ -86,6 +87,7 @@ class RollingPearson(_RollingCorrelation):
     instance of this class.
     """
     window_safe = True
+    kernel = PearsonKernel
 
     def compute(self, today, assets, out, base_data, target_data):
         # If `target_data` is a Slice or single column of data, broadcast it
@@ -176,6 +178,7 @@ class RollingLinearRegression(CustomFactor, SingleInputMixin):
     construct an instance of this class.
     """
     outputs = ['alpha', 'beta', 'r_value', 'p_value', 'stderr']
+    kernel = LinearRegressionKernel
 
     @expect_dtypes(dependent=ALLOWED_DTYPES, independent=ALLOWED_DTYPES)
     @expect_bounded(regression_length=(2, None))
@@ -5,6 +5,8 @@ from textwrap import dedent
 
 from numpy import (
     array,
+    broadcast_arrays,
+    errstate,
     full,
     recarray,
     vstack,
@@ -105,8 +107,14 @@ class CustomTermMixin(object):
     is mapped over the input windows.
 
     Used by CustomFactor, CustomFilter, CustomClassifier, etc.
+
+    A subclass can set `kernel` to a
+    :class:`zipline.pipeline.factors.kernels.RollingKernel` computing the same
+    values as its `compute` function, which is then used to move the window
+    forward one row at a time instead of calling `compute` on every window.
     """
     ctx = nop_context
+    kernel = None
 
     def __new__(cls,
                 inputs=NotSpecified,
@@ -186,11 +194,88 @@ class CustomTermMixin(object):
                 inputs.append(window[:, column_mask])
         return inputs
 
+    def _make_kernel(self, windows):
+        """
+        Build the kernel computing this term, or None if it must be computed
+        with `compute`.
+        """
+        kernel = self.kernel
+        if kernel is None or self.ndim != 2:
+            return None
+
+        # A subclass overriding `compute` is computed with its own `compute`
+        # unless it also provides its own kernel.
+        for cls in type(self).__mro__:
+            if 'compute' in vars(cls):
+                if vars(cls).get('kernel') is not kernel:
+                    return None
+                break
+
+        if not all(input_.dtype.kind in 'fi' for input_ in self.inputs):
+            return None
+        if not all(hasattr(w, 'applied_adjustments') for w in windows):
+            return None
+        return kernel(self.window_length, **self.params)
+
+    def _compute_with_kernel(self, kernel, windows, dates, assets, mask):
+        """
+        Compute by moving `kernel` forward with the rows entering and leaving
+        the windows each day.
+
+        The kernel is rebuilt from the full windows on the first day, on days
+        when an adjustment is applied to one of the inputs, and once every
+        `window_length` days to bound the error accumulated by the updates.
+        """
+        outputs = self.outputs
+        window_length = self.window_length
+        out = self._allocate_output(windows, mask.shape)
+
+        previous = None
+        updates = 0
+        with self.ctx, errstate(divide='ignore', invalid='ignore'):
+            for idx in range(len(dates)):
+                applied = [w.applied_adjustments for w in windows]
+                current = [next(w) for w in windows]
+                if (previous is None or
+                        updates == window_length or
+                        applied != [w.applied_adjustments for w in windows]):
+                    kernel.reset(*current)
+                    updates = 0
+                else:
+                    # Without adjustments the first row of the previous
+                    # windows is still the row which left them.
+                    kernel.update(
+                        [window[-1:] for window in current],
+                        [window[:1] for window in previous],
+                    )
+                    updates += 1
+                previous = current
+
+                out_mask = mask[idx]
+                values = kernel.values()
+                if outputs is NotSpecified:
+                    values = {None: values}
+                for name, value in values.items():
+                    row = out[idx] if name is None else out[name][idx]
+                    value = broadcast_arrays(value, out_mask)[0]
+                    row[out_mask] = value[out_mask]
+        return out
+
     def _compute(self, windows, dates, assets, mask):
         """
         Call the user's `compute` function on each window with a pre-built
         output array.
         """
+        kernel = self._make_kernel(windows)
+        if kernel is not None:
+            return self._compute_with_kernel(
+                kernel,
+                windows,
+                dates,
+                assets,
+                mask,
+            )
+
         format_inputs = self._format_inputs
         compute = self.compute
         params = self.params
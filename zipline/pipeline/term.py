@@ -130,6 +130,9 @@ class Term(with_metaclass(ABCMeta, object)):
                     params=params,
                     *args, **kwargs
                 )
+            # Kept to build a signature of the term which is stable across
+            # processes, see zipline.pipeline.cache.term_signature.
+            new_instance._identity = identity
             return new_instance
 
     @classmethod
@@ -1,6 +1,7 @@
 from six import PY2
 import functools
 import sys
+import time
 
 
 if PY2:
@@ -48,6 +49,9 @@ if PY2:
         return functools.partial(update_wrapper, wrapped=wrapped,
                                  assigned=assigned, updated=updated)
 
+    # Python 2 has no monotonic clock in the standard library.
+    monotonic = time.time
+
 else:
     from types import MappingProxyType as mappingproxy
 
@@ -58,11 +62,13 @@ else:
 
     update_wrapper = functools.update_wrapper
     wraps = functools.wraps
+    monotonic = time.monotonic
 
 
 unicode = type(u'')
 
 __all__ = [
     'mappingproxy',
+    'monotonic',
     'unicode',
 ]
@@ -1,6 +1,17 @@
+from multiprocessing import Pool
+import sqlite3
+import sys
+
+from six import itervalues
 from six.moves import map as imap
 from toolz import compose, identity
 
+try:
+    from multiprocessing import get_all_start_methods, get_context
+except ImportError:
+    # Python 2 forks its workers on every platform but Windows.
+    get_context = None
+
 
 class ApplyAsyncResult(object):
     """An object that boxes results for calls to
@@ -142,3 +153,93 @@ class SequentialPool(object):
     @staticmethod
     def join():
         pass
+
+
+def fork_pool(processes, initializer=None):
+    """Make a :class:`multiprocessing.Pool` of worker processes forked from
+    this one, so they inherit its module state, like the objects prepared by
+    :func:`prepare_fork`.
+
+    Parameters
+    ----------
+    processes : int or None
+        The number of worker processes, None for the number of cpus.
+    initializer : callable, optional
+        Called in each worker process when it starts.
+
+    Raises
+    ------
+    ValueError
+        If the 'fork' start method is not available, e.g. on Windows.
+    """
+    if get_context is None:
+        forks = sys.platform != 'win32'
+    else:
+        forks = 'fork' in get_all_start_methods()
+    if not forks:
+        raise ValueError(
+            "Running in worker processes requires the 'fork' start method,"
+            " which is not available on %s." % sys.platform
+        )
+    if get_context is None:
+        return Pool(processes, initializer=initializer)
+    return get_context('fork').Pool(processes, initializer=initializer)
+
+
+def prepare_fork(objects, asset_finder=None):
+    """Make the sqlite state of this process safe to inherit through a fork.
+
+    sqlite connections must not be used across a fork, so every worker
+    process opens its own, see :func:`reopen_sqlite_connections`.
+
+    Parameters
+    ----------
+    objects : iterable
+        The objects used by the workers, like pipeline loaders or a data
+        portal. Those among them, or held in their attributes, with an open
+        sqlite connection in ``conn`` (e.g. a ``SQLiteAdjustmentReader``)
+        are reopened by the workers.
+    asset_finder : zipline.assets.AssetFinder, optional
+        An asset finder used by the workers. The connections of its engine
+        are closed, the workers open new ones on first use.
+
+    Returns
+    -------
+    readers : list[(object, str)]
+        The objects holding a sqlite connection, with the path of their
+        database, to pass to :func:`reopen_sqlite_connections`.
+    """
+    readers = {}
+    for obj in objects:
+        candidates = [obj]
+        candidates.extend(itervalues(getattr(obj, '__dict__', {})))
+        for reader in candidates:
+            conn = getattr(reader, 'conn', None)
+            if not isinstance(conn, sqlite3.Connection):
+                continue
+            if id(reader) in readers:
+                continue
+            path = conn.execute('PRAGMA database_list').fetchone()[2]
+            # an in-memory database can't be opened again.
+            if path:
+                readers[id(reader)] = reader, path
+
+    engine = getattr(asset_finder, 'engine', None)
+    if engine is not None and engine.url.database not in (None, '',
+                                                          ':memory:'):
+        engine.dispose()
+
+    return list(itervalues(readers))
+
+
+def reopen_sqlite_connections(readers):
+    """Open new sqlite connections in a worker process forked after
+    :func:`prepare_fork`.
+
+    Parameters
+    ----------
+    readers : list[(object, str)]
+        The objects returned by :func:`prepare_fork`.
+    """
+    for reader, path in readers:
+        reader.conn = sqlite3.connect(path)
@@ -1,3 +1,4 @@
+from collections import namedtuple
 import os
 import re
 from runpy import run_path
@@ -46,6 +47,90 @@ class _RunAlgoError(click.ClickException, ValueError):
         return self.pyfunc_msg
 
 
+BacktestData = namedtuple(
+    'BacktestData', (
+        'env',
+        'data_portal',
+        'choose_loader',
+        'trading_calendar',
+        'bm_symbol',
+    ),
+)
+
+
+def _load_backtest_data(bundle, bundle_timestamp, environ):
+    """Load a bundle and build the objects a backtest over it reads from.
+
+    Parameters
+    ----------
+    bundle : str
+        The name of the bundle, or the directory of an ingestion.
+    bundle_timestamp : datetime
+        The datetime to lookup the bundle data for.
+    environ : mapping
+        The environment to use to find the bundle.
+
+    Returns
+    -------
+    backtest_data : BacktestData
+        The trading environment, data portal, pipeline loader dispatcher,
+        calendar and benchmark symbol of the bundle.
+    """
+    if os.path.isdir(bundle):
+        bundle_data = load("bundle", environ, path=bundle)
+    else:
+        bundle_data = load(bundle, environ, bundle_timestamp)
+
+    prefix, connstr = re.split(
+        r'sqlite:///',
+        str(bundle_data.asset_finder.engine.url),
+        maxsplit=1,
+    )
+    if prefix:
+        raise ValueError(
+            "invalid url %r, must begin with 'sqlite:///'" %
+            str(bundle_data.asset_finder.engine.url),
+        )
+
+    trading_calendar = bundle_data.equity_minute_bar_reader.calendar
+    bm_symbol = bundle_data.equity_minute_bar_reader.bm_symbol
+
+    env = TradingEnvironment(asset_db_path=connstr,
+                             trading_calendar=trading_calendar,
+                             bm_symbol=None,
+                             environ=environ)
+    first_trading_day =\
+        bundle_data.equity_minute_bar_reader.first_trading_day
+    data = DataPortal(
+        env.asset_finder,
+        trading_calendar=trading_calendar,
+        first_trading_day=first_trading_day,
+        equity_minute_reader=bundle_data.equity_minute_bar_reader,
+        equity_daily_reader=bundle_data.equity_daily_bar_reader,
+        adjustment_reader=bundle_data.adjustment_reader,
+    )
+
+    pipeline_loader = USEquityPricingLoader(
+        bundle_data.equity_daily_bar_reader,
+        bundle_data.adjustment_reader,
+    )
+
+    def choose_loader(column):
+        if column in EquityPricing.columns:
+            return pipeline_loader
+        raise ValueError(
+            "No PipelineLoader registered for column %s." % column
+        )
+
+    return BacktestData(
+        env=env,
+        data_portal=data,
+        choose_loader=choose_loader,
+        trading_calendar=trading_calendar,
+        bm_symbol=bm_symbol,
+    )
+
+
 def _run(handle_data,
          initialize,
          before_trading_start,
@@ -64,10 +149,14 @@ def _run(handle_data,
          trading_calendar,
          print_algo,
          local_namespace,
-         environ):
+         environ,
+         perf_sink=None):
     """Run a backtest for the given algorithm.
 
     This is shared between the cli and :func:`zipline.run_algo`.
+
+    If ``perf_sink`` is given, the performance of each session is written to
+    it as the simulation runs and nothing is returned.
     """
     warnings.filterwarnings("ignore", category=DeprecationWarning)
     
@@ -115,61 +204,18 @@ def _run(handle_data,
         else:
             click.echo(algotext)
 
-
-    if bundle is not None:
-        if os.path.isdir(bundle):
-            bundle_data = load("bundle",environ,path=bundle)
-        else:
-            bundle_data = load(bundle,environ,bundle_timestamp)
-
-        prefix, connstr = re.split(
-            r'sqlite:///',
-            str(bundle_data.asset_finder.engine.url),
-            maxsplit=1,
-        )
-        if prefix:
-            raise ValueError(
-                "invalid url %r, must begin with 'sqlite:///'" %
-                str(bundle_data.asset_finder.engine.url),
-            )
-        
-        trading_calendar = bundle_data.equity_minute_bar_reader.calendar
-        bm_symbol = bundle_data.equity_minute_bar_reader.bm_symbol
-        
-        env = TradingEnvironment(asset_db_path=connstr, 
-                                 trading_calendar = trading_calendar,
-                                 bm_symbol = None,
-                                 environ=environ)
-        first_trading_day =\
-            bundle_data.equity_minute_bar_reader.first_trading_day
-        data = DataPortal(
-            env.asset_finder,
-            trading_calendar=trading_calendar,
-            first_trading_day=first_trading_day,
-            equity_minute_reader=bundle_data.equity_minute_bar_reader,
-            equity_daily_reader=bundle_data.equity_daily_bar_reader,
-            adjustment_reader=bundle_data.adjustment_reader,
-        )
-
-        pipeline_loader = USEquityPricingLoader(
-            bundle_data.equity_daily_bar_reader,
-            bundle_data.adjustment_reader,
-        )
-
-        def choose_loader(column):
-            if column in EquityPricing.columns:
-                return pipeline_loader
-            raise ValueError(
-                "No PipelineLoader registered for column %s." % column
-            )
-    else:
+    if bundle is None:
         raise ValueError("Bundle input missing")
 
+    env, data, choose_loader, trading_calendar, bm_symbol = \
+        _load_backtest_data(bundle, bundle_timestamp, environ)
+
     perf = TradingAlgorithm(
         namespace=namespace,
         env=env,
         get_pipeline_loader=choose_loader,
         trading_calendar=trading_calendar,
+        perf_sink=perf_sink,
         benchmark_sid = env.asset_finder.lookup_symbol(bm_symbol,as_of_date = end),
         sim_params=create_simulation_parameters(
             start=start,
@@ -0,0 +1,342 @@
+"""
+Parameter sweeps: many variants of one algorithm over data loaded once.
+
+``run_sweep`` loads the bundle, builds the data portal and computes the
+pipelines attached by the algorithm in the calling process. The variants
+then run in worker processes forked from it, which share all of that
+copy-on-write instead of loading it again, and each of them returns a one
+row summary of its performance instead of the full daily performance.
+"""
+from collections import OrderedDict
+from itertools import product
+import os
+import traceback
+
+import pandas as pd
+from six import iteritems
+
+from zipline.algorithm import TradingAlgorithm
+from zipline.finance.performance import PerformanceTracker
+from zipline.pipeline.engine import SimplePipelineEngine
+from zipline.utils.factory import create_simulation_parameters
+from zipline.utils.pool import (
+    SequentialPool,
+    fork_pool,
+    prepare_fork,
+    reopen_sqlite_connections,
+)
+from zipline.utils.run_algo import _load_backtest_data
+
+# The fields of the last row of the performance summarized for each variant.
+SUMMARY_FIELDS = (
+    'portfolio_value',
+    'algorithm_period_return',
+    'benchmark_period_return',
+    'sharpe',
+    'sortino',
+    'max_drawdown',
+    'alpha',
+    'beta',
+)
+
+# The state of a sweep, set in the parent before the workers are forked.
+_sweep_state = None
+
+
+def expand_grid(grid):
+    """Expand a parameter grid into the list of its parameter sets.
+
+    Parameters
+    ----------
+    grid : mapping[str -> iterable]
+        The values to take for each parameter.
+
+    Returns
+    -------
+    params : list[OrderedDict]
+        Every combination of the values, varying the last parameter fastest.
+    """
+    names = list(grid)
+    return [
+        OrderedDict(zip(names, values))
+        for values in product(*(list(grid[name]) for name in names))
+    ]
+
+
+def _pipeline_key(pipeline):
+    # terms are interned, equal pipelines built by different variants have
+    # identical columns and screen.
+    return frozenset(iteritems(pipeline.columns)), pipeline.screen
+
+
+class SweepAlgorithm(TradingAlgorithm):
+    """A TradingAlgorithm run as one variant of a sweep.
+
+    Parameters
+    ----------
+    params : dict, optional
+        The parameters of this variant, available as ``context.params``.
+    precomputed_pipelines : dict, optional
+        Pipeline results computed over the whole simulation, keyed by the
+        columns and screen of the pipeline. Attached pipelines found in it
+        are not computed again.
+    """
+    def __init__(self, *args, **kwargs):
+        self.params = kwargs.pop('params', {})
+        self._precomputed_pipelines = kwargs.pop('precomputed_pipelines', {})
+        super(SweepAlgorithm, self).__init__(*args, **kwargs)
+
+    def _run_pipeline(self, pipeline, start_session, chunksize):
+        try:
+            data = self._precomputed_pipelines[_pipeline_key(pipeline)]
+        except KeyError:
+            return super(SweepAlgorithm, self)._run_pipeline(
+                pipeline,
+                start_session,
+                chunksize,
+            )
+        return data, self.sim_params.end_session
+
+    def attached_pipelines(self):
+        """Run ``initialize`` and return the pipelines it attaches.
+
+        The algorithm is not run afterwards, this is used to find out what to
+        compute once for every variant.
+        """
+        self.perf_tracker = PerformanceTracker(
+            sim_params=self.sim_params,
+            trading_calendar=self.trading_calendar,
+            asset_finder=self.asset_finder,
+        )
+        self.on_dt_changed(self.sim_params.start_session)
+        self.initialize(*self.initialize_args, **self.initialize_kwargs)
+        return [pipeline for pipeline, _ in self._pipelines.values()]
+
+
+def summarize_perf(perf):
+    """Reduce the daily performance of a backtest to a single row.
+
+    Parameters
+    ----------
+    perf : pd.DataFrame
+        The result of ``TradingAlgorithm.run``.
+
+    Returns
+    -------
+    summary : OrderedDict
+        The last value of each of ``SUMMARY_FIELDS`` in ``perf``, with the
+        number of transactions.
+    """
+    summary = OrderedDict(
+        (field, perf[field].iloc[-1])
+        for field in SUMMARY_FIELDS
+        if field in perf and len(perf)
+    )
+    if 'transactions' in perf:
+        summary['transactions'] = sum(map(len, perf['transactions']))
+    return summary
+
+
+def _make_algorithm(state, params, precomputed_pipelines=None):
+    namespace = {}
+    kwargs = {}
+    if state['algotext'] is not None:
+        # bound like the names passed with ``-D`` to ``zipline run``.
+        namespace.update(state['defines'])
+        namespace.update(params)
+        kwargs['script'] = state['algotext']
+        kwargs['algo_filename'] = state['algo_filename']
+    else:
+        kwargs.update(state['functions'])
+
+    data = state['data']
+    return SweepAlgorithm(
+        params=params,
+        precomputed_pipelines=precomputed_pipelines or {},
+        namespace=namespace,
+        env=data.env,
+        get_pipeline_loader=data.choose_loader,
+        trading_calendar=data.trading_calendar,
+        benchmark_sid=state['benchmark_sid'],
+        sim_params=state['sim_params'],
+        **kwargs
+    )
+
+
+def _reconnect():
+    reopen_sqlite_connections(_sweep_state['readers'])
+
+
+def _run_variant(item):
+    index, params = item
+    state = _sweep_state
+    try:
+        algo = _make_algorithm(state, params, state['pipelines'])
+        perf = algo.run(state['data'].data_portal, overwrite_sim_params=False)
+        summary = state['summarize'](perf)
+        error = None
+    except Exception:
+        summary = {}
+        error = traceback.format_exc()
+    return index, summary, error
+
+
+def run_sweep(params,
+              start,
+              end,
+              bundle,
+              initialize=None,
+              handle_data=None,
+              before_trading_start=None,
+              algotext=None,
+              algo_filename='<algorithm>',
+              defines=None,
+              capital_base=10e6,
+              data_frequency='daily',
+              bundle_timestamp=None,
+              processes=None,
+              precompute_pipelines=True,
+              summarize=summarize_perf,
+              environ=None):
+    """Run many variants of one algorithm over data loaded once.
+
+    Parameters
+    ----------
+    params : list[dict] or mapping[str -> iterable]
+        The parameters of each variant. A mapping is a grid expanded with
+        ``expand_grid``.
+    start, end : pd.Timestamp
+        The dates of the simulation.
+    bundle : str
+        The name of the bundle, or the directory of an ingestion.
+    initialize, handle_data, before_trading_start : callable, optional
+        The functions of the algorithm. The parameters of a variant are
+        ``context.params``.
+    algotext : str, optional
+        The script of the algorithm, instead of the functions. The
+        parameters of a variant are bound in its namespace, as well as in
+        ``context.params``.
+    algo_filename : str, optional
+        The file name of ``algotext`` in tracebacks.
+    defines : dict, optional
+        Names bound in the namespace of every variant of ``algotext``.
+    capital_base : float, optional
+        The starting capital of every variant.
+    data_frequency : {'daily', 'minute'}, optional
+        The data frequency of the simulation.
+    bundle_timestamp : datetime, optional
+        The datetime to lookup the bundle data for.
+    processes : int, optional
+        The number of worker processes. Defaults to the number of cpus. With
+        1, the variants run in this process. The workers are forked from
+        this process, so more than one process requires the 'fork' start
+        method, which Windows does not have.
+    precompute_pipelines : bool, optional
+        Whether to compute the pipelines attached by the first variant once,
+        over the whole simulation, for every variant attaching the same
+        pipelines.
+    summarize : callable[pd.DataFrame -> dict], optional
+        Reduce the performance of a variant to the values kept.
+    environ : mapping, optional
+        The environment to use to find the bundle. Defaults to
+        ``os.environ``.
+
+    Returns
+    -------
+    results : pd.DataFrame
+        A row per variant, in the order of ``params``, with the parameters,
+        the summary of the performance and an ``error`` column holding the
+        traceback of the variants which failed.
+    """
+    global _sweep_state
+
+    if isinstance(params, dict):
+        params = expand_grid(params)
+    params = list(params)
+    if (algotext is None) == (initialize is None):
+        raise ValueError(
+            'must specify exactly one of `algotext` or `initialize`',
+        )
+    if environ is None:
+        environ = os.environ
+
+    data = _load_backtest_data(bundle, bundle_timestamp, environ)
+    sim_params = create_simulation_parameters(
+        start=start,
+        end=end,
+        capital_base=capital_base,
+        data_frequency=data_frequency,
+        trading_calendar=data.trading_calendar,
+    )
+    state = {
+        'data': data,
+        'sim_params': sim_params,
+        'benchmark_sid': data.env.asset_finder.lookup_symbol(
+            data.bm_symbol,
+            as_of_date=end,
+        ),
+        'algotext': algotext,
+        'algo_filename': algo_filename,
+        'defines': defines or {},
+        'functions': {
+            'initialize': initialize,
+            'handle_data': handle_data,
+            'before_trading_start': before_trading_start,
+        },
+        'summarize': summarize,
+        'pipelines': {},
+        'readers': [],
+    }
+
+    if precompute_pipelines and params:
+        engine = SimplePipelineEngine(
+            data.choose_loader,
+            data.trading_calendar.all_sessions,
+            data.env.asset_finder,
+        )
+        pipelines = _make_algorithm(state, params[0]).attached_pipelines()
+        # the pipelines are kept alive in ``state`` so the workers creating
+        # the same terms get the same objects back.
+        state['pipelines'] = {
+            _pipeline_key(pipeline): engine.run_pipeline(
+                pipeline,
+                sim_params.start_session,
+                sim_params.end_session,
+            )
+            for pipeline in pipelines
+        }
+
+    if processes is None or processes > 1:
+        state['readers'] = prepare_fork(
+            [data.data_portal],
+            data.env.asset_finder,
+        )
+        _sweep_state = state
+        try:
+            pool = fork_pool(processes, _reconnect)
+        except Exception:
+            _sweep_state = None
+            raise
+    else:
+        _sweep_state = state
+        pool = SequentialPool()
+
+    summaries = [None] * len(params)
+    errors = [None] * len(params)
+    try:
+        for index, summary, error in pool.imap_unordered(
+                _run_variant,
+                enumerate(params)):
+            summaries[index] = summary
+            errors[index] = error
+    finally:
+        pool.close()
+        pool.join()
+        _sweep_state = None
+
+    results = pd.concat(
+        [pd.DataFrame(params), pd.DataFrame(summaries)],
+        axis=1,
+    )
+    results['error'] = errors
+    return results